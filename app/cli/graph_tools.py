@@ -78,11 +78,13 @@ def main(argv: Sequence[str] | None = None) -> int:
     from engine.configs.settings import settings
 
     # 工具入口默认开启信息级日志，确保用户可见关键进度（与 CLI 约定一致）。
-    # 例外：validate-graphs / ui-var 的 --json 模式要求 stdout 仅输出 JSON（便于脚本/CI 消费），
+    # 例外：validate-graphs / ui-var 的 --json 模式与 validate-graphs --watch 要求 stdout 仅输出 JSON（便于脚本/CI 消费），
     # 因此需关闭 info 日志避免混入前置文本。
     enable_info_logs = True
     if parsed_args.command in {"validate-graphs", "ui-var"} and bool(getattr(parsed_args, "output_json", False)):
         enable_info_logs = False
+    if parsed_args.command == "validate-graphs" and bool(getattr(parsed_args, "watch", False)):
+        enable_info_logs = False
     settings.NODE_IMPL_LOG_VERBOSE = bool(enable_info_logs)
     init_settings_for_workspace(workspace_root=workspace_root, load_user_settings=False)
 
@@ -114,6 +114,13 @@ def _build_parser() -> argparse.ArgumentParser:
     serve.add_argument("--present-players", type=int, default=1, help="在场玩家数量（默认 1）")
     serve.add_argument("--auto-signal-id", default="", help="server 启动后自动发送的信号 ID（可选）")
     serve.add_argument("--auto-param", action="append", default=[], help="auto-signal 参数（key=value，可重复）")
+    serve.add_argument(
+        "--trace-level",
+        choices=["off", "events", "nodes", "full"],
+        default="nodes",
+        help="运行期追踪级别（默认 nodes，包含节点执行事件；off 关闭追踪）",
+    )
+    serve.add_argument("--trace-console", action="store_true", help="同时将追踪事件逐条输出到控制台")
 
     click = subparsers.add_parser("click", help="一次性注入 UI 点击事件并打印 UI patches（不启动 server）")
     click.add_argument("--graph", required=True, help="主图节点图源码文件路径（.py）")
@@ -186,6 +193,8 @@ def main(argv: Sequence[str] | None = None) -> int:
             auto_emit_signal_id=str(args.auto_signal_id),
             auto_emit_signal_params=auto_params,
             extra_graph_mounts=extra_mounts,
+            trace_level=str(args.trace_level),
+            trace_console=bool(args.trace_console),
         )
         server = LocalGraphSimServer(cfg)
         server.start()
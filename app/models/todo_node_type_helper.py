@@ -8,6 +8,7 @@ from typing import Any, Dict, List, Literal, Optional, Set
 
 from engine.nodes.node_registry import get_node_registry
 from engine.utils.cache.cache_paths import get_node_cache_dir
+from engine.nodes.node_library_cache import NODE_LIBRARY_CACHE_FILE_NAME
 from engine.utils.graph.graph_utils import is_flow_port_name
 from engine.nodes.port_name_rules import get_dynamic_port_type
 from engine.utils.workspace import (
@@ -375,7 +376,7 @@ class NodeTypeHelper:
 
     def _compute_library_signature(self, workspace_path: Path) -> float:
         cache_dir = get_node_cache_dir(workspace_path)
-        cache_file = cache_dir / "node_library.json"
+        cache_file = cache_dir / NODE_LIBRARY_CACHE_FILE_NAME
         if cache_file.exists():
             return cache_file.stat().st_mtime
         return 0.0
@@ -1,9 +1,9 @@
 """运行时引擎模块 - 执行器与运行时环境"""
 
 from .game_state import GameRuntime
-from .trace_logging import TraceEvent, TraceRecorder
+from .trace_logging import TraceEvent, TraceLevel, TraceRecorder
 
-__all__ = ["GameRuntime", "TraceRecorder", "TraceEvent"]
+__all__ = ["GameRuntime", "TraceRecorder", "TraceEvent", "TraceLevel"]
 
 
 
@@ -1,38 +1,86 @@
 """游戏状态管理 - 变量、实体、事件系统"""
 
-from typing import Any, Dict, List, Optional, Callable, Tuple
+from typing import Any, Dict, List, Mapping, Optional, Callable, Tuple
 import random
 import time
 import copy
+import weakref
 
-from app.runtime.engine.trace_logging import TraceRecorder
+from app.runtime.engine.state_changes import ObservedEntityDict, RuntimeChangeTracker
+from app.runtime.engine.timer_scheduler import TIMER_KIND_MOTOR, TimerRecord, TimerScheduler
+from app.runtime.engine.trace_logging import DEFAULT_TRACE_CAPACITY, TraceLevel, TraceRecorder, print_trace_event
+
+
+# 这些字段被整体赋值时通知 `_on_change`（由 GameRuntime.entities 挂上，用于状态变更日志）
+_OBSERVED_ENTITY_FIELDS = frozenset({"name", "position", "rotation"})
+
+# 读取后可能被原地修改的变量值类型：读取即视为“可能变化”
+_MUTABLE_VARIABLE_TYPES = (dict, list, set)
 
 
 class MockEntity:
     """Mock实体对象"""
     
     def __init__(self, entity_id: str, name: str = "未命名实体"):
+        self._on_change: Optional[Callable[[str], None]] = None
         self.entity_id = entity_id
         self.name = name
         self.position = [0.0, 0.0, 0.0]
         self.rotation = [0.0, 0.0, 0.0]
         self.variables = {}  # 自定义变量
         
+    def __setattr__(self, key: str, value: Any) -> None:
+        object.__setattr__(self, key, value)
+        if key in _OBSERVED_ENTITY_FIELDS:
+            on_change = self._on_change
+            if on_change is not None:
+                on_change(self.entity_id)
+
     def __repr__(self):
         return f"<Entity:{self.name}>"
 
 
+# 弱引用缓存：会话重启/重新加载图模块后，旧的节点图类（及其模块）可以被回收
+_GRAPH_CLASS_LABELS: "weakref.WeakKeyDictionary[type, Tuple[str, str]]" = weakref.WeakKeyDictionary()
+
+
+def _describe_graph_class(graph_class: type) -> Tuple[str, str]:
+    """节点图类 -> (类名, 图名)；图名取自类 docstring 的 `节点图类：` 前缀。"""
+    cached = _GRAPH_CLASS_LABELS.get(graph_class)
+    if cached is not None:
+        return cached
+    graph_name = ""
+    doc = getattr(graph_class, "__doc__", None)
+    if isinstance(doc, str):
+        text = doc.strip()
+        prefix = "节点图类："
+        if text.startswith(prefix):
+            graph_name = text[len(prefix) :].strip()
+    label = (str(getattr(graph_class, "__name__", "") or ""), graph_name)
+    _GRAPH_CLASS_LABELS[graph_class] = label
+    return label
+
+
 class GameRuntime:
     """游戏运行时环境"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        *,
+        trace_level: TraceLevel | int | str = TraceLevel.EVENTS,
+        trace_capacity: int = DEFAULT_TRACE_CAPACITY,
+        trace_console: bool = False,
+    ):
+        # 状态脏标记（供本地测试 server 的增量变更日志使用）
+        self.state_changes = RuntimeChangeTracker()
+
         # 变量系统
         self.custom_variables = {}  # 自定义变量 {entity_id: {var_name: value}}
         self.graph_variables = {}   # 节点图变量 {var_name: value}
         self.local_variables = {}   # 局部变量 {var_id: value}
         
         # 实体系统
-        self.entities = {}  # {entity_id: MockEntity}
+        self.entities = ObservedEntityDict(self.state_changes)  # {entity_id: MockEntity}
         self.entity_counter = 0
         
         # 事件系统
@@ -44,8 +92,7 @@ class GameRuntime:
         # Mock系统状态
         self.music_volume = 100
         self.current_music = None
-        self.timers = {}
-        self._timer_token_counter: int = 0
+        self.timer_scheduler = TimerScheduler()
 
         # 在场玩家（本地测试：可配置人数，用于“等待其他玩家/投票门槛”等逻辑）
         self.present_player_count: int = 1
@@ -59,8 +106,12 @@ class GameRuntime:
         self.ui_binding_root_entity_id: str = ""
         self.ui_lv_defaults: Dict[str, Any] = {}
 
-        # 运行期事件追踪
-        self.trace_recorder = TraceRecorder()
+        # 运行期事件追踪（有界环形缓冲；控制台输出为可选 sink）
+        self.trace_recorder = TraceRecorder(
+            sink=print_trace_event if trace_console else None,
+            level=trace_level,
+            capacity=int(trace_capacity),
+        )
         
         # 创建一些默认实体
         self._create_default_entities()
@@ -118,6 +169,8 @@ class GameRuntime:
         # 本地测试用该字段快速定位 UI 绑定数据来源实体。
         if str(var_name or "").startswith("UI"):
             self.ui_binding_root_entity_id = str(entity_id)
+            self.state_changes.mark_ui()
+        self.state_changes.mark_custom_variable(entity_id, var_name)
         self._update_variable_store(
             entity_variables,
             var_name,
@@ -133,7 +186,10 @@ class GameRuntime:
         entity_id = self._get_entity_id(entity)
         store = self.custom_variables.get(entity_id, {})
         if isinstance(store, dict) and (var_name in store):
-            return store.get(var_name, default)
+            value = store.get(var_name, default)
+            if isinstance(value, _MUTABLE_VARIABLE_TYPES):
+                self.state_changes.mark_custom_variable(entity_id, var_name)
+            return value
 
         # 本地测试：当 UI HTML 提供了 lv.* 默认值时，允许在首次读取时自动补齐到实体自定义变量中，
         # 以避免节点图侧“对字典写 key”在变量不存在时变成 no-op（真实游戏中这些 UI 变量通常是预置的）。
@@ -141,14 +197,17 @@ class GameRuntime:
             entity_variables = self.custom_variables.setdefault(entity_id, {})
             value = copy.deepcopy(self.ui_lv_defaults.get(var_name))
             entity_variables[var_name] = value
+            self.state_changes.mark_custom_variable(entity_id, var_name)
             if str(var_name or "").startswith("UI"):
                 self.ui_binding_root_entity_id = str(entity_id)
+                self.state_changes.mark_ui()
             return value
 
         return default
     
     def set_graph_variable(self, var_name: str, value: Any, trigger_event: bool = False):
         """设置节点图变量"""
+        self.state_changes.mark_graph_variable(var_name)
         self._update_variable_store(
             self.graph_variables,
             var_name,
@@ -161,16 +220,21 @@ class GameRuntime:
     
     def get_graph_variable(self, var_name: str, default=None):
         """获取节点图变量"""
-        return self.graph_variables.get(var_name, default)
+        value = self.graph_variables.get(var_name, default)
+        if isinstance(value, _MUTABLE_VARIABLE_TYPES) and var_name in self.graph_variables:
+            self.state_changes.mark_graph_variable(var_name)
+        return value
     
     def create_local_variable(self, initial_value=None):
         """创建局部变量"""
         var_id = f"local_{len(self.local_variables)}"
         self.local_variables[var_id] = initial_value
+        self.state_changes.mark_local_variable(var_id)
         return var_id, initial_value
     
     def set_local_variable(self, var_id: str, value: Any):
         """设置局部变量"""
+        self.state_changes.mark_local_variable(var_id)
         self._update_variable_store(
             self.local_variables,
             var_id,
@@ -181,7 +245,10 @@ class GameRuntime:
     
     def get_local_variable(self, var_id: str, default=None):
         """获取局部变量"""
-        return self.local_variables.get(var_id, default)
+        value = self.local_variables.get(var_id, default)
+        if isinstance(value, _MUTABLE_VARIABLE_TYPES) and var_id in self.local_variables:
+            self.state_changes.mark_local_variable(var_id)
+        return value
     
     # ========== 实体系统 ==========
     
@@ -240,6 +307,7 @@ class GameRuntime:
         if not isinstance(defaults, dict):
             raise TypeError("defaults 必须是 dict")
         self.ui_lv_defaults = dict(defaults)
+        self.state_changes.mark_ui()
     
     def destroy_entity(self, entity):
         """销毁实体"""
@@ -256,10 +324,9 @@ class GameRuntime:
         """销毁实体后联动清理所有挂靠状态（变量、定时器、事件、节点图）。"""
         self.custom_variables.pop(entity_id, None)
         self.attached_graphs.pop(entity_id, None)
-        timer_prefix = f"{entity_id}_"
-        timers_to_remove = [key for key in self.timers.keys() if key.startswith(timer_prefix)]
-        for timer_key in timers_to_remove:
-            del self.timers[timer_key]
+        self.state_changes.mark_custom_variable_owner(entity_id)
+        self.state_changes.mark_attached_graphs(entity_id)
+        self.timer_scheduler.stop_with_prefix(f"{entity_id}_")
         for event_name in list(self.event_handlers.keys()):
             remaining_handlers = [
                 (handler, owner_id)
@@ -310,77 +377,53 @@ class GameRuntime:
             event_name: 事件名称
             **kwargs: 事件参数
         """
-        print(f"[事件触发] {event_name}")
-        self.record_trace_event(
-            kind="event",
-            message=event_name,
-            payload=dict(kwargs),
-        )
+        recorder = self.trace_recorder
+        tracing = recorder is not None and recorder.wants(TraceLevel.EVENTS)
+        if tracing:
+            self.record_trace_event(
+                kind="event",
+                message=event_name,
+                payload=dict(kwargs),
+            )
         
         # 调用注册的处理器
         handlers = self.event_handlers.get(event_name)
         if handlers:
             for handler, owner_id in handlers:
-                owner_id_text = str(owner_id) if owner_id is not None else ""
-                owner_name = ""
-                if owner_id_text:
-                    ent = self.entities.get(owner_id_text, None)
-                    if ent is not None:
-                        owner_name = str(getattr(ent, "name", "") or "")
-                owner_label = owner_id_text if owner_id_text else "<global>"
-                if owner_name:
-                    owner_label = f"{owner_id_text}({owner_name})"
-
-                graph_obj = getattr(handler, "__self__", None)
-                graph_class = ""
-                graph_name = ""
-                if graph_obj is not None:
-                    graph_class = str(getattr(getattr(graph_obj, "__class__", None), "__name__", "") or "")
-                    doc = getattr(getattr(graph_obj, "__class__", None), "__doc__", None)
-                    if isinstance(doc, str):
-                        text = doc.strip()
-                        prefix = "节点图类："
-                        if text.startswith(prefix):
-                            graph_name = text[len(prefix) :].strip()
-
-                handler_name = str(getattr(handler, "__name__", "") or getattr(handler, "__qualname__", "") or "handler")
-                graph_label = graph_name or graph_class
-                graph_handler = f"{graph_label}.{handler_name}" if graph_label else handler_name
-
-                src_ent = kwargs.get("事件源实体", None)
-                src_id = str(self._get_entity_id(src_ent)) if src_ent is not None else ""
-                src_name = str(getattr(src_ent, "name", "") or "") if isinstance(src_ent, MockEntity) else ""
-                src_label = src_id
-                if src_id and src_name:
-                    src_label = f"{src_id}({src_name})"
-
-                src_guid = kwargs.get("事件源GUID", None)
-                timer_name = kwargs.get("定时器名称", None)
-
-                extra = ""
-                if timer_name is not None:
-                    extra = f" timer={str(timer_name)}"
-                if src_guid is not None:
-                    extra = f"{extra} guid={str(src_guid)}"
-                if src_label:
-                    extra = f"{extra} src={src_label}"
-
-                print(f"[事件分发] {event_name} -> {owner_label} :: {graph_handler}{extra}")
-                self.record_trace_event(
-                    kind="event_dispatch",
-                    message=event_name,
-                    owner_entity_id=owner_id_text,
-                    owner_entity_name=owner_name,
-                    graph_name=graph_name,
-                    graph_class=graph_class,
-                    handler=handler_name,
-                    source_entity_id=src_id,
-                    source_entity_name=src_name,
-                    source_guid=src_guid,
-                    timer_name=str(timer_name) if timer_name is not None else "",
-                )
-
+                if tracing:
+                    self._record_event_dispatch(event_name, handler, owner_id, kwargs)
                 handler(**kwargs)
+
+    def _record_event_dispatch(self, event_name: str, handler: Callable, owner_id: Optional[str], kwargs: Dict[str, Any]) -> None:
+        owner_id_text = str(owner_id) if owner_id is not None else ""
+        owner_name = ""
+        if owner_id_text:
+            ent = self.entities.get(owner_id_text, None)
+            if ent is not None:
+                owner_name = str(getattr(ent, "name", "") or "")
+
+        graph_obj = getattr(handler, "__self__", None)
+        graph_class, graph_name = _describe_graph_class(type(graph_obj)) if graph_obj is not None else ("", "")
+        handler_name = str(getattr(handler, "__name__", "") or getattr(handler, "__qualname__", "") or "handler")
+
+        src_ent = kwargs.get("事件源实体", None)
+        src_id = str(self._get_entity_id(src_ent)) if src_ent is not None else ""
+        src_name = str(getattr(src_ent, "name", "") or "") if isinstance(src_ent, MockEntity) else ""
+        timer_name = kwargs.get("定时器名称", None)
+
+        self.record_trace_event(
+            kind="event_dispatch",
+            message=event_name,
+            owner_entity_id=owner_id_text,
+            owner_entity_name=owner_name,
+            graph_name=graph_name,
+            graph_class=graph_class,
+            handler=handler_name,
+            source_entity_id=src_id,
+            source_entity_name=src_name,
+            source_guid=kwargs.get("事件源GUID", None),
+            timer_name=str(timer_name) if timer_name is not None else "",
+        )
     
     def register_event_handler(self, event_name: str, handler: Callable, owner=None):
         """注册事件处理器
@@ -444,6 +487,7 @@ class GameRuntime:
             self.attached_graphs[owner_entity.entity_id] = []
         
         self.attached_graphs[owner_entity.entity_id].append(graph_instance)
+        self.state_changes.mark_attached_graphs(owner_entity.entity_id)
         
         # 注册事件处理器
         graph_instance.register_handlers()
@@ -465,6 +509,7 @@ class GameRuntime:
         self.ui_current_layout_by_player[player_id] = index
         patch = {"op": "switch_layout", "player_id": player_id, "layout_index": index}
         self.ui_patches.append(patch)
+        self.state_changes.record_ui_patch(patch)
         self.record_trace_event(kind="ui", message="switch_layout", **patch)
 
     def ui_set_widget_state(self, player_entity, widget_index: int, state: str) -> None:
@@ -481,6 +526,7 @@ class GameRuntime:
             "state": state_text,
         }
         self.ui_patches.append(patch)
+        self.state_changes.record_ui_patch(patch)
         self.record_trace_event(kind="ui", message="set_widget_state", **patch)
 
     def ui_activate_widget_group(self, player_entity, group_index: int) -> None:
@@ -491,6 +537,7 @@ class GameRuntime:
         active.add(idx)
         patch = {"op": "activate_widget_group", "player_id": player_id, "group_index": idx}
         self.ui_patches.append(patch)
+        self.state_changes.record_ui_patch(patch)
         self.record_trace_event(kind="ui", message="activate_widget_group", **patch)
 
     def ui_remove_widget_group(self, player_entity, group_index: int) -> None:
@@ -502,6 +549,7 @@ class GameRuntime:
             active.remove(idx)
         patch = {"op": "remove_widget_group", "player_id": player_id, "group_index": idx}
         self.ui_patches.append(patch)
+        self.state_changes.record_ui_patch(patch)
         self.record_trace_event(kind="ui", message="remove_widget_group", **patch)
     
     # ========== Mock系统 ==========
@@ -544,30 +592,61 @@ class GameRuntime:
         if loop_duration <= 0:
             raise ValueError(f"定时器序列最后一项必须 > 0: {timer_sequence!r}")
 
-        now = float(time.monotonic())
-        self._timer_token_counter += 1
-        self.timers[timer_key] = {
-            "entity_id": str(entity_id),
-            "timer_name": str(timer_name),
-            "sequence": seq,
-            "is_loop": bool(is_loop),
-            "loop_duration": loop_duration,
-            "start_time": now,
-            "token": int(self._timer_token_counter),
-            "loop_count": 0,
-            "next_index": 0,
-            "next_fire_time": now + float(seq[0]),
-        }
+        self._start_timer_record(timer_key, str(entity_id), str(timer_name), seq, bool(is_loop))
         print(f"[定时器] 启动定时器'{timer_name}', 序列={seq}, 循环={is_loop}")
     
+    def _start_timer_record(
+        self, timer_key: str, entity_id: str, timer_name: str, sequence: List[float], is_loop: bool
+    ) -> TimerRecord:
+        now = float(time.monotonic())
+        record = TimerRecord(
+            entity_id=entity_id,
+            timer_name=timer_name,
+            sequence=sequence,
+            is_loop=is_loop,
+            loop_duration=float(sequence[-1]),
+            start_time=now,
+            token=self.timer_scheduler.next_token(),
+            next_fire_time=now + float(sequence[0]),
+        )
+        self.timer_scheduler.start(timer_key, record)
+        return record
+
+    @property
+    def timers(self) -> Mapping[str, TimerRecord]:
+        """只读视图：{timer_key: TimerRecord}；修改请走 start/stop/pause/resume 接口。"""
+        return self.timer_scheduler.records
+
+    def get_timer(self, entity, timer_name: str) -> Optional[TimerRecord]:
+        entity_id = self._get_entity_id(entity)
+        return self.timer_scheduler.get(f"{entity_id}_{timer_name}")
+
     def stop_timer(self, entity, timer_name: str):
         """停止定时器（Mock）"""
         entity_id = self._get_entity_id(entity)
         timer_key = f"{entity_id}_{timer_name}"
-        if timer_key in self.timers:
-            del self.timers[timer_key]
+        if self.timer_scheduler.stop(timer_key) is not None:
             print(f"[定时器] 停止定时器'{timer_name}'")
 
+    def pause_timer(self, entity, timer_name: str, *, now: Optional[float] = None) -> bool:
+        """暂停定时器；未找到或已暂停时返回 False。"""
+        entity_id = self._get_entity_id(entity)
+        t = float(time.monotonic() if now is None else now)
+        return self.timer_scheduler.pause(f"{entity_id}_{timer_name}", t)
+
+    def resume_timer(self, entity, timer_name: str, *, now: Optional[float] = None) -> bool:
+        """恢复暂停中的定时器（不追赶暂停期间错过的触发）；未找到或未暂停时返回 False。"""
+        entity_id = self._get_entity_id(entity)
+        t = float(time.monotonic() if now is None else now)
+        return self.timer_scheduler.resume(f"{entity_id}_{timer_name}", t)
+
+    def get_timer_elapsed(self, entity, timer_name: str, *, now: Optional[float] = None) -> float:
+        """定时器当前计时；不存在时返回 0.0。"""
+        record = self.get_timer(entity, timer_name)
+        if record is None:
+            return 0.0
+        return record.elapsed(float(time.monotonic() if now is None else now))
+
     def start_motor(
         self,
         entity,
@@ -613,15 +692,12 @@ class GameRuntime:
             return
 
         # 复用 timer 驱动，但在 tick 中会按 kind=__motor__ 分支改为触发“基础运动器停止时”
-        self.start_timer_sequence(entity, timer_name, [float(dur)], is_loop=False)
-        timer_key = f"{ent_id}_{timer_name}"
-        info = self.timers.get(timer_key, None)
-        if isinstance(info, dict):
-            info["kind"] = "__motor__"
-            info["motor_name"] = str(mname)
-            info["target_position"] = list(target_position) if isinstance(target_position, list) else list(target_position)
-            info["target_rotation"] = list(target_rotation) if isinstance(target_rotation, list) else list(target_rotation)
-            info["lock_rotation"] = bool(lock_rotation)
+        record = self._start_timer_record(f"{ent_id}_{timer_name}", str(ent_id), timer_name, [float(dur)], False)
+        record.kind = TIMER_KIND_MOTOR
+        record.motor_name = str(mname)
+        record.target_position = list(target_position)
+        record.target_rotation = list(target_rotation)
+        record.lock_rotation = bool(lock_rotation)
 
     def stop_motor(self, entity, *, motor_name: str, fire_stop_event: bool = True) -> None:
         """停止并删除离线基础运动器模拟，可选触发 `基础运动器停止时`。"""
@@ -631,9 +707,7 @@ class GameRuntime:
         ent_id = self._get_entity_id(entity)
         timer_name = f"__motor__{mname}"
         timer_key = f"{ent_id}_{timer_name}"
-        existed = timer_key in self.timers
-        if existed:
-            del self.timers[timer_key]
+        self.timer_scheduler.stop(timer_key)
 
         if fire_stop_event:
             src_entity = self.get_entity(str(ent_id))
@@ -645,6 +719,18 @@ class GameRuntime:
                     运动器名称=str(mname),
                 )
 
+    def stop_all_motors(self, entity, *, fire_stop_event: bool = True) -> List[str]:
+        """停止并删除实体上所有离线基础运动器模拟（按启动先后），返回被停止的运动器名称。"""
+        ent_id = str(self._get_entity_id(entity))
+        motor_names = [
+            record.motor_name
+            for record in self.timer_scheduler.records.values()
+            if record.kind == TIMER_KIND_MOTOR and record.entity_id == ent_id
+        ]
+        for mname in motor_names:
+            self.stop_motor(entity, motor_name=mname, fire_stop_event=fire_stop_event)
+        return motor_names
+
     def tick(self, now: Optional[float] = None, *, max_fires: Optional[int] = None) -> int:
         """推进本地 MockRuntime 的时间（用于本地测试的定时器驱动）。
 
@@ -659,66 +745,35 @@ class GameRuntime:
         return int(self._tick_timers(now=t, max_fires=limit))
 
     def _tick_timers(self, *, now: float, max_fires: Optional[int]) -> int:
+        scheduler = self.timer_scheduler
         fired = 0
         # 每次只触发“最早到期”的一个定时器节点，避免乱序；循环直到没有到期项。
         while True:
-            if max_fires is not None and int(fired) >= int(max_fires):
-                return int(fired)
-            due_key: Optional[str] = None
-            due_time: Optional[float] = None
-            for key, info in list(self.timers.items()):
-                if not isinstance(info, dict):
-                    continue
-                nft = info.get("next_fire_time", None)
-                if not isinstance(nft, (int, float)):
-                    continue
-                if float(nft) > float(now):
-                    continue
-                if due_time is None or float(nft) < float(due_time):
-                    due_key = str(key)
-                    due_time = float(nft)
-
-            if due_key is None:
-                return int(fired)
-
-            info = self.timers.get(due_key, None)
-            if not isinstance(info, dict):
-                continue
-            nft = info.get("next_fire_time", None)
-            if not isinstance(nft, (int, float)) or float(nft) > float(now):
-                continue
-
-            entity_id = str(info.get("entity_id") or "")
-            timer_name = str(info.get("timer_name") or "")
-            sequence = info.get("sequence", None)
-            if not isinstance(sequence, list) or (not sequence):
-                del self.timers[due_key]
-                continue
-
-            next_index = int(info.get("next_index", 0))
-            loop_count = int(info.get("loop_count", 0))
-            token = int(info.get("token", 0))
-            src_entity = self.get_entity(entity_id)
+            if max_fires is not None and fired >= max_fires:
+                return fired
+            due = scheduler.pop_due(now)
+            if due is None:
+                return fired
+            due_key, record = due
+
+            src_entity = self.get_entity(record.entity_id)
             if src_entity is None:
                 # 实体不存在：直接销毁定时器
-                del self.timers[due_key]
+                scheduler.stop(due_key)
                 continue
 
-            kind = str(info.get("kind") or "")
-            if kind == "__motor__":
-                pos = info.get("target_position", None)
+            if record.kind == TIMER_KIND_MOTOR:
+                pos = record.target_position
                 if isinstance(pos, list) and len(pos) == 3:
                     src_entity.position = [float(pos[0]), float(pos[1]), float(pos[2])]
-                rot = info.get("target_rotation", None)
-                lock_rot = bool(info.get("lock_rotation", False))
-                if lock_rot and isinstance(rot, list) and len(rot) == 3:
+                rot = record.target_rotation
+                if record.lock_rotation and isinstance(rot, list) and len(rot) == 3:
                     src_entity.rotation = [float(rot[0]), float(rot[1]), float(rot[2])]
-                motor_name = str(info.get("motor_name") or "")
                 self.trigger_event(
                     "基础运动器停止时",
                     事件源实体=src_entity,
                     事件源GUID=0,
-                    运动器名称=motor_name,
+                    运动器名称=record.motor_name,
                 )
             else:
                 # 触发事件：与节点图事件 `定时器触发时` 对齐
@@ -726,43 +781,19 @@ class GameRuntime:
                     "定时器触发时",
                     事件源实体=src_entity,
                     事件源GUID=0,
-                    定时器名称=timer_name,
-                    定时器序列序号=int(next_index + 1),
-                    循环次数=int(loop_count),
+                    定时器名称=record.timer_name,
+                    定时器序列序号=int(record.next_index + 1),
+                    循环次数=int(record.loop_count),
                 )
             fired += 1
 
-            # 事件流中可能终止/重启了定时器；重新取一次确保状态一致
-            info2 = self.timers.get(due_key, None)
-            if not isinstance(info2, dict):
+            # 事件流中可能终止/重启了定时器：不在此处推进序列，避免覆盖新定时器状态
+            if scheduler.get(due_key) is not record:
                 continue
-            if int(info2.get("token", 0)) != token:
-                # 定时器在事件流中被重启/替换：不在此处推进序列，避免覆盖新定时器状态
+            if not record.advance():
+                scheduler.stop(due_key)
                 continue
-
-            sequence2 = info2.get("sequence", None)
-            if not isinstance(sequence2, list) or (not sequence2):
-                del self.timers[due_key]
-                continue
-
-            is_loop = bool(info2.get("is_loop", False))
-            loop_duration = float(info2.get("loop_duration", float(sequence2[-1])))
-            start_time = float(info2.get("start_time", float(now)))
-
-            next_index2 = int(info2.get("next_index", 0)) + 1
-            loop_count2 = int(info2.get("loop_count", 0))
-
-            if next_index2 >= len(sequence2):
-                if is_loop:
-                    loop_count2 += 1
-                    next_index2 = 0
-                else:
-                    del self.timers[due_key]
-                    continue
-
-            info2["next_index"] = int(next_index2)
-            info2["loop_count"] = int(loop_count2)
-            info2["next_fire_time"] = start_time + loop_count2 * loop_duration + float(sequence2[next_index2])
+            scheduler.reschedule(due_key)
     
     def show_ui(self, ui_name: str, player_entity):
         """显示UI（Mock）"""
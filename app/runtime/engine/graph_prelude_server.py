@@ -24,5 +24,6 @@ from .node_graph_validator import validate_node_graph  # 便于节点图以装
 validate_runtime_definitions_or_raise()
 
 # 注入所有 server 节点实现（保持 Graph Code 直接调用“节点函数名(...)”的写法）
+# 注入的是惰性代理：实现模块在对应节点首次被调用时才导入
 globals().update(load_node_exports_for_scope("server"))
 
@@ -3,7 +3,7 @@
 import time
 from typing import Any, Callable, Dict, List, Optional
 
-from app.runtime.engine.trace_logging import TraceRecorder
+from app.runtime.engine.trace_logging import TraceLevel, TraceRecorder
 from engine.utils.loop_protection import LoopProtection
 
 
@@ -23,6 +23,9 @@ class NodeExecutor:
         self.trace_enabled = False  # 是否启用追踪
         self.trace_recorder: Optional[TraceRecorder] = getattr(game_runtime, "trace_recorder", None)
 
+    def _tracing(self, level: TraceLevel) -> bool:
+        return self.trace_recorder is not None and self.trace_recorder.wants(level)
+
     def _record_trace(self, kind: str, message: str, stack: List[str], **details: Any) -> None:
         if self.trace_recorder is None:
             return
@@ -31,6 +34,7 @@ class NodeExecutor:
             kind=kind,
             message=message,
             stack=stack,
+            level=TraceLevel.NODES,
             **details,
         )
 
@@ -43,16 +47,16 @@ class NodeExecutor:
     
     def execute_node(self, node_name: str, node_func: Callable, *args, **kwargs):
         """执行单个节点"""
-        call_stack = list(self.execution_stack)
-        call_stack.append(node_name)
-        call_signature = self._summarize_call(args, kwargs)
+        # 低于 NODES 级别时不构造调用栈/签名，也不记录开始/结束事件
+        tracing = self._tracing(TraceLevel.NODES)
+        call_stack: List[str] = []
+        if tracing:
+            call_stack = [*self.execution_stack, node_name]
+            if self._tracing(TraceLevel.FULL):
+                self._record_trace(kind="start", message=node_name, stack=call_stack, call_signature=self._summarize_call(args, kwargs))
+            else:
+                self._record_trace(kind="start", message=node_name, stack=call_stack)
         start_time = time.perf_counter()
-        self._record_trace(
-            kind="start",
-            message=node_name,
-            stack=call_stack,
-            call_signature=call_signature,
-        )
         if self.trace_enabled:
             print(f"[执行追踪] 开始执行节点: {node_name}")
             self.execution_stack.append(node_name)
@@ -69,14 +73,14 @@ class NodeExecutor:
         
         # 执行节点
         result = node_func(*args, **kwargs)
-        duration_ms = (time.perf_counter() - start_time) * 1000.0
-        self._record_trace(
-            kind="finish",
-            message=node_name,
-            stack=call_stack,
-            duration_ms=duration_ms,
-            result_type=type(result).__name__,
-        )
+        if tracing:
+            self._record_trace(
+                kind="finish",
+                message=node_name,
+                stack=call_stack,
+                duration_ms=(time.perf_counter() - start_time) * 1000.0,
+                result_type=type(result).__name__,
+            )
         if self.trace_enabled:
             self.execution_stack.pop()
             print(f"[执行追踪] 完成执行节点: {node_name}, 返回值: {result}")
@@ -5,7 +5,10 @@ from __future__ import annotations
 说明：
 - 节点“定义/发现/校验”由 engine.nodes.pipeline（V2 AST 管线）完成；
 - 节点“实现导入”是运行时必需行为，本模块用 V2 的 AST 提取结果作为唯一清单来源，
-  在需要导出节点函数时按文件加载并把实现函数注入到目标模块的 globals()。
+  在需要导出节点函数时把实现函数注入到目标模块的 globals()；
+- 清单（函数名 -> 实现文件）复用节点管线的按文件增量缓存（spec_cache），不再每次 AST 全量解析；
+- 导出表中的值是惰性代理（LazyNodeFunction）：首次调用或读取签名/属性时才导入对应实现模块，
+  只用到少量节点的图不必为整个作用域的实现模块付出导入开销。
 
 约束：
 - 不做目录级额外“自发扫描”逻辑：文件清单来自 V2 的 discover_implementation_files；
@@ -15,19 +18,22 @@ from __future__ import annotations
 from importlib.util import module_from_spec, spec_from_file_location
 from pathlib import Path
 from types import ModuleType
-from typing import Callable, Dict, List
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import re
 import sys
+import threading
 import zlib
 
 from engine.nodes.pipeline.discovery import discover_implementation_files
-from engine.nodes.pipeline.extractor_ast import extract_specs
+from engine.nodes.pipeline.spec_cache import extract_normalized_specs_incremental
 from engine.utils.name_utils import make_valid_identifier
 from engine.utils.workspace import resolve_workspace_root
 
 
 _CACHED_MODULES_BY_FILE: Dict[Path, ModuleType] = {}
 _CACHED_EXPORTS_BY_SCOPE: Dict[str, Dict[str, Callable[..., object]]] = {}
+# 实现模块导入锁：多线程（例如本地测试 HTTP server）首次调用同一节点时只导入一次
+_MODULE_LOAD_LOCK = threading.RLock()
 
 
 def _ensure_import_roots_on_sys_path(workspace_root: Path) -> None:
@@ -60,18 +66,93 @@ def _load_module_from_file(*, workspace_root: Path, file_path: Path, scope: str)
     if cached is not None:
         return cached
 
-    module_name = _make_loaded_module_name(workspace_root, file_path, scope)
-    spec = spec_from_file_location(module_name, str(file_path))
-    if spec is None or spec.loader is None:
-        raise RuntimeError(f"无法为节点实现创建模块说明：{file_path}")
-    module = module_from_spec(spec)
-    spec.loader.exec_module(module)  # type: ignore[attr-defined]
-    _CACHED_MODULES_BY_FILE[file_path] = module
-    return module
+    with _MODULE_LOAD_LOCK:
+        cached = _CACHED_MODULES_BY_FILE.get(file_path)
+        if cached is not None:
+            return cached
+        module_name = _make_loaded_module_name(workspace_root, file_path, scope)
+        spec = spec_from_file_location(module_name, str(file_path))
+        if spec is None or spec.loader is None:
+            raise RuntimeError(f"无法为节点实现创建模块说明：{file_path}")
+        module = module_from_spec(spec)
+        spec.loader.exec_module(module)  # type: ignore[attr-defined]
+        _CACHED_MODULES_BY_FILE[file_path] = module
+        return module
+
+
+class LazyNodeFunction:
+    """节点实现函数的惰性代理：首次调用（或读取签名等函数属性）时导入实现模块并缓存真实函数。
+
+    - `__wrapped__` 指向真实函数，`inspect.signature/unwrap` 可直接穿透；
+    - `__name__` 为实现函数名（不触发导入）；
+    - 非 dunder 属性转发给真实函数；dunder 属性（`__doc__`/`__module__`/`__qualname__` 等）不转发，
+      返回的是代理自身的值，需要真实函数的元信息时使用 `resolve()`；
+    - 实现模块的导入错误在首次调用/解析签名时抛出，而不是在 prelude 导入时。
+    """
+
+    __slots__ = ("_workspace_root", "_file_path", "_function_name", "_scope", "_target")
+
+    def __init__(self, *, workspace_root: Path, file_path: Path, function_name: str, scope: str) -> None:
+        self._workspace_root = workspace_root
+        self._file_path = file_path
+        self._function_name = function_name
+        self._scope = scope
+        self._target: Optional[Callable[..., object]] = None
+
+    @property
+    def file_path(self) -> Path:
+        return self._file_path
+
+    @property
+    def function_name(self) -> str:
+        return self._function_name
+
+    @property
+    def loaded(self) -> bool:
+        return self._target is not None
+
+    def resolve(self) -> Callable[..., object]:
+        """导入实现模块并返回真实函数（之后的调用不再经过导入路径）。"""
+        target = self._target
+        if target is None:
+            module = _load_module_from_file(
+                workspace_root=self._workspace_root,
+                file_path=self._file_path,
+                scope=self._scope,
+            )
+            target = getattr(module, self._function_name)
+            self._target = target
+        return target
+
+    @property
+    def __wrapped__(self) -> Callable[..., object]:
+        return self.resolve()
+
+    @property
+    def __name__(self) -> str:
+        return self._function_name
+
+    def __call__(self, *args: Any, **kwargs: Any) -> object:
+        target = self._target
+        if target is None:
+            target = self.resolve()
+        return target(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("__") and name.endswith("__"):
+            raise AttributeError(name)
+        return getattr(self.resolve(), name)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._target is not None else "lazy"
+        return f"<LazyNodeFunction {self._function_name} ({state}) from {self._file_path}>"
 
 
 def load_node_exports_for_scope(scope: str) -> Dict[str, Callable[..., object]]:
-    """加载并返回指定作用域（server/client）的节点实现函数导出表：{函数名: callable}。"""
+    """返回指定作用域（server/client）的节点实现函数导出表：{函数名/可调用别名: LazyNodeFunction}。
+
+    说明：只读取清单，不导入任何实现模块；模块在对应函数首次被调用或解析签名时才导入。
+    """
     scope_text = str(scope or "").strip().lower()
     if scope_text not in {"server", "client"}:
         raise ValueError(f"scope 必须是 'server' 或 'client'（got: {scope!r}）")
@@ -87,20 +168,26 @@ def load_node_exports_for_scope(scope: str) -> Dict[str, Callable[..., object]]:
     all_files = discover_implementation_files(workspace_root)
     scoped_files: List[Path] = [p for p in all_files if impl_root in p.resolve().parents]
 
-    extracted = extract_specs(scoped_files)
+    # 与节点管线共用的持久化按文件缓存：未变化的实现文件不再做 AST 解析
+    extracted = extract_normalized_specs_incremental(scoped_files, workspace_root)
 
     exports: Dict[str, Callable[..., object]] = {}
+    proxies: Dict[Tuple[Path, str], LazyNodeFunction] = {}
     for spec in extracted:
         function_name = str(getattr(spec, "function_name", "") or "").strip()
         if function_name == "":
             raise ValueError(f"节点实现函数名缺失（file={spec.file_path}）")
 
-        module = _load_module_from_file(
-            workspace_root=workspace_root,
-            file_path=spec.file_path,
-            scope=scope_text,
-        )
-        impl = getattr(module, function_name)
+        proxy_key = (Path(spec.file_path), function_name)
+        impl = proxies.get(proxy_key)
+        if impl is None:
+            impl = LazyNodeFunction(
+                workspace_root=workspace_root,
+                file_path=Path(spec.file_path),
+                function_name=function_name,
+                scope=scope_text,
+            )
+            proxies[proxy_key] = impl
         if function_name in exports and exports[function_name] is not impl:
             raise ValueError(f"节点实现函数名冲突：{function_name}（file={spec.file_path}）")
         exports[function_name] = impl
@@ -133,5 +220,3 @@ def load_node_exports_for_scope(scope: str) -> Dict[str, Callable[..., object]]:
 
     _CACHED_EXPORTS_BY_SCOPE[scope_text] = exports
     return exports
-
-
@@ -0,0 +1,135 @@
+"""GameRuntime 的状态脏标记：记录自上次 `drain()` 以来可能变化的实体/变量/UI 键。
+
+只记录“哪些键可能变了”，不保存新旧值；由观察方（例如本地测试 HTTP server 的变更日志）
+按键重新取值并与已发布的值比较，从而避免每次都全量重建快照再做树 diff。
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Set, Tuple
+
+
+@dataclass(frozen=True, slots=True)
+class RuntimeStateChanges:
+    """一次 `drain()` 取出的脏键集合。"""
+
+    entities: FrozenSet[str]
+    attached_graphs: FrozenSet[str]
+    custom_variables: FrozenSet[Tuple[str, str]]
+    custom_variable_owners: FrozenSet[str]
+    graph_variables: FrozenSet[str]
+    local_variables: FrozenSet[str]
+    ui: bool
+    ui_patches: Tuple[Dict[str, Any], ...]
+
+    @property
+    def empty(self) -> bool:
+        return not (
+            self.entities
+            or self.attached_graphs
+            or self.custom_variables
+            or self.custom_variable_owners
+            or self.graph_variables
+            or self.local_variables
+            or self.ui
+            or self.ui_patches
+        )
+
+
+class RuntimeChangeTracker:
+    """GameRuntime 写入路径上的脏标记集合（标记开销为一次 set.add）。
+
+    - `custom_variable_owners`：整个实体的自定义变量需要重新比较（例如实体销毁后整体移除）；
+    - 变量读取返回可变容器（dict/list/set）时也会标记，因为节点图常对其原地修改；
+    - UI patch 需要保存内容，只在有观察方（`observed=True`，由变更日志首次 capture 时设置）时记录，
+      否则没有观察方的 GameRuntime（CLI/测试）会无限累积。
+    """
+
+    def __init__(self) -> None:
+        self.observed = False
+        self._entities: Set[str] = set()
+        self._attached_graphs: Set[str] = set()
+        self._custom_variables: Set[Tuple[str, str]] = set()
+        self._custom_variable_owners: Set[str] = set()
+        self._graph_variables: Set[str] = set()
+        self._local_variables: Set[str] = set()
+        self._ui = False
+        self._ui_patches: List[Dict[str, Any]] = []
+
+    def mark_entity(self, entity_id: str) -> None:
+        self._entities.add(str(entity_id))
+
+    def mark_attached_graphs(self, entity_id: str) -> None:
+        self._attached_graphs.add(str(entity_id))
+
+    def mark_custom_variable(self, entity_id: str, var_name: str) -> None:
+        self._custom_variables.add((str(entity_id), str(var_name)))
+
+    def mark_custom_variable_owner(self, entity_id: str) -> None:
+        self._custom_variable_owners.add(str(entity_id))
+
+    def mark_graph_variable(self, var_name: str) -> None:
+        self._graph_variables.add(str(var_name))
+
+    def mark_local_variable(self, var_id: str) -> None:
+        self._local_variables.add(str(var_id))
+
+    def mark_ui(self) -> None:
+        self._ui = True
+
+    def record_ui_patch(self, patch: Dict[str, Any]) -> None:
+        self._ui = True
+        if self.observed:
+            self._ui_patches.append(dict(patch))
+
+    def drain(self) -> RuntimeStateChanges:
+        """取出并清空当前脏键集合。"""
+        changes = RuntimeStateChanges(
+            entities=frozenset(self._entities),
+            attached_graphs=frozenset(self._attached_graphs),
+            custom_variables=frozenset(self._custom_variables),
+            custom_variable_owners=frozenset(self._custom_variable_owners),
+            graph_variables=frozenset(self._graph_variables),
+            local_variables=frozenset(self._local_variables),
+            ui=bool(self._ui),
+            ui_patches=tuple(self._ui_patches),
+        )
+        self._entities.clear()
+        self._attached_graphs.clear()
+        self._custom_variables.clear()
+        self._custom_variable_owners.clear()
+        self._graph_variables.clear()
+        self._local_variables.clear()
+        self._ui = False
+        self._ui_patches = []
+        return changes
+
+
+class ObservedEntityDict(dict):
+    """`GameRuntime.entities` 的存储：增删实体时打脏标记，并为写入的实体挂上变更回调。
+
+    节点实现会直接 `del game.entities[entity_id]`，因此在容器层面拦截，而不是只依赖 GameRuntime 方法。
+    """
+
+    def __init__(self, tracker: RuntimeChangeTracker) -> None:
+        super().__init__()
+        self._tracker = tracker
+
+    def __setitem__(self, key: str, entity: Any) -> None:
+        super().__setitem__(key, entity)
+        if hasattr(entity, "_on_change"):
+            entity._on_change = self._tracker.mark_entity
+        self._tracker.mark_entity(key)
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        self._tracker.mark_entity(key)
+
+    def pop(self, key: str, *default: Any) -> Any:
+        value = super().pop(key, *default)
+        self._tracker.mark_entity(key)
+        return value
+
+
+__all__ = ["ObservedEntityDict", "RuntimeChangeTracker", "RuntimeStateChanges"]
@@ -0,0 +1,166 @@
+"""本地 MockRuntime 的定时器调度：类型化定时器记录 + 最小堆（惰性删除）。"""
+
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
+
+# 堆中失效条目超过“存活定时器数 × 2 + 该值”时整体重建，避免频繁启停导致堆无限增长
+_HEAP_COMPACT_SLACK = 64
+
+TIMER_KIND_MOTOR = "__motor__"
+
+
+@dataclass(slots=True)
+class TimerRecord:
+    """一个序列定时器（或基础运动器）的运行状态。
+
+    - `token`：每次启动分配的唯一序号；重启同名定时器会换新 token，堆中旧条目随之失效。
+    - `next_fire_time=None` 表示暂停中（`paused_at` 记录暂停时刻）。
+    """
+
+    entity_id: str
+    timer_name: str
+    sequence: List[float]
+    is_loop: bool
+    loop_duration: float
+    start_time: float
+    token: int
+    loop_count: int = 0
+    next_index: int = 0
+    next_fire_time: Optional[float] = None
+    paused_at: Optional[float] = None
+
+    # 基础运动器（kind == TIMER_KIND_MOTOR）：到期时更新位姿并触发 `基础运动器停止时`
+    kind: str = ""
+    motor_name: str = ""
+    target_position: Optional[List[float]] = None
+    target_rotation: Optional[List[float]] = None
+    lock_rotation: bool = False
+
+    @property
+    def paused(self) -> bool:
+        return self.paused_at is not None
+
+    def compute_next_fire_time(self) -> float:
+        return self.start_time + self.loop_count * self.loop_duration + self.sequence[self.next_index]
+
+    def advance(self) -> bool:
+        """推进到序列下一项；非循环定时器跑完时返回 False（调用方负责删除）。"""
+        next_index = self.next_index + 1
+        if next_index >= len(self.sequence):
+            if not self.is_loop:
+                return False
+            self.loop_count += 1
+            next_index = 0
+        self.next_index = next_index
+        if not self.paused:
+            self.next_fire_time = self.compute_next_fire_time()
+        return True
+
+    def elapsed(self, now: float) -> float:
+        """当前计时（暂停中按暂停时刻计；循环定时器按单轮时长取模）。"""
+        at = self.paused_at if self.paused_at is not None else float(now)
+        value = max(0.0, float(at) - self.start_time)
+        if self.is_loop and self.loop_duration > 0:
+            value = value % self.loop_duration
+        return float(value)
+
+
+class TimerScheduler:
+    """按 `next_fire_time` 排序的定时器调度器。
+
+    - 记录按 timer_key（`{entity_id}_{timer_name}`）存放；
+    - 堆条目为 `(fire_time, token, timer_key)`：同一时刻到期时按启动先后（token）稳定排序；
+    - 停止/重启/暂停不删除堆条目，弹出时与当前记录比对 token 与 fire_time，不一致即丢弃。
+    """
+
+    def __init__(self) -> None:
+        self._records: Dict[str, TimerRecord] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._token_counter = 0
+
+    @property
+    def records(self) -> Mapping[str, TimerRecord]:
+        return MappingProxyType(self._records)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, timer_key: object) -> bool:
+        return timer_key in self._records
+
+    def get(self, timer_key: str) -> Optional[TimerRecord]:
+        return self._records.get(str(timer_key))
+
+    def next_token(self) -> int:
+        self._token_counter += 1
+        return int(self._token_counter)
+
+    def start(self, timer_key: str, record: TimerRecord) -> None:
+        """登记（或替换同名）定时器并按 `next_fire_time` 入堆。"""
+        self._records[str(timer_key)] = record
+        self.reschedule(str(timer_key))
+
+    def stop(self, timer_key: str) -> Optional[TimerRecord]:
+        return self._records.pop(str(timer_key), None)
+
+    def stop_with_prefix(self, key_prefix: str) -> int:
+        keys = [key for key in self._records if key.startswith(key_prefix)]
+        for key in keys:
+            del self._records[key]
+        return len(keys)
+
+    def pause(self, timer_key: str, now: float) -> bool:
+        record = self._records.get(str(timer_key))
+        if record is None or record.paused:
+            return False
+        record.paused_at = float(now)
+        record.next_fire_time = None
+        return True
+
+    def resume(self, timer_key: str, now: float) -> bool:
+        """恢复暂停的定时器：start_time 整体右移暂停时长，保持序列时间点的相对进度不变。"""
+        record = self._records.get(str(timer_key))
+        if record is None or record.paused_at is None:
+            return False
+        record.start_time += max(0.0, float(now) - record.paused_at)
+        record.paused_at = None
+        record.next_fire_time = record.compute_next_fire_time()
+        self.reschedule(str(timer_key))
+        return True
+
+    def reschedule(self, timer_key: str) -> None:
+        """记录的 `next_fire_time` 被修改后调用：为新的到期时刻入堆（暂停中则不入堆）。"""
+        record = self._records.get(str(timer_key))
+        if record is None or record.next_fire_time is None:
+            return
+        entries = self._heap
+        heapq.heappush(entries, (float(record.next_fire_time), int(record.token), str(timer_key)))
+        if len(entries) > 2 * len(self._records) + _HEAP_COMPACT_SLACK:
+            self._compact()
+
+    def pop_due(self, now: float) -> Optional[Tuple[str, TimerRecord]]:
+        """弹出最早到期（fire_time <= now）且仍有效的定时器；无到期项返回 None。"""
+        entries = self._heap
+        while entries and entries[0][0] <= now:
+            fire_time, token, timer_key = heapq.heappop(entries)
+            record = self._records.get(timer_key)
+            if record is None or record.token != token or record.next_fire_time != fire_time:
+                continue
+            return timer_key, record
+        return None
+
+    def _compact(self) -> None:
+        entries = [
+            (float(record.next_fire_time), int(record.token), key)
+            for key, record in self._records.items()
+            if record.next_fire_time is not None
+        ]
+        heapq.heapify(entries)
+        self._heap = entries
+
+
+__all__ = ["TIMER_KIND_MOTOR", "TimerRecord", "TimerScheduler"]
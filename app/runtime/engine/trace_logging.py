@@ -1,6 +1,32 @@
+import itertools
 import time
+from collections import deque
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, List, Optional
+from enum import IntEnum
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+# 默认环形缓冲容量：长时间会话只保留最近的事件，内存占用有上限
+DEFAULT_TRACE_CAPACITY = 20000
+
+
+class TraceLevel(IntEnum):
+    """追踪级别：记录时声明所需级别，高于 recorder 当前级别的事件直接丢弃（不构造、不格式化）。"""
+
+    OFF = 0
+    EVENTS = 1  # 运行时事件：事件触发/分发、UI、控制操作
+    NODES = 2  # + 节点执行开始/结束
+    FULL = 3  # + 节点调用签名等高开销细节
+
+    @classmethod
+    def parse(cls, value: "TraceLevel | int | str") -> "TraceLevel":
+        if isinstance(value, TraceLevel):
+            return value
+        if isinstance(value, int):
+            return cls(int(value))
+        text = str(value or "").strip().upper()
+        if text not in cls.__members__:
+            raise ValueError(f"未知追踪级别: {value!r}（可选：{', '.join(m.lower() for m in cls.__members__)}）")
+        return cls[text]
 
 
 @dataclass
@@ -9,11 +35,13 @@ class TraceEvent:
     kind: str
     message: str
     timestamp: float
-    stack: List[str]
+    stack: Sequence[str]
     details: Dict[str, Any]
+    seq: int = 0
 
     def to_dict(self) -> Dict[str, Any]:
         return {
+            "seq": self.seq,
             "source": self.source,
             "kind": self.kind,
             "message": self.message,
@@ -24,41 +52,143 @@ class TraceEvent:
 
 
 class TraceRecorder:
-    """轻量级事件追踪记录器，用于捕获运行期的节点执行与信号事件。"""
+    """轻量级事件追踪记录器，用于捕获运行期的节点执行与信号事件。
+
+    - 固定容量环形缓冲：超出容量时最早的事件被淘汰；
+    - 每个事件带单调递增的 `seq`（`clear()` 不重置），读取方用 `read_since(cursor)` 增量拉取；
+    - `sink` 为可选的旁路输出（例如 `print_trace_event` 控制台输出），只接收通过级别过滤的事件。
+    """
 
-    def __init__(self, sink: Optional[Callable[[TraceEvent], None]] = None) -> None:
-        self.events: List[TraceEvent] = []
+    def __init__(
+        self,
+        sink: Optional[Callable[[TraceEvent], None]] = None,
+        *,
+        level: "TraceLevel | int | str" = TraceLevel.EVENTS,
+        capacity: int = DEFAULT_TRACE_CAPACITY,
+    ) -> None:
+        if int(capacity) <= 0:
+            raise ValueError(f"capacity 必须 > 0: {capacity!r}")
+        self._buffer: Deque[TraceEvent] = deque(maxlen=int(capacity))
+        self._next_seq = 0
+        self.level = TraceLevel.parse(level)
         self.sink = sink
 
+    @property
+    def events(self) -> List[TraceEvent]:
+        """当前缓冲区内事件的快照（按 seq 升序）。"""
+        return list(self._buffer)
+
+    @property
+    def capacity(self) -> int:
+        return int(self._buffer.maxlen or 0)
+
+    @property
+    def next_seq(self) -> int:
+        """下一条事件将获得的 seq；可作为“从现在开始”的读取游标。"""
+        return int(self._next_seq)
+
+    def wants(self, level: TraceLevel) -> bool:
+        """是否会记录该级别的事件；调用方据此跳过细节构造。"""
+        return TraceLevel.OFF < level <= self.level
+
     def record(
         self,
         source: str,
         kind: str,
         message: str,
         *,
-        stack: Optional[List[str]] = None,
+        stack: Optional[Sequence[str]] = None,
+        level: TraceLevel = TraceLevel.EVENTS,
         **details: Any,
-    ) -> TraceEvent:
-        event_stack = list(stack) if stack else []
+    ) -> Optional[TraceEvent]:
+        if not self.wants(level):
+            return None
         event = TraceEvent(
             source=source,
             kind=kind,
             message=message,
             timestamp=time.time(),
-            stack=event_stack,
-            details=dict(details),
+            stack=stack if stack else (),
+            details=details,
+            seq=self._next_seq,
         )
-        self.events.append(event)
+        self._next_seq += 1
+        self._buffer.append(event)
         if self.sink is not None:
             self.sink(event)
         return event
 
+    def read_since(self, since: int) -> Tuple[List[TraceEvent], int]:
+        """返回 seq >= since 且仍在缓冲区内的事件，以及下一次读取用的游标。"""
+        buffer = self._buffer
+        if not buffer:
+            return [], self.next_seq
+        start = max(0, int(since) - int(buffer[0].seq))
+        if start >= len(buffer):
+            return [], self.next_seq
+        return list(itertools.islice(buffer, start, None)), self.next_seq
+
     def set_sink(self, sink: Optional[Callable[[TraceEvent], None]]) -> None:
         self.sink = sink
 
+    def set_level(self, level: "TraceLevel | int | str") -> None:
+        self.level = TraceLevel.parse(level)
+
     def clear(self) -> None:
-        self.events.clear()
+        self._buffer.clear()
 
     def as_list(self) -> List[TraceEvent]:
-        return list(self.events)
+        return list(self._buffer)
+
+
+def format_trace_event_line(event: TraceEvent) -> str:
+    """将事件格式化为单行控制台文本（仅在控制台 sink 中调用，记录路径不做格式化）。"""
+    details = event.details
+    if event.source == "runtime" and event.kind == "event":
+        return f"[事件触发] {event.message}"
+    if event.source == "runtime" and event.kind == "event_dispatch":
+        owner_id = str(details.get("owner_entity_id") or "")
+        owner_name = str(details.get("owner_entity_name") or "")
+        owner_label = owner_id if owner_id else "<global>"
+        if owner_name:
+            owner_label = f"{owner_id}({owner_name})"
+
+        handler_name = str(details.get("handler") or "")
+        graph_label = str(details.get("graph_name") or "") or str(details.get("graph_class") or "")
+        graph_handler = f"{graph_label}.{handler_name}" if graph_label else handler_name
+
+        src_id = str(details.get("source_entity_id") or "")
+        src_name = str(details.get("source_entity_name") or "")
+        src_label = f"{src_id}({src_name})" if src_id and src_name else src_id
+
+        extra = ""
+        if details.get("timer_name"):
+            extra = f" timer={details['timer_name']}"
+        if details.get("source_guid") is not None:
+            extra = f"{extra} guid={details['source_guid']}"
+        if src_label:
+            extra = f"{extra} src={src_label}"
+        return f"[事件分发] {event.message} -> {owner_label} :: {graph_handler}{extra}"
+    if event.source == "node_executor":
+        if event.kind == "start":
+            return f"[执行追踪] 开始执行节点: {event.message}"
+        if event.kind == "finish":
+            return f"[执行追踪] 完成执行节点: {event.message} ({float(details.get('duration_ms', 0.0)):.3f}ms)"
+        if event.kind == "breakpoint":
+            return f"[断点] 在节点 {event.message} 处暂停"
+    return f"[{event.source}] {event.kind}: {event.message}"
+
+
+def print_trace_event(event: TraceEvent) -> None:
+    """控制台 sink：`TraceRecorder(sink=print_trace_event)`。"""
+    print(format_trace_event_line(event))
+
 
+__all__ = [
+    "DEFAULT_TRACE_CAPACITY",
+    "TraceEvent",
+    "TraceLevel",
+    "TraceRecorder",
+    "format_trace_event_line",
+    "print_trace_event",
+]
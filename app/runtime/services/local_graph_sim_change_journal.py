@@ -0,0 +1,231 @@
+"""
+Local Graph Sim 变更日志（server 侧）：
+- 基于 GameRuntime.state_changes 的脏标记，只对“可能变化”的键重新取值并与已发布值比较；
+- 产出带单调递增 seq 的增量条目（实体/挂载图/变量/UI/UI patch/trace），客户端按 `since` 游标增量拉取；
+- 会话重建（restart）或游标过旧/过新时返回 reset，由调用方附带一次全量快照重新对齐。
+"""
+
+from __future__ import annotations
+
+import itertools
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque
+
+from app.runtime.services.local_graph_sim_observability import (
+    _join_path,
+    attached_graph_names,
+    build_attached_graphs_payload,
+    build_entities_payload,
+    build_entity_row,
+    build_ui_payload,
+    json_safe,
+)
+
+# 环形缓冲容量：长时间运行的会话只保留最近的变更条目，落后太多的客户端走 reset + 全量快照
+DEFAULT_CHANGE_JOURNAL_CAPACITY = 50000
+
+_MISSING = object()
+
+
+@dataclass(frozen=True, slots=True)
+class ChangeEntry:
+    seq: int
+    channel: str  # reset|entity|attached_graphs|variable|ui|ui_patch|trace
+    op: str  # reset|add|remove|replace|append
+    path: str  # JSON Pointer 风格，与 build_session_snapshot 的结构对应（实体按 entity_id 寻址）
+    value: Any
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"seq": self.seq, "channel": self.channel, "op": self.op, "path": self.path, "value": self.value}
+
+
+@dataclass(frozen=True, slots=True)
+class ChangeReadResult:
+    entries: list[ChangeEntry]
+    next_seq: int
+    reset: bool  # True：游标已无法增量续上，调用方需提供全量快照
+
+
+class LocalSimChangeJournal:
+    """线程安全的变更日志。
+
+    - `capture(game)` 必须在持有 server 锁时调用（读取运行态）；
+    - `read_since/wait_for_changes` 只持有日志自身的条件变量，长轮询/SSE 等待期间不阻塞模拟推进。
+    """
+
+    def __init__(self, *, capacity: int = DEFAULT_CHANGE_JOURNAL_CAPACITY) -> None:
+        if int(capacity) <= 0:
+            raise ValueError(f"capacity 必须 > 0: {capacity!r}")
+        self._cond = threading.Condition()
+        self._entries: Deque[ChangeEntry] = deque(maxlen=int(capacity))
+        self._next_seq = 0
+        self._baseline_seq = -1
+        self._closed = False
+        self._game: Any = None
+        self._trace_cursor = 0
+
+        # 已发布（客户端可见）的值：按键比较，决定产出 add/replace/remove
+        self._entities: dict[str, Any] = {}
+        self._attached_graphs: dict[str, Any] = {}
+        self._custom_variables: dict[str, dict[str, Any]] = {}
+        self._graph_variables: dict[str, Any] = {}
+        self._local_variables: dict[str, Any] = {}
+        self._ui: dict[str, Any] = {}
+
+    @property
+    def next_seq(self) -> int:
+        with self._cond:
+            return int(self._next_seq)
+
+    @property
+    def closed(self) -> bool:
+        return bool(self._closed)
+
+    # ------------------------------------------------------------------ write side
+    def capture(self, game: Any) -> int:
+        """把 game 自上次 capture 以来的变化写入日志；返回新增条目数。"""
+        with self._cond:
+            if self._closed:
+                return 0
+            before = self._next_seq
+            if game is not self._game:
+                self._rebuild(game)
+            else:
+                self._apply_changes(game)
+            self._append_trace(game)
+            appended = int(self._next_seq - before)
+            if appended:
+                self._cond.notify_all()
+            return appended
+
+    def close(self) -> None:
+        """关闭日志并唤醒所有等待方（server stop 时调用）。"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def _append(self, channel: str, op: str, path: str, value: Any) -> None:
+        self._entries.append(ChangeEntry(seq=self._next_seq, channel=channel, op=op, path=path, value=value))
+        self._next_seq += 1
+
+    def _rebuild(self, game: Any) -> None:
+        """新会话：以当前运行态为基线重建已发布值，并写入 reset 条目。"""
+        game.state_changes.observed = True
+        game.state_changes.drain()
+        self._game = game
+        self._entities = {row["entity_id"]: row for row in build_entities_payload(game)}
+        self._attached_graphs = dict(build_attached_graphs_payload(game))
+        self._custom_variables = {
+            str(entity_id): dict(values)
+            for entity_id, values in json_safe(game.custom_variables).items()
+            if isinstance(values, dict)
+        }
+        self._graph_variables = dict(json_safe(game.graph_variables))
+        self._local_variables = dict(json_safe(game.local_variables))
+        self._ui = dict(build_ui_payload(game))
+        # reset 之前的 trace 不进入日志（需要历史时走 /trace 接口）
+        self._trace_cursor = int(game.trace_recorder.next_seq)
+        self._baseline_seq = int(self._next_seq)
+        self._append("reset", "reset", "/", None)
+
+    def _publish(self, store: dict[str, Any], key: str, value: Any, channel: str, path_parts: list[str]) -> None:
+        old = store.get(key, _MISSING)
+        if value is _MISSING:
+            if old is _MISSING:
+                return
+            del store[key]
+            self._append(channel, "remove", _join_path(path_parts), None)
+            return
+        if old is _MISSING:
+            store[key] = value
+            self._append(channel, "add", _join_path(path_parts), value)
+            return
+        if old != value:
+            store[key] = value
+            self._append(channel, "replace", _join_path(path_parts), value)
+
+    def _apply_changes(self, game: Any) -> None:
+        changes = game.state_changes.drain()
+        if changes.empty:
+            return
+
+        for entity_id in sorted(changes.entities):
+            ent = game.entities.get(entity_id)
+            row = build_entity_row(entity_id, ent) if ent is not None else _MISSING
+            self._publish(self._entities, entity_id, row, "entity", ["entities", entity_id])
+
+        for entity_id in sorted(changes.attached_graphs):
+            graphs = game.attached_graphs.get(entity_id, _MISSING)
+            names = attached_graph_names(graphs) if graphs is not _MISSING else _MISSING
+            self._publish(self._attached_graphs, entity_id, names, "attached_graphs", ["attached_graphs", entity_id])
+
+        custom_keys = set(changes.custom_variables)
+        for entity_id in changes.custom_variable_owners:
+            custom_keys.update((entity_id, name) for name in self._custom_variables.get(entity_id, {}))
+            custom_keys.update((entity_id, str(name)) for name in game.custom_variables.get(entity_id, {}))
+        for entity_id, var_name in sorted(custom_keys):
+            values = game.custom_variables.get(entity_id, {})
+            value = json_safe(values[var_name]) if var_name in values else _MISSING
+            store = self._custom_variables.setdefault(entity_id, {})
+            self._publish(store, var_name, value, "variable", ["variables", "custom_variables", entity_id, var_name])
+            if not store:
+                del self._custom_variables[entity_id]
+
+        for var_name in sorted(changes.graph_variables):
+            values = game.graph_variables
+            value = json_safe(values[var_name]) if var_name in values else _MISSING
+            self._publish(self._graph_variables, var_name, value, "variable", ["variables", "graph_variables", var_name])
+
+        for var_id in sorted(changes.local_variables):
+            values = game.local_variables
+            value = json_safe(values[var_id]) if var_id in values else _MISSING
+            self._publish(self._local_variables, var_id, value, "variable", ["variables", "local_variables", var_id])
+
+        if changes.ui:
+            ui_payload = build_ui_payload(game)
+            for key in sorted(set(self._ui) | set(ui_payload)):
+                self._publish(self._ui, key, ui_payload.get(key, _MISSING), "ui", ["ui", key])
+
+        for patch in changes.ui_patches:
+            self._append("ui_patch", "append", "/ui_patches", json_safe(patch))
+
+    def _append_trace(self, game: Any) -> None:
+        events, cursor = game.trace_recorder.read_since(self._trace_cursor)
+        self._trace_cursor = int(cursor)
+        for ev in events:
+            self._append("trace", "append", "/trace", json_safe(ev.to_dict()))
+
+    # ------------------------------------------------------------------ read side
+    def read_since(self, since: int, *, limit: int | None = None) -> ChangeReadResult:
+        """返回 seq >= since 的条目；游标早于最近一次 reset/已被淘汰/超前时返回 reset。"""
+        with self._cond:
+            return self._read_since_locked(int(since), limit)
+
+    def _read_since_locked(self, since: int, limit: int | None) -> ChangeReadResult:
+        next_seq = int(self._next_seq)
+        oldest = int(self._entries[0].seq) if self._entries else next_seq
+        if since <= self._baseline_seq or since < oldest or since > next_seq:
+            return ChangeReadResult(entries=[], next_seq=next_seq, reset=True)
+        stop = None if limit is None else since - oldest + max(1, int(limit))
+        entries = list(itertools.islice(self._entries, since - oldest, stop))
+        cursor = int(entries[-1].seq) + 1 if entries else next_seq
+        return ChangeReadResult(entries=entries, next_seq=cursor, reset=False)
+
+    def wait_for_changes(self, since: int, timeout: float) -> bool:
+        """阻塞直到日志游标离开 `since`（有新条目或需要 reset）或超时；日志已关闭时返回 False。"""
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self._closed or self._next_seq != int(since),
+                timeout=max(0.0, float(timeout)),
+            )
+            return not self._closed
+
+
+__all__ = [
+    "DEFAULT_CHANGE_JOURNAL_CAPACITY",
+    "ChangeEntry",
+    "ChangeReadResult",
+    "LocalSimChangeJournal",
+]
@@ -28,31 +28,35 @@ def json_safe(value: Any) -> Any:
     return str(value)
 
 
+def build_entity_row(entity_id: Any, ent: Any) -> dict[str, Any]:
+    return {
+        "entity_id": str(entity_id),
+        "name": str(getattr(ent, "name", "")),
+        "position": list(getattr(ent, "position", [])),
+        "rotation": list(getattr(ent, "rotation", [])),
+    }
+
+
 def build_entities_payload(game: Any) -> list[dict[str, Any]]:
-    entities: list[dict[str, Any]] = []
-    for entity_id, ent in getattr(game, "entities", {}).items():
-        entities.append(
-            {
-                "entity_id": str(entity_id),
-                "name": str(getattr(ent, "name", "")),
-                "position": list(getattr(ent, "position", [])),
-                "rotation": list(getattr(ent, "rotation", [])),
-            }
-        )
+    entities = [build_entity_row(entity_id, ent) for entity_id, ent in getattr(game, "entities", {}).items()]
     entities.sort(key=lambda x: (x.get("name", ""), x.get("entity_id", "")))
     return entities
 
 
+def attached_graph_names(graphs: Any) -> list[str]:
+    items: list[str] = []
+    if isinstance(graphs, list):
+        for inst in graphs:
+            items.append(str(getattr(getattr(inst, "__class__", None), "__name__", "Graph")))
+    return items
+
+
 def build_attached_graphs_payload(game: Any) -> dict[str, list[str]]:
     attached_graphs: dict[str, list[str]] = {}
     raw_attached = getattr(game, "attached_graphs", None)
     if isinstance(raw_attached, dict):
         for entity_id, graphs in raw_attached.items():
-            items: list[str] = []
-            if isinstance(graphs, list):
-                for inst in graphs:
-                    items.append(str(getattr(getattr(inst, "__class__", None), "__name__", "Graph")))
-            attached_graphs[str(entity_id)] = items
+            attached_graphs[str(entity_id)] = attached_graph_names(graphs)
     return attached_graphs
 
 
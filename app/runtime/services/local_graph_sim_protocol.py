@@ -29,6 +29,8 @@ class LocalSimApiRoutes:
     trace: str = f"{LOCAL_SIM_API_BASE}/trace"
     last_action: str = f"{LOCAL_SIM_API_BASE}/last_action"
     snapshot: str = f"{LOCAL_SIM_API_BASE}/snapshot"
+    changes: str = f"{LOCAL_SIM_API_BASE}/changes"
+    changes_stream: str = f"{LOCAL_SIM_API_BASE}/changes_stream"
     validation_status: str = f"{LOCAL_SIM_API_BASE}/validation_status"
 
     # patches / runtime sync
@@ -75,6 +77,8 @@ def build_local_sim_protocol_payload() -> dict:
             "trace": str(api.trace),
             "last_action": str(api.last_action),
             "snapshot": str(api.snapshot),
+            "changes": str(api.changes),
+            "changes_stream": str(api.changes_stream),
             "validation_status": str(api.validation_status),
             "bootstrap": str(api.bootstrap),
             "sync": str(api.sync),
@@ -94,6 +98,8 @@ def build_local_sim_protocol_payload() -> dict:
             "status": "监控页会话信息与当前 UI/layout",
             "poll": "推进虚拟时间（未暂停）+ drain patches + 回传 bindings.lv",
             "sync": "一次性回传当前 UI 状态（layout/groups/widget_states）",
+            "changes": "增量变更（?since=<next>&wait=<秒>）；reset=true 时附带全量 snapshot",
+            "changes_stream": "同 changes 的 SSE 版本（event: changes；id 即下一次的 since，支持 Last-Event-ID）",
             "protocol": "协议自描述；前端可用它消除硬编码",
         },
     }
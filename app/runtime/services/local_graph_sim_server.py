@@ -11,6 +11,7 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+from app.runtime.services.local_graph_sim_change_journal import LocalSimChangeJournal
 from app.runtime.services.local_graph_sim_server_html import (
     _build_layout_html_map,
     _extract_lv_defaults_from_ui_html,
@@ -92,6 +93,9 @@ class LocalGraphSimServerConfig:
     auto_emit_signal_params: dict[str, Any] = field(default_factory=dict)
     extra_graph_mounts: list[GraphMountSpec] = field(default_factory=list)
     resource_mounts: list[LocalGraphSimResourceMountSpec] = field(default_factory=list)
+    # 监控面板与生成的回放测试依赖节点 start/finish 事件：server 默认 nodes（headless GameRuntime 默认 events）
+    trace_level: str = "nodes"
+    trace_console: bool = False
 
 
 class _LocalSimThreadingHttpServer(http.server.ThreadingHTTPServer):
@@ -114,6 +118,8 @@ class LocalGraphSimServer:
     def __init__(self, config: LocalGraphSimServerConfig) -> None:
         self._config = config
         self._lock = threading.RLock()
+        self._lock_depth: int = 0
+        self._change_journal = LocalSimChangeJournal()
         self._session: LocalGraphSimSession | None = None
         self._bootstrap_patches: list[dict[str, Any]] = []
         self._last_action: dict[str, Any] | None = None
@@ -142,6 +148,7 @@ class LocalGraphSimServer:
         game = session.game
         for p in game.get_present_player_entities():
             game.ui_current_layout_by_player[str(p.entity_id)] = int(idx)
+        game.state_changes.mark_ui()
 
     def get_sim_time(self) -> float:
         """返回本地测试会话的“虚拟时间”（可暂停）。用于驱动 GameRuntime.tick(now=...)。"""
@@ -149,9 +156,29 @@ class LocalGraphSimServer:
 
     @contextlib.contextmanager
     def locked(self) -> Any:
-        """获取 server 内部锁的上下文管理器（避免 HTTP 层穿透访问 `_lock`）。"""
+        """获取 server 内部锁的上下文管理器（避免 HTTP 层穿透访问 `_lock`）。
+
+        最外层退出时把本次持锁期间的运行态变化写入变更日志（嵌套持锁只在最外层写一次）。
+        """
         with self._lock:
-            yield
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_depth == 0:
+                    self.capture_changes()
+
+    @property
+    def change_journal(self) -> LocalSimChangeJournal:
+        return self._change_journal
+
+    def capture_changes(self) -> None:
+        """将当前会话的运行态变化写入变更日志（调用方需持有 server 锁）。"""
+        session = self._session
+        if session is None:
+            return
+        self._change_journal.capture(session.game)
 
     def is_paused(self) -> bool:
         return bool(self._clock.is_paused)
@@ -174,6 +201,8 @@ class LocalGraphSimServer:
             return
 
         ensure_local_sim_web_assets_exist()
+        if self._change_journal.closed:
+            self._change_journal = LocalSimChangeJournal()
 
         ui_file = Path(self._config.ui_html_file).resolve()
         if not ui_file.is_file():
@@ -195,6 +224,8 @@ class LocalGraphSimServer:
             present_player_count=int(self._config.present_player_count),
             extra_graph_mounts=list(self._config.extra_graph_mounts or []),
             resource_mounts=list(self._config.resource_mounts or []),
+            trace_level=str(self._config.trace_level),
+            trace_console=bool(self._config.trace_console),
         )
         self._session_generation += 1
         self._sync_player_layouts_to_current_layout_index()
@@ -236,7 +267,7 @@ class LocalGraphSimServer:
             session_gen = int(self._session_generation)
 
             def _emit_auto_signal() -> None:
-                with self._lock:
+                with self.locked():
                     if session_gen != self._session_generation:
                         return
                     patches = self.session.emit_signal(
@@ -258,7 +289,7 @@ class LocalGraphSimServer:
         if not ui_file.is_file():
             raise FileNotFoundError(str(ui_file))
 
-        with self._lock:
+        with self.locked():
             self._bootstrap_patches = []
             self._last_action = None
             self._last_validation_report = None
@@ -275,6 +306,8 @@ class LocalGraphSimServer:
                 present_player_count=int(self._config.present_player_count),
                 extra_graph_mounts=list(self._config.extra_graph_mounts or []),
                 resource_mounts=list(self._config.resource_mounts or []),
+                trace_level=str(self._config.trace_level),
+                trace_console=bool(self._config.trace_console),
             )
             self._session_generation += 1
             self._sync_player_layouts_to_current_layout_index()
@@ -296,7 +329,7 @@ class LocalGraphSimServer:
             session_gen = int(self._session_generation)
 
             def _emit_auto_signal() -> None:
-                with self._lock:
+                with self.locked():
                     if session_gen != self._session_generation:
                         return
                     patches = self.session.emit_signal(
@@ -314,6 +347,8 @@ class LocalGraphSimServer:
         thread = self._thread
         if httpd is None:
             return
+        # 先唤醒长轮询/SSE 等待方，避免 shutdown 等待这些请求线程
+        self._change_journal.close()
         httpd.shutdown()
         httpd.server_close()
         self._httpd = None
@@ -7,7 +7,7 @@ from typing import Any
 from urllib.parse import parse_qs, urlsplit
 
 from app.runtime.services.local_graph_sim_server_html import _parse_int
-from app.runtime.services.local_graph_sim_server_http_facade import LocalGraphSimHttpFacade
+from app.runtime.services.local_graph_sim_server_http_facade import CHANGES_MAX_WAIT_SECONDS, LocalGraphSimHttpFacade
 from app.runtime.services.local_graph_sim_protocol import (
     LOCAL_SIM_API,
     LOCAL_SIM_PROTOCOL_VERSION,
@@ -100,6 +100,12 @@ class _LocalSimRequestHandler(http.server.BaseHTTPRequestHandler):
         if parsed.path == api.snapshot:
             self._handle_snapshot(parsed)
             return
+        if parsed.path == api.changes:
+            self._handle_changes(parsed)
+            return
+        if parsed.path == api.changes_stream:
+            self._handle_changes_stream(parsed)
+            return
         if parsed.path == api.validation_status:
             self._send_json({"ok": True, "report": self._api.get_last_validation_report()}, status=200)
             return
@@ -199,6 +205,50 @@ class _LocalSimRequestHandler(http.server.BaseHTTPRequestHandler):
         payload = self._api.build_snapshot_payload(include_entities=bool(include_entities))
         self._send_json(payload, status=200)
 
+    def _parse_changes_query(self, parsed: Any) -> tuple[int, float]:
+        qs = parse_qs(parsed.query)
+        since = 0
+        if "since" in qs and qs["since"]:
+            since = _parse_int(str(qs["since"][0] or "")) or 0
+        wait_seconds = 0.0
+        if "wait" in qs and qs["wait"]:
+            wait_seconds = float(str(qs["wait"][0] or "0").strip() or "0")
+        return int(max(0, int(since))), float(max(0.0, wait_seconds))
+
+    def _handle_changes(self, parsed: Any) -> None:
+        since, wait_seconds = self._parse_changes_query(parsed)
+        self._send_json(self._api.build_changes_payload(since=since, wait_seconds=wait_seconds), status=200)
+
+    def _handle_changes_stream(self, parsed: Any) -> None:
+        since, _wait_seconds = self._parse_changes_query(parsed)
+        last_event_id = str(self.headers.get("Last-Event-ID", "") or "").strip()
+        if last_event_id:
+            since = int(max(0, _parse_int(last_event_id) or 0))
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        # 每个 SSE 连接独占一个请求线程（ThreadingHTTPServer），等待期间不持有 server 锁
+        while True:
+            payload = self._api.build_changes_payload(since=since, wait_seconds=CHANGES_MAX_WAIT_SECONDS / 2)
+            if bool(payload.get("closed", False)):
+                return
+            if payload.get("changes") or payload.get("reset"):
+                since = int(payload["next"])
+                body = json.dumps(payload, ensure_ascii=False)
+                chunk = f"id: {since}\nevent: changes\ndata: {body}\n\n"
+            else:
+                chunk = ": keepalive\n\n"
+            try:
+                self.wfile.write(chunk.encode("utf-8"))
+                self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                return
+
     def _handle_click(self) -> None:
         payload = self._read_json_body()
         if not isinstance(payload, dict):
@@ -15,6 +15,11 @@ from app.runtime.services.local_graph_sim_observability import (
 )
 from app.runtime.services.local_graph_sim_server_web_assets import get_local_sim_flatten_overlay_module_file
 
+# 长轮询单次最长等待（秒）；SSE 以该粒度发送心跳
+CHANGES_MAX_WAIT_SECONDS = 30.0
+# 单次响应最多返回的变更条目数（落后较多的客户端分页追赶）
+CHANGES_PAGE_LIMIT = 5000
+
 
 @dataclass(frozen=True, slots=True)
 class HttpStaticBytesResult:
@@ -233,15 +238,14 @@ class LocalGraphSimHttpFacade:
 
     def build_trace_payload(self, *, since: int) -> dict[str, Any]:
         session = self.server.session
-        events = session.game.trace_recorder.as_list()
+        recorder = session.game.trace_recorder
         since2 = max(0, int(since))
-        out: list[dict[str, Any]] = []
-        for ev in events[since2:]:
-            if hasattr(ev, "to_dict"):
-                out.append(json_safe(ev.to_dict()))
-            else:
-                out.append(json_safe(ev))
-        return {"ok": True, "since": int(since2), "next": int(len(events)), "events": out}
+        if since2 > recorder.next_seq:
+            # 游标来自重启前的会话：从当前缓冲区起点重新读取
+            since2 = 0
+        events, next_seq = recorder.read_since(since2)
+        out = [json_safe(ev.to_dict()) for ev in events]
+        return {"ok": True, "since": int(since2), "next": int(next_seq), "events": out}
 
     def build_entities_payload(self) -> dict[str, Any]:
         session = self.server.session
@@ -303,6 +307,45 @@ class LocalGraphSimHttpFacade:
             snap = build_session_snapshot(session, include_entities=bool(include_entities))
         return {"ok": True, "snapshot": json_safe(snap)}
 
+    def build_changes_payload(
+        self,
+        *,
+        since: int,
+        wait_seconds: float = 0.0,
+        limit: int = CHANGES_PAGE_LIMIT,
+    ) -> dict[str, Any]:
+        """增量变更：返回 seq >= since 的变更条目；无变化时最多等待 `wait_seconds`（长轮询）。
+
+        - reset=True 时附带全量 `snapshot`（与 `next` 游标在同一次持锁内生成，保证对齐）；
+        - 等待期间不持有 server 锁，其它请求（click/poll 等）照常推进模拟。
+        """
+        journal = self.server.change_journal
+        deadline = time.monotonic() + max(0.0, min(float(wait_seconds), CHANGES_MAX_WAIT_SECONDS))
+        snapshot: dict[str, Any] | None = None
+        while True:
+            with self.server.locked():
+                self.server.capture_changes()
+                result = journal.read_since(int(since), limit=int(limit))
+                if result.reset:
+                    snapshot = json_safe(build_session_snapshot(self.server.session, include_entities=True))
+            remaining = deadline - time.monotonic()
+            if result.reset or result.entries or remaining <= 0:
+                break
+            if not journal.wait_for_changes(result.next_seq, remaining):
+                break
+
+        payload: dict[str, Any] = {
+            "ok": True,
+            "since": int(since),
+            "next": int(result.next_seq),
+            "reset": bool(result.reset),
+            "closed": bool(journal.closed),
+            "changes": [entry.to_dict() for entry in result.entries],
+        }
+        if snapshot is not None:
+            payload["snapshot"] = snapshot
+        return payload
+
     # ------------------------------ api: patches / control
     def drain_bootstrap_patches(self) -> list[dict[str, Any]]:
         with self.server.locked():
@@ -55,6 +55,8 @@
         trace: base + "/trace",
         last_action: base + "/last_action",
         snapshot: base + "/snapshot",
+        changes: base + "/changes",
+        changes_stream: base + "/changes_stream",
         validation_status: base + "/validation_status",
         bootstrap: base + "/bootstrap",
         sync: base + "/sync",
@@ -34,6 +34,8 @@
   var lastRenderedActionKey = "";
   var watchPollTimer = 0;
   var watchRuntime = { spec: null, items: [], lastByPath: {}, lastTriggeredAt: 0 };
+  // 服务端变更日志的本地镜像：首次（或 reset）拿全量 snapshot，之后只按 since 游标应用增量
+  var liveState = { snapshot: null, cursor: 0 };
 
   function jsonSafeStringify(obj) {
     return JSON.stringify(obj, null, 2);
@@ -368,6 +370,55 @@
     }
   }
 
+  function _unescapePointerToken(token) {
+    return String(token).replace(/~1/g, "/").replace(/~0/g, "~");
+  }
+
+  function applyChangeEntry(snapshot, entry) {
+    var parts = String(entry.path || "").split("/").slice(1).map(_unescapePointerToken);
+    if (!parts.length) return;
+    if (entry.channel === "entity") {
+      // snapshot.entities 是按名称排序的数组：按 entity_id 定位行
+      var rows = Array.isArray(snapshot.entities) ? snapshot.entities : (snapshot.entities = []);
+      var entityId = parts[1];
+      var idx = -1;
+      for (var i = 0; i < rows.length; i++) {
+        if (rows[i] && rows[i].entity_id === entityId) { idx = i; break; }
+      }
+      if (entry.op === "remove") {
+        if (idx >= 0) rows.splice(idx, 1);
+      } else if (idx >= 0) {
+        rows[idx] = entry.value;
+      } else {
+        rows.push(entry.value);
+      }
+      return;
+    }
+    var cur = snapshot;
+    for (var j = 0; j < parts.length - 1; j++) {
+      if (!cur[parts[j]] || typeof cur[parts[j]] !== "object") cur[parts[j]] = {};
+      cur = cur[parts[j]];
+    }
+    var leaf = parts[parts.length - 1];
+    if (entry.op === "remove") delete cur[leaf];
+    else cur[leaf] = entry.value;
+  }
+
+  async function syncLiveSnapshot() {
+    var url = endpoint("changes", "/api/local_sim/changes") + "?since=" + encodeURIComponent(String(liveState.cursor || 0));
+    var payload = await getJson(url);
+    if (payload.reset) liveState.snapshot = payload.snapshot || null;
+    var changes = Array.isArray(payload.changes) ? payload.changes : [];
+    for (var i = 0; i < changes.length; i++) {
+      var entry = changes[i] || {};
+      if (!liveState.snapshot) break;
+      if (entry.channel === "trace" || entry.channel === "ui_patch" || entry.channel === "reset") continue;
+      applyChangeEntry(liveState.snapshot, entry);
+    }
+    liveState.cursor = parseInt(payload.next, 10) || 0;
+    return liveState.snapshot;
+  }
+
   async function pollWatchOnce() {
     var box = $("watchOutBox");
     if (!box) return;
@@ -376,14 +427,13 @@
     var items = watchRuntime.items || [];
     if (!spec || !items.length) return;
 
-    var snapPayload = null;
+    var snapshot = null;
     try {
-      snapPayload = await getJson(endpoint("snapshot", "/api/local_sim/snapshot") + "?entities=0");
+      snapshot = await syncLiveSnapshot();
     } catch (e) {
-      box.value = "watch: snapshot 拉取失败: " + String(e && e.message ? e.message : e);
+      box.value = "watch: 变更同步失败: " + String(e && e.message ? e.message : e);
       return;
     }
-    var snapshot = snapPayload ? snapPayload.snapshot : null;
 
     var out = [];
     out.push("【Watch】items=" + String(items.length) + " poll_ms=" + String(spec.poll_ms));
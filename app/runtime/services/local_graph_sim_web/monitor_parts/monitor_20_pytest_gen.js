@@ -300,7 +300,7 @@
     code.push("    for i, act in enumerate(actions):");
     code.push("        kind = str(act.get(\"kind\") or \"\")");
     code.push("        details = act.get(\"details\") or {}");
-    code.push("        base = len(session.game.trace_recorder.events)");
+    code.push("        base = session.game.trace_recorder.next_seq");
     code.push("");
     code.push("        patches = []");
     code.push("        if kind == \"ui_click\":");
@@ -322,7 +322,7 @@
     code.push("            continue");
     code.push("");
     code.push("        last_patches = list(patches or [])");
-    code.push("        last_trace_slice = list(session.game.trace_recorder.events[base:])");
+    code.push("        last_trace_slice = list(session.game.trace_recorder.read_since(base)[0])");
     code.push("");
     code.push("        # per-action assertions");
     code.push("        for a in list(assertions or []):");
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import hashlib
+import importlib.util
+import json
+import marshal
 import re
 import sys
 import types
@@ -8,7 +12,9 @@ from dataclasses import dataclass
 from pathlib import Path
 
 from engine import GraphCodeParser, get_node_registry
+from engine.resources.definition_schema_view import get_default_definition_schema_view
 from engine.utils.cache.cache_paths import get_runtime_cache_root
+from engine.utils.graph.node_defs_fingerprint import compute_node_defs_fingerprint
 from engine.utils.name_utils import sanitize_class_name
 from engine.utils.workspace import init_settings_for_workspace
 
@@ -16,6 +22,12 @@ from app.codegen import ExecutableCodeGenerator
 
 from .local_graph_simulator_ui_keys import _hash32
 
+# 可执行图缓存格式版本：生成文件/元信息/字节码头的结构变化时递增，使旧缓存整体失效
+_EXECUTABLE_CACHE_SCHEMA_VERSION = 1
+
+# 字节码缓存头：解释器 magic number + 源码 sha256（源码或解释器版本变化都会使其失效）
+_CODE_CACHE_MAGIC = importlib.util.MAGIC_NUMBER
+
 
 @dataclass(frozen=True, slots=True)
 class GraphCompileResult:
@@ -26,6 +38,71 @@ class GraphCompileResult:
     executable_file: Path
     module_name: str
     class_name: str
+    code_cache_file: Path | None = None
+    cache_hit: bool = False
+
+
+def compute_codegen_fingerprint() -> str:
+    """代码生成器签名：`app/codegen/*.py` 的文件名 + mtime(ns) + size（不读内容）。
+
+    说明：每次调用都重新 stat（文件数量少、开销可忽略），长驻进程内修改代码生成器后缓存同样失效。
+    """
+    codegen_root = Path(str(sys.modules[ExecutableCodeGenerator.__module__].__file__)).resolve().parent
+    hasher = hashlib.sha256(f"schema={_EXECUTABLE_CACHE_SCHEMA_VERSION}".encode("utf-8"))
+    for path in sorted(codegen_root.glob("*.py")):
+        stat = path.stat()
+        hasher.update(path.name.encode("utf-8"))
+        hasher.update(b"\0")
+        hasher.update(f"{int(stat.st_mtime_ns)}:{int(stat.st_size)}".encode("utf-8"))
+        hasher.update(b"\n")
+    return hasher.hexdigest()
+
+
+def compute_definitions_fingerprint() -> str:
+    """信号/结构体定义签名：语义 pass 会把信号名/结构体名解析为稳定 ID 并写入生成代码（例如 emit_signal 的信号 ID）。
+
+    说明：取当前默认 DefinitionSchemaView（与代码生成时使用的作用域一致）的定义内容做摘要。
+    """
+    schema_view = get_default_definition_schema_view()
+    payload = {
+        "signals": schema_view.get_all_signal_definitions() or {},
+        "structs": schema_view.get_all_struct_definitions() or {},
+    }
+    text = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _compute_executable_cache_key(*, workspace: Path, graph_path: Path) -> str:
+    """可执行图缓存键：图源码内容 + 节点定义指纹 + 信号/结构体定义签名 + 代码生成器签名。"""
+    hasher = hashlib.sha256()
+    hasher.update(graph_path.read_bytes())
+    hasher.update(b"\0")
+    hasher.update(compute_node_defs_fingerprint(workspace).encode("utf-8"))
+    hasher.update(b"\0")
+    hasher.update(compute_definitions_fingerprint().encode("utf-8"))
+    hasher.update(b"\0")
+    hasher.update(compute_codegen_fingerprint().encode("utf-8"))
+    return hasher.hexdigest()
+
+
+def _write_bytes_atomic(path: Path, data: bytes) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(bytes(data))
+    tmp_path.replace(path)
+
+
+def _load_executable_meta(meta_file: Path, *, cache_key: str, executable_file: Path) -> dict | None:
+    """读取缓存元信息；键不一致、结构不完整或生成源码缺失时视为未命中。"""
+    if not meta_file.is_file() or not executable_file.is_file():
+        return None
+    payload = json.loads(meta_file.read_text(encoding="utf-8"))
+    if not isinstance(payload, dict) or payload.get("cache_key") != cache_key:
+        return None
+    graph_name = str(payload.get("graph_name") or "").strip()
+    graph_type = str(payload.get("graph_type") or "").strip()
+    if not graph_name or not graph_type:
+        return None
+    return {"graph_name": graph_name, "graph_type": graph_type}
 
 
 def compile_graph_to_executable(*, workspace_root: Path, graph_code_file: Path) -> GraphCompileResult:
@@ -35,7 +112,10 @@ def compile_graph_to_executable(*, workspace_root: Path, graph_code_file: Path)
     注意：
     - 生成文件属于运行时缓存，不落资源库；
     - 为保持 `app/runtime/cache/` 的“纯数据目录”约束，生成源码 **不以 `.py` 落盘**，而是写入 `.py.txt`；
-    - 加载时始终走 `tokenize.open + compile + exec`，避免触发 `__pycache__`（并避免误将 cache 当作可导入包）。
+    - 加载时走 `tokenize.open + compile + exec`，避免触发 `__pycache__`（并避免误将 cache 当作可导入包）；
+    - 缓存键为“图源码内容 + 节点定义指纹 + 信号/结构体定义签名 + 代码生成器签名”（写入同名 `.meta.json`）：
+      命中时跳过解析与代码生成；
+    - 文件名仍按绝对路径稳定（每个图只保留一份生成物，不随源码修改堆积）。
     """
     workspace = Path(workspace_root).resolve()
     graph_path = Path(graph_code_file).resolve()
@@ -44,29 +124,41 @@ def compile_graph_to_executable(*, workspace_root: Path, graph_code_file: Path)
 
     init_settings_for_workspace(workspace_root=workspace, load_user_settings=False)
 
-    registry = get_node_registry(workspace, include_composite=True)
-    node_library = registry.get_library()
-
-    parser = GraphCodeParser(workspace, node_library)
-    graph_model, metadata = parser.parse_file(graph_path)
-
-    graph_name = str(metadata.get("graph_name") or getattr(graph_model, "graph_name", "") or "").strip()
-    graph_type = str(metadata.get("graph_type") or "server").strip() or "server"
-    if not graph_name:
-        graph_name = str(getattr(graph_model, "graph_name", "") or "").strip() or graph_path.stem
-
-    generator = ExecutableCodeGenerator(workspace, node_library)
-    executable_code = generator.generate_code(graph_model, metadata)
-
     cache_root = get_runtime_cache_root(workspace)
     out_dir = (cache_root / "local_graph_sim" / "executable_graph_sources").resolve()
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    # 稳定 key：仅基于绝对路径（避免每次修改源码都生成新文件/新 module_name 造成缓存堆积）。
+    # 稳定文件名：仅基于绝对路径（避免每次修改源码都生成新文件/新 module_name 造成缓存堆积）。
     key = graph_path.as_posix()
     digest = _hash32(key)
-    out_file = (out_dir / f"{graph_path.stem}__exec_{digest:08x}.py.txt").resolve()
-    out_file.write_text(executable_code, encoding="utf-8")
+    file_stem = f"{graph_path.stem}__exec_{digest:08x}"
+    out_file = (out_dir / f"{file_stem}.py.txt").resolve()
+    meta_file = out_file.with_name(f"{file_stem}.meta.json")
+    code_cache_file = out_file.with_name(f"{file_stem}.code.bin")
+
+    cache_key = _compute_executable_cache_key(workspace=workspace, graph_path=graph_path)
+    cached_meta = _load_executable_meta(meta_file, cache_key=cache_key, executable_file=out_file)
+    if cached_meta is not None:
+        graph_name = cached_meta["graph_name"]
+        graph_type = cached_meta["graph_type"]
+    else:
+        registry = get_node_registry(workspace, include_composite=True)
+        node_library = registry.get_library()
+
+        parser = GraphCodeParser(workspace, node_library)
+        graph_model, metadata = parser.parse_file(graph_path)
+
+        graph_name = str(metadata.get("graph_name") or getattr(graph_model, "graph_name", "") or "").strip()
+        graph_type = str(metadata.get("graph_type") or "server").strip() or "server"
+        if not graph_name:
+            graph_name = str(getattr(graph_model, "graph_name", "") or "").strip() or graph_path.stem
+
+        generator = ExecutableCodeGenerator(workspace, node_library)
+        executable_code = generator.generate_code(graph_model, metadata)
+
+        _write_bytes_atomic(out_file, executable_code.encode("utf-8"))
+        meta = {"cache_key": cache_key, "graph_name": graph_name, "graph_type": graph_type}
+        _write_bytes_atomic(meta_file, json.dumps(meta, ensure_ascii=False, indent=2).encode("utf-8"))
 
     module_name = f"runtime.local_graph_sim.{graph_path.stem}_{digest:08x}"
     class_name = sanitize_class_name(graph_name)
@@ -81,13 +173,32 @@ def compile_graph_to_executable(*, workspace_root: Path, graph_code_file: Path)
         executable_file=out_file,
         module_name=module_name,
         class_name=class_name,
+        code_cache_file=code_cache_file,
+        cache_hit=cached_meta is not None,
     )
 
 
+def _load_or_compile_code(source_text: str, *, filename: str, code_cache_file: Path | None) -> types.CodeType:
+    """编译生成源码；提供 `code_cache_file` 时以 marshal 缓存 code object（头部校验 magic + 源码哈希）。"""
+    if code_cache_file is None:
+        return compile(source_text, filename, "exec")
+    header = _CODE_CACHE_MAGIC + hashlib.sha256(source_text.encode("utf-8")).digest()
+    if code_cache_file.is_file():
+        data = code_cache_file.read_bytes()
+        if data[: len(header)] == header:
+            code = marshal.loads(data[len(header) :])
+            if isinstance(code, types.CodeType) and code.co_filename == filename:
+                return code
+    code = compile(source_text, filename, "exec")
+    _write_bytes_atomic(code_cache_file, header + marshal.dumps(code))
+    return code
+
+
 def load_compiled_graph_class(result: GraphCompileResult) -> type:
     # 说明：
     # - 不走 importlib 的 bytecode cache（__pycache__），避免在 runtime cache 下生成/污染 __pycache__；
-    # - 生成文件以 `.py.txt` 形式落盘，仍然按 Python 源码语义执行（便于 diff/排查）。
+    # - 生成文件以 `.py.txt` 形式落盘，仍然按 Python 源码语义执行（便于 diff/排查）；
+    # - code object 以 marshal 缓存在同目录 `.code.bin`，重复加载会话时跳过 compile。
     if not result.executable_file.is_file():
         raise FileNotFoundError(str(result.executable_file))
     with tokenize.open(str(result.executable_file)) as f:
@@ -96,7 +207,11 @@ def load_compiled_graph_class(result: GraphCompileResult) -> type:
     module.__file__ = str(result.executable_file)
     module.__package__ = str(result.module_name).rpartition(".")[0]
     sys.modules[str(result.module_name)] = module
-    code = compile(source_text, str(result.executable_file), "exec")
+    code = _load_or_compile_code(
+        source_text,
+        filename=str(result.executable_file),
+        code_cache_file=result.code_cache_file,
+    )
     exec(code, module.__dict__)
 
     graph_class = getattr(module, result.class_name, None)
@@ -132,10 +247,18 @@ def _parse_graph_meta_from_source(graph_code_file: Path) -> tuple[str, str]:
     return graph_name, graph_type
 
 
+def _source_graph_code_cache_file(result: GraphSourceResult) -> Path:
+    graph_path = Path(result.graph_code_file).resolve()
+    cache_dir = (get_runtime_cache_root(Path(result.workspace_root)) / "local_graph_sim" / "source_graph_code").resolve()
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir / f"{graph_path.stem}__src_{_hash32(graph_path.as_posix()):08x}.code.bin"
+
+
 def load_source_graph_module_and_class(*, result: GraphSourceResult) -> tuple[object, type]:
     # 说明：
     # - 不走 importlib 的 bytecode cache（__pycache__），避免“项目存档目录携带旧 pyc”导致源码与执行不一致；
-    # - 同时避免在 `assets/资源库/项目存档/...` 下生成/污染 __pycache__。
+    # - 同时避免在 `assets/资源库/项目存档/...` 下生成/污染 __pycache__；code object 改为缓存到 runtime cache
+    #   （头部校验源码哈希，源码变更即失效）。
     # - 编码规则对齐 Python importer：使用 tokenize.open() 解析 PEP 263 编码声明。
     with tokenize.open(str(result.graph_code_file)) as f:
         source_text = f.read()
@@ -143,7 +266,11 @@ def load_source_graph_module_and_class(*, result: GraphSourceResult) -> tuple[ob
     module.__file__ = str(result.graph_code_file)
     module.__package__ = str(result.module_name).rpartition(".")[0]
     sys.modules[str(result.module_name)] = module
-    code = compile(source_text, str(result.graph_code_file), "exec")
+    code = _load_or_compile_code(
+        source_text,
+        filename=str(result.graph_code_file),
+        code_cache_file=_source_graph_code_cache_file(result),
+    )
     exec(code, module.__dict__)
 
     graph_class = getattr(module, result.class_name, None)
@@ -155,6 +282,8 @@ def load_source_graph_module_and_class(*, result: GraphSourceResult) -> tuple[ob
 __all__ = [
     "GraphCompileResult",
     "compile_graph_to_executable",
+    "compute_codegen_fingerprint",
+    "compute_definitions_fingerprint",
     "load_compiled_graph_class",
     "GraphSourceResult",
     "load_source_graph_module_and_class",
@@ -10,6 +10,7 @@ from engine.utils.name_utils import sanitize_class_name
 from engine.utils.workspace import init_settings_for_workspace, resolve_workspace_root
 
 from app.runtime.engine.game_state import GameRuntime, MockEntity
+from app.runtime.engine.trace_logging import TraceLevel
 from app.runtime.services.local_graph_sim_mount_catalog import (
     LocalGraphSimResourceMountSpec,
     list_mount_resources_for_package,
@@ -426,6 +427,8 @@ def build_local_graph_sim_session(
     enable_layout_index_fallback: bool = True,
     extra_graph_mounts: Sequence[GraphMountSpec] = (),
     resource_mounts: Sequence[LocalGraphSimResourceMountSpec] = (),
+    trace_level: TraceLevel | str = TraceLevel.EVENTS,
+    trace_console: bool = False,
 ) -> LocalGraphSimSession:
     workspace = (
         Path(workspace_root).resolve()
@@ -578,7 +581,7 @@ def build_local_graph_sim_session(
         seen_graph_module_ids.add(module_id)
         resolve_ui_key_placeholders_in_graph_module(graph_module=module, ui_registry=ui_registry)
 
-    game = GameRuntime()
+    game = GameRuntime(trace_level=trace_level, trace_console=bool(trace_console))
     game.set_present_player_count(int(present_player_count))
     sim_notes: dict[str, Any] = {
         "ui_key_registry_size": int(len(ui_registry.keys())),
@@ -22,6 +22,7 @@ from app.ui.scene.view_context_menu_mixin import SceneViewContextMenuMixin
 from app.ui.scene.ydebug_interaction_mixin import YDebugInteractionMixin
 from typing import Optional, List, Dict, TYPE_CHECKING, Iterable
 from engine.graph.models.graph_model import GraphModel, NodeModel
+from engine.nodes.node_def_index import get_node_def_index
 from app.ui.graph.graph_undo import UndoRedoManager
 from engine.layout import UI_ROW_HEIGHT  # unified row height metric
 from engine.layout import LayoutService
@@ -946,13 +947,7 @@ class GraphScene(
             if chosen_def is None:
                 raise KeyError(f"GraphScene.get_node_def: node_library 中未找到 builtin NodeDef：{ref_key}")
         elif kind == "composite":
-            chosen_def = None
-            for _, candidate in (self.node_library or {}).items():
-                if not getattr(candidate, "is_composite", False):
-                    continue
-                if str(getattr(candidate, "composite_id", "") or "") == ref_key:
-                    chosen_def = candidate
-                    break
+            chosen_def = get_node_def_index(self.node_library or {}).get_composite(ref_key)
             if chosen_def is None:
                 raise KeyError(f"GraphScene.get_node_def: node_library 中未找到 composite NodeDef（composite_id={ref_key}）")
         elif kind == "event":
@@ -540,6 +540,7 @@ class RemovePortCommand(Command):
                 dst_port=dst_port,
             )
             self.model.edges[edge_id] = edge
+            self.model.touch_edges_revision()
             # UI 层恢复
             self.scene.add_edge_item(edge)
 
@@ -612,6 +613,8 @@ class RenamePortCommand(Command):
                 if edge.src_node == self.node_id and edge.src_port == old_name:
                     edge.src_port = new_name
                     changed.append(edge_id)
+        if changed:
+            self.model.touch_edges_revision()
         return changed
 
     def _refresh_node_item(self) -> None:
@@ -104,23 +104,21 @@ class GraphSearchIndex:
         node_comment_preview_by_id: Dict[str, str] = {}
         node_fields_by_id: Dict[str, _NodeFieldIndex] = {}
 
-        # (src_node, src_port) -> [dst_node, ...]
-        outgoing_nodes_by_endpoint: Dict[Tuple[str, str], List[str]] = {}
-        edge_endpoints_by_id: Dict[str, Tuple[str, str]] = {}
-        edge_ids_by_node_id: Dict[str, List[str]] = {}
-        for edge_id, edge_obj in (getattr(model, "edges", {}) or {}).items():
-            edge_identifier = str(edge_id or "")
-            src_node_id = str(getattr(edge_obj, "src_node", "") or "")
-            src_port_name = str(getattr(edge_obj, "src_port", "") or "")
-            dst_node_id = str(getattr(edge_obj, "dst_node", "") or "")
-
-            edge_endpoints_by_id[edge_identifier] = (src_node_id, dst_node_id)
-            if src_node_id:
-                edge_ids_by_node_id.setdefault(src_node_id, []).append(edge_identifier)
-            if dst_node_id:
-                edge_ids_by_node_id.setdefault(dst_node_id, []).append(edge_identifier)
-            key = (src_node_id, src_port_name)
-            outgoing_nodes_by_endpoint.setdefault(key, []).append(dst_node_id)
+        # 连线邻接：复用 GraphModel 的共享邻接索引（按端口出边 / 按节点关联边）
+        edge_index = model.get_edge_index()
+        edge_endpoints_by_id: Dict[str, Tuple[str, str]] = {
+            str(edge_id or ""): (
+                str(getattr(edge_obj, "src_node", "") or ""),
+                str(getattr(edge_obj, "dst_node", "") or ""),
+            )
+            for edge_id, edge_obj in (getattr(model, "edges", {}) or {}).items()
+        }
+        edge_ids_by_node_id: Dict[str, Tuple[str, ...]] = {}
+        for node_id in dict.fromkeys([*edge_index.outgoing_by_node.keys(), *edge_index.incoming_by_node.keys()]):
+            if node_id:
+                edge_ids_by_node_id[str(node_id)] = tuple(
+                    str(edge.id or "") for edge in edge_index.edges_of_node(node_id)
+                )
 
         # 变量名（casefold）-> [(定义节点ID, 输出端口名), ...]
         var_definitions_by_name: Dict[str, List[Tuple[str, str]]] = {}
@@ -306,9 +304,9 @@ class GraphSearchIndex:
                     related_nodes.add(def_node_id)
                 if not def_node_id or not def_out_port:
                     continue
-                for dst_node_id in outgoing_nodes_by_endpoint.get((def_node_id, def_out_port), []) or []:
-                    if dst_node_id:
-                        related_nodes.add(str(dst_node_id))
+                for edge in edge_index.get_outgoing(def_node_id, def_out_port):
+                    if edge.dst_node:
+                        related_nodes.add(str(edge.dst_node))
             if related_nodes:
                 var_related_nodes_by_name[var_name_cf] = related_nodes
 
@@ -329,7 +327,7 @@ class GraphSearchIndex:
             node_comment_preview_by_id=node_comment_preview_by_id,
             node_fields_by_id=node_fields_by_id,
             edge_endpoints_by_id=edge_endpoints_by_id,
-            edge_ids_by_node_id={k: tuple(v) for k, v in edge_ids_by_node_id.items() if k},
+            edge_ids_by_node_id=edge_ids_by_node_id,
             var_definitions_by_name=var_definitions_by_name,
             var_display_name_by_cf=var_display_name_by_cf,
             var_related_nodes_by_name=var_related_nodes_by_name,
@@ -369,6 +369,7 @@ def _rename_struct_input_port_in_model(model: GraphModel, node: NodeModel, *, ol
     for edge in (getattr(model, "edges", None) or {}).values():
         if getattr(edge, "dst_node", "") == node.id and getattr(edge, "dst_port", "") == old:
             edge.dst_port = STRUCT_PORT_NAME
+    model.touch_edges_revision()
 
     for port in getattr(node, "inputs", None) or []:
         if getattr(port, "name", "") == old:
@@ -396,6 +397,7 @@ def _rename_struct_output_port_in_model(model: GraphModel, node: NodeModel, *, o
     for edge in (getattr(model, "edges", None) or {}).values():
         if getattr(edge, "src_node", "") == node.id and getattr(edge, "src_port", "") == old:
             edge.src_port = STRUCT_PORT_NAME
+    model.touch_edges_revision()
 
     for port in getattr(node, "outputs", None) or []:
         if getattr(port, "name", "") == old:
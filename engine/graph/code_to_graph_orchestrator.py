@@ -9,8 +9,9 @@ from __future__ import annotations
 
 import ast
 import uuid
+from functools import partial
 from pathlib import Path
-from typing import Dict, Optional, Any, List
+from typing import Dict, Mapping, Optional, Any, List, Tuple
 
 from engine.graph.models import GraphModel, NodeModel, PortModel
 from engine.nodes.node_definition_loader import NodeDef
@@ -28,7 +29,13 @@ from engine.graph.ir.node_factory import (
     register_event_outputs as ir_register_event_outputs,
 )
 from engine.graph.ir.flow_builder import parse_method_body as ir_parse_method_body
-from engine.graph.common import node_name_index_from_library
+from engine.graph.ir.event_flow_cache import (
+    EventFlowCache,
+    EventFlowFragment,
+    compute_event_method_fingerprint,
+    compute_graph_context_fingerprint,
+)
+from engine.graph.common import get_composite_defs_by_class, get_node_name_index
 from engine.utils.logging.logger import log_info
 from engine.graph.utils.composite_instance_utils import iter_composite_instance_pairs
 from engine.graph.utils.ast_utils import (
@@ -46,6 +53,11 @@ from engine.graph.semantic import SEMANTIC_SIGNAL_ID_CONSTANT_KEY
 from importlib import import_module
 
 
+def _apply_layout_step(graph_model: GraphModel, *, workspace_path: Optional[Path]) -> None:
+    """延迟布局步骤（模块级函数：保证登记后的 GraphModel 仍可被 pickle/deepcopy）。"""
+    apply_layout_quietly(graph_model, workspace_path=workspace_path)
+
+
 class CodeToGraphParser:
     def __init__(
         self,
@@ -58,15 +70,16 @@ class CodeToGraphParser:
         self.verbose = verbose
         self.workspace_path = workspace_path
 
-        # 名称索引（统一构建，含同义/别名）。
-        # 注意：该索引在 parse_code(...) 时会按 scope 重新构建，以支持 server/client 变体自动映射。
-        self.node_name_index: Dict[str, str] = node_name_index_from_library(node_library)
-        self._composite_defs_by_class: Dict[str, NodeDef] = {}
-        for key, node_def in node_library.items():
-            if getattr(node_def, "is_composite", False):
-                self._composite_defs_by_class[node_def.name] = node_def
-                if '/' in node_def.name:
-                    self._composite_defs_by_class.setdefault(node_def.name.replace('/', ''), node_def)
+        # 名称索引（统一构建，含同义/别名；按节点库对象 + scope 记忆化共享，只读）。
+        # 注意：该索引在 parse_code(...) 时会按 scope 切换，以支持 server/client 变体自动映射。
+        self.node_name_index: Mapping[str, str] = get_node_name_index(node_library)
+        self._composite_defs_by_class: Mapping[str, NodeDef] = get_composite_defs_by_class(
+            node_library,
+            include_slashless_alias=True,
+        )
+
+        # 事件方法级 IR 产物缓存（仅 parse_code(incremental_key=...) 使用）
+        self._event_flow_cache = EventFlowCache()
 
         # IR 环境与上下文
         self._env = VarEnv()
@@ -106,6 +119,49 @@ class CodeToGraphParser:
                     node_def.composite_id,
                 )
     
+    @staticmethod
+    def _resolve_signal_binding(literal: Any, signal_repo: Any) -> Optional[Tuple[str, str]]:
+        """将 register_handlers 绑定字面量解析为 (signal_id, 信号显示名)；未绑定到已定义信号时返回 None。"""
+        if not (isinstance(literal, str) and literal.strip()):
+            return None
+        resolved_id = str(literal).strip()
+        resolved_payload: Any = None
+        if signal_repo is not None:
+            resolved_payload = signal_repo.get_payload(resolved_id)
+            if not (isinstance(resolved_payload, dict) and resolved_payload):
+                resolved_by_name = signal_repo.resolve_id_by_name(resolved_id)
+                if resolved_by_name:
+                    resolved_id = str(resolved_by_name)
+                    resolved_payload = signal_repo.get_payload(resolved_id)
+        if not (isinstance(resolved_payload, dict) and resolved_payload):
+            return None
+        display_name = str(resolved_payload.get("signal_name") or "").strip()
+        return str(resolved_id), display_name or literal
+
+    def _merge_event_fragment(
+        self,
+        graph_model: GraphModel,
+        fragment: GraphModel,
+        *,
+        warnings: Optional[List[str]] = None,
+        errors: Optional[List[str]] = None,
+    ) -> None:
+        """将单个事件的 IR 片段并入目标 GraphModel（节点/连线/事件顺序/端口类型覆盖/IR 告警）。"""
+        graph_model.event_flow_order.extend(fragment.event_flow_order)
+        graph_model.event_flow_titles.extend(fragment.event_flow_titles)
+        graph_model.nodes.update(fragment.nodes)
+        graph_model.edges.update(fragment.edges)
+        fragment_overrides = fragment.metadata.get("port_type_overrides")
+        if isinstance(fragment_overrides, dict) and fragment_overrides:
+            overrides_raw = graph_model.metadata.get("port_type_overrides")
+            overrides: Dict[str, Dict[str, str]] = dict(overrides_raw) if isinstance(overrides_raw, dict) else {}
+            overrides.update(fragment_overrides)
+            graph_model.metadata["port_type_overrides"] = overrides
+        if warnings:
+            self._validators.warnings.extend(warnings)
+        if errors:
+            self._validators.errors.extend(errors)
+
     def parse_code(
         self,
         code: str,
@@ -114,7 +170,17 @@ class CodeToGraphParser:
         tree: Optional[ast.Module] = None,
         scope: str = "server",
         folder_path: str = "",
+        defer_layout: bool = False,
+        incremental_key: str = "",
     ) -> GraphModel:
+        """解析 Graph Code 为 GraphModel。
+
+        defer_layout=True 时不立即执行自动布局，而是登记为 GraphModel 的延迟布局步骤：
+        校验等不读取坐标/基本块的链路可完全跳过布局；需要布局的调用方通过 `graph_model.ensure_layout()` 触发。
+
+        incremental_key 非空时启用事件方法级增量解析：按该 key（通常为源文件绝对路径）缓存每个 `on_` 方法的
+        IR 产物，再次解析同一图时仅重建方法体发生变化的事件流，其余事件克隆上次结果；布局仍对整图执行。
+        """
         if self.verbose:
             log_info("[CodeToGraphParser] 开始解析代码...")
 
@@ -124,7 +190,7 @@ class CodeToGraphParser:
         # scope-aware 节点名索引：确保 client 节点图解析时能自动命中 `名称#client` 变体，
         # 避免误用 server 版本节点导致端口名不一致（UI 连线会被跳过）。
         normalized_scope = str(scope or "server").strip().lower()
-        self.node_name_index = node_name_index_from_library(self.node_library, scope=normalized_scope)
+        self.node_name_index = get_node_name_index(self.node_library, scope=normalized_scope)
         self._factory_ctx.node_name_index = self.node_name_index
         self._factory_ctx.graph_scope = normalized_scope
         self._factory_ctx.graph_folder_path = str(folder_path or "")
@@ -205,9 +271,49 @@ class CodeToGraphParser:
         get_repo = getattr(signal_module, "get_default_signal_repository")
         signal_repo = get_repo()
 
-        for event_ir in ir_scan_event_methods(class_def):
+        event_irs = ir_scan_event_methods(class_def)
+
+        # 增量模式：图级上下文未变化时，未改动的事件方法直接复用上次的 IR 产物
+        previous_fragments: Dict[str, EventFlowFragment] = {}
+        current_fragments: Dict[str, EventFlowFragment] = {}
+        context_fingerprint = ""
+        if incremental_key:
+            context_fingerprint = compute_graph_context_fingerprint(
+                module,
+                class_def,
+                [event_ir.method_def for event_ir in event_irs],
+                extra=(normalized_scope, str(folder_path or ""), str(id(self.node_library))),
+            )
+            previous_fragments = self._event_flow_cache.get_fragments(incremental_key, context_fingerprint)
+
+        for event_ir in event_irs:
             event_name = event_ir.name
             method = event_ir.method_def
+            method_lineno = int(getattr(method, "lineno", 0) or 0)
+
+            # 下沉信号事件推导：若 register_handlers 里将该 on_<method> 绑定到了已定义信号，
+            # 则将事件节点表现为【监听信号】并写入节点常量（由 GraphSemanticPass 统一生成 signal_bindings）。
+            signal_binding = self._resolve_signal_binding(handler_literal_by_method.get(event_name), signal_repo)
+
+            fragment_key = ""
+            if incremental_key:
+                fragment_key = compute_event_method_fingerprint(method, extra=(repr(signal_binding),))
+                cached_fragment = previous_fragments.get(fragment_key)
+                if cached_fragment is not None and cached_fragment.can_reuse_at(method_lineno):
+                    self._merge_event_fragment(
+                        graph_model,
+                        cached_fragment.instantiate(method_lineno),
+                        warnings=cached_fragment.warnings,
+                        errors=cached_fragment.errors,
+                    )
+                    current_fragments[fragment_key] = cached_fragment
+                    continue
+
+            # 每个事件在独立的片段 GraphModel 上建模（IR 只向 graph_model 写入本事件节点相关的端口类型覆盖），
+            # 便于增量模式按事件缓存产物；合并顺序与逐事件直接写入一致。
+            fragment = GraphModel()
+            warnings_before = len(self._validators.warnings)
+            errors_before = len(self._validators.errors)
 
             # 重置事件上下文（不能复用上一个事件方法的 VarEnv 状态）：
             # - assignment_counts/local_const_values 等在 parse_method_body 内会被缓存用于递归解析；
@@ -220,44 +326,44 @@ class CodeToGraphParser:
             event_node.source_lineno = getattr(method, "lineno", 0)
             event_node.source_end_lineno = getattr(method, "end_lineno", getattr(method, "lineno", 0))
 
-            # 下沉信号事件推导：若 register_handlers 里将该 on_<method> 绑定到了已定义信号，
-            # 则将事件节点表现为【监听信号】并写入节点常量（由 GraphSemanticPass 统一生成 signal_bindings）。
-            literal = handler_literal_by_method.get(event_name)
-            if isinstance(literal, str) and literal.strip():
-                resolved_id = str(literal).strip()
-                resolved_payload: Any = None
-                if signal_repo is not None:
-                    resolved_payload = signal_repo.get_payload(resolved_id)
-                    if not (isinstance(resolved_payload, dict) and resolved_payload):
-                        resolved_by_name = signal_repo.resolve_id_by_name(resolved_id)
-                        if resolved_by_name:
-                            resolved_id = str(resolved_by_name)
-                            resolved_payload = signal_repo.get_payload(resolved_id)
-                if isinstance(resolved_payload, dict) and resolved_payload:
-                    event_node.title = SIGNAL_LISTEN_NODE_TITLE
-                    # 确保存在“信号名”输入端口（事件节点可能没有输入端口）
-                    if not any(getattr(p, "name", "") == SIGNAL_NAME_PORT_NAME for p in (event_node.inputs or [])):
-                        event_node.inputs = list(event_node.inputs or [])
-                        event_node.inputs.append(PortModel(name=SIGNAL_NAME_PORT_NAME, is_input=True))
-                    display_name = str(resolved_payload.get("signal_name") or "").strip()
-                    event_node.input_constants.setdefault(SIGNAL_NAME_PORT_NAME, display_name or literal)
-                    # 回填稳定 ID（隐藏常量），供 GraphSemanticPass 生成 metadata["signal_bindings"]
-                    event_node.input_constants[SEMANTIC_SIGNAL_ID_CONSTANT_KEY] = str(resolved_id)
-
-            graph_model.event_flow_order.append(event_node.id)
-            graph_model.event_flow_titles.append(event_node.title)
-            graph_model.nodes[event_node.id] = event_node
+            if signal_binding is not None:
+                resolved_id, display_name = signal_binding
+                event_node.title = SIGNAL_LISTEN_NODE_TITLE
+                # 确保存在“信号名”输入端口（事件节点可能没有输入端口）
+                if not any(getattr(p, "name", "") == SIGNAL_NAME_PORT_NAME for p in (event_node.inputs or [])):
+                    event_node.inputs = list(event_node.inputs or [])
+                    event_node.inputs.append(PortModel(name=SIGNAL_NAME_PORT_NAME, is_input=True))
+                event_node.input_constants.setdefault(SIGNAL_NAME_PORT_NAME, display_name)
+                # 回填稳定 ID（隐藏常量），供 GraphSemanticPass 生成 metadata["signal_bindings"]
+                event_node.input_constants[SEMANTIC_SIGNAL_ID_CONSTANT_KEY] = resolved_id
+
+            fragment.event_flow_order.append(event_node.id)
+            fragment.event_flow_titles.append(event_node.title)
+            fragment.nodes[event_node.id] = event_node
             self._env.current_event_node = event_node
 
-            ir_register_event_outputs(event_node, method, self._env, graph_model=graph_model)
+            ir_register_event_outputs(event_node, method, self._env, graph_model=fragment)
 
             nodes, edges, _final_prev = ir_parse_method_body(
-                method.body, event_node, graph_model, False, self._env, self._factory_ctx, self._validators
+                method.body, event_node, fragment, False, self._env, self._factory_ctx, self._validators
             )
             for n in nodes:
-                graph_model.nodes[n.id] = n
+                fragment.nodes[n.id] = n
             for e in edges:
-                graph_model.edges[e.id] = e
+                fragment.edges[e.id] = e
+
+            if incremental_key:
+                # 缓存模板须在并入（随后被布局就地修改）之前克隆
+                current_fragments[fragment_key] = EventFlowFragment(
+                    graph=fragment.clone(),
+                    method_lineno=method_lineno,
+                    warnings=list(self._validators.warnings[warnings_before:]),
+                    errors=list(self._validators.errors[errors_before:]),
+                )
+            self._merge_event_fragment(graph_model, fragment)
+
+        if incremental_key:
+            self._event_flow_cache.store(incremental_key, context_fingerprint, current_fragments)
 
         # IR 解析过程中收集的告警/错误信息：用于上层做“严格模式（fail-closed）”判定或 UI 提示。
         if getattr(self._validators, "warnings", None):
@@ -265,10 +371,13 @@ class CodeToGraphParser:
         if getattr(self._validators, "errors", None):
             graph_model.metadata["ir_errors"] = list(self._validators.errors or [])
 
-        # 布局（调用点保持不变）
-        apply_layout_quietly(graph_model, workspace_path=self.workspace_path)
-        if self.verbose:
-            log_info("[CodeToGraphParser] 自动布局完成")
+        # 布局（调用点保持不变；延迟模式下登记为延迟布局步骤）
+        if defer_layout:
+            graph_model.defer_layout(partial(_apply_layout_step, workspace_path=self.workspace_path))
+        else:
+            apply_layout_quietly(graph_model, workspace_path=self.workspace_path)
+            if self.verbose:
+                log_info("[CodeToGraphParser] 自动布局完成")
 
         # 清理模块常量上下文，避免跨文件残留
         clear_module_constants_context()
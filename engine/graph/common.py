@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
 
 from engine.graph.models import EdgeModel, GraphModel, NodeModel
 from engine.nodes.node_definition_loader import NodeDef
+from engine.nodes.node_def_index import get_node_def_index
 from engine.utils.graph.graph_utils import is_flow_port_name
 from engine.nodes.port_type_system import is_flow_port_with_context
 from engine.type_registry import (
@@ -158,15 +160,17 @@ def _get_data_input_edge_index(graph_model: GraphModel) -> Dict[str, Dict[str, E
     if cache is not None and cache_revision == current_revision and cache_len == current_len:
         return cache
 
+    # 基于 GraphModel 共享邻接索引：每个目标端口只判定一次流程/数据，并取其第一条入边
     index: Dict[str, Dict[str, EdgeModel]] = {}
-    for edge in graph_model.edges.values():
-        dst_node = graph_model.nodes.get(edge.dst_node)
+    for (dst_node_id, dst_port), edges in graph_model.get_edge_index().incoming_by_port.items():
+        if not edges:
+            continue
+        dst_node = graph_model.nodes.get(dst_node_id)
         if dst_node is None:
             continue
-        if is_flow_port(dst_node, edge.dst_port, False):
+        if is_flow_port(dst_node, dst_port, False):
             continue
-        per_node = index.setdefault(edge.dst_node, {})
-        per_node.setdefault(edge.dst_port, edge)
+        index.setdefault(dst_node_id, {})[dst_port] = edges[0]
 
     setattr(graph_model, "_cached_data_input_edges", index)
     setattr(graph_model, "_cached_data_input_edges_revision", current_revision)
@@ -426,6 +430,56 @@ def node_name_index_from_library(
     return index
 
 
+def get_node_name_index(
+    node_library: Dict[str, NodeDef],
+    *,
+    scope: str | None = None,
+) -> Mapping[str, str]:
+    """`node_name_index_from_library` 的记忆化只读版本（按节点库对象 + scope 缓存）。
+
+    缓存挂在节点库的共享 `NodeDefIndex` 上：节点库对象被替换（如 NodeRegistry.refresh 后重载）
+    或条目数变化时随索引一并失效。返回值不可修改；需要可变副本时请调用 `dict(...)`。
+    """
+    normalized_scope = str(scope or "").strip().lower()
+    if normalized_scope not in ("server", "client"):
+        normalized_scope = ""
+    return get_node_def_index(node_library).get_derived(
+        ("node_name_index", normalized_scope),
+        lambda: MappingProxyType(node_name_index_from_library(node_library, scope=normalized_scope or None)),
+    )
+
+
+def composite_defs_by_class_from_library(
+    node_library: Dict[str, NodeDef],
+    *,
+    include_slashless_alias: bool = False,
+) -> Dict[str, NodeDef]:
+    """复合节点类名 -> NodeDef（同名时后出现者覆盖）；可选为含 '/' 的名称补充去斜杠别名。"""
+    mapping: Dict[str, NodeDef] = {}
+    for _, node_def in (node_library or {}).items():
+        if not getattr(node_def, "is_composite", False):
+            continue
+        name = str(getattr(node_def, "name", "") or "")
+        mapping[name] = node_def
+        if include_slashless_alias and "/" in name:
+            mapping.setdefault(name.replace("/", ""), node_def)
+    return mapping
+
+
+def get_composite_defs_by_class(
+    node_library: Dict[str, NodeDef],
+    *,
+    include_slashless_alias: bool = False,
+) -> Mapping[str, NodeDef]:
+    """`composite_defs_by_class_from_library` 的记忆化只读版本（缓存口径同 `get_node_name_index`）。"""
+    return get_node_def_index(node_library).get_derived(
+        ("composite_defs_by_class", bool(include_slashless_alias)),
+        lambda: MappingProxyType(
+            composite_defs_by_class_from_library(node_library, include_slashless_alias=include_slashless_alias)
+        ),
+    )
+
+
 # 流程端口与占位符名称（集中定义，供引擎/UI/自动化复用）
 FLOW_PORT_PLACEHOLDER: str = "flow"
 # 标准流程输出端口名（节点定义与 UI 展示中的中文名称）
@@ -6,7 +6,7 @@
 from __future__ import annotations
 import ast
 import uuid
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Mapping, Optional, Tuple
 
 from engine.nodes.node_definition_loader import NodeDef
 from engine.nodes.advanced_node_features import VirtualPinConfig, MappedPort
@@ -15,7 +15,7 @@ from engine.graph.ir.node_factory import FactoryContext as IRFactoryContext, cre
 from engine.graph.ir.var_env import VarEnv as IRVarEnv
 from engine.graph.ir.validators import Validators as IRValidators
 from engine.graph.ir.flow_builder import parse_method_body as ir_parse_method_body
-from engine.graph.common import node_name_index_from_library, is_loop_node_name
+from engine.graph.common import get_composite_defs_by_class, get_node_name_index, is_loop_node_name
 from engine.graph.models import GraphModel, NodeModel
 from engine.graph.composite.param_usage_tracker import ParamUsageTracker
 from engine.graph.semantic import GraphSemanticPass
@@ -39,7 +39,7 @@ class ClassFormatParser:
         """
         self.node_library = node_library
         self.verbose = verbose
-        self.node_name_index = node_name_index_from_library(node_library)
+        self.node_name_index = get_node_name_index(node_library)
         self._factory_ctx = IRFactoryContext(
             node_library,
             self.node_name_index,
@@ -50,10 +50,7 @@ class ClassFormatParser:
         # 复合实例映射：alias -> composite_id（来自 __init__ 的 self.xxx = CompositeClass(...)）
         self._composite_instances: Dict[str, str] = {}
         # 复合类名 -> NodeDef（用于解析 __init__ 中的实例声明）
-        self._composite_defs_by_class: Dict[str, NodeDef] = {}
-        for _, node_def in (node_library or {}).items():
-            if getattr(node_def, "is_composite", False):
-                self._composite_defs_by_class[str(getattr(node_def, "name", "") or "")] = node_def
+        self._composite_defs_by_class: Mapping[str, NodeDef] = get_composite_defs_by_class(node_library)
     
     def parse_class_methods(
         self,
@@ -10,8 +10,9 @@ from typing import Dict, Optional
 from pathlib import Path
 
 from engine.nodes.node_definition_loader import NodeDef
+from engine.nodes.node_def_index import get_node_def_index
 from engine.nodes.advanced_node_features import CompositeNodeConfig, MappedPort
-from engine.graph.common import node_name_index_from_library, apply_layout_quietly
+from engine.graph.common import get_node_name_index, apply_layout_quietly
 from engine.graph.composite.source_format import (
     find_primary_composite_class,
     try_parse_composite_payload,
@@ -21,9 +22,7 @@ from engine.graph.utils.metadata_extractor import (
     extract_metadata_from_code,
 )
 from engine.graph.utils.graph_code_rewrite_config import build_graph_code_rewrite_config
-from engine.graph.utils.list_literal_rewriter import rewrite_graph_code_list_literals
-from engine.graph.utils.dict_literal_rewriter import rewrite_graph_code_dict_literals
-from engine.graph.utils.syntax_sugar_rewriter import rewrite_graph_code_syntax_sugars
+from engine.graph.utils.graph_code_rewrite_pipeline import rewrite_graph_code
 from engine.graph.ir.virtual_pin_builder import build_virtual_pins_from_class
 from engine.graph.composite.class_format_parser import ClassFormatParser
 from engine.utils.logging.logger import log_info
@@ -66,7 +65,7 @@ class CompositeCodeParser:
         self.workspace_path = workspace_path
         
         # 建立统一的节点名索引（含同义键）
-        self.node_name_index = node_name_index_from_library(node_library)
+        self.node_name_index = get_node_name_index(node_library)
         
         # 创建专用解析器（仅支持类格式）
         self.class_parser = ClassFormatParser(node_library, verbose)
@@ -109,25 +108,10 @@ class CompositeCodeParser:
         metadata_obj = extract_metadata_from_code(code)
         scope = str((metadata_obj.scope or metadata_obj.graph_type or "server") or "server").strip().lower()
 
-        # 类格式复合节点：常见语法糖（下标读取/len/比较/and-or/+= 等）改写，保证 IR 解析与校验口径一致。
+        # 类格式复合节点：语法糖归一化（常见语法糖 → `[...]` 列表字面量 → `{k: v}` 字典字面量），
+        # 等价转换为节点调用（【拼装列表】/【拼装字典】等），保证 IR 解析与校验口径一致。
         rewrite_config = build_graph_code_rewrite_config(is_composite=True)
-        tree, _syntax_rewrite_issues = rewrite_graph_code_syntax_sugars(
-            tree,
-            scope=scope,
-            enable_shared_composite_sugars=rewrite_config.enable_shared_composite_sugars,
-        )
-
-        # 类格式复合节点：在解析前对类方法体中的 `[...]` 列表字面量做语法糖改写，
-        # 将其等价转换为【拼装列表】节点调用，保证 IR 解析与校验口径一致。
-        tree, _rewrite_issues = rewrite_graph_code_list_literals(
-            tree,
-            max_elements=rewrite_config.max_list_literal_elements,
-        )
-        # 类格式复合节点：字典字面量 `{k: v}` 语法糖改写，等价转换为【拼装字典】节点调用。
-        tree, _dict_rewrite_issues = rewrite_graph_code_dict_literals(
-            tree,
-            max_pairs=rewrite_config.max_dict_literal_pairs,
-        )
+        tree = rewrite_graph_code(tree, scope=scope, config=rewrite_config).tree
         return self.parse_class_format(code, file_path, tree=tree, metadata_obj=metadata_obj)
     
     def parse_class_format(
@@ -284,12 +268,7 @@ class CompositeCodeParser:
                 return self.node_library.get(key)
             if kind == "composite":
                 # key 为 composite_id：node_library 的 key 可能为 canonical key，这里按 composite_id 回查一次
-                for node_def in (self.node_library or {}).values():
-                    if not getattr(node_def, "is_composite", False):
-                        continue
-                    if str(getattr(node_def, "composite_id", "") or "") == key:
-                        return node_def
-                return None
+                return get_node_def_index(self.node_library or {}).get_composite(key)
             return None
 
         for pin in list(virtual_pins or []):
@@ -3,12 +3,12 @@ from __future__ import annotations
 import ast
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional, Any, Sequence, Mapping
-from collections import defaultdict
 from datetime import datetime
 import re
 
 from engine.nodes.node_definition_loader import NodeDef
 from engine.nodes.node_registry import get_node_registry
+from engine.nodes.node_def_index import get_node_def_index
 from engine.graph.models import GraphModel, NodeModel, PortModel
 from engine.graph.common import (
     is_flow_port,
@@ -47,9 +47,7 @@ from engine.utils.workspace import (
     resolve_workspace_root,
 )
 from engine.graph.utils.graph_code_rewrite_config import build_graph_code_rewrite_config
-from engine.graph.utils.list_literal_rewriter import rewrite_graph_code_list_literals
-from engine.graph.utils.dict_literal_rewriter import rewrite_graph_code_dict_literals
-from engine.graph.utils.syntax_sugar_rewriter import rewrite_graph_code_syntax_sugars
+from engine.graph.utils.graph_code_rewrite_pipeline import rewrite_graph_code
 
 
 """节点图代码（Graph Code）解析工具集。
@@ -109,11 +107,9 @@ def validate_graph_model(
 
     port_type_overrides = build_port_type_overrides(model)
     
-    incoming_counts: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
-    incoming_edges_by_port: Dict[Tuple[str, str], List[Any]] = defaultdict(list)
-    for edge in model.edges.values():
-        incoming_counts[edge.dst_node][edge.dst_port] += 1
-        incoming_edges_by_port[(edge.dst_node, edge.dst_port)].append(edge)
+    # 入边索引：复用 GraphModel 的共享邻接索引（(dst_node, dst_port) -> [edge...]，保持 edges 顺序）
+    edge_index = model.get_edge_index()
+    incoming_edges_by_port = edge_index.incoming_by_port
 
     def _resolve_node_def(node: NodeModel) -> Optional[NodeDef]:
         """从 node_library 中解析 NodeDef（唯一真源：node.node_def_ref）。"""
@@ -130,11 +126,9 @@ def validate_graph_model(
             return found
         if kind == "composite":
             # key 为 composite_id：禁止通过 title/name 模糊匹配
-            for _, node_def in node_library.items():
-                if not getattr(node_def, "is_composite", False):
-                    continue
-                if str(getattr(node_def, "composite_id", "") or "") == key:
-                    return node_def
+            found = get_node_def_index(node_library).get_composite(key)
+            if found is not None:
+                return found
             raise KeyError(f"node_library 中未找到 composite NodeDef（composite_id={key}）")
         if kind == "event":
             # 事件入口：默认不在节点库中；端口类型由 GraphModel/overrides 承载。
@@ -378,10 +372,9 @@ def validate_graph_model(
     for node in model.nodes.values():
         # 流程入口校验（事件节点除外）
         if node.category != '事件节点':
-            incoming = incoming_counts.get(node.id, {})
             for port in node.inputs:
                 if _is_flow(node, port.name, False) and port.name != '跳出循环':
-                    in_count = incoming.get(port.name, 0)
+                    in_count = edge_index.count_incoming(node.id, port.name)
                     is_virtual_pin = virtual_pin_mappings.get((node.id, port.name), False)
                     if in_count == 0 and not is_virtual_pin:
                         lo = getattr(node, 'source_lineno', 0)
@@ -389,10 +382,9 @@ def validate_graph_model(
                         span_text = f" (第{lo}~{hi}行)" if isinstance(lo, int) and lo > 0 else " (第?~?行)"
                         errors.append(f"节点 {node.category}/{node.title} 的流程入口 '{port.name}' 未连接{span_text}")
         
-        incoming = incoming_counts.get(node.id, {})
         for port in node.inputs:
             if not _is_flow(node, port.name, False):
-                has_incoming_edge = incoming.get(port.name, 0) > 0
+                has_incoming_edge = edge_index.count_incoming(node.id, port.name) > 0
                 has_constant_value = port.name in node.input_constants
                 is_virtual_pin = virtual_pin_mappings.get((node.id, port.name), False)
                 if not (has_incoming_edge or has_constant_value or is_virtual_pin):
@@ -444,20 +436,11 @@ def validate_graph_model(
                         )
 
     # 输出端被消费（存在数据出边）：其有效类型必须可确定，禁止仍为泛型
-    outgoing_data_counts: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
-    for edge in model.edges.values():
-        src_node = model.nodes.get(edge.src_node)
-        if src_node is None:
-            continue
-        if _is_flow(src_node, edge.src_port, True):
-            continue
-        outgoing_data_counts[str(edge.src_node)][str(edge.src_port)] += 1
     for node in model.nodes.values():
-        out_counts = outgoing_data_counts.get(str(node.id), {})
         for port in (node.outputs or []):
             if _is_flow(node, port.name, True):
                 continue
-            if out_counts.get(str(port.name), 0) <= 0:
+            if not edge_index.get_outgoing(node.id, port.name):
                 continue
             effective = effective_type_resolver.resolve(str(node.id), str(port.name), is_input=False)
             if is_generic_type_name(effective):
@@ -480,7 +463,7 @@ def validate_graph_model(
         for port in (node.inputs or []):
             if _is_flow(node, port.name, False):
                 continue
-            if incoming_counts.get(node.id, {}).get(port.name, 0) > 0:
+            if edge_index.count_incoming(node.id, port.name) > 0:
                 continue
             if port.name not in (node.input_constants or {}):
                 continue
@@ -586,7 +569,7 @@ def validate_graph_model(
         if not group_candidates:
             group_candidates = sorted([str(x) for x in group_set if str(x).strip() != ""])
         for port_name in enum_ports:
-            if incoming_counts.get(node.id, {}).get(port_name, 0) > 0:
+            if edge_index.count_incoming(node.id, port_name) > 0:
                 continue
             if port_name not in (node.input_constants or {}):
                 continue
@@ -611,6 +594,30 @@ def validate_graph_model(
 # 节点图代码解析器
 # ============================================================================
 
+def _align_client_graph_to_builtin_anchor(graph_model: GraphModel) -> None:
+    """client 节点图：平移整张图，使主锚点节点位于原点。"""
+    graph_type_text = str(graph_model.metadata.get("graph_type", "") or "").strip().lower()
+    folder_path_text = str(graph_model.metadata.get("folder_path", "") or "")
+    if graph_type_text != "client" or not folder_path_text:
+        return
+    anchor_titles = get_builtin_anchor_titles_for_client_graph(folder_path=folder_path_text)
+    if not anchor_titles:
+        return
+    primary_anchor_title = str(anchor_titles[0] or "")
+    anchor_node = None
+    for node in graph_model.nodes.values():
+        if getattr(node, "title", "") == primary_anchor_title:
+            anchor_node = node
+            break
+    if anchor_node is None:
+        return
+    dx = 0.0 - float(anchor_node.pos[0])
+    dy = 0.0 - float(anchor_node.pos[1])
+    if (dx != 0.0) or (dy != 0.0):
+        for node in graph_model.nodes.values():
+            node.pos = (float(node.pos[0]) + dx, float(node.pos[1]) + dy)
+
+
 class GraphParseError(Exception):
     """解析错误"""
     def __init__(self, message: str, line_number: Optional[int] = None):
@@ -634,6 +641,8 @@ class GraphCodeParser:
         verbose: bool = False,
         *,
         strict: bool = True,
+        defer_layout: bool = False,
+        incremental: bool = False,
     ):
         """初始化解析器
         
@@ -646,10 +655,18 @@ class GraphCodeParser:
                 - IR 解析阶段的“语义不可可靠建模”的错误会导致解析失败；
                 - 结构校验（validate_graph_model）报告的任何错误会导致解析失败；
               目标是“要么正确产图，要么报错”，避免静默生成错误节点图。
+            defer_layout: 延迟布局。启用后解析结果不立即计算布局（节点坐标/基本块/跨块数据副本），
+              首次读取 basic_blocks、序列化或显式调用 `GraphModel.ensure_layout()` 时才计算。
+              仅适用于不读取坐标与副本的链路（如 validate）；可执行代码生成与导出依赖布局副本/坐标，须保持默认。
+            incremental: 事件方法级增量解析。启用后解析器按源文件缓存每个 `on_` 方法的 IR 产物，
+              同一文件再次解析时只重建方法体有变化的事件流（适用于文件监听触发的反复重解析；
+              图级上下文如模块常量/__init__/register_handlers 变化时自动整图重建）。
         """
         self.workspace_path = workspace_path
         self.verbose = verbose
         self.strict = bool(strict)
+        self.defer_layout = bool(defer_layout)
+        self.incremental = bool(incremental)
         if node_library is not None:
             self.node_library = node_library
         else:
@@ -747,30 +764,18 @@ class GraphCodeParser:
         if not assume_tree_already_rewritten_flag:
             rewrite_config = build_graph_code_rewrite_config(is_composite=False)
 
-            # 1.0 常见语法糖：下标读取/len/比较/and-or/+= 等，解析前统一改写为等价节点调用。
-            # 额外：普通节点图允许启用“共享复合节点语法糖”（仅 server），
-            # 例如：整数列表切片、sum/any/all、三元表达式等，会被改写为共享复合节点实例方法调用。
-            # 注意：该改写为“纯语法等价转换”，不写回源码；非法写法由验证层报错。
-            tree, syntax_rewrite_issues = rewrite_graph_code_syntax_sugars(
-                tree,
-                scope=scope,
-                enable_shared_composite_sugars=rewrite_config.enable_shared_composite_sugars,
-            )
-
-            # 1.1 列表字面量语法糖：在类方法体内允许 `[...]`，解析前统一改写为【拼装列表】节点调用。
-            # 注意：该改写为“纯语法等价转换”，不写回源码；若出现空列表/超长列表等非法写法，
-            # 校验层会报告错误，解析层仅尽力生成图模型以供 UI/工具定位。
-            tree, list_literal_rewrite_issues = rewrite_graph_code_list_literals(
-                tree,
-                max_elements=rewrite_config.max_list_literal_elements,
-            )
-            # 1.2 字典字面量语法糖：在类方法体内允许 `{k: v}`，解析前统一改写为【拼装字典】节点调用。
-            # 注意：该改写为“纯语法等价转换”，不写回源码；若出现空字典/超长/展开等非法写法，
-            # 校验层会报告错误，解析层仅尽力生成图模型以供 UI/工具定位。
-            tree, dict_literal_rewrite_issues = rewrite_graph_code_dict_literals(
-                tree,
-                max_pairs=rewrite_config.max_dict_literal_pairs,
-            )
+            # 语法糖归一化（常见语法糖 → 列表字面量 → 字典字面量），解析前统一改写为等价节点调用：
+            # - 1.0 常见语法糖：下标读取/len/比较/and-or/+= 等；普通节点图允许启用“共享复合节点语法糖”（仅 server），
+            #   例如：整数列表切片、sum/any/all、三元表达式等，会被改写为共享复合节点实例方法调用；
+            # - 1.1 列表字面量：类方法体内的 `[...]` 改写为【拼装列表】节点调用；
+            # - 1.2 字典字面量：类方法体内的 `{k: v}` 改写为【拼装字典】节点调用。
+            # 注意：该改写为“纯语法等价转换”，不写回源码；空列表/超长/展开等非法写法由校验层报错，
+            # 解析层仅尽力生成图模型以供 UI/工具定位。三个阶段共享同一份 AST 副本（只克隆一次）。
+            rewrite_result = rewrite_graph_code(tree, scope=scope, config=rewrite_config)
+            tree = rewrite_result.tree
+            syntax_rewrite_issues = rewrite_result.syntax_sugar_issues
+            list_literal_rewrite_issues = rewrite_result.list_literal_issues
+            dict_literal_rewrite_issues = rewrite_result.dict_literal_issues
 
         if self.strict:
             strict_messages: List[str] = []
@@ -816,6 +821,8 @@ class GraphCodeParser:
             tree=tree,
             scope=scope,
             folder_path=str(metadata_obj.folder_path or ""),
+            defer_layout=self.defer_layout,
+            incremental_key=str(code_file.resolve()) if self.incremental else "",
         )
 
         # 2.0 关键：在 strict 模式执行结构校验（validate_graph_model）前，
@@ -882,25 +889,11 @@ class GraphCodeParser:
 
         # client 节点图：对齐“新建图模板”自带锚点节点坐标（平移整张图），避免自动布局把锚点偏移后
         # 导致 UI 自动化在“跳过创建锚点节点”时无法正确校准与定位。
-        graph_type_text = str(graph_model.metadata.get("graph_type", "") or "").strip().lower()
-        folder_path_text = str(graph_model.metadata.get("folder_path", "") or "")
-        if graph_type_text == "client" and folder_path_text:
-            anchor_titles = get_builtin_anchor_titles_for_client_graph(folder_path=folder_path_text)
-            if anchor_titles:
-                primary_anchor_title = str(anchor_titles[0] or "")
-                anchor_node = None
-                for node in graph_model.nodes.values():
-                    if getattr(node, "title", "") == primary_anchor_title:
-                        anchor_node = node
-                        break
-                if anchor_node is not None:
-                    anchor_x = float(anchor_node.pos[0])
-                    anchor_y = float(anchor_node.pos[1])
-                    dx = 0.0 - anchor_x
-                    dy = 0.0 - anchor_y
-                    if (dx != 0.0) or (dy != 0.0):
-                        for node in graph_model.nodes.values():
-                            node.pos = (float(node.pos[0]) + dx, float(node.pos[1]) + dy)
+        # 延迟布局模式下该平移依赖布局结果，需登记在自动布局之后执行。
+        if graph_model.has_pending_layout():
+            graph_model.defer_layout(_align_client_graph_to_builtin_anchor)
+        else:
+            _align_client_graph_to_builtin_anchor(graph_model)
         
         # 同步 docstring/代码中的图变量（保持与上方 strict 前同步逻辑一致；非 strict 路径也需要）
         if metadata.get("graph_variables"):
@@ -960,9 +953,9 @@ class GraphCodeParser:
         node_library = self.node_library
         node_name_index = getattr(self._code_parser, "node_name_index", None)
         if node_name_index is None:
-            from engine.graph.common import node_name_index_from_library
+            from engine.graph.common import get_node_name_index
 
-            node_name_index = node_name_index_from_library(node_library)
+            node_name_index = get_node_name_index(node_library)
 
         for item in graph_class.body:
             if not isinstance(item, ast.FunctionDef):
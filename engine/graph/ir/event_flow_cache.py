@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import ast
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from engine.graph.models import GraphModel
+from engine.graph.utils.ast_utils import clone_ast
+
+
+# 增量解析：按“事件方法”缓存 IR 产物（事件节点 + 方法体节点/连线 + 端口类型覆盖 + IR 告警）。
+#
+# 约定：
+# - 每个事件方法的 IR 只依赖“方法体 AST + 图级上下文（模块/类常量、复合节点实例、register_handlers 绑定、
+#   scope/folder_path、节点库）”；事件之间 VarEnv 相互独立，因此未变化的方法可直接复用上次的 IR 产物；
+# - 图级上下文指纹变化时整图重建（不复用任何事件）；
+# - 方法指纹按“相对方法首行的行号”计算：仅因上方代码增删行而整体平移的方法仍可复用，
+#   复用时同步平移节点的 source_lineno/source_end_lineno。
+
+
+@dataclass
+class EventFlowFragment:
+    """单个事件方法的 IR 产物快照（只读模板：复用时克隆，不直接并入 GraphModel）。"""
+
+    graph: GraphModel
+    method_lineno: int
+    warnings: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+    def instantiate(self, method_lineno: int) -> GraphModel:
+        """克隆一份可并入目标 GraphModel 的片段，并按新的方法首行平移源码行号。"""
+        fragment = self.graph.clone()
+        delta = int(method_lineno) - int(self.method_lineno)
+        if delta:
+            for node in fragment.nodes.values():
+                if node.source_lineno:
+                    node.source_lineno += delta
+                if node.source_end_lineno:
+                    node.source_end_lineno += delta
+        return fragment
+
+    def can_reuse_at(self, method_lineno: int) -> bool:
+        # IR 告警/错误文本内嵌绝对行号：方法发生平移时不复用，重新解析以得到正确的定位信息
+        if int(method_lineno) == int(self.method_lineno):
+            return True
+        return not self.warnings and not self.errors
+
+
+@dataclass
+class GraphEventFlowCacheEntry:
+    context_fingerprint: str
+    fragments: Dict[str, EventFlowFragment] = field(default_factory=dict)
+
+
+class EventFlowCache:
+    """按图（调用方提供的 key，通常为源文件绝对路径）缓存事件方法级 IR 产物，LRU 限制图数量。"""
+
+    def __init__(self, max_graphs: int = 16) -> None:
+        self._max_graphs = max(1, int(max_graphs))
+        self._entries: "OrderedDict[str, GraphEventFlowCacheEntry]" = OrderedDict()
+
+    def get_fragments(self, key: str, context_fingerprint: str) -> Dict[str, EventFlowFragment]:
+        entry = self._entries.get(key)
+        if entry is None or entry.context_fingerprint != context_fingerprint:
+            return {}
+        self._entries.move_to_end(key)
+        return entry.fragments
+
+    def store(self, key: str, context_fingerprint: str, fragments: Dict[str, EventFlowFragment]) -> None:
+        self._entries[key] = GraphEventFlowCacheEntry(context_fingerprint=context_fingerprint, fragments=fragments)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_graphs:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+
+def _digest(parts: Iterable[str]) -> str:
+    hasher = hashlib.sha1()
+    for part in parts:
+        hasher.update(part.encode("utf-8"))
+        hasher.update(b"\0")
+    return hasher.hexdigest()
+
+
+def compute_graph_context_fingerprint(
+    module: ast.Module,
+    class_def: ast.ClassDef,
+    event_methods: Iterable[ast.FunctionDef],
+    *,
+    extra: Iterable[str] = (),
+) -> str:
+    """图级上下文指纹：模块与节点图类中除事件方法体以外的全部 AST（不含行列号）+ 调用方附加项。"""
+    event_method_ids = {id(method) for method in event_methods}
+    parts: List[str] = list(extra)
+    for stmt in module.body:
+        if stmt is not class_def:
+            parts.append(ast.dump(stmt))
+            continue
+        parts.append(f"class {class_def.name}")
+        parts.extend(ast.dump(expr) for expr in [*class_def.bases, *class_def.keywords, *class_def.decorator_list])
+        for item in class_def.body:
+            if id(item) in event_method_ids:
+                # 事件方法本身由方法指纹负责；此处只记录其位置顺序
+                parts.append(f"event {getattr(item, 'name', '')}")
+            else:
+                parts.append(ast.dump(item))
+    return _digest(parts)
+
+
+def compute_event_method_fingerprint(method: ast.FunctionDef, *, extra: Iterable[str] = ()) -> str:
+    """事件方法指纹：方法 AST（行号相对方法首行归一）+ 调用方附加项（如信号绑定解析结果）。"""
+    normalized = clone_ast(method)
+    ast.increment_lineno(normalized, 1 - int(getattr(method, "lineno", 1) or 1))
+    return _digest([*extra, ast.dump(normalized, include_attributes=True)])
+
+
+__all__ = [
+    "EventFlowFragment",
+    "EventFlowCache",
+    "compute_graph_context_fingerprint",
+    "compute_event_method_fingerprint",
+]
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+if TYPE_CHECKING:
+    from .graph_model import EdgeModel
+
+
+EdgeKey = Tuple[str, str, str, str]
+PortKey = Tuple[str, str]
+
+
+class GraphEdgeIndex:
+    """GraphModel 连线的邻接索引（按节点 / 按端口的入边与出边 + 连线端点集合）。
+
+    约定：
+    - 由 `GraphModel.get_edge_index()` 构建与维护，调用方只读，勿直接修改其中的列表；
+    - 各列表保持 `GraphModel.edges` 的插入顺序（与逐条遍历 edges 的顺序一致）；
+    - `revision/edge_count/edges_ref` 记录构建时的连线版本：GraphModel 的增删 API 会增量更新并重新盖章，
+      外部直接改动 `edges` 字典（条数变化）或调用 `touch_edges_revision()` 后，下次读取时整体重建。
+    """
+
+    def __init__(self) -> None:
+        self.revision: int = -1
+        self.edge_count: int = -1
+        self.edges_ref: object = None
+        self.incoming_by_node: Dict[str, List["EdgeModel"]] = {}
+        self.outgoing_by_node: Dict[str, List["EdgeModel"]] = {}
+        self.incoming_by_port: Dict[PortKey, List["EdgeModel"]] = {}
+        self.outgoing_by_port: Dict[PortKey, List["EdgeModel"]] = {}
+        # 端点四元组 -> 条数（允许重复连线存在，删除时按计数回收）
+        self.edge_keys: Dict[EdgeKey, int] = {}
+
+    @classmethod
+    def build(cls, edges: Dict[str, "EdgeModel"]) -> "GraphEdgeIndex":
+        index = cls()
+        for edge in edges.values():
+            index.add(edge)
+        return index
+
+    def is_current(self, edges: Dict[str, "EdgeModel"], revision: int) -> bool:
+        return self.edges_ref is edges and self.revision == revision and self.edge_count == len(edges)
+
+    def stamp(self, edges: Dict[str, "EdgeModel"], revision: int) -> None:
+        self.edges_ref = edges
+        self.revision = int(revision)
+        self.edge_count = len(edges)
+
+    # -------- 增量维护 --------
+    def add(self, edge: "EdgeModel") -> None:
+        src_node = edge.src_node
+        dst_node = edge.dst_node
+        self.outgoing_by_node.setdefault(src_node, []).append(edge)
+        self.incoming_by_node.setdefault(dst_node, []).append(edge)
+        self.outgoing_by_port.setdefault((src_node, edge.src_port), []).append(edge)
+        self.incoming_by_port.setdefault((dst_node, edge.dst_port), []).append(edge)
+        key = (src_node, edge.src_port, dst_node, edge.dst_port)
+        self.edge_keys[key] = self.edge_keys.get(key, 0) + 1
+
+    def discard(self, edge: "EdgeModel") -> None:
+        _remove_from_bucket(self.outgoing_by_node, edge.src_node, edge)
+        _remove_from_bucket(self.incoming_by_node, edge.dst_node, edge)
+        _remove_from_bucket(self.outgoing_by_port, (edge.src_node, edge.src_port), edge)
+        _remove_from_bucket(self.incoming_by_port, (edge.dst_node, edge.dst_port), edge)
+        key = (edge.src_node, edge.src_port, edge.dst_node, edge.dst_port)
+        remaining = self.edge_keys.get(key, 0) - 1
+        if remaining > 0:
+            self.edge_keys[key] = remaining
+        else:
+            self.edge_keys.pop(key, None)
+
+    # -------- 查询 --------
+    def has_edge(self, src_node: str, src_port: str, dst_node: str, dst_port: str) -> bool:
+        return (src_node, src_port, dst_node, dst_port) in self.edge_keys
+
+    def get_incoming(self, node_id: str, port_name: str) -> List["EdgeModel"]:
+        return self.incoming_by_port.get((node_id, port_name), [])
+
+    def get_outgoing(self, node_id: str, port_name: str) -> List["EdgeModel"]:
+        return self.outgoing_by_port.get((node_id, port_name), [])
+
+    def count_incoming(self, node_id: str, port_name: str) -> int:
+        return len(self.incoming_by_port.get((node_id, port_name), ()))
+
+    def edges_of_node(self, node_id: str) -> List["EdgeModel"]:
+        """节点的全部关联连线（出边在前、入边在后；自环会出现两次）。"""
+        return [*self.outgoing_by_node.get(node_id, ()), *self.incoming_by_node.get(node_id, ())]
+
+
+def _remove_from_bucket(buckets: Dict, key: object, edge: "EdgeModel") -> None:
+    bucket = buckets.get(key)
+    if not bucket:
+        return
+    for position, existing in enumerate(bucket):
+        if existing is edge:
+            del bucket[position]
+            break
+    if not bucket:
+        del buckets[key]
+
+
+__all__ = [
+    "GraphEdgeIndex",
+]
@@ -1,13 +1,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple, Any, Literal
+from typing import Callable, Dict, List, Optional, Tuple, Any, Literal
 from datetime import datetime
 
 from .deprecated_metadata_writes import (
     raise_deprecated_signal_bindings_write,
     raise_deprecated_struct_bindings_write,
 )
+from .graph_edge_index import GraphEdgeIndex
 
 
 @dataclass
@@ -250,6 +251,8 @@ class GraphModel:
         # 注意：若外部直接原地修改 EdgeModel 字段（而非通过 GraphModel API），
         # 需要调用 `touch_edges_revision()` 主动触发失效。
         self._edges_revision: int = 0
+        # 邻接索引（按需构建；经 add_edge/remove_edge 等 API 增量维护，见 get_edge_index）
+        self._edge_index: Optional[GraphEdgeIndex] = None
         self.graph_variables: List[dict] = []  # 节点图变量列表（存储序列化后的GraphVariableConfig）
         # 元数据（所属模板、实例、信号绑定、结构体绑定等）
         self.metadata: Dict[str, Any] = {}
@@ -266,11 +269,45 @@ class GraphModel:
         
         # 基本块列表：用于可视化显示（半透明矩形框）
         self.basic_blocks: List[BasicBlock] = []  # 基本块列表
+
+        # 延迟布局步骤：解析时选择“延迟布局”后登记，首次读取 basic_blocks / 序列化 / 显式 ensure_layout 时执行。
+        # 说明：仅校验等不读取坐标与块结构的链路会跳过布局；需要坐标的调用方必须先 ensure_layout()。
+        self._deferred_layout_steps: List[Callable[["GraphModel"], None]] = []
         
         # 自动生成ID（如果未提供）
         if not self.graph_id:
             self.graph_id = datetime.now().strftime("graph_%Y%m%d_%H%M%S_%f")
 
+    # -------- 延迟布局 --------
+    @property
+    def basic_blocks(self) -> List[BasicBlock]:
+        if self._deferred_layout_steps:
+            self.ensure_layout()
+        return self._basic_blocks
+
+    @basic_blocks.setter
+    def basic_blocks(self, value: List[BasicBlock]) -> None:
+        self._basic_blocks = value
+
+    def defer_layout(self, step: Callable[["GraphModel"], None]) -> None:
+        """登记一个延迟布局步骤（按登记顺序执行，例如“自动布局 → 锚点平移”）。"""
+        self._deferred_layout_steps.append(step)
+
+    def has_pending_layout(self) -> bool:
+        """是否存在尚未执行的延迟布局（此时节点坐标与基本块均未计算）。"""
+        return bool(self._deferred_layout_steps)
+
+    def ensure_layout(self) -> bool:
+        """执行全部待定的延迟布局步骤；返回本次是否实际执行了布局。"""
+        if not self._deferred_layout_steps:
+            return False
+        steps = self._deferred_layout_steps
+        # 先清空再执行：布局过程中读取 basic_blocks 不得重入
+        self._deferred_layout_steps = []
+        for step in steps:
+            step(self)
+        return True
+
     def gen_id(self, prefix: str) -> str:
         new_id = f"{prefix}_{self._next_id}"
         self._next_id += 1
@@ -292,6 +329,43 @@ class GraphModel:
     def get_edges_revision(self) -> int:
         """获取当前连线版本号（用于调试与缓存策略）。"""
         return int(self._edges_revision)
+
+    # -------- 邻接索引 --------
+    def get_edge_index(self) -> GraphEdgeIndex:
+        """获取连线邻接索引（按节点/按端口的入边与出边、连线端点集合）。
+
+        索引随连线版本号失效：通过本类 API 增删连线时增量维护；外部直接改动 `edges`
+        或调用 `touch_edges_revision()` 后，下次读取时整体重建。返回值只读，勿长期持有。
+        """
+        index = self._edge_index
+        if index is None or not index.is_current(self.edges, self._edges_revision):
+            index = GraphEdgeIndex.build(self.edges)
+            index.stamp(self.edges, self._edges_revision)
+            self._edge_index = index
+        return index
+
+    def _get_current_edge_index(self) -> Optional[GraphEdgeIndex]:
+        """返回仍与 edges 一致、可增量维护的索引（不一致则返回 None，留待下次读取时重建）。"""
+        index = self._edge_index
+        if index is not None and index.is_current(self.edges, self._edges_revision):
+            return index
+        return None
+
+    def _remove_edges_by_ids(self, edge_ids: List[str]) -> List[str]:
+        index = self._get_current_edge_index()
+        removed: List[str] = []
+        for edge_id in edge_ids:
+            edge = self.edges.pop(edge_id, None)
+            if edge is None:
+                continue
+            removed.append(edge_id)
+            if index is not None:
+                index.discard(edge)
+        if removed:
+            self._touch_edges_revision()
+            if index is not None:
+                index.stamp(self.edges, self._edges_revision)
+        return removed
     
     def add_node(self, title: str, category: str, input_names: List[str], output_names: List[str], pos=(0.0, 0.0)) -> NodeModel:
         node_id = self.gen_id("node")
@@ -303,23 +377,29 @@ class GraphModel:
         return node
     
     def add_edge(self, src_node: str, src_port: str, dst_node: str, dst_port: str) -> EdgeModel:
+        index = self._get_current_edge_index()
         edge_id = self.gen_id("edge")
         edge = EdgeModel(id=edge_id, src_node=src_node, src_port=src_port, dst_node=dst_node, dst_port=dst_port)
         self.edges[edge_id] = edge
         self._touch_edges_revision()
+        if index is not None:
+            index.add(edge)
+            index.stamp(self.edges, self._edges_revision)
         return edge
     
     def add_edge_if_absent(self, src_node: str, src_port: str, dst_node: str, dst_port: str) -> Optional[EdgeModel]:
         """若相同连线不存在则添加，否则返回None。"""
-        for existing_edge in self.edges.values():
-            if (
-                existing_edge.src_node == src_node
-                and existing_edge.src_port == src_port
-                and existing_edge.dst_node == dst_node
-                and existing_edge.dst_port == dst_port
-            ):
-                return None
+        if self.get_edge_index().has_edge(src_node, src_port, dst_node, dst_port):
+            return None
         return self.add_edge(src_node, src_port, dst_node, dst_port)
+
+    def remove_edge(self, edge_id: str) -> Optional[EdgeModel]:
+        """删除指定连线；不存在时返回 None。"""
+        edge = self.edges.get(edge_id)
+        if edge is None:
+            return None
+        self._remove_edges_by_ids([edge_id])
+        return edge
     
     # -------- 信号绑定辅助（GraphModel.metadata["signal_bindings"]）--------
     def get_signal_bindings(self) -> Dict[str, Dict[str, str]]:
@@ -399,13 +479,11 @@ class GraphModel:
     def remove_node(self, node_id: str) -> None:
         if node_id not in self.nodes:
             return
-        # remove edges connected
-        to_del = [eid for eid, e in self.edges.items() if e.src_node == node_id or e.dst_node == node_id]
-        for eid in to_del:
-            self.edges.pop(eid, None)
+        # remove edges connected（自环在出边/入边中各出现一次，按 ID 去重）
+        index = self.get_edge_index()
+        to_del = list(dict.fromkeys(edge.id for edge in index.edges_of_node(node_id)))
+        self._remove_edges_by_ids(to_del)
         self.nodes.pop(node_id, None)
-        if to_del:
-            self._touch_edges_revision()
     
     def has_port_connections(self, node_id: str, port_name: str, is_input: bool) -> bool:
         """检查指定端口是否有连线
@@ -418,14 +496,10 @@ class GraphModel:
         Returns:
             是否有连线连接到该端口
         """
-        for edge in self.edges.values():
-            if is_input:
-                if edge.dst_node == node_id and edge.dst_port == port_name:
-                    return True
-            else:
-                if edge.src_node == node_id and edge.src_port == port_name:
-                    return True
-        return False
+        index = self.get_edge_index()
+        if is_input:
+            return bool(index.get_incoming(node_id, port_name))
+        return bool(index.get_outgoing(node_id, port_name))
     
     def remove_port_connections(self, node_id: str, port_name: str, is_input: bool) -> List[str]:
         """删除指定端口的所有连线
@@ -438,23 +512,9 @@ class GraphModel:
         Returns:
             被删除的边的ID列表
         """
-        removed_edges = []
-        to_del = []
-        
-        for edge_id, edge in self.edges.items():
-            if is_input:
-                if edge.dst_node == node_id and edge.dst_port == port_name:
-                    to_del.append(edge_id)
-            else:
-                if edge.src_node == node_id and edge.src_port == port_name:
-                    to_del.append(edge_id)
-        
-        for edge_id in to_del:
-            self.edges.pop(edge_id, None)
-            removed_edges.append(edge_id)
-        if removed_edges:
-            self._touch_edges_revision()
-        return removed_edges
+        index = self.get_edge_index()
+        edges = index.get_incoming(node_id, port_name) if is_input else index.get_outgoing(node_id, port_name)
+        return self._remove_edges_by_ids([edge.id for edge in edges])
     
     def sync_composite_nodes_from_library(self, node_library: Dict) -> int:
         """从节点库同步所有复合节点的端口定义
@@ -471,7 +531,8 @@ class GraphModel:
         return sync_composite_nodes_from_library(self, node_library)
 
     def serialize(self) -> dict:
-        """序列化节点图为字典"""
+        """序列化节点图为字典（存在延迟布局时先完成布局，保证坐标与基本块落盘正确）"""
+        self.ensure_layout()
         from engine.graph.models.graph_serialization import serialize_graph
         return serialize_graph(self)
     
@@ -555,11 +616,12 @@ class GraphModel:
         cloned.preserve_formatting = bool(self.preserve_formatting)
         cloned.event_flow_order = list(self.event_flow_order)
         cloned.event_flow_titles = list(self.event_flow_titles)
-        # 基本块：重建对象 + 列表浅复制
+        # 基本块：重建对象 + 列表浅复制（克隆不触发延迟布局，待定步骤随克隆一并保留）
         cloned.basic_blocks = [
             BasicBlock(nodes=list(b.nodes), color=b.color, alpha=b.alpha, order_index=int(getattr(b, "order_index", 0) or 0))
-            for b in self.basic_blocks
+            for b in self._basic_blocks
         ]
+        cloned._deferred_layout_steps = list(self._deferred_layout_steps)
         return cloned
 
 
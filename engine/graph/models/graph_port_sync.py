@@ -62,11 +62,10 @@ def sync_composite_nodes_from_library(graph: "GraphModel", node_library: Dict) -
         # 优先使用 composite_id 查找节点定义（稳定标识符，不受改名影响）
         node_def = None
         if node.composite_id:
-            # 尝试通过 composite_id 查找（精确匹配）
-            for key, candidate_def in node_library.items():
-                if hasattr(candidate_def, 'composite_id') and candidate_def.composite_id == node.composite_id:
-                    node_def = candidate_def
-                    break
+            # 尝试通过 composite_id 查找（精确匹配，走节点库共享索引）
+            from engine.nodes.node_def_index import get_node_def_index
+
+            node_def = get_node_def_index(node_library).get_composite(node.composite_id)
         
         # 退化方案：使用 "类别/标题" 查找（可能受改名影响）
         if not node_def:
@@ -132,6 +131,7 @@ def _update_edges_after_port_sync(
             output_mapping[old_name] = new_outputs[i]
     
     # 更新所有相关的连线
+    edges_changed = False
     for edge in graph.edges.values():
         # 更新源端口（输出端口）
         if edge.src_node == node_id and edge.src_port in output_mapping:
@@ -139,6 +139,7 @@ def _update_edges_after_port_sync(
             new_port = output_mapping[old_port]
             if old_port != new_port:
                 edge.src_port = new_port
+                edges_changed = True
         
         # 更新目标端口（输入端口）
         if edge.dst_node == node_id and edge.dst_port in input_mapping:
@@ -146,5 +147,8 @@ def _update_edges_after_port_sync(
             new_port = input_mapping[old_port]
             if old_port != new_port:
                 edge.dst_port = new_port
+                edges_changed = True
+    if edges_changed:
+        graph.touch_edges_revision()
 
 
@@ -392,19 +392,28 @@ class EffectivePortTypeResolver:
         self._visiting: Set[Tuple[str, str, bool]] = set()
 
     def _build_edge_indices(self) -> None:
-        for edge in (getattr(self.graph_model, "edges", None) or {}).values():
-            src_node_id = str(getattr(edge, "src_node", "") or "")
-            src_port = str(getattr(edge, "src_port", "") or "")
-            dst_node_id = str(getattr(edge, "dst_node", "") or "")
-            dst_port = str(getattr(edge, "dst_port", "") or "")
-            if not src_node_id or not dst_node_id or not src_port or not dst_port:
-                continue
-            self._incoming_edges.setdefault((dst_node_id, dst_port), []).append(edge)
-            self._outgoing_edges.setdefault((src_node_id, src_port), []).append(edge)
-        for edges in self._incoming_edges.values():
-            edges.sort(key=lambda e: str(getattr(e, "id", "") or ""))
-        for edges in self._outgoing_edges.values():
-            edges.sort(key=lambda e: str(getattr(e, "id", "") or ""))
+        # 复用 GraphModel 的共享邻接索引：仅在此基础上过滤端点不完整的连线并按 edge.id 排序（保证解析可复现）
+        edge_index = self.graph_model.get_edge_index()
+
+        def _is_complete(edge: object) -> bool:
+            return bool(
+                getattr(edge, "src_node", "")
+                and getattr(edge, "src_port", "")
+                and getattr(edge, "dst_node", "")
+                and getattr(edge, "dst_port", "")
+            )
+
+        def _sorted_complete(buckets: Dict[Tuple[str, str], list[object]]) -> Dict[Tuple[str, str], list[object]]:
+            result: Dict[Tuple[str, str], list[object]] = {}
+            for key, edges in buckets.items():
+                kept = [edge for edge in edges if _is_complete(edge)]
+                if kept:
+                    kept.sort(key=lambda e: str(getattr(e, "id", "") or ""))
+                    result[(str(key[0]), str(key[1]))] = kept
+            return result
+
+        self._incoming_edges = _sorted_complete(edge_index.incoming_by_port)
+        self._outgoing_edges = _sorted_complete(edge_index.outgoing_by_port)
 
     def _get_node_def(self, node: NodeModel) -> Any:
         node_id = str(getattr(node, "id", "") or "")
@@ -3,6 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Dict, Optional
 
+from engine.nodes.node_def_index import get_node_def_index
 from engine.nodes.node_definition_loader import NodeDef
 
 
@@ -50,27 +51,31 @@ class ReverseGraphCodeOptions:
 
 
 def _resolve_node_def(*, node: object, node_library: Dict[str, NodeDef]) -> NodeDef:
-    category = str(getattr(node, "category", "") or "")
-    title = str(getattr(node, "title", "") or "")
-    key = f"{category}/{title}"
-    if key in node_library:
-        return node_library[key]
-    composite_key = f"复合节点/{title}"
-    if composite_key in node_library:
-        return node_library[composite_key]
-    raise ReverseGraphCodeError(f"无法在节点库中定位 NodeDef：{key!r}")
+    node_def = _try_resolve_node_def(node=node, node_library=node_library)
+    if node_def is None:
+        key = f"{getattr(node, 'category', '') or ''}/{getattr(node, 'title', '') or ''}"
+        raise ReverseGraphCodeError(f"无法在节点库中定位 NodeDef：{key!r}")
+    return node_def
 
 
 def _try_resolve_node_def(*, node: object, node_library: Dict[str, NodeDef]) -> Optional[NodeDef]:
-    """尽量解析 NodeDef；失败时返回 None（避免用 try/except 做控制流）。"""
+    """尽量解析 NodeDef；失败时返回 None（避免用 try/except 做控制流）。
+
+    顺序：`类别/标题` 标准键 → 复合节点按 node_def_ref(composite_id) 走节点库共享索引 → `复合节点/标题`。
+    """
 
     category = str(getattr(node, "category", "") or "")
     title = str(getattr(node, "title", "") or "")
     key = f"{category}/{title}"
     if key in node_library:
         return node_library[key]
+    node_def_ref = getattr(node, "node_def_ref", None)
+    if node_def_ref is not None and str(getattr(node_def_ref, "kind", "") or "").strip() == "composite":
+        composite_id = str(getattr(node_def_ref, "key", "") or "").strip()
+        node_def = get_node_def_index(node_library).get_composite(composite_id) if composite_id else None
+        if node_def is not None:
+            return node_def
     composite_key = f"复合节点/{title}"
     if composite_key in node_library:
         return node_library[composite_key]
     return None
-
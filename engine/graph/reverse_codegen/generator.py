@@ -3,12 +3,13 @@ from __future__ import annotations
 from collections import deque
 import json
 import keyword
+from types import MappingProxyType
 from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
 
 from engine.graph.common import (
     SIGNAL_LISTEN_NODE_TITLE,
     SIGNAL_NAME_PORT_NAME,
-    node_name_index_from_library,
+    get_node_name_index,
 )
 from engine.graph.port_type_effective_resolver import (
     build_port_type_overrides,
@@ -16,6 +17,7 @@ from engine.graph.port_type_effective_resolver import (
 )
 from engine.graph.models import GraphModel, NodeModel
 from engine.graph.semantic import SEMANTIC_SIGNAL_ID_CONSTANT_KEY
+from engine.nodes.node_def_index import get_node_def_index
 from engine.nodes.node_definition_loader import NodeDef
 from engine.nodes.port_type_system import is_flow_port_with_context
 from engine.utils.name_utils import make_valid_identifier
@@ -44,8 +46,8 @@ def generate_graph_code_from_model(
     if scope not in {"server", "client"}:
         raise ReverseGraphCodeError(f"不支持的 scope：{scope!r}（仅支持 'server'/'client'）")
 
-    node_name_index = node_name_index_from_library(node_library, scope=scope)
-    call_name_candidates_by_identity = _build_call_name_candidates_by_identity(node_library)
+    node_name_index = get_node_name_index(node_library, scope=scope)
+    call_name_candidates_by_identity = _get_call_name_candidates_by_identity(node_library)
     composite_specs, composite_alias_by_id = _collect_composite_instance_specs(
         model=model,
         node_library=node_library,
@@ -634,6 +636,14 @@ def _build_call_name_candidates_by_identity(node_library: Dict[str, NodeDef]) ->
     return {k: sorted(v, key=_call_name_sort_key) for k, v in candidates.items()}
 
 
+def _get_call_name_candidates_by_identity(node_library: Dict[str, NodeDef]) -> Mapping[int, List[str]]:
+    """按节点库对象记忆化（随节点库共享索引失效）；键为 id(NodeDef)，节点库存活期间稳定。"""
+    return get_node_def_index(node_library).get_derived(
+        ("call_name_candidates_by_identity",),
+        lambda: MappingProxyType(_build_call_name_candidates_by_identity(node_library)),
+    )
+
+
 def _call_name_sort_key(name: str) -> Tuple[int, int, str]:
     has_underscore = 1 if "_" in name else 0
     return (has_underscore, len(name), name)
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import ast
+from typing import Dict, List, Optional, Type
+
+
+class GraphCodeAstIndex:
+    """Graph Code AST 的一次遍历节点索引（父节点 / 按类型）。
+
+    说明：
+    - 构建时对树做一次 `ast.walk`，各查询结果保持 `ast.walk` 的遍历顺序（与逐条规则自行遍历的顺序一致）；
+    - 索引是树的只读快照：树被就地改写后必须重建（校验侧由 `engine.validate.rules.ast_utils.get_ast_index` 负责失效）。
+    """
+
+    def __init__(self, tree: ast.AST) -> None:
+        self.tree = tree
+        self.parents: Dict[ast.AST, ast.AST] = {}
+        self._nodes_by_type: Dict[Type[ast.AST], List[ast.AST]] = {}
+        # 多类型合并查询时才需要的遍历序号（按需构建）
+        self._walk_position: Dict[int, int] = {}
+
+        for node in ast.walk(tree):
+            self._nodes_by_type.setdefault(type(node), []).append(node)
+            for child in ast.iter_child_nodes(node):
+                self.parents[child] = node
+
+    def parent_of(self, node: ast.AST) -> Optional[ast.AST]:
+        return self.parents.get(node)
+
+    def nodes_of_type(self, *node_types: Type[ast.AST]) -> List[ast.AST]:
+        """返回指定类型（精确类型匹配，不含子类）的全部节点；多个类型时按遍历顺序合并。"""
+        if len(node_types) == 1:
+            return list(self._nodes_by_type.get(node_types[0], []))
+        buckets = [self._nodes_by_type.get(node_type, []) for node_type in node_types]
+        buckets = [bucket for bucket in buckets if bucket]
+        if len(buckets) <= 1:
+            return list(buckets[0]) if buckets else []
+        positions = self._get_walk_positions()
+        merged = [node for bucket in buckets for node in bucket]
+        merged.sort(key=lambda n: positions[id(n)])
+        return merged
+
+    def _get_walk_positions(self) -> Dict[int, int]:
+        if not self._walk_position:
+            self._walk_position = {id(node): position for position, node in enumerate(ast.walk(self.tree))}
+        return self._walk_position
+
+
+__all__ = [
+    "GraphCodeAstIndex",
+]
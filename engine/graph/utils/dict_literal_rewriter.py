@@ -5,6 +5,7 @@ import copy
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Set, Tuple
 
+from .ast_utils import clone_ast
 from .graph_code_rewrite_config import DEFAULT_MAX_DICT_LITERAL_PAIRS
 from engine.type_registry import (
     BASE_TYPES,
@@ -57,7 +58,7 @@ def rewrite_graph_code_dict_literals(
       禁止直接在节点调用入参或其它表达式中书写 `{...}`，避免出现“未明确数据类型”的字典构造。
 
     注意：
-    - 该函数为“纯函数”：会 deepcopy 输入 AST，并返回新 AST；
+    - 该函数为“纯函数”：会克隆输入 AST，并返回新 AST；
     - 不处理模块顶层除 GRAPH_VARIABLES 之外的字典字面量：应由验证层报错（无法转换为节点）。
     """
     if not isinstance(tree, ast.Module):
@@ -67,7 +68,16 @@ def rewrite_graph_code_dict_literals(
     if max_pairs_int <= 0:
         raise ValueError("max_pairs 必须为正整数")
 
-    cloned_tree: ast.Module = copy.deepcopy(tree)
+    cloned_tree: ast.Module = clone_ast(tree)
+    issues = rewrite_dict_literals_in_place(cloned_tree, max_pairs=max_pairs_int)
+    ast.fix_missing_locations(cloned_tree)
+    return cloned_tree, issues
+
+
+def rewrite_dict_literals_in_place(tree: ast.Module, *, max_pairs: int) -> List[DictLiteralRewriteIssue]:
+    """就地改写（供融合改写管线复用同一份 AST 副本）；调用方负责克隆与 fix_missing_locations。"""
+    max_pairs_int = int(max_pairs)
+    cloned_tree = tree
     issues: List[DictLiteralRewriteIssue] = []
     module_dict_constant_literals = _collect_module_typed_dict_constant_literals(cloned_tree)
 
@@ -115,8 +125,7 @@ def rewrite_graph_code_dict_literals(
             transformer.visit(method_def)
             issues.extend(transformer.issues)
 
-    ast.fix_missing_locations(cloned_tree)
-    return cloned_tree, issues
+    return issues
 
 
 def _is_graph_variables_declaration(stmt: ast.stmt) -> bool:
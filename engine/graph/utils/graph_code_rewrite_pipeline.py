@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import ast
+from dataclasses import dataclass, field
+from typing import List
+
+from .ast_utils import clone_ast
+from .dict_literal_rewriter import DictLiteralRewriteIssue, rewrite_dict_literals_in_place
+from .graph_code_rewrite_config import GraphCodeRewriteConfig
+from .list_literal_rewriter import ListLiteralRewriteIssue, rewrite_list_literals_in_place
+from .syntax_sugar_rewriter import rewrite_syntax_sugars_in_place
+from .syntax_sugar_rewriter_issue import SyntaxSugarRewriteIssue
+
+
+@dataclass
+class GraphCodeRewriteResult:
+    """融合改写结果：改写后的 AST + 各阶段 issue（保持阶段划分，便于上层按规则归类）。"""
+
+    tree: ast.Module
+    syntax_sugar_issues: List[SyntaxSugarRewriteIssue] = field(default_factory=list)
+    list_literal_issues: List[ListLiteralRewriteIssue] = field(default_factory=list)
+    dict_literal_issues: List[DictLiteralRewriteIssue] = field(default_factory=list)
+
+    @property
+    def all_issues(self) -> List[object]:
+        return [*self.syntax_sugar_issues, *self.list_literal_issues, *self.dict_literal_issues]
+
+
+def rewrite_graph_code(
+    tree: ast.Module,
+    *,
+    scope: str,
+    config: GraphCodeRewriteConfig,
+) -> GraphCodeRewriteResult:
+    """Graph Code 语法糖归一化的统一入口：常见语法糖 → 列表字面量 → 字典字面量。
+
+    与依次调用三个 `rewrite_graph_code_*` 等价，但：
+    - 只克隆一次输入 AST（各阶段在同一副本上就地改写）；
+    - 不再在阶段之间做深拷贝。
+
+    注意：阶段之间仍需 `ast.fix_missing_locations`——列表/字典改写会沿用被替换节点的位置信息，
+    语法糖阶段新建的节点若未补齐位置，会导致最终 AST 的行列号与逐步改写不一致。
+
+    阶段顺序不可调换：后一阶段需要看到前一阶段产出的节点调用（例如语法糖改写后的实参中的列表字面量）。
+    """
+    if not isinstance(tree, ast.Module):
+        raise TypeError("rewrite_graph_code 仅支持 ast.Module 输入")
+
+    working_tree: ast.Module = clone_ast(tree)
+    syntax_sugar_issues = rewrite_syntax_sugars_in_place(
+        working_tree,
+        scope=scope,
+        enable_shared_composite_sugars=config.enable_shared_composite_sugars,
+    )
+    ast.fix_missing_locations(working_tree)
+    list_literal_issues = rewrite_list_literals_in_place(
+        working_tree,
+        max_elements=config.max_list_literal_elements,
+    )
+    ast.fix_missing_locations(working_tree)
+    dict_literal_issues = rewrite_dict_literals_in_place(
+        working_tree,
+        max_pairs=config.max_dict_literal_pairs,
+    )
+    ast.fix_missing_locations(working_tree)
+    return GraphCodeRewriteResult(
+        tree=working_tree,
+        syntax_sugar_issues=list(syntax_sugar_issues),
+        list_literal_issues=list(list_literal_issues),
+        dict_literal_issues=list(dict_literal_issues),
+    )
+
+
+__all__ = [
+    "GraphCodeRewriteResult",
+    "rewrite_graph_code",
+]
@@ -5,6 +5,7 @@ import copy
 from dataclasses import dataclass
 from typing import Dict, List, Set, Tuple, Optional
 
+from .ast_utils import clone_ast
 from .graph_code_rewrite_config import DEFAULT_MAX_LIST_LITERAL_ELEMENTS
 from engine.type_registry import (
     BASE_TYPES,
@@ -68,7 +69,7 @@ def rewrite_graph_code_list_literals(
     - `for x in [...]` 不允许：for 的迭代器位置必须是“显式声明带中文类型注解”的列表变量（例如 `列表: "整数列表" = [1,2,3]`）。
 
     注意：
-    - 该函数为“纯函数”：会 deepcopy 输入 AST，并返回新 AST；
+    - 该函数为“纯函数”：会克隆输入 AST，并返回新 AST；
     - 不处理模块/类体顶层的语法糖：应由验证层报错（无法转换为节点）。
     """
     if not isinstance(tree, ast.Module):
@@ -78,7 +79,16 @@ def rewrite_graph_code_list_literals(
     if max_elements_int <= 0:
         raise ValueError("max_elements 必须为正整数")
 
-    cloned_tree: ast.Module = copy.deepcopy(tree)
+    cloned_tree: ast.Module = clone_ast(tree)
+    issues = rewrite_list_literals_in_place(cloned_tree, max_elements=max_elements_int)
+    ast.fix_missing_locations(cloned_tree)
+    return cloned_tree, issues
+
+
+def rewrite_list_literals_in_place(tree: ast.Module, *, max_elements: int) -> List[ListLiteralRewriteIssue]:
+    """就地改写（供融合改写管线复用同一份 AST 副本）；调用方负责克隆与 fix_missing_locations。"""
+    max_elements_int = int(max_elements)
+    cloned_tree = tree
     issues: List[ListLiteralRewriteIssue] = []
     module_list_constant_literals = _collect_module_typed_list_constant_literals(cloned_tree)
 
@@ -125,8 +135,7 @@ def rewrite_graph_code_list_literals(
             transformer.visit(method_def)
             issues.extend(transformer.issues)
 
-    ast.fix_missing_locations(cloned_tree)
-    return cloned_tree, issues
+    return issues
 
 
 def _is_graph_variables_declaration(stmt: ast.stmt) -> bool:
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 import ast
-import copy
 from typing import List, Tuple
 
+from .ast_utils import clone_ast
 from .syntax_sugar_rewriter_ast_helpers import (
     _collect_all_name_ids,
     _collect_container_var_names,
@@ -130,15 +130,32 @@ def rewrite_graph_code_syntax_sugars(
       - `目标字典.pop(键)` → `以键对字典移除键值对(self.game, 字典=目标字典, 键=键)`（仅语句形态，不支持承接返回值）
 
     说明：
-    - 该函数为“纯函数”：会 deepcopy 输入 AST，并返回新 AST；
+    - 该函数为“纯函数”：会克隆输入 AST，并返回新 AST；
     - 仅处理类方法体；模块顶层/类体顶层不做重写（语义不明确，且无法转换为节点图执行流）。
     - scope 用于处理 server/client 的节点名/端口名差异。
     """
     if not isinstance(tree, ast.Module):
         raise TypeError("rewrite_graph_code_syntax_sugars 仅支持 ast.Module 输入")
 
+    cloned_tree: ast.Module = clone_ast(tree)
+    issues = rewrite_syntax_sugars_in_place(
+        cloned_tree,
+        scope=scope,
+        enable_shared_composite_sugars=enable_shared_composite_sugars,
+    )
+    ast.fix_missing_locations(cloned_tree)
+    return cloned_tree, issues
+
+
+def rewrite_syntax_sugars_in_place(
+    tree: ast.Module,
+    *,
+    scope: str,
+    enable_shared_composite_sugars: bool = False,
+) -> List[SyntaxSugarRewriteIssue]:
+    """就地改写（供融合改写管线复用同一份 AST 副本）；调用方负责克隆与 fix_missing_locations。"""
     normalized_scope = _normalize_scope(scope)
-    cloned_tree: ast.Module = copy.deepcopy(tree)
+    cloned_tree = tree
     issues: List[SyntaxSugarRewriteIssue] = []
     module_list_var_names, module_dict_var_names = _collect_module_container_var_names(cloned_tree)
 
@@ -173,8 +190,7 @@ def rewrite_graph_code_syntax_sugars(
         if enable_shared_composite_sugars and required_shared_composites:
             _ensure_shared_composites_in_init(class_def, required_shared_composites)
 
-    ast.fix_missing_locations(cloned_tree)
-    return cloned_tree, issues
+    return issues
 
 
 def _ensure_shared_composites_in_init(class_def: ast.ClassDef, required: dict[str, str]) -> None:
@@ -274,6 +290,7 @@ def _ensure_shared_composites_in_init(class_def: ast.ClassDef, required: dict[st
 __all__ = [
     "SyntaxSugarRewriteIssue",
     "rewrite_graph_code_syntax_sugars",
+    "rewrite_syntax_sugars_in_place",
 ]
 
 
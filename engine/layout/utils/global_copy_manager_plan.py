@@ -130,6 +130,7 @@ class _GlobalCopyManagerPlanMixin:
         self._apply_edge_mutations(plan.edge_mutations)
         self._ensure_new_edges(plan.new_edges)
         self._dedupe_edges_after_application()
+        self.model.touch_edges_revision()
 
     def _ensure_copy_nodes(self, copy_nodes: Iterable[CopyNodeSpec]) -> None:
         """确保副本节点存在（优先复用已有副本）。"""
@@ -165,14 +165,22 @@ def build_edge_indices(
     if not model:
         return flow_out_by_node, flow_in_by_node, data_out_by_node, data_in_by_node
 
+    # 流程/数据判定只取决于目标端口：借助 GraphModel 共享邻接索引，每个目标端口只判定一次。
+    # 列表仍按 edges 顺序追加（事件起点发现与块排序依赖该顺序与字典键顺序）。
+    is_flow_by_target: Dict[Tuple[str, str], bool] = {}
+    for dst_id, dst_port_name in model.get_edge_index().incoming_by_port.keys():
+        dst_node = model.nodes.get(dst_id)
+        if not dst_node:
+            continue
+        dst_port = dst_node.get_input_port(dst_port_name)
+        is_flow_by_target[(dst_id, dst_port_name)] = bool(dst_port and is_flow_input_port(dst_node, dst_port.name))
+
     for edge in model.edges.values():
         src_id = edge.src_node
         dst_id = edge.dst_node
-        dst_node = model.nodes.get(dst_id)
-        if not dst_node:
+        is_flow_target = is_flow_by_target.get((dst_id, edge.dst_port))
+        if is_flow_target is None:
             continue
-        dst_port = dst_node.get_input_port(edge.dst_port)
-        is_flow_target = bool(dst_port and is_flow_input_port(dst_node, dst_port.name))
 
         if is_flow_target:
             flow_out_by_node.setdefault(src_id, []).append(edge)
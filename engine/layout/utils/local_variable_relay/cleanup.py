@@ -195,6 +195,8 @@ def _restore_original_edges_and_remove_existing_relays(
             model.nodes.pop(relay_node_id, None)
             did_mutate = True
 
+    if did_mutate:
+        model.touch_edges_revision()
     return set(stale_relay_node_ids), bool(did_mutate)
 
 
@@ -105,10 +105,12 @@ def remove_data_nodes(
                 if edge.src_node == node_id or edge.dst_node == node_id:
                     edges_to_purge.append(edge.id)
 
+    purged_any = False
     for edge_id in set(edges_to_purge):
         edge = model.edges.pop(edge_id, None)
         if edge is None:
             continue
+        purged_any = True
         if data_in_index is not None and edge.dst_node in data_in_index:
             data_in_index[edge.dst_node] = [
                 existing for existing in data_in_index[edge.dst_node] if existing.id != edge_id
@@ -118,6 +120,9 @@ def remove_data_nodes(
                 existing for existing in data_out_index[edge.src_node] if existing.id != edge_id
             ]
 
+    if purged_any:
+        model.touch_edges_revision()
+
     for node_id in nodes_to_remove:
         model.nodes.pop(node_id, None)
 
@@ -181,6 +186,7 @@ def _redirect_edges_to_canonical(model: GraphModel, source_id: str, canonical_id
             edge.src_node = canonical_id
         if edge.dst_node == source_id:
             edge.dst_node = canonical_id
+    model.touch_edges_revision()
 
 
 def _dedupe_edges(model: GraphModel, edge_indices: Optional[dict] = None) -> None:
@@ -189,13 +195,17 @@ def _dedupe_edges(model: GraphModel, edge_indices: Optional[dict] = None) -> Non
     from engine.graph.models import EdgeModel
     
     seen_edges: Dict[Tuple[str, str, str, str], str] = {}
+    removed_any = False
     for edge_id in list(model.edges.keys()):
         edge = model.edges[edge_id]
         key = (edge.src_node, edge.src_port, edge.dst_node, edge.dst_port)
         if key in seen_edges:
             del model.edges[edge_id]
+            removed_any = True
         else:
             seen_edges[key] = edge_id
+    if removed_any:
+        model.touch_edges_revision()
 
     if edge_indices:
         data_in_index = edge_indices.get("data_in_edges_by_dst") or {}
@@ -0,0 +1,117 @@
+"""NodeDef 库派生的查找索引（composite_id / (类别, 名称) → NodeDef）。
+
+节点库以 `类别/名称[#scope]` 为键；按 composite_id 或 (类别, 名称) 查找原本需要整库线性扫描
+（对懒物化节点库还会触发全量物化）。本模块为同一个节点库对象维护一份共享索引：
+解析器、校验器、UI 场景与反向生成拿到的通常是 NodeRegistry 返回的同一个库对象，因此共享同一份索引。
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterator, Mapping, Optional, Tuple, TypeVar
+
+from .node_definition_loader import NodeDef
+from .node_library_cache import LazyNodeDefLibrary
+
+_INDEX_FIELD_NAMES: Tuple[str, ...] = ("is_composite", "composite_id", "category", "name")
+_MAX_CACHED_INDEXES = 8
+_MISSING = object()
+
+T = TypeVar("T")
+
+
+def _iter_index_fields(node_library: Mapping[str, NodeDef]) -> Iterator[Tuple[Any, tuple]]:
+    if isinstance(node_library, LazyNodeDefLibrary):
+        yield from node_library.iter_field_values(_INDEX_FIELD_NAMES)
+        return
+    for key, node_def in node_library.items():
+        yield key, tuple(getattr(node_def, name, None) for name in _INDEX_FIELD_NAMES)
+
+
+class NodeDefIndex:
+    """单个节点库对象的只读查找索引。
+
+    约定：
+    - 与线性扫描口径一致：同一 composite_id / (类别, 名称) 命中多个键时取节点库顺序中的第一个；
+    - 索引只记录键，查找时再经节点库取值（懒物化节点库只物化命中的条目）；
+    - 节点库对象被替换或条目数变化后索引失效（见 `get_node_def_index`）；
+    - (类别, 名称) 取 NodeDef 自身的 category/name，同名多作用域变体（`#server/#client`）取第一个，
+      需要精确作用域时请直接使用标准键；
+    - `get_derived` 供其它模块挂载“由同一节点库派生”的只读结构（如按 scope 的节点名索引），随索引一并失效。
+    """
+
+    def __init__(self, node_library: Mapping[str, NodeDef]) -> None:
+        self.node_library = node_library
+        self.size = len(node_library)
+        self._composite_key_by_id: Dict[str, Any] = {}
+        self._key_by_category_title: Dict[Tuple[str, str], Any] = {}
+        self._derived: Dict[Hashable, Any] = {}
+        for key, (is_composite, composite_id, category, name) in _iter_index_fields(node_library):
+            if is_composite:
+                composite_id_text = str(composite_id or "")
+                if composite_id_text:
+                    self._composite_key_by_id.setdefault(composite_id_text, key)
+            self._key_by_category_title.setdefault((str(category or ""), str(name or "")), key)
+
+    def is_current_for(self, node_library: Mapping[str, NodeDef]) -> bool:
+        return self.node_library is node_library and self.size == len(node_library)
+
+    def get_composite(self, composite_id: str) -> Optional[NodeDef]:
+        """按 composite_id 精确查找复合节点定义（禁止 title/name 模糊匹配）。"""
+        key = self._composite_key_by_id.get(str(composite_id or ""))
+        return self.node_library.get(key) if key is not None else None
+
+    def get_composite_key(self, composite_id: str) -> Optional[str]:
+        key = self._composite_key_by_id.get(str(composite_id or ""))
+        return str(key) if key is not None else None
+
+    def get_by_category_title(self, category: str, title: str) -> Optional[NodeDef]:
+        key = self._key_by_category_title.get((str(category or ""), str(title or "")))
+        return self.node_library.get(key) if key is not None else None
+
+    def get_derived(self, key: Hashable, build: Callable[[], T]) -> T:
+        """返回按 key 记忆的派生结构（首次调用时构建）；调用方必须把返回值视为只读。"""
+        value = self._derived.get(key, _MISSING)
+        if value is _MISSING:
+            value = self._derived.setdefault(key, build())
+        return value
+
+
+_cache_lock = threading.Lock()
+_cached_indexes: "OrderedDict[int, NodeDefIndex]" = OrderedDict()
+
+
+def get_node_def_index(node_library: Mapping[str, NodeDef]) -> NodeDefIndex:
+    """获取节点库对象对应的共享索引（按对象身份缓存，LRU 保留最近使用的少量节点库）。"""
+    cache_key = id(node_library)
+    with _cache_lock:
+        index = _cached_indexes.get(cache_key)
+        if index is not None and index.is_current_for(node_library):
+            _cached_indexes.move_to_end(cache_key)
+            return index
+    index = NodeDefIndex(node_library)
+    with _cache_lock:
+        _cached_indexes[cache_key] = index
+        _cached_indexes.move_to_end(cache_key)
+        while len(_cached_indexes) > _MAX_CACHED_INDEXES:
+            _cached_indexes.popitem(last=False)
+    return index
+
+
+def invalidate_node_def_index(node_library: Optional[Mapping[str, NodeDef]] = None) -> None:
+    """丢弃指定节点库（或全部）的索引；节点库原地增删条目后由调用方显式调用。"""
+    with _cache_lock:
+        if node_library is None:
+            _cached_indexes.clear()
+            return
+        index = _cached_indexes.get(id(node_library))
+        if index is not None and index.node_library is node_library:
+            _cached_indexes.pop(id(node_library), None)
+
+
+__all__ = [
+    "NodeDefIndex",
+    "get_node_def_index",
+    "invalidate_node_def_index",
+]
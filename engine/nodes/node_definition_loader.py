@@ -208,10 +208,12 @@ def find_composite_node_def(library: Dict[str, NodeDef],
     """
     # 方式1：通过 composite_id 精确查找（推荐）
     if composite_id:
-        for node_key, node_def in library.items():
-            if (hasattr(node_def, 'is_composite') and node_def.is_composite and 
-                hasattr(node_def, 'composite_id') and node_def.composite_id == composite_id):
-                return (node_key, node_def)
+        from .node_def_index import get_node_def_index
+
+        composite_index = get_node_def_index(library)
+        composite_key = composite_index.get_composite_key(composite_id)
+        if composite_key is not None:
+            return (composite_key, library[composite_key])
     
     # 方式2：通过名称查找（兼容性回退）
     if node_name:
@@ -0,0 +1,293 @@
+"""节点库持久化缓存（紧凑二进制格式 + 懒物化）。
+
+格式（pickle protocol 5）：
+- schema_version：缓存布局版本；
+- field_names：写入时 NodeDef 的字段顺序（NodeDef 增删字段后旧缓存整体失效）；
+- node_defs_fp：节点库指纹；
+- keys：全部键（含别名）的原始顺序；
+- rows：canonical key -> 字段值元组（每个 NodeDef 只存一份）；
+- aliases：别名注入键 -> canonical key（与全量加载时“多个 key 共享同一 NodeDef 实例”的口径一致）。
+
+读取时不立即构建 NodeDef：`LazyNodeDefLibrary` 仅在首次按键访问时物化对应条目；
+整库遍历（items/values/复制）时一次性物化全部条目。
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+import threading
+from dataclasses import fields
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .node_definition_loader import NodeDef
+
+NODE_LIBRARY_CACHE_FILE_NAME = "node_library.pickle"
+_NODE_LIBRARY_CACHE_SCHEMA_VERSION = 1
+
+
+def _node_def_field_names() -> Tuple[str, ...]:
+    return tuple(f.name for f in fields(NodeDef))
+
+
+class _PendingNodeDef:
+    """占位：尚未物化的条目，记录其 canonical key。"""
+
+    __slots__ = ("canonical_key",)
+
+    def __init__(self, canonical_key: str) -> None:
+        self.canonical_key = canonical_key
+
+
+class LazyNodeDefLibrary(dict):
+    """按需物化 NodeDef 的节点库字典。
+
+    说明：
+    - 仍为 dict 子类：调用方的 `isinstance(library, dict)` 判定、`in`/len/keys 语义保持不变；
+    - 单键访问（`[]`/get/pop/setdefault）只物化该 canonical 条目，并回填到其全部别名键（共享同一实例）；
+    - 需要值的整库操作（items/values/copy/比较/序列化）先物化全部条目，再走原生 dict 实现；
+    - 覆写 `__iter__` 使 `dict(lib)` / `{**lib}` 走 keys()+__getitem__ 路径，不会泄漏占位对象。
+    """
+
+    def __init__(
+        self,
+        keys: List[str],
+        rows: Dict[str, tuple],
+        aliases: Dict[str, str],
+        field_names: Tuple[str, ...],
+    ) -> None:
+        super().__init__()
+        self._rows: Dict[str, tuple] = dict(rows)
+        self._field_names: Tuple[str, ...] = field_names
+        self._alias_keys_by_canonical: Dict[str, List[str]] = {}
+        self._materialize_lock = threading.Lock()
+        # 按原节点库的键顺序填充占位，保持“先到先得”类遍历语义不变
+        for key in keys:
+            canonical_key = aliases.get(key, key)
+            if canonical_key not in self._rows:
+                continue
+            dict.__setitem__(self, key, _PendingNodeDef(canonical_key))
+            if canonical_key != key:
+                self._alias_keys_by_canonical.setdefault(canonical_key, []).append(key)
+
+    # ------------------------ 物化 ------------------------
+    def _materialize(self, pending: _PendingNodeDef) -> NodeDef:
+        canonical_key = pending.canonical_key
+        with self._materialize_lock:
+            current = dict.get(self, canonical_key)
+            if isinstance(current, NodeDef):
+                return current
+            row = self._rows.pop(canonical_key)
+            node_def = NodeDef(**dict(zip(self._field_names, row)))
+            if not str(node_def.canonical_key or "").strip():
+                node_def.canonical_key = canonical_key
+            for key in [canonical_key, *self._alias_keys_by_canonical.pop(canonical_key, [])]:
+                if isinstance(dict.get(self, key), _PendingNodeDef):
+                    dict.__setitem__(self, key, node_def)
+            return node_def
+
+    def _resolve(self, key: Any, value: Any) -> Any:
+        if isinstance(value, _PendingNodeDef):
+            node_def = self._materialize(value)
+            # 别名键若已被调用方覆盖为其它对象，以覆盖值为准
+            current = dict.get(self, key)
+            return node_def if isinstance(current, _PendingNodeDef) or current is node_def else current
+        return value
+
+    def materialize_all(self) -> None:
+        """物化全部条目（整库遍历前调用）。"""
+        if not self._rows:
+            return
+        for key, value in list(dict.items(self)):
+            if isinstance(value, _PendingNodeDef):
+                self._resolve(key, value)
+
+    def iter_field_values(self, field_names: Tuple[str, ...]) -> Iterator[Tuple[Any, tuple]]:
+        """按键顺序产出 (key, 指定字段值元组)；未物化条目直接读缓存行，不触发物化。"""
+        positions = [self._field_names.index(name) for name in field_names]
+        for key, value in list(dict.items(self)):
+            if isinstance(value, _PendingNodeDef):
+                row = self._rows.get(value.canonical_key)
+                if row is not None:
+                    yield key, tuple(row[position] for position in positions)
+                    continue
+                value = self._resolve(key, value)
+            yield key, tuple(getattr(value, name, None) for name in field_names)
+
+    @property
+    def pending_count(self) -> int:
+        """尚未物化的 canonical 条目数（用于诊断/测试）。"""
+        return len(self._rows)
+
+    # ------------------------ 单键访问 ------------------------
+    def __getitem__(self, key: Any) -> Any:
+        return self._resolve(key, dict.__getitem__(self, key))
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        value = dict.get(self, key, _MISSING)
+        if value is _MISSING:
+            return default
+        return self._resolve(key, value)
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        if key in self:
+            return self[key]
+        dict.__setitem__(self, key, default)
+        return default
+
+    def pop(self, key: Any, *args: Any) -> Any:
+        if key in self:
+            value = self[key]
+            dict.pop(self, key)
+            return value
+        return dict.pop(self, key, *args)
+
+    def popitem(self) -> Tuple[Any, Any]:
+        key, value = dict.popitem(self)
+        if isinstance(value, _PendingNodeDef):
+            # 先放回再物化，保证 canonical 条目与别名键一致回填
+            dict.__setitem__(self, key, value)
+            value = self[key]
+            dict.pop(self, key)
+        return key, value
+
+    # ------------------------ 整库访问 ------------------------
+    def __iter__(self) -> Iterator[Any]:
+        return dict.__iter__(self)
+
+    def items(self):  # type: ignore[override]
+        self.materialize_all()
+        return dict.items(self)
+
+    def values(self):  # type: ignore[override]
+        self.materialize_all()
+        return dict.values(self)
+
+    def copy(self) -> Dict[str, NodeDef]:
+        self.materialize_all()
+        return dict(dict.items(self))
+
+    def __eq__(self, other: object) -> bool:
+        self.materialize_all()
+        if isinstance(other, LazyNodeDefLibrary):
+            other.materialize_all()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other: object) -> bool:
+        return not self.__eq__(other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __or__(self, other: Any) -> Dict[str, NodeDef]:
+        merged = self.copy()
+        merged.update(other)
+        return merged
+
+    def __ror__(self, other: Any) -> Dict[str, NodeDef]:
+        self.materialize_all()
+        merged = dict(other)
+        merged.update(dict.items(self))
+        return merged
+
+    def __repr__(self) -> str:
+        self.materialize_all()
+        return dict.__repr__(self)
+
+    def __reduce__(self):
+        # 跨进程传递/深拷贝时退化为普通 dict，避免序列化锁与占位对象
+        return (dict, (self.copy(),))
+
+
+_MISSING = object()
+
+
+def build_node_library_cache_payload(library: Dict[str, NodeDef], node_defs_fp: str) -> Dict[str, Any]:
+    """将节点库拆分为 canonical 行 + 别名表。
+
+    同一 NodeDef 实例被多个 key 引用时，仅以其 canonical_key（缺失时取首个出现的 key）存储一份。
+    """
+    field_names = _node_def_field_names()
+    rows: Dict[str, tuple] = {}
+    aliases: Dict[str, str] = {}
+    keys_by_object_id: Dict[int, List[str]] = {}
+    node_def_by_object_id: Dict[int, NodeDef] = {}
+    for key, node_def in library.items():
+        keys_by_object_id.setdefault(id(node_def), []).append(str(key))
+        node_def_by_object_id[id(node_def)] = node_def
+
+    for object_id, keys in keys_by_object_id.items():
+        node_def = node_def_by_object_id[object_id]
+        declared_canonical = str(getattr(node_def, "canonical_key", "") or "")
+        canonical_key = declared_canonical if declared_canonical in keys else keys[0]
+        rows[canonical_key] = tuple(getattr(node_def, name) for name in field_names)
+        for key in keys:
+            if key != canonical_key:
+                aliases[key] = canonical_key
+
+    return {
+        "schema_version": _NODE_LIBRARY_CACHE_SCHEMA_VERSION,
+        "field_names": field_names,
+        "node_defs_fp": node_defs_fp,
+        "keys": [str(key) for key in library.keys()],
+        "rows": rows,
+        "aliases": aliases,
+    }
+
+
+def save_node_library_cache(cache_file: Path, library: Dict[str, NodeDef], node_defs_fp: str) -> None:
+    """原子写：先写同目录唯一临时文件再 replace（并行校验时多个 worker 可能同时重建该缓存）。"""
+    payload = build_node_library_cache_payload(library, node_defs_fp)
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = cache_file.with_name(f".{cache_file.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp_file, "wb") as f:
+        pickle.dump(payload, f, protocol=5)
+    tmp_file.replace(cache_file)
+
+
+def load_node_library_cache(cache_file: Path) -> Optional[Dict[str, Any]]:
+    """读取缓存 payload；文件缺失或 schema/字段布局不匹配时返回 None（指纹由调用方比对）。"""
+    if not cache_file.is_file():
+        return None
+    with open(cache_file, "rb") as f:
+        payload = pickle.load(f)
+    if not isinstance(payload, dict):
+        return None
+    if payload.get("schema_version") != _NODE_LIBRARY_CACHE_SCHEMA_VERSION:
+        return None
+    if tuple(payload.get("field_names") or ()) != _node_def_field_names():
+        return None
+    if (
+        not isinstance(payload.get("keys"), list)
+        or not isinstance(payload.get("rows"), dict)
+        or not isinstance(payload.get("aliases"), dict)
+    ):
+        return None
+    return payload
+
+
+def payload_contains_composite(payload: Dict[str, Any]) -> bool:
+    """不物化 NodeDef，直接按字段位置判断缓存中是否含复合节点。"""
+    is_composite_index = tuple(payload["field_names"]).index("is_composite")
+    return any(bool(row[is_composite_index]) for row in payload["rows"].values())
+
+
+def build_lazy_node_library(payload: Dict[str, Any], *, include_composite: bool = True) -> LazyNodeDefLibrary:
+    """由缓存 payload 构建懒物化节点库；include_composite=False 时在行级别过滤复合节点。"""
+    field_names = tuple(payload["field_names"])
+    rows: Dict[str, tuple] = payload["rows"]
+    if not include_composite:
+        is_composite_index = field_names.index("is_composite")
+        rows = {key: row for key, row in rows.items() if not row[is_composite_index]}
+    return LazyNodeDefLibrary(payload["keys"], rows, payload["aliases"], field_names)
+
+
+__all__ = [
+    "NODE_LIBRARY_CACHE_FILE_NAME",
+    "LazyNodeDefLibrary",
+    "build_node_library_cache_payload",
+    "save_node_library_cache",
+    "load_node_library_cache",
+    "payload_contains_composite",
+    "build_lazy_node_library",
+]
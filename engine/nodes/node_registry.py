@@ -1,15 +1,21 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Dict, List, Set, Tuple, Optional
-from dataclasses import asdict
-import json
+from typing import Dict, List, Mapping, Set, Tuple, Optional
 import threading
 
 from .node_definition_loader import load_all_nodes, NodeDef
 from .port_type_system import BOOLEAN_TYPE_KEYWORDS
 from .pipeline.runner import run_pipeline
 from .pipeline.node_library import NodeLibrary
+from .node_def_index import NodeDefIndex, get_node_def_index, invalidate_node_def_index
+from .node_library_cache import (
+    NODE_LIBRARY_CACHE_FILE_NAME,
+    build_lazy_node_library,
+    load_node_library_cache,
+    payload_contains_composite,
+    save_node_library_cache,
+)
 from engine.utils.logging.logger import log_debug, log_info
 from engine.utils.graph.node_defs_fingerprint import compute_node_defs_fingerprint
 from engine.utils.cache.cache_paths import get_node_cache_dir
@@ -76,15 +82,10 @@ class NodeRegistry:
             # 先尝试从持久化缓存加载
             cached = self._load_persistent_node_library()
             if cached is not None:
-                if self.include_composite:
-                    self._library = cached
-                else:
-                    # include_composite=False 仅影响当前注册表实例的“视图”：
-                    # - 磁盘缓存始终保留全量节点库（含复合节点），避免破坏依赖复合节点解析的调用方；
-                    # - 当前实例按需过滤掉复合节点，满足“只看基础节点”的使用场景。
-                    self._library = {
-                        key: node_def for key, node_def in cached.items() if not getattr(node_def, "is_composite", False)
-                    }
+                # include_composite=False 仅影响当前注册表实例的“视图”：
+                # - 磁盘缓存始终保留全量节点库（含复合节点），避免破坏依赖复合节点解析的调用方；
+                # - 当前实例按需过滤掉复合节点（已在构建懒物化节点库时按行过滤），满足“只看基础节点”的使用场景。
+                self._library = cached
                 # 命中缓存时清理索引视图，按需懒构建
                 self._index_cache = None
                 self._node_library_view = None
@@ -150,41 +151,35 @@ class NodeRegistry:
         """
         return compute_node_defs_fingerprint(self.workspace_path)
 
+    def _get_persistent_node_library_file(self) -> Path:
+        return self._get_node_cache_dir() / NODE_LIBRARY_CACHE_FILE_NAME
+
     def _load_persistent_node_library(self) -> Optional[Dict[str, NodeDef]]:
-        """从磁盘持久化缓存加载节点库（命中且指纹一致时返回）。"""
-        cache_dir = self._get_node_cache_dir()
-        cache_file = cache_dir / "node_library.json"
+        """从磁盘持久化缓存加载节点库（命中且指纹一致时返回）。
+
+        返回懒物化节点库：NodeDef 仅在首次按键访问时构建（见 `node_library_cache`）。
+        """
+        cache_file = self._get_persistent_node_library_file()
         if not cache_file.exists():
             log_debug(f"[缓存][节点库] 未找到持久化缓存文件（{cache_file}），需要重建")
             return None
-        with open(cache_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        if "node_defs_fp" not in data or "items" not in data:
-            log_debug("[缓存][节点库] 缓存结构不完整，跳过使用并准备重建")
+        payload = load_node_library_cache(cache_file)
+        if payload is None:
+            log_debug("[缓存][节点库] 缓存结构版本不匹配或不完整，跳过使用并准备重建")
             return None
         current_fp = self._compute_node_defs_fingerprint()
-        if data.get("node_defs_fp") != current_fp:
-            old_fp = data.get("node_defs_fp", "<none>")
+        if payload.get("node_defs_fp") != current_fp:
+            old_fp = payload.get("node_defs_fp", "<none>")
             log_debug("[缓存][节点库] 指纹变更，缓存失效（旧: {} -> 新: {}），准备重建", str(old_fp)[:120], str(current_fp)[:120])
             return None
-        item_count = len(data.get("items", {}))
-        log_debug(f"[缓存][节点库] 命中持久化缓存，共 {item_count} 项，快速恢复中...")
-        raw_items: Dict[str, dict] = data["items"]
-        library: Dict[str, NodeDef] = {}
-        for key, item in raw_items.items():
-            library[key] = NodeDef(**item)
-            # 兼容：旧缓存/旧 schema 可能缺少 canonical_key（或为空）。
-            # 约定：canonical_key 必须指向“by_key 的标准键”，而不是别名键。
-            # 由于持久化缓存的 items 同时可能包含别名注入键（指向同一 NodeDef 对象的多条记录），
-            # 这里仅在缺失/为空时回填当前 key；若该对象后续通过其 canonical 条目被加载，会保持 canonical 值不被覆盖。
-            node_def = library[key]
-            if not str(getattr(node_def, "canonical_key", "") or "").strip():
-                node_def.canonical_key = str(key)
-
-        # 兜底：防止“基础库（不含复合）”误写入 node_library.json，导致共享复合节点无法被识别。
+        log_debug(
+            f"[缓存][节点库] 命中持久化缓存，共 {len(payload['keys'])} 项"
+            f"（{len(payload['rows'])} 个 canonical 定义），按需物化..."
+        )
+
+        # 兜底：防止“基础库（不含复合）”误写入节点库缓存，导致共享复合节点无法被识别。
         # 说明：GraphCodeParser 依赖节点库中存在复合节点 NodeDef 才能解析 `self.<复合实例>.<入口>(...)`。
-        has_any_composite = any(getattr(nd, "is_composite", False) for nd in library.values())
-        if not has_any_composite:
+        if not payload_contains_composite(payload):
             from engine.nodes.composite_file_policy import discover_composite_definition_files
 
             composite_files = discover_composite_definition_files(self.workspace_path)
@@ -194,26 +189,21 @@ class NodeRegistry:
                     len(composite_files),
                 )
                 return None
-        return library
+        return build_lazy_node_library(payload, include_composite=self.include_composite)
 
     def _save_persistent_node_library(self, library: Dict[str, NodeDef]) -> None:
-        """将当前节点库写入磁盘持久化缓存。"""
-        cache_dir = self._get_node_cache_dir()
-        cache_dir.mkdir(parents=True, exist_ok=True)
-        cache_file = cache_dir / "node_library.json"
+        """将当前节点库写入磁盘持久化缓存（canonical 定义只存一份 + 别名表，原子写）。"""
+        cache_file = self._get_persistent_node_library_file()
         fp = self._compute_node_defs_fingerprint()
         log_debug(f"[缓存][节点库] 写入持久化缓存：{cache_file}（{len(library)} 项，指纹={fp}）")
-        payload = {
-            "node_defs_fp": fp,
-            "items": {k: asdict(v) for k, v in library.items()},
-        }
-        with open(cache_file, "w", encoding="utf-8") as f:
-            json.dump(payload, f, ensure_ascii=False, indent=2)
+        save_node_library_cache(cache_file, library, fp)
         log_debug("[缓存][节点库] 写入完成")
 
     # ------------------------ 对外API ------------------------
     def refresh(self) -> None:
         """强制重载节点库与派生索引。"""
+        if self._library is not None:
+            invalidate_node_def_index(self._library)
         self._library = None
         self._flow_node_names = None
         self._boolean_node_names = None
@@ -247,6 +237,24 @@ class NodeRegistry:
         node_library = self.get_library()
         return node_library.get(str(key))
 
+    def get_node_def_index(self) -> NodeDefIndex:
+        """返回当前节点库的共享查找索引（composite_id / (类别, 名称) → NodeDef）。"""
+        return get_node_def_index(self.get_library())
+
+    def get_node_name_index(self, scope: Optional[str] = None) -> Mapping[str, str]:
+        """返回当前节点库按 scope 记忆化的只读节点名索引（refresh 或节点库替换后重建）。"""
+        from engine.graph.common import get_node_name_index
+
+        return get_node_name_index(self.get_library(), scope=scope)
+
+    def get_node_by_composite_id(self, composite_id: str) -> Optional[NodeDef]:
+        """按 composite_id 精确获取复合节点定义。"""
+        return self.get_node_def_index().get_composite(composite_id)
+
+    def get_node_by_category_title(self, category: str, title: str) -> Optional[NodeDef]:
+        """按 NodeDef 自身的 (类别, 名称) 获取节点定义（多作用域变体取节点库顺序中的第一个）。"""
+        return self.get_node_def_index().get_by_category_title(category, title)
+
     def get_node_by_alias(self, category: str, name_or_alias: str) -> Optional[NodeDef]:
         """
         按别名或名称获取节点定义。
@@ -2,12 +2,14 @@ from __future__ import annotations
 
 # V2 节点加载管线
 # 分层：discovery → extractor_ast → normalizer → validator → merger → indexer → lookup → node_library
+# spec_cache：extractor_ast + normalizer 的按文件增量缓存（runner 使用）
 # 已由实现加载器在开关启用时走“只解析不导入”的快速路径
 
 __all__ = [
     "discovery",
     "extractor_ast",
     "normalizer",
+    "spec_cache",
     "validator",
     "merger",
     "indexer",
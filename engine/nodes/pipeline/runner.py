@@ -4,8 +4,7 @@ from pathlib import Path
 from typing import Any, Dict
 
 from .discovery import discover_implementation_files
-from .extractor_ast import extract_specs
-from .normalizer import normalize_specs
+from .spec_cache import extract_normalized_specs_incremental
 from .validator import validate_specs
 from .merger import merge_specs
 from .indexer import build_index
@@ -24,10 +23,8 @@ def run_pipeline(workspace_path: Path) -> Dict[str, Any]:
 
     # 1) 发现实现文件
     files = discover_implementation_files(workspace_path)
-    # 2) AST 提取（不导入模块）
-    extracted = extract_specs(files)
-    # 3) 标准化
-    normalized = normalize_specs(extracted)
+    # 2) AST 提取（不导入模块）+ 3) 标准化：按实现文件增量缓存，仅重新提取变化的文件
+    normalized = extract_normalized_specs_incremental(files, workspace_path)
     # 4) 校验（阻断式）
     validated = validate_specs(normalized)
     # 5) 合并（server 优先，端口不兼容→作用域变体）
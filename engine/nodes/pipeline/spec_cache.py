@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import copy
+import hashlib
+import os
+import pickle
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from .extractor_ast import extract_specs
+from .normalizer import normalize_specs
+from .types import NormalizedSpec
+
+# 缓存结构版本：NormalizedSpec 字段或缓存布局变化时递增，旧缓存整体失效。
+_SPEC_CACHE_SCHEMA_VERSION = 1
+_SPEC_CACHE_FILE_NAME = "node_spec_extract_cache.pickle"
+# 未命中文件数达到该阈值才启用多进程提取（进程启动本身有固定开销，少量文件串行更快）。
+_PARALLEL_EXTRACT_MIN_FILES = 48
+
+# 参与“提取器签名”的源码模块：提取/标准化逻辑变化时，所有按文件缓存的产物都必须失效。
+_EXTRACTOR_SOURCE_FILES = ("extractor_ast.py", "normalizer.py", "types.py", "node_spec_ast_utils.py")
+
+
+@dataclass
+class _FileSpecEntry:
+    mtime_ns: int
+    size: int
+    content_sha1: str
+    specs: List[NormalizedSpec] = field(default_factory=list)
+
+
+@dataclass
+class _SpecCacheState:
+    extractor_signature: str
+    entries: Dict[str, _FileSpecEntry] = field(default_factory=dict)
+    dirty: bool = False
+
+
+_STATE_LOCK = threading.Lock()
+# 进程内缓存：cache_file -> 状态；避免同一进程多次 run_pipeline 时重复反序列化磁盘缓存。
+_STATE_BY_CACHE_FILE: Dict[str, _SpecCacheState] = {}
+
+
+def _compute_extractor_signature() -> str:
+    pipeline_dir = Path(__file__).resolve().parent
+    parts: List[str] = [str(_SPEC_CACHE_SCHEMA_VERSION)]
+    for name in _EXTRACTOR_SOURCE_FILES:
+        source_file = pipeline_dir / name
+        if not source_file.is_file():
+            # 冻结环境（PyInstaller）下源码不可见：实现随发行版固定，仅依赖 schema 版本。
+            parts.append(f"{name}:-")
+            continue
+        stat = source_file.stat()
+        parts.append(f"{name}:{int(stat.st_mtime_ns)}:{int(stat.st_size)}")
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+
+
+def _get_cache_file(workspace_path: Path) -> Path:
+    from engine.utils.cache.cache_paths import get_node_cache_dir
+
+    return get_node_cache_dir(workspace_path) / _SPEC_CACHE_FILE_NAME
+
+
+def _load_state(cache_file: Path, extractor_signature: str) -> _SpecCacheState:
+    key = str(cache_file)
+    state = _STATE_BY_CACHE_FILE.get(key)
+    if state is not None and state.extractor_signature == extractor_signature:
+        return state
+
+    state = _SpecCacheState(extractor_signature=extractor_signature)
+    if cache_file.is_file():
+        with open(cache_file, "rb") as f:
+            payload = pickle.load(f)
+        if (
+            isinstance(payload, dict)
+            and payload.get("schema_version") == _SPEC_CACHE_SCHEMA_VERSION
+            and payload.get("extractor_signature") == extractor_signature
+            and isinstance(payload.get("entries"), dict)
+        ):
+            state.entries = dict(payload["entries"])
+    _STATE_BY_CACHE_FILE[key] = state
+    return state
+
+
+def _save_state(cache_file: Path, state: _SpecCacheState) -> None:
+    """原子写：先写同目录唯一临时文件再 replace，避免并发进程读到半写入的缓存。"""
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "schema_version": _SPEC_CACHE_SCHEMA_VERSION,
+        "extractor_signature": state.extractor_signature,
+        "entries": state.entries,
+    }
+    tmp_file = cache_file.with_name(f".{cache_file.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp_file, "wb") as f:
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp_file.replace(cache_file)
+    state.dirty = False
+
+
+def _extract_normalized_specs_for_file(file_path: Path) -> Tuple[str, List[NormalizedSpec]]:
+    """单文件提取 + 标准化（进程池 worker 入口，需保持为模块级函数以便序列化）。"""
+    content_sha1 = hashlib.sha1(file_path.read_bytes()).hexdigest()
+    return content_sha1, normalize_specs(extract_specs([file_path]))
+
+
+def _extract_misses(misses: List[Path]) -> List[Tuple[str, List[NormalizedSpec]]]:
+    if len(misses) < _PARALLEL_EXTRACT_MIN_FILES or getattr(sys, "frozen", False):
+        return [_extract_normalized_specs_for_file(p) for p in misses]
+    max_workers = max(1, min(int(os.cpu_count() or 1), len(misses) // (_PARALLEL_EXTRACT_MIN_FILES // 4)))
+    if max_workers <= 1:
+        return [_extract_normalized_specs_for_file(p) for p in misses]
+    chunk_size = max(1, len(misses) // (max_workers * 4))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_extract_normalized_specs_for_file, misses, chunksize=chunk_size))
+
+
+def extract_normalized_specs_incremental(file_paths: List[Path], workspace_path: Path) -> List[NormalizedSpec]:
+    """按实现文件增量提取并标准化节点规范（等价于 `normalize_specs(extract_specs(file_paths))`）。
+
+    缓存口径：
+    - 每个实现文件一条缓存，键为 路径 + mtime + size + 内容哈希；
+    - mtime/size 一致直接命中；不一致时比对内容哈希（仅 touch 未改内容的文件仍命中）；
+    - 提取器/标准化器源码变化时整体失效；
+    - 未命中的文件数量较多时（冷启动）使用多进程并行提取；
+    - 输出顺序与 file_paths 一致，保证后续 merge_specs 的“先到先得”语义不变。
+    """
+    for p in file_paths:
+        if not isinstance(p, Path):
+            raise TypeError("file_paths 列表元素必须是 pathlib.Path 实例")
+
+    cache_file = _get_cache_file(workspace_path)
+    extractor_signature = _compute_extractor_signature()
+
+    with _STATE_LOCK:
+        state = _load_state(cache_file, extractor_signature)
+
+        existing_files: List[Path] = []
+        stats: Dict[str, Tuple[int, int]] = {}
+        misses: List[Path] = []
+        for file_path in file_paths:
+            if not file_path.exists():
+                continue
+            existing_files.append(file_path)
+            stat = file_path.stat()
+            file_state = (int(stat.st_mtime_ns), int(stat.st_size))
+            key = str(file_path)
+            stats[key] = file_state
+            entry = state.entries.get(key)
+            if entry is not None and (entry.mtime_ns, entry.size) == file_state:
+                continue
+            if entry is not None and entry.size == file_state[1]:
+                content_sha1 = hashlib.sha1(file_path.read_bytes()).hexdigest()
+                if content_sha1 == entry.content_sha1:
+                    entry.mtime_ns = file_state[0]
+                    state.dirty = True
+                    continue
+            misses.append(file_path)
+
+        if misses:
+            for file_path, (content_sha1, specs) in zip(misses, _extract_misses(misses)):
+                mtime_ns, size = stats[str(file_path)]
+                state.entries[str(file_path)] = _FileSpecEntry(
+                    mtime_ns=mtime_ns,
+                    size=size,
+                    content_sha1=content_sha1,
+                    specs=specs,
+                )
+            state.dirty = True
+
+        stale_keys = [key for key in state.entries if key not in stats and not Path(key).exists()]
+        for key in stale_keys:
+            state.entries.pop(key, None)
+            state.dirty = True
+
+        if state.dirty:
+            _save_state(cache_file, state)
+
+        # 浅拷贝：validator 会就地回写规范化后的字段，不应污染进程内缓存条目。
+        result: List[NormalizedSpec] = []
+        for file_path in existing_files:
+            result.extend(copy.copy(spec) for spec in state.entries[str(file_path)].specs)
+        return result
+
+
+def invalidate_node_spec_cache_in_memory() -> None:
+    """清空进程内缓存（磁盘缓存保留，下次调用按文件状态重新校验）。"""
+    with _STATE_LOCK:
+        _STATE_BY_CACHE_FILE.clear()
+
+
+__all__ = [
+    "extract_normalized_specs_incremental",
+    "invalidate_node_spec_cache_in_memory",
+]
@@ -17,6 +17,7 @@ from engine.graph.semantic import GraphSemanticPass
 from engine.layout import LayoutService
 from engine.layout.utils.augmented_layout_merge import apply_augmented_layout_merge
 from engine.nodes.node_registry import get_node_registry
+from engine.nodes.node_def_index import get_node_def_index
 from engine.utils.logging.logger import log_error, log_info
 
 from .graph_cache_facade import GraphCacheFacade
@@ -175,9 +176,11 @@ class GraphLoader:
 
             registry = get_node_registry(self._workspace_path, include_composite=True)
             node_library = registry.get_library()
+            # 资源层解析器随加载器常驻：文件监听触发的重解析只重建改动过的事件方法
             self._graph_parser = GraphCodeParser(
                 self._workspace_path,
                 node_library=node_library,
+                incremental=True,
             )
             self._graph_parser_active_package_id = current_active_package_id
         return self._graph_parser
@@ -338,7 +341,6 @@ class GraphLoader:
         - 当声明为泛型家族时，结合输入常量与连线做尽力推断；
         - 无法推断时回退到节点定义的声明/动态类型（通常为“泛型/泛型字典/泛型列表”等）。
         """
-        from engine.graph.common import node_name_index_from_library
         from engine.nodes.node_definition_loader import find_composite_node_def
         from engine.graph.port_type_effective_resolver import (
             apply_effective_port_type_snapshots,
@@ -396,13 +398,7 @@ class GraphLoader:
                 if node_def is None:
                     raise KeyError(f"node_library 中未找到 builtin NodeDef：{key}（node_id={node_id}）")
             elif kind == "composite":
-                node_def = None
-                for _, candidate in node_library.items():
-                    if not getattr(candidate, "is_composite", False):
-                        continue
-                    if str(getattr(candidate, "composite_id", "") or "") == key:
-                        node_def = candidate
-                        break
+                node_def = get_node_def_index(node_library).get_composite(key)
                 if node_def is None:
                     raise KeyError(f"node_library 中未找到 composite NodeDef（composite_id={key}，node_id={node_id}）")
             elif kind == "event":
@@ -160,6 +160,8 @@ class DeleteNodeModelCommand(Command):
         # 删除相关连线
         for edge_id, _ in self.related_edges:
             self.model.edges.pop(edge_id, None)
+        if self.related_edges:
+            self.model.touch_edges_revision()
         # 删除节点
         self.model.nodes.pop(self.node_id, None)
 
@@ -170,6 +172,8 @@ class DeleteNodeModelCommand(Command):
         # 恢复连线
         for edge_id, edge in self.related_edges:
             self.model.edges[edge_id] = edge
+        if self.related_edges:
+            self.model.touch_edges_revision()
 
 
 class AddEdgeModelCommand(Command):
@@ -201,10 +205,12 @@ class AddEdgeModelCommand(Command):
             dst_port=self.dst_port,
         )
         self.model.edges[self.edge_id] = edge
+        self.model.touch_edges_revision()
         self.edge = edge
 
     def undo(self) -> None:
         self.model.edges.pop(self.edge_id, None)
+        self.model.touch_edges_revision()
         self.edge = None
 
 
@@ -218,10 +224,12 @@ class DeleteEdgeModelCommand(Command):
 
     def execute(self) -> None:
         self.edge = self.model.edges.pop(self.edge_id, None)
+        self.model.touch_edges_revision()
 
     def undo(self) -> None:
         if self.edge is not None:
             self.model.edges[self.edge_id] = self.edge
+            self.model.touch_edges_revision()
 
 
 class MoveNodeModelCommand(Command):
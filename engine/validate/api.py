@@ -10,6 +10,7 @@ from .config import DEFAULT_CONFIG, merge_config, apply_exemptions
 from .validation_cache import (
     build_rules_hash,
     load_validation_cache,
+    normalize_validation_cache_file_key,
     save_validation_cache,
     try_load_cached_issues_for_file,
     update_validation_cache_for_file,
@@ -235,77 +236,117 @@ def _build_rules(config: Dict[str, Any], *, is_composite: bool) -> List[Validati
     return rules
 
 
+class GraphFileValidator:
+    """预构建配置、规则流水线的节点图校验器。
+
+    - `validate_files` 每次调用新建一个实例；
+    - 常驻场景（validate-graphs --watch）持有同一实例跨轮复用，一次校验一组文件（一次缓存读写），
+      节点索引缓存只在作用域刷新后由调用方显式清理（`clear_node_index_caches`）。
+    """
+
+    def __init__(self, workspace: Path, *, strict_entity_wire_only: bool = False) -> None:
+        self.workspace = workspace
+        self.config = merge_config(
+            DEFAULT_CONFIG,
+            {"STRICT_ENTITY_INPUTS_WIRE_ONLY": bool(strict_entity_wire_only)},
+        )
+        self._composite_rules = _build_rules(self.config, is_composite=True)
+        self._standard_rules = _build_rules(self.config, is_composite=False)
+        self._composite_pipeline = ValidationPipeline(rules=self._composite_rules)
+        self._standard_pipeline = ValidationPipeline(rules=self._standard_rules)
+
+    def validate_each(
+        self,
+        paths: Iterable[Path],
+        *,
+        use_cache: bool = True,
+        cache_updates: Dict[str, Any] | None = None,
+    ) -> List[Tuple[Path, List[EngineIssue]]]:
+        """按输入顺序返回 [(文件, 该文件的问题列表)]；缓存口径与 `validate_files` 一致。"""
+        workspace = self.workspace
+        paths_list = list(paths)
+        results: List[Tuple[Path, List[EngineIssue]]] = []
+
+        cache_data: Dict[str, Any] = {}
+        rules_hash = ""
+        if use_cache:
+            cache_data = load_validation_cache(workspace)
+            rules_hash = build_rules_hash(
+                self.config,
+                self._standard_rules,
+                self._composite_rules,
+                workspace=workspace,
+            )
+        for file_path in paths_list:
+            if use_cache and rules_hash:
+                cached = try_load_cached_issues_for_file(
+                    workspace=workspace,
+                    file_path=file_path,
+                    cache=cache_data,
+                    current_rules_hash=rules_hash,
+                )
+                if cached is not None:
+                    results.append((file_path, list(cached)))
+                    continue
+            ctx = ValidationContext(
+                workspace_path=workspace,
+                file_path=file_path,
+                is_composite=_is_composite_file(file_path),
+                config=self.config,
+            )
+            pipeline = self._composite_pipeline if ctx.is_composite else self._standard_pipeline
+            produced = pipeline.run(ctx)
+            produced = apply_exemptions(produced, ctx, self.config)
+            results.append((file_path, list(produced)))
+            if use_cache and rules_hash:
+                update_validation_cache_for_file(
+                    workspace=workspace,
+                    file_path=file_path,
+                    cache=cache_data,
+                    current_rules_hash=rules_hash,
+                    issues=produced,
+                )
+        if use_cache and rules_hash:
+            if cache_updates is None:
+                save_validation_cache(workspace, cache_data)
+            else:
+                cache_updates["rules_hash"] = str(cache_data.get("rules_hash", ""))
+                updated_files = cache_updates.setdefault("files", {})
+                files_section = cache_data.get("files") or {}
+                for file_path in paths_list:
+                    key = normalize_validation_cache_file_key(file_path, workspace)
+                    if key in files_section:
+                        updated_files[key] = files_section[key]
+        return results
+
+
 def validate_files(
     paths: Iterable[Path],
     workspace: Path,
     strict_entity_wire_only: bool = False,
     use_cache: bool = True,
+    *,
+    cache_updates: Dict[str, Any] | None = None,
 ) -> ValidationReport:
     """验证一组节点图文件（类结构 + 复合节点）
 
     说明：
         - 这是节点图验证的统一底层入口，所有 CLI / UI / runtime 都应通过此函数间接调用验证引擎。
         - 接受任意可迭代的路径序列，内部会先收敛为列表，以便统计与二次遍历时行为一致。
+        - cache_updates：提供时缓存只读不落盘，本次更新的条目（rules_hash + files）写入该字典，
+          由调用方合并后统一落盘（并行校验的 worker 进程使用，避免多进程争写同一缓存文件）。
     """
     paths_list = list(paths)
     clear_node_index_caches()
-    override = {
-        "STRICT_ENTITY_INPUTS_WIRE_ONLY": bool(strict_entity_wire_only),
-    }
-    config = merge_config(DEFAULT_CONFIG, override)
-    issues: List[EngineIssue] = []
-    composite_rules = _build_rules(config, is_composite=True)
-    standard_rules = _build_rules(config, is_composite=False)
-    composite_pipeline = ValidationPipeline(rules=composite_rules)
-    standard_pipeline = ValidationPipeline(rules=standard_rules)
-
-    cache_data: Dict[str, Any] = {}
-    rules_hash = ""
-    if use_cache:
-        cache_data = load_validation_cache(workspace)
-        rules_hash = build_rules_hash(
-            config,
-            standard_rules,
-            composite_rules,
-            workspace=workspace,
-        )
-    for file_path in paths_list:
-        if use_cache and rules_hash:
-            cached = try_load_cached_issues_for_file(
-                workspace=workspace,
-                file_path=file_path,
-                cache=cache_data,
-                current_rules_hash=rules_hash,
-            )
-            if cached is not None:
-                issues.extend(cached)
-                continue
-        ctx = ValidationContext(
-            workspace_path=workspace,
-            file_path=file_path,
-            is_composite=_is_composite_file(file_path),
-            config=config,
-        )
-        pipeline = composite_pipeline if ctx.is_composite else standard_pipeline
-        produced = pipeline.run(ctx)
-        produced = apply_exemptions(produced, ctx, config)
-        issues.extend(produced)
-        if use_cache and rules_hash:
-            update_validation_cache_for_file(
-                workspace=workspace,
-                file_path=file_path,
-                cache=cache_data,
-                current_rules_hash=rules_hash,
-                issues=produced,
-            )
-    if use_cache and rules_hash:
-        save_validation_cache(workspace, cache_data)
+    validator = GraphFileValidator(workspace, strict_entity_wire_only=strict_entity_wire_only)
+    results = validator.validate_each(paths_list, use_cache=use_cache, cache_updates=cache_updates)
+    issues: List[EngineIssue] = [issue for _file_path, file_issues in results for issue in file_issues]
 
     stats = {
         "files": len(paths_list),
         "errors": len([i for i in issues if i.level == "error"]),
         "warnings": len([i for i in issues if i.level == "warning"]),
     }
-    return ValidationReport(issues=issues, stats=stats, config=config)
+    return ValidationReport(issues=issues, stats=stats, config=validator.config)
 
  
\ No newline at end of file
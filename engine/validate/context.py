@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple, TYPE_CHECKING
+from typing import Any, Dict, Optional, Set, Tuple, TYPE_CHECKING
 
 import ast
 
@@ -33,3 +33,7 @@ class ValidationContext:
     node_library: Dict[str, "NodeDef"] = field(default_factory=dict)
     verbose: bool = False
     ast_cache: Dict[Path, ast.AST] = field(default_factory=dict)
+    # ast_cache 中归本上下文私有（可就地改写）的文件：首次改写前从共享解析缓存克隆一次
+    ast_owned_files: Set[Path] = field(default_factory=set)
+    # 文件 -> GraphCodeAstIndex（随 ast_cache 中的树失效）
+    ast_index_cache: Dict[Path, Any] = field(default_factory=dict)
@@ -77,6 +77,30 @@ def add_validate_graphs_cli_args(parser: argparse.ArgumentParser) -> None:
         action="store_true",
         help="禁用复合节点结构校验（默认启用；用于对齐 UI 的“缺少数据来源/未连接”等检查）",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        dest="jobs",
+        type=int,
+        default=1,
+        help="并行校验的进程数（默认 1=串行；0=按 CPU 核数自动选择）。按项目存档作用域分组后分发到进程池，输出顺序与串行一致",
+    )
+    parser.add_argument(
+        "--watch",
+        dest="watch",
+        action="store_true",
+        help=(
+            "常驻校验模式：首轮校验后持续监控 assets/资源库，只重新校验变化的文件及其依赖方\n"
+            "（引用了变化的复合节点/信号/结构体的文件），结果以 JSON lines 输出到 stdout；Ctrl+C 退出。"
+        ),
+    )
+    parser.add_argument(
+        "--watch-interval",
+        dest="watch_interval",
+        type=float,
+        default=0.5,
+        help="--watch 模式下的文件轮询间隔（秒，默认 0.5）",
+    )
     parser.add_argument(
         "--json",
         dest="output_json",
@@ -121,6 +145,42 @@ def _resolve_targets_or_print_errors(
     return list(resolution.targets)
 
 
+def _run_validate_graphs_watch(
+    parsed_args: argparse.Namespace,
+    workspace_root: Path,
+    targets: List[Path],
+) -> int:
+    """--watch：常驻进程增量校验，每轮结果输出为一行 JSON。"""
+    from engine.validate.graph_validation_watch import GraphValidationWatcher
+
+    if bool(getattr(parsed_args, "apply_fixes", False)) or bool(getattr(parsed_args, "fix_dry_run", False)):
+        print("[ERROR] --watch 与 --fix/--fix-dry-run 不兼容。")
+        return 1
+    if int(getattr(parsed_args, "jobs", 1)) != 1:
+        print("[ERROR] --watch 在常驻进程内增量校验，不支持 --jobs。")
+        return 1
+
+    watcher = GraphValidationWatcher(
+        targets,
+        workspace_root,
+        options=ValidateGraphsOrchestrationOptions(
+            strict_entity_wire_only=bool(getattr(parsed_args, "strict_entity_wire_only", False)),
+            use_cache=bool(not getattr(parsed_args, "disable_cache", False)),
+            enable_composite_struct_check=bool(not getattr(parsed_args, "disable_composite_struct_check", False)),
+        ),
+    )
+
+    def _emit_json_line(event: dict) -> None:
+        # 与 --json 一致：ensure_ascii=True 保证跨编码环境可解析；每行立即 flush 供管道消费方实时读取。
+        print(json.dumps(event, ensure_ascii=True), flush=True)
+
+    try:
+        watcher.run_forever(_emit_json_line, interval_seconds=float(getattr(parsed_args, "watch_interval", 0.5)))
+    except KeyboardInterrupt:
+        _emit_json_line({"type": "stopped"})
+    return 0
+
+
 def run_validate_graphs_cli(
     parsed_args: argparse.Namespace,
     workspace_root: Path,
@@ -143,6 +203,9 @@ def run_validate_graphs_cli(
     if targets is None:
         return 1
 
+    if bool(getattr(parsed_args, "watch", False)):
+        return _run_validate_graphs_watch(parsed_args, workspace_root, targets)
+
     mode_desc = "STRICT" if bool(getattr(parsed_args, "strict_entity_wire_only", False)) else "DEFAULT"
 
     output_json = bool(getattr(parsed_args, "output_json", False))
@@ -188,6 +251,7 @@ def run_validate_graphs_cli(
         strict_entity_wire_only=bool(getattr(parsed_args, "strict_entity_wire_only", False)),
         use_cache=bool(not getattr(parsed_args, "disable_cache", False)),
         enable_composite_struct_check=bool(not getattr(parsed_args, "disable_composite_struct_check", False)),
+        jobs=int(getattr(parsed_args, "jobs", 1)),
     )
     all_issues: List[EngineIssue] = collect_validate_graphs_engine_issues(
         targets,
@@ -6,6 +6,9 @@ validate-graphs 的编排层（引擎侧可复用）。
 职责定位：
 - 组合 `engine.validate.validate_files(...)` 的基础校验结果；
 - 按需叠加：复合节点结构校验（UI 同款“缺少数据来源/未连接”等）；
+- 可选并行（options.jobs > 1）：按项目存档作用域把文件切成工作单元，分发到进程池执行；
+  每个 worker 进程保持自己的作用域与已预热的 NodeRegistry/Schema 视图，结果按单元顺序合并，
+  与串行模式产出相同的 EngineIssue 顺序；校验缓存由主进程统一合并落盘。
 
 边界：
 - 本模块只返回 `EngineIssue` 列表，不做任何输出；
@@ -13,9 +16,11 @@ validate-graphs 的编排层（引擎侧可复用）。
 - 作为“编排层”允许依赖 `engine.validate.*` 与 `engine.nodes.*` 的公共入口。
 """
 
+import os
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Sequence, Tuple
+from typing import Any, Dict, List, Sequence, Tuple
 
 from engine.validate.api import validate_files
 from engine.validate.composite_structural_checks import collect_composite_structural_issues
@@ -24,6 +29,8 @@ from engine.validate.issue import EngineIssue
 __all__ = [
     "ValidateGraphsOrchestrationOptions",
     "collect_validate_graphs_engine_issues",
+    "ensure_validate_graphs_scope_applied",
+    "group_targets_by_package_scope",
 ]
 
 
@@ -32,86 +39,227 @@ class ValidateGraphsOrchestrationOptions:
     strict_entity_wire_only: bool = False
     use_cache: bool = True
     enable_composite_struct_check: bool = True
+    # 并行进程数：1=串行（默认，进程内执行）；<=0=按 CPU 核数自动选择。
+    jobs: int = 1
 
 
-def collect_validate_graphs_engine_issues(
-    targets: Sequence[Path],
-    workspace_root: Path,
-    *,
-    options: ValidateGraphsOrchestrationOptions,
-) -> List[EngineIssue]:
-    """统一产出 validate-graphs 的 EngineIssue 列表（供 app-cli/UI 复用）。"""
+# 单个并行工作单元的最大文件数：同一作用域的大分组会被切成多个单元，以便多个 worker 分担。
+_PARALLEL_UNIT_MAX_FILES = 32
 
-    def _infer_active_package_id_for_file(file_path: Path) -> str | None:
-        """根据文件路径推断其所属项目存档作用域（None=共享根）。"""
-        from engine.utils.resource_library_layout import (
-            PROJECT_ARCHIVE_LIBRARY_DIRNAME,
-            SHARED_LIBRARY_DIRNAME,
-            find_containing_resource_root,
-        )
+# 本进程当前已应用的校验作用域（哨兵值表示尚未应用任何作用域）。
+_UNSET_SCOPE = object()
+_APPLIED_SCOPE: Any = _UNSET_SCOPE
 
-        resource_library_root = (workspace_root / "assets" / "资源库").resolve()
-        resolved_file = file_path.resolve()
-        resource_root = find_containing_resource_root(resource_library_root, resolved_file)
-        if resource_root is None:
-            return None
-        if resource_root.name == SHARED_LIBRARY_DIRNAME:
-            return None
-        if resource_root.parent.name == PROJECT_ARCHIVE_LIBRARY_DIRNAME:
-            return resource_root.name
+
+def _infer_active_package_id_for_file(file_path: Path, workspace_root: Path) -> str | None:
+    """根据文件路径推断其所属项目存档作用域（None=共享根）。"""
+    from engine.utils.resource_library_layout import (
+        PROJECT_ARCHIVE_LIBRARY_DIRNAME,
+        SHARED_LIBRARY_DIRNAME,
+        find_containing_resource_root,
+    )
+
+    resource_library_root = (workspace_root / "assets" / "资源库").resolve()
+    resolved_file = file_path.resolve()
+    resource_root = find_containing_resource_root(resource_library_root, resolved_file)
+    if resource_root is None:
         return None
+    if resource_root.name == SHARED_LIBRARY_DIRNAME:
+        return None
+    if resource_root.parent.name == PROJECT_ARCHIVE_LIBRARY_DIRNAME:
+        return resource_root.name
+    return None
 
-    def _apply_scope_and_refresh_node_library(active_package_id: str | None) -> None:
-        """应用当前作用域（共享 / 共享+存档）并刷新节点库/Schema 缓存。
 
-        注意：validate-graphs 可能一次校验多个项目存档的文件；必须按文件所属存档切换作用域，
-        否则复合节点、结构体/信号/关卡变量等代码级定义会串包，导致误报或漏报。
-        """
-        from engine.utils.runtime_scope import set_active_package_id as set_runtime_active_package_id
+def _apply_scope_and_refresh_node_library(active_package_id: str | None, workspace_root: Path) -> None:
+    """应用当前作用域（共享 / 共享+存档）并刷新节点库/Schema 缓存。
 
-        from engine.resources.definition_schema_view import (
-            set_default_definition_schema_view_active_package_id,
-        )
-        from engine.resources.level_variable_schema_view import (
-            set_default_level_variable_schema_view_active_package_id,
-        )
-        from engine.resources.ingame_save_template_schema_view import (
-            set_default_ingame_save_template_schema_view_active_package_id,
-        )
-        from engine.signal import invalidate_default_signal_repository_cache
-        from engine.struct import invalidate_default_struct_repository_cache
+    注意：validate-graphs 可能一次校验多个项目存档的文件；必须按文件所属存档切换作用域，
+    否则复合节点、结构体/信号/关卡变量等代码级定义会串包，导致误报或漏报。
+    """
+    from engine.utils.runtime_scope import set_active_package_id as set_runtime_active_package_id
 
-        set_runtime_active_package_id(active_package_id)
-        set_default_definition_schema_view_active_package_id(active_package_id)
-        set_default_level_variable_schema_view_active_package_id(active_package_id)
-        set_default_ingame_save_template_schema_view_active_package_id(active_package_id)
-        invalidate_default_signal_repository_cache()
-        invalidate_default_struct_repository_cache()
+    from engine.resources.definition_schema_view import (
+        set_default_definition_schema_view_active_package_id,
+    )
+    from engine.resources.level_variable_schema_view import (
+        set_default_level_variable_schema_view_active_package_id,
+    )
+    from engine.resources.ingame_save_template_schema_view import (
+        set_default_ingame_save_template_schema_view_active_package_id,
+    )
+    from engine.signal import invalidate_default_signal_repository_cache
+    from engine.struct import invalidate_default_struct_repository_cache
 
-        # NodeRegistry 需要显式 refresh 才会按新作用域重建复合节点集合。
-        from engine.nodes.node_registry import get_node_registry
+    set_runtime_active_package_id(active_package_id)
+    set_default_definition_schema_view_active_package_id(active_package_id)
+    set_default_level_variable_schema_view_active_package_id(active_package_id)
+    set_default_ingame_save_template_schema_view_active_package_id(active_package_id)
+    invalidate_default_signal_repository_cache()
+    invalidate_default_struct_repository_cache()
 
-        registry = get_node_registry(workspace_root, include_composite=True)
-        registry.refresh()
+    # NodeRegistry 需要显式 refresh 才会按新作用域重建复合节点集合。
+    from engine.nodes.node_registry import get_node_registry
 
-    # --- 1) 分组：按文件所属项目存档作用域分别执行 validate_files / composite_struct_check ---
-    files = list(targets or [])
+    registry = get_node_registry(workspace_root, include_composite=True)
+    registry.refresh()
+
+
+def ensure_validate_graphs_scope_applied(
+    active_package_id: str | None,
+    workspace_root: Path,
+    *,
+    force_refresh: bool = True,
+) -> None:
+    """确保本进程已应用指定作用域。
+
+    - force_refresh=True：无条件切换作用域并 refresh 节点库（一次性校验的默认口径）；
+    - force_refresh=False：作用域未变化时复用已预热的节点库/Schema 视图（并行 worker 与常驻校验使用）。
+    """
+    global _APPLIED_SCOPE
+    if (not force_refresh) and _APPLIED_SCOPE is not _UNSET_SCOPE and _APPLIED_SCOPE == active_package_id:
+        return
+    _apply_scope_and_refresh_node_library(active_package_id, workspace_root)
+    _APPLIED_SCOPE = active_package_id
+
+
+def group_targets_by_package_scope(
+    targets: Sequence[Path],
+    workspace_root: Path,
+) -> List[Tuple[str | None, List[Path]]]:
+    """按文件所属项目存档作用域分组，并返回稳定顺序（共享根在前，其余存档按名称排序）。"""
     grouped: Dict[str | None, List[Path]] = {}
-    for file_path in files:
-        group_key = _infer_active_package_id_for_file(file_path) if isinstance(file_path, Path) else None
+    for file_path in list(targets or []):
+        group_key = (
+            _infer_active_package_id_for_file(file_path, workspace_root) if isinstance(file_path, Path) else None
+        )
         grouped.setdefault(group_key, []).append(file_path)
 
-    # 稳定顺序：共享根在前，其余存档按名称排序，避免输出与缓存行为漂移。
+    # 稳定顺序：避免输出与缓存行为漂移。
     ordered_groups: List[Tuple[str | None, List[Path]]] = []
     if None in grouped:
         ordered_groups.append((None, grouped.pop(None)))
     for pkg_id in sorted(grouped.keys(), key=lambda x: str(x or "").casefold()):
         ordered_groups.append((pkg_id, grouped[pkg_id]))
+    return ordered_groups
+
+
+def _resolve_parallel_jobs(jobs: int) -> int:
+    jobs_value = int(jobs)
+    if jobs_value <= 0:
+        return max(1, int(os.cpu_count() or 1))
+    return jobs_value
+
+
+def _init_validate_graphs_worker(workspace_root: Path, node_impl_log_verbose: bool) -> None:
+    """worker 进程初始化：对齐主进程的 workspace_root 与日志口径（spawn 模式下不会继承主进程状态）。"""
+    from engine.configs.settings import settings
+    from engine.utils.workspace import init_settings_for_workspace
+
+    os.chdir(workspace_root)
+    settings.NODE_IMPL_LOG_VERBOSE = bool(node_impl_log_verbose)
+    init_settings_for_workspace(workspace_root=workspace_root, load_user_settings=False)
+
+
+def _run_validate_graphs_unit_in_worker(
+    active_package_id: str | None,
+    unit_targets: List[Path],
+    workspace_root: Path,
+    options: ValidateGraphsOrchestrationOptions,
+) -> Tuple[List[EngineIssue], List[EngineIssue], Dict[str, Any]]:
+    """在 worker 进程内校验一个同作用域的工作单元。
+
+    返回：(validate_files 的问题, 复合节点结构问题, 待主进程合并的缓存条目)。
+    worker 只在作用域变化时才切换作用域并 refresh，连续的同作用域单元复用已预热的节点库。
+    """
+    ensure_validate_graphs_scope_applied(active_package_id, workspace_root, force_refresh=False)
+
+    cache_updates: Dict[str, Any] = {}
+    report = validate_files(
+        list(unit_targets),
+        workspace_root,
+        strict_entity_wire_only=bool(options.strict_entity_wire_only),
+        use_cache=bool(options.use_cache),
+        cache_updates=cache_updates,
+    )
+    structural_issues: List[EngineIssue] = []
+    if bool(options.enable_composite_struct_check):
+        structural_issues = collect_composite_structural_issues(unit_targets, workspace_root)
+    return list(report.issues), structural_issues, cache_updates
+
+
+def _collect_issues_in_process_pool(
+    ordered_groups: List[Tuple[str | None, List[Path]]],
+    workspace_root: Path,
+    *,
+    options: ValidateGraphsOrchestrationOptions,
+    jobs: int,
+) -> List[EngineIssue]:
+    """把各作用域分组切成工作单元并行校验，再按串行模式的顺序合并结果。"""
+    from engine.configs.settings import settings
+    from engine.validate.validation_cache import load_validation_cache, save_validation_cache
+
+    units: List[Tuple[int, str | None, List[Path]]] = []
+    for group_index, (active_package_id, group_targets) in enumerate(ordered_groups):
+        group_files = list(group_targets or [])
+        unit_size = max(1, min(_PARALLEL_UNIT_MAX_FILES, -(-len(group_files) // jobs)))
+        for start in range(0, len(group_files), unit_size):
+            units.append((group_index, active_package_id, group_files[start : start + unit_size]))
+
+    results: List[Tuple[List[EngineIssue], List[EngineIssue], Dict[str, Any]]] = []
+    with ProcessPoolExecutor(
+        max_workers=min(jobs, len(units)),
+        initializer=_init_validate_graphs_worker,
+        initargs=(workspace_root, bool(getattr(settings, "NODE_IMPL_LOG_VERBOSE", False))),
+    ) as executor:
+        futures = [
+            executor.submit(_run_validate_graphs_unit_in_worker, active_package_id, unit_targets, workspace_root, options)
+            for _group_index, active_package_id, unit_targets in units
+        ]
+        for future in futures:
+            results.append(future.result())
+
+    # 合并顺序与串行模式一致：每个分组先输出 validate_files 的问题，再输出复合节点结构问题。
+    issues: List[EngineIssue] = []
+    for group_index in range(len(ordered_groups)):
+        group_results = [result for (unit_group, _pkg, _files), result in zip(units, results) if unit_group == group_index]
+        for validate_issues, _structural_issues, _cache_updates in group_results:
+            issues.extend(validate_issues)
+        for _validate_issues, structural_issues, _cache_updates in group_results:
+            issues.extend(structural_issues)
+
+    if bool(options.use_cache):
+        cache_data = load_validation_cache(workspace_root)
+        files_section = cache_data.setdefault("files", {})
+        for _validate_issues, _structural_issues, cache_updates in results:
+            if not cache_updates:
+                continue
+            cache_data["rules_hash"] = str(cache_updates.get("rules_hash", ""))
+            files_section.update(cache_updates.get("files") or {})
+        save_validation_cache(workspace_root, cache_data)
+
+    return issues
+
+
+def collect_validate_graphs_engine_issues(
+    targets: Sequence[Path],
+    workspace_root: Path,
+    *,
+    options: ValidateGraphsOrchestrationOptions,
+) -> List[EngineIssue]:
+    """统一产出 validate-graphs 的 EngineIssue 列表（供 app-cli/UI 复用）。"""
+    # --- 1) 分组：按文件所属项目存档作用域分别执行 validate_files / composite_struct_check ---
+    ordered_groups = group_targets_by_package_scope(targets, workspace_root)
+
+    jobs = _resolve_parallel_jobs(options.jobs)
+    file_count = sum(len(group_targets) for _pkg, group_targets in ordered_groups)
+    if jobs > 1 and file_count > 1:
+        return _collect_issues_in_process_pool(ordered_groups, workspace_root, options=options, jobs=jobs)
 
     issues: List[EngineIssue] = []
 
     for active_package_id, group_targets in ordered_groups:
-        _apply_scope_and_refresh_node_library(active_package_id)
+        ensure_validate_graphs_scope_applied(active_package_id, workspace_root)
 
         report = validate_files(
             list(group_targets or []),
@@ -125,5 +273,3 @@ def collect_validate_graphs_engine_issues(
             issues.extend(collect_composite_structural_issues(group_targets, workspace_root))
 
     return issues
-
-
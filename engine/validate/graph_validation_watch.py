@@ -0,0 +1,337 @@
+"""
+validate-graphs 常驻校验（--watch）的引擎侧实现。
+
+职责定位：
+- 进程常驻：节点库、规则集与 Schema 视图保持预热，作用域未变化时不重复 refresh；
+- 轮询 `assets/资源库` 下的 *.py 文件状态（mtime_ns + size），只重新校验发生变化的目标文件，
+  以及依赖了变化的复合节点 / 信号 / 结构体定义的目标文件；
+- 每轮校验结果以 dict 事件的形式交给调用方提供的 sink（CLI 负责序列化为 JSON lines 输出）。
+
+边界：
+- 不解析命令行参数，不做任何输出；
+- 依赖判定采用“源码文本引用”口径（复合节点模块名/类名、信号名/结构体名），宁可多校验也不漏校验：
+  无法从定义文件中提取名称时，退化为重新校验同作用域内的全部目标。
+"""
+
+from __future__ import annotations
+
+import ast
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from engine.nodes.composite_file_policy import is_composite_definition_file
+from engine.utils.resource_library_layout import (
+    PROJECT_ARCHIVE_LIBRARY_DIRNAME,
+    SHARED_LIBRARY_DIRNAME,
+    find_containing_resource_root,
+)
+from engine.validate.api import GraphFileValidator
+from engine.validate.composite_structural_checks import collect_composite_structural_issues
+from engine.validate.graph_validation_orchestrator import (
+    ValidateGraphsOrchestrationOptions,
+    ensure_validate_graphs_scope_applied,
+    group_targets_by_package_scope,
+)
+from engine.validate.graph_validation_targets import relative_path_for_display
+from engine.validate.issue import EngineIssue
+from engine.validate.rules.node_index import clear_node_index_caches
+
+__all__ = [
+    "GraphValidationWatcher",
+    "GraphValidationWatchCycle",
+]
+
+# 管理配置下会影响节点图校验口径的代码级定义目录。
+_MANAGEMENT_DIRNAME = "管理配置"
+# 定义文件内可用于“按名称反查引用方”的字段。
+_DEFINITION_NAME_KEYS = ("signal_name", "struct_name")
+
+_FileState = Tuple[int, int]
+_ScopeKey = Tuple[bool, str | None]  # (是否共享根, package_id)
+
+
+@dataclass
+class GraphValidationWatchCycle:
+    """一轮增量校验的结果摘要。"""
+
+    changed_files: List[Path] = field(default_factory=list)
+    validated_files: List[Path] = field(default_factory=list)
+    issues_by_file: Dict[Path, List[EngineIssue]] = field(default_factory=dict)
+    elapsed_ms: float = 0.0
+
+
+class GraphValidationWatcher:
+    """常驻校验器：保持节点库/规则预热，按文件变化增量重新校验。"""
+
+    def __init__(
+        self,
+        targets: Sequence[Path],
+        workspace_root: Path,
+        *,
+        options: ValidateGraphsOrchestrationOptions,
+    ) -> None:
+        self._workspace_root = Path(workspace_root).resolve()
+        self._resource_library_root = (self._workspace_root / "assets" / "资源库").resolve()
+        self._targets: List[Path] = [Path(p).resolve() for p in targets]
+        self._target_set: Set[Path] = set(self._targets)
+        self._options = options
+        self._file_states: Dict[Path, _FileState] = {}
+        # 定义文件（复合节点/信号/结构体）上一次提取到的引用名称：用于变更后同时匹配“旧名称”的引用方。
+        self._definition_names: Dict[Path, Set[str]] = {}
+        # 定义代际：复合节点/信号/结构体定义变化后递增；作用域上次 refresh 时的代际与当前不一致时需要强制 refresh。
+        self._shared_generation: int = 0
+        self._package_generations: Dict[str | None, int] = {}
+        self._refreshed_generations: Dict[str | None, Tuple[int, int]] = {}
+        # 规则流水线跨轮复用；节点索引缓存只在作用域切换/刷新后清理（其内容取决于当前节点库）
+        self._validator = GraphFileValidator(
+            self._workspace_root,
+            strict_entity_wire_only=bool(options.strict_entity_wire_only),
+        )
+        self._node_index_scope: Tuple[str | None, Tuple[int, int]] | None = None
+
+    # ------------------------------------------------------------------ 对外 API
+    @property
+    def targets(self) -> List[Path]:
+        return list(self._targets)
+
+    def run_initial(self) -> GraphValidationWatchCycle:
+        """首轮全量校验（允许命中磁盘校验缓存），并记录文件状态快照。"""
+        self._file_states = self._snapshot_file_states()
+        for file_path in self._file_states:
+            if self._is_definition_file(file_path):
+                self._definition_names[file_path] = self._extract_reference_names(file_path)
+        self._refreshed_generations.clear()
+        return self._validate(self._targets, changed_files=[], use_cache=bool(self._options.use_cache))
+
+    def poll_once(self) -> GraphValidationWatchCycle | None:
+        """对比文件状态快照；存在变化时增量校验并返回结果，否则返回 None。"""
+        current_states = self._snapshot_file_states()
+        changed: List[Path] = []
+        for file_path, state in current_states.items():
+            if self._file_states.get(file_path) != state:
+                changed.append(file_path)
+        for file_path in self._file_states:
+            if file_path not in current_states:
+                changed.append(file_path)
+        self._file_states = current_states
+        if not changed:
+            return None
+        changed.sort(key=lambda p: str(p).casefold())
+        affected = self.compute_affected_targets(changed)
+        # 变化后的文件不能命中磁盘缓存：信号/结构体定义变化不会反映在缓存的规则签名中。
+        return self._validate(affected, changed_files=changed, use_cache=False)
+
+    def run_forever(
+        self,
+        sink: Callable[[Dict[str, Any]], None],
+        *,
+        interval_seconds: float = 0.5,
+        should_stop: Callable[[], bool] | None = None,
+    ) -> None:
+        """首轮校验后持续轮询，每轮结果转换为事件 dict 交给 sink。"""
+        sink({"type": "ready", "targets": len(self._targets)})
+        sink(self.build_cycle_event(self.run_initial(), initial=True))
+        while not (should_stop is not None and should_stop()):
+            time.sleep(max(0.05, float(interval_seconds)))
+            cycle = self.poll_once()
+            if cycle is not None:
+                sink(self.build_cycle_event(cycle, initial=False))
+
+    def build_cycle_event(self, cycle: GraphValidationWatchCycle, *, initial: bool) -> Dict[str, Any]:
+        files_payload: List[Dict[str, Any]] = []
+        for file_path in cycle.validated_files:
+            file_issues = cycle.issues_by_file.get(file_path, [])
+            files_payload.append(
+                {
+                    "file": relative_path_for_display(file_path, self._workspace_root),
+                    "errors": len([i for i in file_issues if i.level == "error"]),
+                    "warnings": len([i for i in file_issues if i.level == "warning"]),
+                    "issues": [issue.to_dict() for issue in file_issues],
+                }
+            )
+        return {
+            "type": "initial" if initial else "cycle",
+            "changed": [relative_path_for_display(p, self._workspace_root) for p in cycle.changed_files],
+            "validated": len(cycle.validated_files),
+            "elapsed_ms": round(float(cycle.elapsed_ms), 2),
+            "files": files_payload,
+        }
+
+    def compute_affected_targets(self, changed_files: Iterable[Path]) -> List[Path]:
+        """根据变化文件计算需要重新校验的目标（保持 targets 原始顺序）。
+
+        - 目标文件自身变化：重新校验该文件；
+        - 复合节点定义变化：重新校验同作用域内引用其模块名/类名的目标（含嵌套复合节点的传递引用）；
+        - 信号/结构体等管理配置定义变化：重新校验同作用域内引用其名称的目标；
+          无法提取名称时重新校验同作用域内的全部目标。
+        """
+        affected: Set[Path] = set()
+        reference_tokens_by_scope: Dict[_ScopeKey, Set[str]] = {}
+        whole_scopes: Set[_ScopeKey] = set()
+
+        for raw_path in changed_files:
+            file_path = Path(raw_path).resolve()
+            if file_path in self._target_set:
+                affected.add(file_path)
+            if not self._is_definition_file(file_path):
+                continue
+            scope_key = self._scope_key_for_file(file_path)
+            self._mark_scope_stale(scope_key)
+            if is_composite_definition_file(file_path):
+                from engine.utils.graph.node_defs_fingerprint import (
+                    invalidate_composite_node_defs_fingerprint_cache,
+                )
+
+                invalidate_composite_node_defs_fingerprint_cache()
+            previous_names = self._definition_names.get(file_path, set())
+            current_names = self._extract_reference_names(file_path) if file_path.is_file() else set()
+            self._definition_names[file_path] = current_names
+            names = previous_names | current_names
+            if not names:
+                whole_scopes.add(scope_key)
+                continue
+            reference_tokens_by_scope.setdefault(scope_key, set()).update(names)
+
+        for target in self._targets:
+            target_scope = self._scope_key_for_file(target)
+            if any(self._scope_covers(scope, target_scope) for scope in whole_scopes):
+                affected.add(target)
+
+        # 传递闭包：被波及的复合节点本身也可能被其它目标引用（嵌套复合节点）。
+        pending: List[Tuple[_ScopeKey, Set[str]]] = list(reference_tokens_by_scope.items())
+        expanded_composites: Set[Path] = {Path(p).resolve() for p in changed_files}
+        while pending:
+            scope_key, tokens = pending.pop()
+            for target in self._targets:
+                if not self._scope_covers(scope_key, self._scope_key_for_file(target)):
+                    continue
+                if not self._source_mentions_any(target, tokens):
+                    continue
+                affected.add(target)
+                if is_composite_definition_file(target) and target not in expanded_composites:
+                    expanded_composites.add(target)
+                    nested_tokens = self._definition_names.get(target) or self._extract_reference_names(target)
+                    if nested_tokens:
+                        pending.append((self._scope_key_for_file(target), nested_tokens))
+
+        return [target for target in self._targets if target in affected]
+
+    # ------------------------------------------------------------------ 校验执行
+    def _validate(
+        self,
+        files: Sequence[Path],
+        *,
+        changed_files: List[Path],
+        use_cache: bool,
+    ) -> GraphValidationWatchCycle:
+        started = time.perf_counter()
+        cycle = GraphValidationWatchCycle(changed_files=list(changed_files))
+        existing_files = [p for p in files if p.is_file()]
+        for active_package_id, group_targets in group_targets_by_package_scope(existing_files, self._workspace_root):
+            generation = (self._shared_generation, self._package_generations.get(active_package_id, 0))
+            ensure_validate_graphs_scope_applied(
+                active_package_id,
+                self._workspace_root,
+                force_refresh=self._refreshed_generations.get(active_package_id) != generation,
+            )
+            self._refreshed_generations[active_package_id] = generation
+            if self._node_index_scope != (active_package_id, generation):
+                clear_node_index_caches()
+                self._node_index_scope = (active_package_id, generation)
+
+            # 同作用域的文件一次校验（一次缓存读写），再按文件拆分结果
+            results = self._validator.validate_each(group_targets, use_cache=use_cache)
+            structural_by_display: Dict[str, List[EngineIssue]] = {}
+            if bool(self._options.enable_composite_struct_check):
+                for issue in collect_composite_structural_issues(group_targets, self._workspace_root):
+                    structural_by_display.setdefault(str(issue.file or ""), []).append(issue)
+            for file_path, file_issues in results:
+                display = relative_path_for_display(file_path, self._workspace_root)
+                cycle.validated_files.append(file_path)
+                cycle.issues_by_file[file_path] = [*file_issues, *structural_by_display.get(display, [])]
+        cycle.elapsed_ms = (time.perf_counter() - started) * 1000.0
+        return cycle
+
+    # ------------------------------------------------------------------ 文件与作用域
+    def _snapshot_file_states(self) -> Dict[Path, _FileState]:
+        states: Dict[Path, _FileState] = {}
+        watched: List[Path] = list(self._targets)
+        if self._resource_library_root.is_dir():
+            watched.extend(self._resource_library_root.rglob("*.py"))
+        for file_path in watched:
+            resolved = Path(file_path).resolve()
+            if resolved in states or not resolved.is_file():
+                continue
+            stat = resolved.stat()
+            states[resolved] = (int(stat.st_mtime_ns), int(stat.st_size))
+        return states
+
+    def _is_definition_file(self, file_path: Path) -> bool:
+        if file_path.suffix != ".py":
+            return False
+        if is_composite_definition_file(file_path):
+            return True
+        return _MANAGEMENT_DIRNAME in file_path.parts
+
+    def _scope_key_for_file(self, file_path: Path) -> _ScopeKey:
+        resource_root = find_containing_resource_root(self._resource_library_root, file_path)
+        if resource_root is None or resource_root.name == SHARED_LIBRARY_DIRNAME:
+            return (True, None)
+        if resource_root.parent.name == PROJECT_ARCHIVE_LIBRARY_DIRNAME:
+            return (False, resource_root.name)
+        return (True, None)
+
+    @staticmethod
+    def _scope_covers(definition_scope: _ScopeKey, target_scope: _ScopeKey) -> bool:
+        """共享根下的定义对所有作用域可见；项目存档下的定义只对同一存档可见。"""
+        is_shared, package_id = definition_scope
+        if is_shared:
+            return True
+        return target_scope == definition_scope
+
+    def _mark_scope_stale(self, scope_key: _ScopeKey) -> None:
+        is_shared, package_id = scope_key
+        if is_shared:
+            self._shared_generation += 1
+            return
+        self._package_generations[package_id] = self._package_generations.get(package_id, 0) + 1
+
+    # ------------------------------------------------------------------ 引用名称提取
+    @staticmethod
+    def _read_text(file_path: Path) -> Optional[str]:
+        if not file_path.is_file():
+            return None
+        return file_path.read_text(encoding="utf-8-sig")
+
+    def _source_mentions_any(self, file_path: Path, tokens: Set[str]) -> bool:
+        text = self._read_text(file_path)
+        if text is None:
+            return False
+        return any(token in text for token in tokens)
+
+    def _extract_reference_names(self, file_path: Path) -> Set[str]:
+        """提取可被其它源码引用的名称：复合节点取模块名与类名，管理配置定义取信号名/结构体名。"""
+        text = self._read_text(file_path)
+        if text is None:
+            return set()
+        names: Set[str] = set()
+        if is_composite_definition_file(file_path):
+            names.add(file_path.stem)
+        try:
+            tree = ast.parse(text, filename=str(file_path))
+        except SyntaxError:
+            # 编辑过程中源码可能暂时不完整：不提取名称，由调用方退化为按作用域全量校验。
+            return names
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ClassDef) and is_composite_definition_file(file_path):
+                names.add(node.name)
+            if isinstance(node, ast.Dict):
+                for key_node, value_node in zip(node.keys, node.values):
+                    if not (isinstance(key_node, ast.Constant) and key_node.value in _DEFINITION_NAME_KEYS):
+                        continue
+                    if isinstance(value_node, ast.Constant) and isinstance(value_node.value, str) and value_node.value:
+                        names.add(value_node.value)
+        return names
+
@@ -5,6 +5,7 @@ from typing import Dict, Iterable, Mapping, Optional, Sequence, Tuple
 
 from engine.nodes.constants import ALLOWED_SCOPES
 from engine.nodes.node_definition_loader import NodeDef
+from engine.nodes.node_def_index import get_node_def_index
 from engine.nodes import get_canonical_node_def_key
 
 
@@ -127,12 +128,10 @@ def resolve_node_def_for_model(
             return None
         return ResolvedNodeDef(key=get_canonical_node_def_key(node_def), node_def=node_def)
     if kind == "composite":
-        for _, node_def in node_library.items():
-            if not getattr(node_def, "is_composite", False):
-                continue
-            if str(getattr(node_def, "composite_id", "") or "") == key:
-                return ResolvedNodeDef(key=get_canonical_node_def_key(node_def), node_def=node_def)
-        return None
+        node_def = get_node_def_index(node_library).get_composite(key)
+        if node_def is None:
+            return None
+        return ResolvedNodeDef(key=get_canonical_node_def_key(node_def), node_def=node_def)
     return None
 
 
@@ -261,6 +261,7 @@ def strict_parse_file(file_path: Path) -> None:
 
     from engine.graph.graph_code_parser import GraphCodeParser
 
+    # fail-closed 判定需覆盖布局阶段的错误：保持立即布局。
     GraphCodeParser(workspace_root, strict=True).parse_file(resolved_target)
 
 
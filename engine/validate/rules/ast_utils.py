@@ -9,6 +9,8 @@ if TYPE_CHECKING:
     from ..context import ValidationContext
 
 from ..issue import EngineIssue
+from engine.graph.utils.ast_node_index import GraphCodeAstIndex
+from engine.graph.utils.ast_utils import clone_ast
 from engine.graph.utils.metadata_extractor import (
     extract_graph_variables_from_ast,
     extract_metadata_from_docstring,
@@ -39,6 +41,41 @@ def get_cached_module(ctx: "ValidationContext") -> ast.Module:
     return cached
 
 
+def get_owned_module(ctx: "ValidationContext") -> ast.Module:
+    """返回归本上下文私有、可就地改写的 AST。
+
+    `parse_module` 的结果由 lru_cache 跨上下文共享，不能被改写；首次请求时克隆一份写回 ctx.ast_cache，
+    之后的语法糖/列表/字典改写规则都在这份副本上就地进行（整个校验流程只克隆一次）。
+    改写后须调用 `mark_module_mutated` 使节点索引失效。
+    """
+    if ctx.file_path is None:
+        raise ValueError("ValidationContext 缺少 file_path，无法解析 AST")
+    tree = get_cached_module(ctx)
+    if ctx.file_path not in ctx.ast_owned_files:
+        tree = clone_ast(tree)
+        ctx.ast_cache[ctx.file_path] = tree
+        ctx.ast_owned_files.add(ctx.file_path)
+        ctx.ast_index_cache.pop(ctx.file_path, None)
+    return tree
+
+
+def mark_module_mutated(ctx: "ValidationContext") -> None:
+    """ctx.ast_cache 中的树已被就地改写：丢弃其节点索引。"""
+    if ctx.file_path is not None:
+        ctx.ast_index_cache.pop(ctx.file_path, None)
+
+
+def get_ast_index(ctx: "ValidationContext") -> GraphCodeAstIndex:
+    """返回当前文件 AST（含已改写结果）的共享节点索引；同一棵树只构建一次。"""
+    tree = get_cached_module(ctx)
+    file_path = ctx.file_path
+    index = ctx.ast_index_cache.get(file_path)
+    if not isinstance(index, GraphCodeAstIndex) or index.tree is not tree:
+        index = GraphCodeAstIndex(tree)
+        ctx.ast_index_cache[file_path] = index
+    return index
+
+
 def build_parent_map(tree: ast.AST) -> Dict[ast.AST, ast.AST]:
     parent_map: Dict[ast.AST, ast.AST] = {}
     for node in ast.walk(tree):
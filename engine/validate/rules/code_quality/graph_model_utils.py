@@ -25,7 +25,8 @@ def _get_or_parse_graph_model(ctx: ValidationContext):
     if ctx.file_path is None:
         return None
     # validate 阶段需要“尽力解析”以便产出尽可能多的规则问题；不能启用严格 fail-closed。
-    parser = GraphCodeParser(ctx.workspace_path, strict=False)
+    # 多数规则只读取图结构与源码行号：延迟布局；依赖布局结果的规则自行调用 ensure_layout()。
+    parser = GraphCodeParser(ctx.workspace_path, strict=False, defer_layout=True)
     # 复用 validate 流程中已被 rewrite 规则改写过的 AST，避免“同一套改写逻辑跑两遍”。
     rewritten_tree = get_cached_module(ctx)
     model, _ = parser.parse_file(
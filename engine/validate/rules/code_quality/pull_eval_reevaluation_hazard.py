@@ -74,6 +74,9 @@ class PullEvalReevaluationHazardRule(ValidationRule):
         if not any(_is_custom_var_write_node_title(n.title) for n in graph_model.nodes.values()):
             return []
 
+        # 判定依赖布局插入的跨块数据副本（与导出/执行口径一致）：延迟布局的模型需先完成布局
+        graph_model.ensure_layout()
+
         incoming_data_edges = _build_incoming_data_edge_index(graph_model)
         flow_next_map = _build_flow_next_index(graph_model)
         data_closure_cache: Dict[str, Set[str]] = {}
@@ -10,7 +10,7 @@ from engine.validate.id_digits import is_digits_1_to_10
 from ...context import ValidationContext
 from ...issue import EngineIssue
 from ...pipeline import ValidationRule
-from ..ast_utils import create_rule_issue, get_cached_module, line_span_text
+from ..ast_utils import create_rule_issue, get_ast_index, line_span_text
 from ..ui_key_registry_utils import (
     extract_ui_key_placeholder_raw_key,
     parse_ui_key_placeholder,
@@ -92,16 +92,14 @@ class IdLiteralTenDigitsRule(ValidationRule):
             return []
 
         file_path: Path = ctx.file_path
-        tree = get_cached_module(ctx)
+        ast_index = get_ast_index(ctx)
         ui_view = try_load_ui_html_ui_keys_for_ctx(ctx)
         ui_key_set = set(ui_view.ui_keys) if ui_view is not None else set()
         workbench_view = try_load_ui_workbench_ui_keys_for_ctx(ctx)
         workbench_ui_key_set = set(workbench_view.ui_keys) if workbench_view is not None else set()
         issues: List[EngineIssue] = []
 
-        for node in ast.walk(tree):
-            if not isinstance(node, ast.AnnAssign):
-                continue
+        for node in ast_index.nodes_of_type(ast.AnnAssign):
 
             type_name = _extract_type_name(getattr(node, "annotation", None))
             if type_name not in _ID_TYPES:
@@ -8,8 +8,8 @@ from ...context import ValidationContext
 from ...issue import EngineIssue
 from ...pipeline import ValidationRule
 from ..ast_utils import (
-    build_parent_map,
     create_rule_issue,
+    get_ast_index,
     get_cached_module,
     iter_class_methods,
     line_span_text,
@@ -34,7 +34,7 @@ class LocalVarUsageRule(ValidationRule):
 
         file_path: Path = ctx.file_path
         tree = get_cached_module(ctx)
-        parent_map = build_parent_map(tree)
+        parent_map = get_ast_index(ctx).parents
 
         issues: List[EngineIssue] = []
 
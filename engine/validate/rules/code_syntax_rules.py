@@ -27,22 +27,24 @@ from ..issue import EngineIssue
 from ..pipeline import ValidationRule
 from .ast_utils import (
     get_cached_module,
-    build_parent_map,
+    get_owned_module,
+    get_ast_index,
+    mark_module_mutated,
     line_span_text,
     iter_class_methods,
     create_rule_issue,
 )
 from engine.graph.utils.list_literal_rewriter import (
     ListLiteralRewriteIssue,
-    rewrite_graph_code_list_literals,
+    rewrite_list_literals_in_place,
 )
 from engine.graph.utils.dict_literal_rewriter import (
     DictLiteralRewriteIssue,
-    rewrite_graph_code_dict_literals,
+    rewrite_dict_literals_in_place,
 )
 from engine.graph.utils.syntax_sugar_rewriter import (
     SyntaxSugarRewriteIssue,
-    rewrite_graph_code_syntax_sugars,
+    rewrite_syntax_sugars_in_place,
 )
 from engine.graph.utils.graph_code_rewrite_config import build_graph_code_rewrite_config
 from engine.graph.composite.pin_marker_collector import (
@@ -67,7 +69,7 @@ class ListLiteralRewriteRule(ValidationRule):
     - `for x in [...]` 禁止：for 的迭代器位置必须是“显式声明带中文类型注解”的列表变量。
 
     说明：
-    - 该规则会**就地更新 ctx.ast_cache**，使后续规则在同一校验流程中看到“已改写”的 AST；
+    - 该规则会**就地改写 ctx.ast_cache 中的 AST**（上下文私有副本），使后续规则在同一校验流程中看到“已改写”的 AST；
     - 不支持模块/类体顶层列表字面量（无法转换为节点），这类写法会直接报错。
     """
 
@@ -80,13 +82,14 @@ class ListLiteralRewriteRule(ValidationRule):
             return []
 
         file_path: Path = ctx.file_path
-        tree = get_cached_module(ctx)
+        tree = get_owned_module(ctx)
         rewrite_config = _rewrite_config_for_ctx(ctx)
-        rewritten_tree, rewrite_issues = rewrite_graph_code_list_literals(
+        rewrite_issues = rewrite_list_literals_in_place(
             tree,
             max_elements=rewrite_config.max_list_literal_elements,
         )
-        ctx.ast_cache[ctx.file_path] = rewritten_tree
+        ast.fix_missing_locations(tree)
+        mark_module_mutated(ctx)
 
         issues: List[EngineIssue] = []
         for rewrite_issue in list(rewrite_issues or []):
@@ -113,7 +116,7 @@ class SyntaxSugarRewriteRule(ValidationRule):
     - 避免 IR 对 Subscript/Compare/BoolOp/AugAssign 等语法不完备导致“缺线/缺数据来源”。
 
     说明：
-    - 该规则会**就地更新 ctx.ast_cache**，使后续规则看到“已改写”的 AST；
+    - 该规则会**就地改写 ctx.ast_cache 中的 AST**（上下文私有副本），使后续规则看到“已改写”的 AST；
     - scope（server/client）会影响部分节点名/端口名映射。
     """
 
@@ -126,17 +129,18 @@ class SyntaxSugarRewriteRule(ValidationRule):
             return []
 
         file_path: Path = ctx.file_path
-        tree = get_cached_module(ctx)
+        tree = get_owned_module(ctx)
         from .ast_utils import infer_graph_scope  # 避免在模块顶层形成循环 import
 
         scope = infer_graph_scope(ctx)
         rewrite_config = _rewrite_config_for_ctx(ctx)
-        rewritten_tree, rewrite_issues = rewrite_graph_code_syntax_sugars(
+        rewrite_issues = rewrite_syntax_sugars_in_place(
             tree,
             scope=scope,
             enable_shared_composite_sugars=rewrite_config.enable_shared_composite_sugars,
         )
-        ctx.ast_cache[ctx.file_path] = rewritten_tree
+        ast.fix_missing_locations(tree)
+        mark_module_mutated(ctx)
 
         issues: List[EngineIssue] = []
         for rewrite_issue in list(rewrite_issues or []):
@@ -205,7 +209,7 @@ class UnsupportedPythonSyntaxRule(ValidationRule):
 
         file_path: Path = ctx.file_path
         tree = get_cached_module(ctx)
-        parent_map = build_parent_map(tree)
+        parent_map = get_ast_index(ctx).parents
 
         # scope 会影响可调用节点集合（server/client 同名节点可能不同）
         from .ast_utils import infer_graph_scope  # 避免在模块顶层形成循环 import
@@ -603,7 +607,7 @@ class DictLiteralRewriteRule(ValidationRule):
     - 禁止在节点调用入参或其它表达式里直接内联 `{...}`：字典必须先落到变量并显式声明别名字典类型（键类型-值类型字典 / 键类型_值类型字典）。
 
     说明：
-    - 该规则会**就地更新 ctx.ast_cache**，使后续规则在同一校验流程中看到“已改写”的 AST；
+    - 该规则会**就地改写 ctx.ast_cache 中的 AST**（上下文私有副本），使后续规则在同一校验流程中看到“已改写”的 AST；
     - 不支持模块/类体顶层字典字面量（无法转换为节点），这类写法会直接报错。
     """
 
@@ -616,8 +620,9 @@ class DictLiteralRewriteRule(ValidationRule):
             return []
 
         file_path: Path = ctx.file_path
-        tree = get_cached_module(ctx)
-        parent_map = build_parent_map(tree)
+        tree = get_owned_module(ctx)
+        ast_index = get_ast_index(ctx)
+        parent_map = ast_index.parents
 
         # 端口期望类型判定：用于对“别名字典端口”的 dict literal 入参做豁免
         # （仍会改写为【拼装字典】调用，并由后续端口类型规则做键/值类型强校验）。
@@ -635,25 +640,6 @@ class DictLiteralRewriteRule(ValidationRule):
 
         scope = infer_graph_scope(ctx)
         node_defs_by_name = callable_node_defs_by_name(ctx.workspace_path, scope, include_composite=True)
-        rewrite_config = _rewrite_config_for_ctx(ctx)
-        rewritten_tree, rewrite_issues = rewrite_graph_code_dict_literals(
-            tree,
-            max_pairs=rewrite_config.max_dict_literal_pairs,
-        )
-        ctx.ast_cache[ctx.file_path] = rewritten_tree
-
-        def _find_dict_node_in_original_tree(issue_node: ast.AST) -> ast.Dict | None:
-            lineno = getattr(issue_node, "lineno", None)
-            col = getattr(issue_node, "col_offset", None)
-            if not isinstance(lineno, int) or not isinstance(col, int):
-                return None
-            for n in ast.walk(tree):
-                if not isinstance(n, ast.Dict):
-                    continue
-                if getattr(n, "lineno", None) == lineno and getattr(n, "col_offset", None) == col:
-                    return n
-            return None
-
         def _extract_call_context(dict_node: ast.Dict) -> tuple[str, str]:
             """返回 (call_name, input_port_name)。仅支持“关键字参数=字典字面量”的场景。"""
             parent = parent_map.get(dict_node)
@@ -706,10 +692,13 @@ class DictLiteralRewriteRule(ValidationRule):
         def _should_suppress_typed_annotation_required(rewrite_issue: DictLiteralRewriteIssue) -> bool:
             if str(getattr(rewrite_issue, "code", "") or "") != "CODE_DICT_LITERAL_TYPED_ANNOTATION_REQUIRED":
                 return False
-            dict_node = _find_dict_node_in_original_tree(rewrite_issue.node)
-            if dict_node is None:
+            issue_node = rewrite_issue.node
+            call_context = call_context_by_dict_position.get(
+                (getattr(issue_node, "lineno", None), getattr(issue_node, "col_offset", None))
+            )
+            if call_context is None:
                 return False
-            call_name, port_name = _extract_call_context(dict_node)
+            call_name, port_name = call_context
             if not call_name or not port_name:
                 return False
             expected_port_type = _resolve_input_port_type(call_name, port_name)
@@ -719,6 +708,21 @@ class DictLiteralRewriteRule(ValidationRule):
             # 仅对“具体别名字典端口”放行：泛型家族仍要求显式落盘类型注解，避免出现未收敛的字典构造。
             return _is_concrete_non_generic_type_text(key_type) and _is_concrete_non_generic_type_text(value_type)
 
+        # 改写会就地替换字典字面量：先按位置记录改写前各 `{...}` 所在的调用上下文（同位置取遍历序首个）
+        call_context_by_dict_position: dict[tuple[object, object], tuple[str, str]] = {}
+        for dict_node in ast_index.nodes_of_type(ast.Dict):
+            position = (getattr(dict_node, "lineno", None), getattr(dict_node, "col_offset", None))
+            if isinstance(position[0], int) and isinstance(position[1], int):
+                call_context_by_dict_position.setdefault(position, _extract_call_context(dict_node))
+
+        rewrite_config = _rewrite_config_for_ctx(ctx)
+        rewrite_issues = rewrite_dict_literals_in_place(
+            tree,
+            max_pairs=rewrite_config.max_dict_literal_pairs,
+        )
+        ast.fix_missing_locations(tree)
+        mark_module_mutated(ctx)
+
         issues: List[EngineIssue] = []
         for rewrite_issue in list(rewrite_issues or []):
             if not isinstance(rewrite_issue, DictLiteralRewriteIssue):
@@ -793,12 +797,9 @@ class MatchCaseLiteralPatternRule(ValidationRule):
             return []
 
         file_path: Path = ctx.file_path
-        tree = get_cached_module(ctx)
         issues: List[EngineIssue] = []
 
-        for node in ast.walk(tree):
-            if not isinstance(node, ast.Match):
-                continue
+        for node in get_ast_index(ctx).nodes_of_type(ast.Match):
             for one_case in getattr(node, "cases", []) or []:
                 pattern = getattr(one_case, "pattern", None)
                 if pattern is None:
@@ -833,7 +834,7 @@ class NoMethodNestedCallsRule(ValidationRule):
         file_path: Path = ctx.file_path
         tree = get_cached_module(ctx)
         issues: List[EngineIssue] = []
-        parent_map = build_parent_map(tree)
+        parent_map = get_ast_index(ctx).parents
         allowed_full_names = set((ctx.config or {}).get("ALLOW_METHOD_CALLS", []) or [])
         allowed_method_names = set((ctx.config or {}).get("ALLOW_METHOD_CALL_NAMES", []) or [])
         
@@ -1006,7 +1007,7 @@ class NoInlineArithmeticInRangeRule(ValidationRule):
 
         file_path: Path = ctx.file_path
         tree = get_cached_module(ctx)
-        parent_map = build_parent_map(tree)
+        parent_map = get_ast_index(ctx).parents
         issues: List[EngineIssue] = []
 
         for _, method in iter_class_methods(tree):
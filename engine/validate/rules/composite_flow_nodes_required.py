@@ -4,7 +4,7 @@ import ast
 from pathlib import Path
 from typing import Dict, List, Optional
 
-from engine.graph.common import node_name_index_from_library
+from engine.graph.common import get_node_name_index
 from engine.graph.composite.pin_marker_collector import collect_pin_markers
 from engine.graph.composite.source_format import find_composite_classes
 from engine.graph.utils.metadata_extractor import extract_metadata_from_docstring
@@ -64,7 +64,7 @@ class CompositeFlowNodesRequiredRule(ValidationRule):
         # 只需要基础节点库即可判断“调用的节点是否为流程节点”
         registry = get_node_registry(ctx.workspace_path, include_composite=False)
         node_library: Dict[str, NodeDef] = registry.get_library()
-        node_name_index = node_name_index_from_library(node_library, scope=scope)
+        node_name_index = get_node_name_index(node_library, scope=scope)
 
         issues: List[EngineIssue] = []
         for composite_class in find_composite_classes(tree):
@@ -13,7 +13,7 @@ from engine.utils.path_utils import normalize_slash
 from .issue import EngineIssue
 
 
-def _normalize_file_key(file_path: Path, workspace: Path) -> str:
+def normalize_validation_cache_file_key(file_path: Path, workspace: Path) -> str:
     """将文件路径标准化为缓存键（优先使用相对工作区的路径）。"""
     resolved_file = file_path.resolve()
     resolved_workspace = workspace.resolve()
@@ -117,7 +117,7 @@ def try_load_cached_issues_for_file(
     if cached_rules_hash != current_rules_hash:
         return None
     files_section = cache.get("files") or {}
-    key = _normalize_file_key(file_path, workspace)
+    key = normalize_validation_cache_file_key(file_path, workspace)
     entry = files_section.get(key)
     if not isinstance(entry, dict):
         return None
@@ -152,7 +152,7 @@ def update_validation_cache_for_file(
     if not isinstance(files_section, dict):
         files_section = {}
         cache["files"] = files_section
-    key = _normalize_file_key(file_path, workspace)
+    key = normalize_validation_cache_file_key(file_path, workspace)
     stat = file_path.stat()
     current_mtime = float(stat.st_mtime)
     current_size = int(stat.st_size)
@@ -18,33 +18,13 @@ def 停止并删除基础运动器(game, 目标实体, 运动器名称, 是否
     if ent is None:
         return
 
-    stop_motor = getattr(game, "stop_motor", None)
-    if not callable(stop_motor):
-        return
-
     if bool(是否停止所有基础运动器):
-        timers = getattr(game, "timers", None)
-        if isinstance(timers, dict):
-            prefix = f"{ent.entity_id}___motor__"
-            names: list[str] = []
-            for k, info in list(timers.items()):
-                if not isinstance(k, str):
-                    continue
-                if not k.startswith(prefix):
-                    continue
-                if not isinstance(info, dict):
-                    continue
-                if str(info.get("kind") or "") != "__motor__":
-                    continue
-                mname = str(info.get("motor_name") or "")
-                if mname:
-                    names.append(mname)
-            for n in names:
-                stop_motor(ent, motor_name=n, fire_stop_event=True)
+        stopped = game.stop_all_motors(ent, fire_stop_event=True)
+        log_info("[停止并删除基础运动器] 停止所有 count={}", len(stopped))
         return
 
     name = str(运动器名称 or "").strip()
     if not name:
         return
-    stop_motor(ent, motor_name=name, fire_stop_event=True)
+    game.stop_motor(ent, motor_name=name, fire_stop_event=True)
     log_info("[停止并删除基础运动器] name={}", name)
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import time
 from engine.nodes.node_spec import node_spec
 from plugins.nodes.shared.server_执行节点_impl_helpers import *
 from engine.utils.logging.logger import log_info
@@ -19,22 +18,15 @@ def 暂停定时器(game, 目标实体, 定时器名称):
     timer_name = str(定时器名称 or "")
     timer_key = f"{entity_id}_{timer_name}"
 
-    timers = getattr(game, "timers", None)
-    if not isinstance(timers, dict):
-        raise TypeError("暂停定时器：game.timers 必须为 dict")
-
-    info = timers.get(timer_key, None)
-    if not isinstance(info, dict):
+    info = game.get_timer(目标实体, timer_name)
+    if info is None:
         log_info("[定时器] 暂停定时器：未找到 timer_key={}", timer_key)
         return
 
-    if bool(info.get("paused", False)):
+    if info.paused:
         log_info("[定时器] 暂停定时器：已处于暂停状态 timer_key={}", timer_key)
         return
 
-    now = float(time.monotonic())
-    info["paused"] = True
-    info["paused_at"] = float(now)
-    # 将 next_fire_time 置为非数值，令 MockRuntime 的 tick() 自动跳过该定时器
-    info["next_fire_time"] = None
+    # 暂停期间不入调度堆，MockRuntime 的 tick() 不会触发该定时器
+    game.pause_timer(目标实体, timer_name)
     log_info("[定时器] 已暂停 timer_key={}", timer_key)
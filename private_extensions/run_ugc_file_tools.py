@@ -21,12 +21,31 @@ def _ensure_private_extensions_importable() -> None:
             sys.path.insert(0, root_text)
 
 
+_JSONL_WORKER_FLAG = "--jsonl-worker"
+
+
 def main(argv: list[str] | None = None) -> None:
     _ensure_private_extensions_importable()
+    arguments = list(argv if argv is not None else sys.argv[1:])
+
+    if arguments[:1] == [_JSONL_WORKER_FLAG]:
+        # 常驻 worker 模式（UI 侧复用同一进程执行多次 CLI，见 ui_integration/_cli_worker.py）
+        import argparse
+
+        from ugc_file_tools.ui_integration._cli_worker_server import serve_jsonl_worker
+
+        parser = argparse.ArgumentParser(prog="run_ugc_file_tools.py " + _JSONL_WORKER_FLAG)
+        parser.add_argument("--idle-timeout", type=float, default=600.0, help="空闲多少秒后自动退出")
+        worker_arguments = parser.parse_args(arguments[1:])
+        serve_jsonl_worker(
+            idle_timeout_seconds=float(worker_arguments.idle_timeout),
+            script_path=str(Path(__file__).resolve()),
+        )
+        return
 
     from ugc_file_tools.unified_cli import main as unified_main
 
-    unified_main(argv if argv is not None else sys.argv[1:])
+    unified_main(arguments)
 
 
 if __name__ == "__main__":
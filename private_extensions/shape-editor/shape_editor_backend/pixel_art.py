@@ -3,6 +3,7 @@ from __future__ import annotations
 import base64
 import io
 import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -70,33 +71,62 @@ def _rgb_uint8_to_lab(rgb: np.ndarray) -> np.ndarray:
     return lab.reshape(shape)
 
 
+# 分块计算 DE76 距离时每块 (rows, P, 3) 差值张量的元素上限（float64 约 24 MB）
+_QUANTIZE_CHUNK_ELEMENTS = 1 << 20
+
+
+@lru_cache(maxsize=16)
+def _palette_rgb_and_lab(palette_key: tuple[str, ...]) -> tuple[np.ndarray, np.ndarray]:
+    """调色板 RGB / Lab（按调色板内容缓存；返回只读数组）。"""
+    palette_rgb = _hex_to_rgb_array(list(palette_key))  # (P, 3)
+    palette_lab = _rgb_uint8_to_lab(palette_rgb)  # (P, 3)
+    palette_rgb.setflags(write=False)
+    palette_lab.setflags(write=False)
+    return palette_rgb, palette_lab
+
+
+def _nearest_palette_index(colors_lab: np.ndarray, palette_lab: np.ndarray) -> np.ndarray:
+    """(M, 3) Lab -> (M,) 最近调色板索引（DE76），按块计算以限制中间张量大小。"""
+    count = int(colors_lab.shape[0])
+    rows_per_chunk = max(1, _QUANTIZE_CHUNK_ELEMENTS // max(1, int(palette_lab.shape[0])))
+    nearest_idx = np.empty(count, dtype=np.intp)
+    for start in range(0, count, rows_per_chunk):
+        chunk = colors_lab[start : start + rows_per_chunk]
+        # 利用广播：(n, 1, 3) - (P, 3) -> (n, P, 3) -> sum -> (n, P)
+        diff = chunk[:, np.newaxis, :] - palette_lab[np.newaxis, :, :]
+        dist_sq = np.sum(diff * diff, axis=2)
+        nearest_idx[start : start + chunk.shape[0]] = np.argmin(dist_sq, axis=1)
+    return nearest_idx
+
+
 def prequantize_to_palette(rgb: np.ndarray, palette_hex: list[str]) -> np.ndarray:
     """
     将 (H, W, 3) uint8 RGB 图像的每个像素映射到 palette_hex 中 Lab DE76 最近的颜色。
 
+    先按打包 RGB 去重，只对唯一颜色做 Lab 转换与最近色搜索（像素图 / 截图通常只有少量唯一色），
+    再按逆索引回填；距离按块计算，内存与图像尺寸无关。
+
     返回 (H, W, 3) uint8 RGB（颜色仅来自调色板）。
     """
     if not palette_hex:
         return rgb.copy()
 
     H, W = rgb.shape[:2]
-    palette_rgb = _hex_to_rgb_array(palette_hex)  # (P, 3)
-    palette_lab = _rgb_uint8_to_lab(palette_rgb)   # (P, 3)
+    palette_rgb, palette_lab = _palette_rgb_and_lab(tuple(palette_hex))
 
-    # 将图像展平为 (N, 3)，转 Lab
-    pixels_lab = _rgb_uint8_to_lab(rgb.reshape(-1, 3))  # (N, 3)
+    flat = np.ascontiguousarray(rgb.reshape(-1, 3), dtype=np.uint8)
+    packed = (flat[:, 0].astype(np.uint32) << 16) | (flat[:, 1].astype(np.uint32) << 8) | flat[:, 2].astype(np.uint32)
+    unique_packed, inverse = np.unique(packed, return_inverse=True)
 
-    # 计算每个像素到每个调色板颜色的 DE76^2 距离
-    # pixels_lab: (N, 3), palette_lab: (P, 3)
-    # 利用广播：(N, 1, 3) - (P, 3) -> (N, P, 3) -> sum -> (N, P)
-    diff = pixels_lab[:, np.newaxis, :] - palette_lab[np.newaxis, :, :]  # (N, P, 3)
-    dist_sq = np.sum(diff * diff, axis=2)  # (N, P)
+    unique_rgb = np.empty((unique_packed.shape[0], 3), dtype=np.uint8)
+    unique_rgb[:, 0] = (unique_packed >> 16) & 0xFF
+    unique_rgb[:, 1] = (unique_packed >> 8) & 0xFF
+    unique_rgb[:, 2] = unique_packed & 0xFF
 
-    # 每个像素取最近调色板索引
-    nearest_idx = np.argmin(dist_sq, axis=1)  # (N,)
+    nearest_idx = _nearest_palette_index(_rgb_uint8_to_lab(unique_rgb), palette_lab)
 
-    # 用调色板 RGB 替换
-    out = palette_rgb[nearest_idx].reshape(H, W, 3)
+    # 唯一色 -> 调色板 RGB，再按逆索引展开回像素
+    out = palette_rgb[nearest_idx][inverse.reshape(-1)].reshape(H, W, 3)
     return out
 
 
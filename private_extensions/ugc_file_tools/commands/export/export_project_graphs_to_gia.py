@@ -175,6 +175,13 @@ def main(argv: Optional[Sequence[str]] = None) -> None:
         default="",
         help="合并打包输出的 .gia 文件名（仅文件名，例如 打包一起.gia；默认 <package_id>_packed_graphs.gia）。",
     )
+    parser.add_argument(
+        "--artifact-cache",
+        dest="artifact_cache_enabled",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="是否复用未变化节点图的上次导出产物（默认启用；缓存位于 管理配置/导出缓存/gia_artifacts）。",
+    )
 
     args = parser.parse_args(list(argv) if argv is not None else None)
 
@@ -250,6 +257,7 @@ def main(argv: Optional[Sequence[str]] = None) -> None:
         bundle_include_ui_guid_registry=bool(args.bundle_include_ui_guid_registry),
         pack_graphs_to_single_gia=bool(args.pack_graphs_to_single_gia),
         pack_output_gia_file_name=str(args.pack_output_gia_file_name or "").strip(),
+        artifact_cache_enabled=bool(args.artifact_cache_enabled),
     )
 
     def _progress_cb(current: int, total: int, label: str) -> None:
@@ -345,120 +345,179 @@ def _patch_parent_entity_name(parent_unit_bytes: bytes, *, new_name: str) -> byt
     return new_parent_bytes
 
 
-def _patch_transform_message(
-    transform_bytes: bytes,
-    *,
-    pos: Tuple[float, float, float],
-    yaw_deg: Optional[float],
-    rot_deg: Optional[Tuple[float, float, float]],
-    scale: Tuple[float, float, float],
-) -> bytes:
-    parsed = _parse_chunks(_decode_wire_chunks_checked(transform_bytes))
+# ---------------------------------------------------------------------------
+# Accessory stamp：模板只解码一次，编译为“常量字节片段 + 槽位”的嵌套结构
+# ---------------------------------------------------------------------------
+#
+# 每个装饰物只需为槽位编码新值，再拼接预先切好的常量片段；嵌套 length-delimited 字段的长度前缀
+# 在拼接时按实际 body 长度重新编码（槽位值长度随 id/name/浮点数变化）。
+# 编译过程逐字段复刻“按字段补丁”的匹配规则（首个匹配字段替换、缺失时追加到末尾），输出字节与逐个补丁一致。
+
+_SLOT_UNIT_ID = "unit_id"  # varint value（不含 tag）
+_SLOT_UNIT_NAME = "unit_name"  # length-delimited value（不含 tag）
+_SLOT_TEMPLATE_ID = "template_id"  # varint value
+_SLOT_POS = "pos"  # length-delimited Vector3 value
+_SLOT_ROT = "rot"  # 完整 chunk（tag + value），不需要改旋转时为模板原字节或空
+_SLOT_SCALE = "scale"  # length-delimited Vector3 value
+_SLOT_RELATED_UNIT_ID = "related_unit_id"  # varint value
+
+_VECTOR3_STRUCT = struct.Struct("<BfBfBf")
+_VECTOR3_LD_PREFIX = encode_varint(_VECTOR3_STRUCT.size)
 
-    pos_payload = _build_vector3_message(pos[0], pos[1], pos[2])
-    scale_payload = _build_vector3_message(scale[0], scale[1], scale[2])
-
-    def _replace_or_append_ld(field_no: int, payload: bytes) -> None:
-        nonlocal parsed
-        for i, c in enumerate(parsed):
-            if c.field_number == field_no and c.wire_type == 2:
-                parsed[i] = _Chunk(
-                    field_number=c.field_number,
-                    wire_type=c.wire_type,
-                    tag_raw=c.tag_raw,
-                    value_raw=_wrap_length_delimited(payload),
-                )
-                return
-        parsed.append(
-            _Chunk(
-                field_number=field_no,
-                wire_type=2,
-                tag_raw=encode_tag(field_no, 2),
-                value_raw=_wrap_length_delimited(payload),
-            )
-        )
 
-    _replace_or_append_ld(1, pos_payload)
-    # field_2 is a Vector3-like rotation message (deg).
-    # Merge rotation components to avoid wiping template's pre-rotated x/z (e.g. circles use x=-90).
-    want_rot = rot_deg
-    if want_rot is None and isinstance(yaw_deg, (int, float)):
-        want_rot = (None, float(yaw_deg), None)  # type: ignore[assignment]
-    if want_rot is not None:
-        existing_payload: Optional[bytes] = None
-        for c in parsed:
-            if c.field_number == 2 and c.wire_type == 2:
-                _lr0, existing_payload = _split_length_delimited(c.value_raw)
-                break
-        ex, ey, ez = _decode_vector3_message(existing_payload or b"")
-        wx, wy, wz = want_rot
-        nx = float(wx) if isinstance(wx, (int, float)) else ex
-        ny = float(wy) if isinstance(wy, (int, float)) else ey
-        nz = float(wz) if isinstance(wz, (int, float)) else ez
-        rot_payload = _build_rotation_message(x=nx, y=ny, z=nz)
-        _replace_or_append_ld(2, rot_payload)
-    _replace_or_append_ld(3, scale_payload)
-    return encode_wire_chunks([(c.tag_raw, c.value_raw) for c in parsed])
+@dataclass(frozen=True, slots=True)
+class _StampField:
+    """length-delimited 字段：tag 固定，payload 为含槽位的子结构。"""
+
+    tag_raw: bytes
+    parts: Tuple[Any, ...]
 
 
-def _patch_accessory_payload(
-    payload_bytes: bytes,
-    *,
-    unit_id: int,
-    unit_name: str,
-    template_id: int,
-    parent_unit_id: int,
-    pos: Tuple[float, float, float],
-    yaw_deg: Optional[float],
-    rot_deg: Optional[Tuple[float, float, float]],
-    scale: Tuple[float, float, float],
-) -> bytes:
+def _freeze_stamp_parts(parts: List[Any]) -> Tuple[Any, ...]:
+    """合并相邻常量片段，减少拼接次数。"""
+    out: List[Any] = []
+    for part in parts:
+        if isinstance(part, bytes) and out and isinstance(out[-1], bytes):
+            out[-1] = out[-1] + part
+        else:
+            out.append(part)
+    return tuple(out)
+
+
+def _render_stamp_parts(parts: Tuple[Any, ...], slot_values: Dict[str, bytes]) -> bytes:
+    out: List[bytes] = []
+    for part in parts:
+        if isinstance(part, bytes):
+            out.append(part)
+        elif isinstance(part, str):
+            out.append(slot_values[part])
+        else:
+            body = _render_stamp_parts(part.parts, slot_values)
+            out.append(part.tag_raw)
+            out.append(encode_varint(len(body)))
+            out.append(body)
+    return b"".join(out)
+
+
+def _compile_first_varint_slot(message_bytes: bytes, *, field_number: int, slot: str) -> Tuple[Any, ...]:
+    """等价于 `_patch_first_varint_field`：首个 varint 字段改为槽位；缺失时在末尾追加。"""
+    parts: List[Any] = []
+    replaced = False
+    for c in _parse_chunks(_decode_wire_chunks_checked(message_bytes)):
+        if c.field_number == int(field_number) and c.wire_type == 0 and not replaced:
+            parts.extend([c.tag_raw, slot])
+            replaced = True
+        else:
+            parts.append(c.tag_raw + c.value_raw)
+    if not replaced:
+        parts.extend([encode_tag(int(field_number), 0), slot])
+    return _freeze_stamp_parts(parts)
+
+
+def _encode_vector3_ld(x: float, y: float, z: float) -> bytes:
+    return _VECTOR3_LD_PREFIX + _VECTOR3_STRUCT.pack(0x0D, float(x), 0x15, float(y), 0x1D, float(z))
+
+
+@dataclass(frozen=True, slots=True)
+class _CompiledTransform:
+    parts: Tuple[Any, ...]
+    rot_tag_raw: bytes
+    # 模板原有的 rotation chunk（tag + value）；不存在时为空
+    rot_original_chunk: bytes
+    rot_original_payload: Optional[bytes]
+
+
+def _compile_transform_message(transform_bytes: bytes) -> _CompiledTransform:
+    """
+    transform：field_1=pos / field_2=rotation(deg) / field_3=scale，均为 Vector3-like message。
+    pos/scale 总是覆盖；rotation 仅在装饰物给出 yaw/rot 时按分量与模板原值合并（保留模板预旋转，如圆形 x=-90）。
+    """
+    parsed = _parse_chunks(_decode_wire_chunks_checked(transform_bytes))
+    parts: List[Any] = []
+    seen_ld = {1: False, 2: False, 3: False}
+    rot_tag_raw = encode_tag(2, 2)
+    rot_original_chunk = b""
+    rot_original_payload: Optional[bytes] = None
+    slot_by_field = {1: _SLOT_POS, 3: _SLOT_SCALE}
+
+    for c in parsed:
+        if c.wire_type == 2 and c.field_number in seen_ld and not seen_ld[c.field_number]:
+            seen_ld[c.field_number] = True
+            if c.field_number == 2:
+                rot_tag_raw = c.tag_raw
+                rot_original_chunk = c.tag_raw + c.value_raw
+                _lr0, rot_original_payload = _split_length_delimited(c.value_raw)
+                parts.append(_SLOT_ROT)
+            else:
+                parts.extend([c.tag_raw, slot_by_field[c.field_number]])
+            continue
+        parts.append(c.tag_raw + c.value_raw)
+
+    # 缺失字段按 pos → rotation → scale 的顺序追加
+    if not seen_ld[1]:
+        parts.extend([encode_tag(1, 2), _SLOT_POS])
+    if not seen_ld[2]:
+        parts.append(_SLOT_ROT)
+    if not seen_ld[3]:
+        parts.extend([encode_tag(3, 2), _SLOT_SCALE])
+
+    return _CompiledTransform(
+        parts=_freeze_stamp_parts(parts),
+        rot_tag_raw=bytes(rot_tag_raw),
+        rot_original_chunk=bytes(rot_original_chunk),
+        rot_original_payload=rot_original_payload,
+    )
+
+
+def _compile_accessory_payload(payload_bytes: bytes, *, parent_unit_id: int) -> Tuple[Tuple[Any, ...], _CompiledTransform]:
     # payload fields (observed in truth samples):
     # - 1: unit_id (varint)
     # - 2: template_id (varint)
     # - 4: repeated entries, one of which binds to parent id (entry.field_1 == 40; entry.field_50.message.field_502 = parent_id)
     # - 5: repeated entries, one of which contains field 11 (transform message)
-    patched = _patch_first_varint_field(payload_bytes, field_number=1, new_value=int(unit_id))
-    patched = _patch_first_varint_field(patched, field_number=2, new_value=int(template_id))
-
-    parsed = _parse_chunks(_decode_wire_chunks_checked(patched))
-    out_payload: List[Tuple[bytes, bytes]] = []
-    transform_patched = False
+    # parent_id 对同一实体的所有装饰物相同：编译时直接写入常量片段。
+    parts: List[Any] = []
+    unit_id_slotted = False
+    template_id_slotted = False
+    transform: Optional[_CompiledTransform] = None
     parent_bind_patched = False
 
-    for c in parsed:
-        if c.field_number == 5 and c.wire_type == 2 and not transform_patched:
+    for c in _parse_chunks(_decode_wire_chunks_checked(payload_bytes)):
+        if c.field_number == 1 and c.wire_type == 0 and not unit_id_slotted:
+            parts.extend([c.tag_raw, _SLOT_UNIT_ID])
+            unit_id_slotted = True
+            continue
+        if c.field_number == 2 and c.wire_type == 0 and not template_id_slotted:
+            parts.extend([c.tag_raw, _SLOT_TEMPLATE_ID])
+            template_id_slotted = True
+            continue
+
+        if c.field_number == 5 and c.wire_type == 2 and transform is None:
             _lr, entry_payload = _split_length_delimited(c.value_raw)
             if not _is_valid_message_payload(entry_payload):
-                out_payload.append((c.tag_raw, c.value_raw))
+                parts.append(c.tag_raw + c.value_raw)
                 continue
-            entry_parsed = _parse_chunks(_decode_wire_chunks_checked(entry_payload))
-            new_entry_chunks: List[Tuple[bytes, bytes]] = []
-            patched_entry = False
-            for ec in entry_parsed:
-                if ec.field_number == 11 and ec.wire_type == 2 and not patched_entry:
+            entry_parts: List[Any] = []
+            for ec in _parse_chunks(_decode_wire_chunks_checked(entry_payload)):
+                if ec.field_number == 11 and ec.wire_type == 2 and transform is None:
                     _lrr, transform_payload = _split_length_delimited(ec.value_raw)
                     if not _is_valid_message_payload(transform_payload):
-                        new_entry_chunks.append((ec.tag_raw, ec.value_raw))
+                        entry_parts.append(ec.tag_raw + ec.value_raw)
                         continue
-                    new_transform = _patch_transform_message(
-                        transform_payload, pos=pos, yaw_deg=yaw_deg, rot_deg=rot_deg, scale=scale
-                    )
-                    new_entry_chunks.append((ec.tag_raw, _wrap_length_delimited(new_transform)))
-                    patched_entry = True
+                    transform = _compile_transform_message(transform_payload)
+                    entry_parts.append(_StampField(tag_raw=ec.tag_raw, parts=transform.parts))
                 else:
-                    new_entry_chunks.append((ec.tag_raw, ec.value_raw))
-            if patched_entry:
-                out_payload.append((c.tag_raw, _wrap_length_delimited(encode_wire_chunks(new_entry_chunks))))
-                transform_patched = True
+                    entry_parts.append(ec.tag_raw + ec.value_raw)
+            if transform is not None:
+                parts.append(_StampField(tag_raw=c.tag_raw, parts=_freeze_stamp_parts(entry_parts)))
             else:
-                out_payload.append((c.tag_raw, c.value_raw))
+                parts.append(c.tag_raw + c.value_raw)
             continue
 
         if c.field_number == 4 and c.wire_type == 2 and not parent_bind_patched:
             _lr, entry_payload = _split_length_delimited(c.value_raw)
             if not _is_valid_message_payload(entry_payload):
-                out_payload.append((c.tag_raw, c.value_raw))
+                parts.append(c.tag_raw + c.value_raw)
                 continue
             entry_parsed = _parse_chunks(_decode_wire_chunks_checked(entry_payload))
 
@@ -470,10 +529,10 @@ def _patch_accessory_payload(
                         entry_key = int(v)
                     break
             if entry_key != 40:
-                out_payload.append((c.tag_raw, c.value_raw))
+                parts.append(c.tag_raw + c.value_raw)
                 continue
 
-            new_entry_chunks = []
+            new_entry_chunks: List[Tuple[bytes, bytes]] = []
             patched_entry = False
             for ec in entry_parsed:
                 if ec.field_number == 50 and ec.wire_type == 2 and not patched_entry:
@@ -487,114 +546,131 @@ def _patch_accessory_payload(
                 else:
                     new_entry_chunks.append((ec.tag_raw, ec.value_raw))
             if patched_entry:
-                out_payload.append((c.tag_raw, _wrap_length_delimited(encode_wire_chunks(new_entry_chunks))))
+                parts.append(c.tag_raw + _wrap_length_delimited(encode_wire_chunks(new_entry_chunks)))
                 parent_bind_patched = True
             else:
-                out_payload.append((c.tag_raw, c.value_raw))
+                parts.append(c.tag_raw + c.value_raw)
             continue
 
-        out_payload.append((c.tag_raw, c.value_raw))
+        parts.append(c.tag_raw + c.value_raw)
+
+    if not unit_id_slotted:
+        parts.extend([encode_tag(1, 0), _SLOT_UNIT_ID])
+    if not template_id_slotted:
+        parts.extend([encode_tag(2, 0), _SLOT_TEMPLATE_ID])
 
-    if not transform_patched:
+    if transform is None:
         raise ValueError("accessory payload: 找不到可补丁的 transform（field_5[*].field_11）")
     if not parent_bind_patched:
         raise ValueError("accessory payload: 找不到可补丁的 parent bind（field_4 entry key=40 / field_50.field_502）")
 
-    return encode_wire_chunks(out_payload)
-
-
-def _patch_accessory_unit(
-    unit_bytes: bytes,
-    *,
-    unit_id: int,
-    unit_name: str,
-    template_id: int,
-    parent_unit_id: int,
-    pos: Tuple[float, float, float],
-    yaw_deg: Optional[float],
-    rot_deg: Optional[Tuple[float, float, float]],
-    scale: Tuple[float, float, float],
-) -> bytes:
-    # Accessory GraphUnit:
-    # - field 1: Id message -> patch field 4
-    # - field 3: name string
-    # - wrapper field (unknown numeric in truth variants) -> message with field 1 containing payload message
-    parsed = _parse_chunks(_decode_wire_chunks_checked(unit_bytes))
-    out: List[Tuple[bytes, bytes]] = []
-    id_patched = False
-    name_patched = False
-    wrapper_patched = False
+    return _freeze_stamp_parts(parts), transform
 
-    for c in parsed:
-        if c.field_number == 1 and c.wire_type == 2 and not id_patched:
-            _lr, id_payload = _split_length_delimited(c.value_raw)
-            if not _is_valid_message_payload(id_payload):
-                raise ValueError("accessory unit: id payload 不是 message")
-            new_id_payload = _patch_first_varint_field(id_payload, field_number=4, new_value=int(unit_id))
-            out.append((c.tag_raw, _wrap_length_delimited(new_id_payload)))
-            id_patched = True
-            continue
 
-        if c.field_number == 3 and c.wire_type == 2 and not name_patched:
-            out.append((c.tag_raw, _wrap_length_delimited(str(unit_name).encode("utf-8"))))
-            name_patched = True
-            continue
+class _AccessoryUnitStamp:
+    """
+    装饰物 GraphUnit 模板的编译结果：
+    - field 1: Id message -> field 4 为 unit_id 槽位
+    - field 3: name string 槽位
+    - wrapper field（真源变体中字段号不固定）-> message.field_1 为 payload（unit_id/template_id/transform 槽位）
+    """
 
-        if c.wire_type == 2 and not wrapper_patched:
-            _lr, wrapper_payload = _split_length_delimited(c.value_raw)
-            if not _is_valid_message_payload(wrapper_payload):
-                out.append((c.tag_raw, c.value_raw))
+    def __init__(self, unit_bytes: bytes, *, parent_unit_id: int) -> None:
+        parts: List[Any] = []
+        id_patched = False
+        name_patched = False
+        transform: Optional[_CompiledTransform] = None
+
+        for c in _parse_chunks(_decode_wire_chunks_checked(unit_bytes)):
+            if c.field_number == 1 and c.wire_type == 2 and not id_patched:
+                _lr, id_payload = _split_length_delimited(c.value_raw)
+                if not _is_valid_message_payload(id_payload):
+                    raise ValueError("accessory unit: id payload 不是 message")
+                id_parts = _compile_first_varint_slot(id_payload, field_number=4, slot=_SLOT_UNIT_ID)
+                parts.append(_StampField(tag_raw=c.tag_raw, parts=id_parts))
+                id_patched = True
                 continue
-            wrapper_parsed = _parse_chunks(_decode_wire_chunks_checked(wrapper_payload))
 
-            # wrapper must contain field 1 as length-delimited payload message
-            has_field1 = False
-            for wc in wrapper_parsed:
-                if wc.field_number == 1 and wc.wire_type == 2:
-                    has_field1 = True
-                    break
-            if not has_field1:
-                out.append((c.tag_raw, c.value_raw))
+            if c.field_number == 3 and c.wire_type == 2 and not name_patched:
+                parts.extend([c.tag_raw, _SLOT_UNIT_NAME])
+                name_patched = True
                 continue
 
-            new_wrapper_chunks: List[Tuple[bytes, bytes]] = []
-            inner_patched = False
-            for wc in wrapper_parsed:
-                if wc.field_number == 1 and wc.wire_type == 2 and not inner_patched:
-                    _lrr, payload_bytes = _split_length_delimited(wc.value_raw)
-                    if not _is_valid_message_payload(payload_bytes):
-                        raise ValueError("accessory wrapper: payload(field_1) 不是 message")
-                    new_payload = _patch_accessory_payload(
-                        payload_bytes,
-                        unit_id=int(unit_id),
-                        unit_name=str(unit_name),
-                        template_id=int(template_id),
-                        parent_unit_id=int(parent_unit_id),
-                        pos=pos,
-                        yaw_deg=yaw_deg,
-                        rot_deg=rot_deg,
-                        scale=scale,
-                    )
-                    new_wrapper_chunks.append((wc.tag_raw, _wrap_length_delimited(new_payload)))
-                    inner_patched = True
-                else:
-                    new_wrapper_chunks.append((wc.tag_raw, wc.value_raw))
-            if not inner_patched:
-                raise ValueError("accessory wrapper: 缺少 payload(field_1)")
-            out.append((c.tag_raw, _wrap_length_delimited(encode_wire_chunks(new_wrapper_chunks))))
-            wrapper_patched = True
-            continue
+            if c.wire_type == 2 and transform is None:
+                _lr, wrapper_payload = _split_length_delimited(c.value_raw)
+                if not _is_valid_message_payload(wrapper_payload):
+                    parts.append(c.tag_raw + c.value_raw)
+                    continue
+                wrapper_parsed = _parse_chunks(_decode_wire_chunks_checked(wrapper_payload))
 
-        out.append((c.tag_raw, c.value_raw))
+                # wrapper must contain field 1 as length-delimited payload message
+                if not any(wc.field_number == 1 and wc.wire_type == 2 for wc in wrapper_parsed):
+                    parts.append(c.tag_raw + c.value_raw)
+                    continue
 
-    if not id_patched:
-        raise ValueError("accessory unit: 缺少 id(field_1)")
-    if not name_patched:
-        raise ValueError("accessory unit: 缺少 name(field_3)")
-    if not wrapper_patched:
-        raise ValueError("accessory unit: 找不到可补丁的 wrapper（含 field_1 payload 的 message）")
+                wrapper_parts: List[Any] = []
+                for wc in wrapper_parsed:
+                    if wc.field_number == 1 and wc.wire_type == 2 and transform is None:
+                        _lrr, payload_bytes = _split_length_delimited(wc.value_raw)
+                        if not _is_valid_message_payload(payload_bytes):
+                            raise ValueError("accessory wrapper: payload(field_1) 不是 message")
+                        payload_parts, transform = _compile_accessory_payload(payload_bytes, parent_unit_id=int(parent_unit_id))
+                        wrapper_parts.append(_StampField(tag_raw=wc.tag_raw, parts=payload_parts))
+                    else:
+                        wrapper_parts.append(wc.tag_raw + wc.value_raw)
+                parts.append(_StampField(tag_raw=c.tag_raw, parts=_freeze_stamp_parts(wrapper_parts)))
+                continue
 
-    return encode_wire_chunks(out)
+            parts.append(c.tag_raw + c.value_raw)
+
+        if not id_patched:
+            raise ValueError("accessory unit: 缺少 id(field_1)")
+        if not name_patched:
+            raise ValueError("accessory unit: 缺少 name(field_3)")
+        if transform is None:
+            raise ValueError("accessory unit: 找不到可补丁的 wrapper（含 field_1 payload 的 message）")
+
+        self._parts = _freeze_stamp_parts(parts)
+        self._transform = transform
+        self._rot_original_xyz: Optional[Tuple[Optional[float], Optional[float], Optional[float]]] = None
+
+    def _rotation_chunk(self, *, yaw_deg: Optional[float], rot_deg: Optional[Tuple[float, float, float]]) -> bytes:
+        want_rot: Optional[Tuple[Optional[float], Optional[float], Optional[float]]] = rot_deg
+        if want_rot is None and isinstance(yaw_deg, (int, float)):
+            want_rot = (None, float(yaw_deg), None)
+        if want_rot is None:
+            return self._transform.rot_original_chunk
+        if self._rot_original_xyz is None:
+            self._rot_original_xyz = _decode_vector3_message(self._transform.rot_original_payload or b"")
+        ex, ey, ez = self._rot_original_xyz
+        wx, wy, wz = want_rot
+        rot_payload = _build_rotation_message(
+            x=float(wx) if isinstance(wx, (int, float)) else ex,
+            y=float(wy) if isinstance(wy, (int, float)) else ey,
+            z=float(wz) if isinstance(wz, (int, float)) else ez,
+        )
+        return self._transform.rot_tag_raw + _wrap_length_delimited(rot_payload)
+
+    def stamp(
+        self,
+        *,
+        unit_id: int,
+        unit_name: str,
+        template_id: int,
+        pos: Tuple[float, float, float],
+        yaw_deg: Optional[float],
+        rot_deg: Optional[Tuple[float, float, float]],
+        scale: Tuple[float, float, float],
+    ) -> bytes:
+        slot_values = {
+            _SLOT_UNIT_ID: encode_varint(int(unit_id)),
+            _SLOT_UNIT_NAME: _wrap_length_delimited(str(unit_name).encode("utf-8")),
+            _SLOT_TEMPLATE_ID: encode_varint(int(template_id)),
+            _SLOT_POS: _encode_vector3_ld(pos[0], pos[1], pos[2]),
+            _SLOT_ROT: self._rotation_chunk(yaw_deg=yaw_deg, rot_deg=rot_deg),
+            _SLOT_SCALE: _encode_vector3_ld(scale[0], scale[1], scale[2]),
+        }
+        return _render_stamp_parts(self._parts, slot_values)
 
 
 def _patch_parent_related_ids(parent_unit_bytes: bytes, *, related_id_template: _Chunk, unit_ids: Sequence[int]) -> bytes:
@@ -629,10 +705,14 @@ def _patch_parent_related_ids(parent_unit_bytes: bytes, *, related_id_template:
     if not _is_valid_message_payload(related_template_payload):
         raise ValueError("relatedIds template payload 不是 message")
 
-    new_related_chunks: List[Tuple[bytes, bytes]] = []
-    for uid in unit_ids:
-        new_related_payload = _patch_first_varint_field(related_template_payload, field_number=4, new_value=int(uid))
-        new_related_chunks.append((related_id_template.tag_raw, _wrap_length_delimited(new_related_payload)))
+    related_parts = _compile_first_varint_slot(related_template_payload, field_number=4, slot=_SLOT_RELATED_UNIT_ID)
+    new_related_chunks: List[Tuple[bytes, bytes]] = [
+        (
+            related_id_template.tag_raw,
+            _wrap_length_delimited(_render_stamp_parts(related_parts, {_SLOT_RELATED_UNIT_ID: encode_varint(int(uid))})),
+        )
+        for uid in unit_ids
+    ]
 
     # splice into kept at remembered position (defaults to after field_1)
     kept = kept[:current_out_index] + new_related_chunks + kept[current_out_index:]
@@ -924,16 +1004,15 @@ def build_entity_gia_with_decorations_wire(
     new_parent_bytes = _patch_parent_related_ids(parent_bytes, related_id_template=related_id_template_chunk, unit_ids=unit_ids)
     new_parent_bytes = _patch_packed_ids_inside_parent_graph(new_parent_bytes, packed_ids=packed_ids)
 
-    # Build accessories
+    # Build accessories：模板编译一次，逐个装饰物只编码槽位值
+    accessory_stamp = _AccessoryUnitStamp(accessory_unit_template_bytes, parent_unit_id=int(parent_unit_id))
     new_accessory_units: List[bytes] = []
     for uid, dec in zip(unit_ids, decorations, strict=True):
         new_accessory_units.append(
-            _patch_accessory_unit(
-                accessory_unit_template_bytes,
+            accessory_stamp.stamp(
                 unit_id=int(uid),
                 unit_name=str(dec.name),
                 template_id=int(dec.template_id),
-                parent_unit_id=int(parent_unit_id),
                 pos=dec.pos,
                 yaw_deg=dec.yaw_deg,
                 rot_deg=dec.rot_deg,
@@ -69,18 +69,10 @@ def scan_instance_ids_by_name(*, gil_file_path: Path, decode_max_depth: int = 16
     if not p.is_file():
         raise FileNotFoundError(str(p))
 
-    from ugc_file_tools.gil_dump_codec.dump_json_tree import load_gil_payload_as_dump_json_object
-
-    dump_obj = load_gil_payload_as_dump_json_object(
-        p,
-        max_depth=int(decode_max_depth),
-        prefer_raw_hex_for_utf8=False,
-    )
-    payload_root = dump_obj.get("4")
-    if not isinstance(payload_root, dict):
-        raise TypeError("decoded payload_root is not dict")
-
-    instance_section = payload_root.get("5")
+    from ugc_file_tools.gil_dump_codec.gil_payload_view import get_gil_payload_view
+
+    # 只解码段 5（其余段不解码；同一文件的重复扫描复用共享缓存）
+    instance_section = get_gil_payload_view(p).get_section(5, max_depth=int(decode_max_depth), prefer_raw_hex_for_utf8=False)
     if not isinstance(instance_section, dict):
         return {}
 
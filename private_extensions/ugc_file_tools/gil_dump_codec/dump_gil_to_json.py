@@ -2,29 +2,167 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, TextIO
 
-from ugc_file_tools.gil_dump_codec.dump_json_tree import load_gil_payload_as_dump_json_object
+from ugc_file_tools.gil_dump_codec.gil_container import read_gil_payload_bytes
+from ugc_file_tools.gil_dump_codec.protobuf_like_view import MessageView, WireField
 
+# 与 load_gil_payload_as_dump_json_object(max_depth=32, prefer_raw_hex_for_utf8=False) 的口径一致
+_DUMP_MAX_DEPTH = 32
+# 累积到该字符数再写入文件句柄（减少小块 write 调用）
+_WRITE_CHUNK_CHARS = 1 << 16
 
-def dump_gil_to_json(gil_file_path: str, json_file_path: str) -> None:
+
+def dump_gil_to_json(
+    gil_file_path: str,
+    json_file_path: str,
+    *,
+    compact: bool = False,
+    split_sections: bool = False,
+) -> None:
     """
     纯 Python 实现：将 `.gil` 的 payload 解码为“数值键 JSON”（与历史 DLL dump-json 口径兼容）。
 
     输出 JSON 的顶层仍保持 `{"4": <payload_root>}` 形态（与现有工具链一致）：
     - `<payload_root>` 为 protobuf-like message 的数值键 dict（"1"/"2"/...），
       值为 int/float/str/"<binary_data> .."/dict/list 的组合。
+
+    流式输出：直接遍历 wire 结构边解码边写文件，不构造整棵 dict、也不拼接整份 JSON 字符串；
+    峰值内存约为“文件 bytes + 当前嵌套路径上的视图”。默认格式与 `json.dumps(..., indent=2)` 逐字节一致。
+
+    - compact=True：不缩进（separators=(",", ":")），体积更小；
+    - split_sections=True：每个顶层段写入 `<json 文件名>.sections/<段号>.json`，
+      主文件写为 `{"4": {"<段号>": "<相对路径>"}}` 索引。
     """
     input_path = Path(gil_file_path).resolve()
     if not input_path.is_file():
         raise FileNotFoundError(str(input_path))
 
-    dump_object: Dict[str, Any] = load_gil_payload_as_dump_json_object(input_path, max_depth=32, prefer_raw_hex_for_utf8=False)
-
+    root_view = _open_payload_root_view(input_path)
     output_path = Path(json_file_path).resolve()
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(json.dumps(dump_object, ensure_ascii=False, indent=2), encoding="utf-8")
 
+    if not bool(split_sections):
+        with output_path.open("w", encoding="utf-8") as stream:
+            write_gil_payload_json(root_view, stream, compact=bool(compact))
+        return
+
+    sections_dir = output_path.parent / f"{output_path.name}.sections"
+    sections_dir.mkdir(parents=True, exist_ok=True)
+    section_index: Dict[str, str] = {}
+    for field_number, bucket in root_view.grouped_fields().items():
+        section_path = sections_dir / f"{field_number}.json"
+        with section_path.open("w", encoding="utf-8") as stream:
+            writer = _JsonStreamWriter(stream, compact=bool(compact))
+            writer.write_bucket(bucket, level=0)
+            writer.flush()
+        section_index[str(field_number)] = section_path.relative_to(output_path.parent).as_posix()
+
+    index_text = json.dumps({"4": section_index}, ensure_ascii=False, **_json_dumps_format_kwargs(bool(compact)))
+    output_path.write_text(index_text, encoding="utf-8")
+
+
+def write_gil_payload_json(root_view: MessageView, stream: TextIO, *, compact: bool = False) -> None:
+    """将 payload 根视图以 `{"4": <payload_root>}` 形态流式写入文本句柄。"""
+    writer = _JsonStreamWriter(stream, compact=bool(compact))
+    writer.write("{")
+    writer.write_key('"4"', level=1, first=True)
+    writer.write_message(root_view, level=1)
+    writer.write(writer.newline(0) + "}")
+    writer.flush()
+
+
+def _open_payload_root_view(input_path: Path) -> MessageView:
+    payload_bytes = read_gil_payload_bytes(input_path)
+    root_view = MessageView(payload_bytes, remaining_depth=_DUMP_MAX_DEPTH)
+    if root_view.consumed_offset != len(payload_bytes):
+        raise ValueError(
+            "gil payload 未能完整解码为单个 message（存在 trailing bytes）："
+            f"consumed={root_view.consumed_offset}, total={len(payload_bytes)} path={str(input_path)!r}"
+        )
+    return root_view
+
+
+def _json_dumps_format_kwargs(compact: bool) -> Dict[str, Any]:
+    if compact:
+        return {"separators": (",", ":")}
+    return {"indent": 2}
+
+
+class _JsonStreamWriter:
+    """按 `json.dumps(indent=2 | separators=(",", ":"))` 的排版规则增量写出 numeric_message。"""
+
+    def __init__(self, stream: TextIO, *, compact: bool) -> None:
+        self._stream = stream
+        self._compact = bool(compact)
+        self._key_separator = ":" if self._compact else ": "
+        self._pending: List[str] = []
+        self._pending_chars = 0
+
+    def write(self, text: str) -> None:
+        self._pending.append(text)
+        self._pending_chars += len(text)
+        if self._pending_chars >= _WRITE_CHUNK_CHARS:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._pending:
+            self._stream.write("".join(self._pending))
+            self._pending = []
+            self._pending_chars = 0
+
+    def newline(self, level: int) -> str:
+        if self._compact:
+            return ""
+        return "\n" + "  " * level
+
+    def write_key(self, key_text: str, *, level: int, first: bool) -> None:
+        self.write(("" if first else ",") + self.newline(level) + key_text + self._key_separator)
+
+    def write_message(self, view: MessageView, *, level: int) -> None:
+        grouped = view.grouped_fields()
+        if not grouped:
+            self.write("{}")
+            return
+        self.write("{")
+        first = True
+        for field_number, bucket in grouped.items():
+            self.write_key(f'"{field_number}"', level=level + 1, first=first)
+            first = False
+            self.write_bucket(bucket, level=level + 1)
+        self.write(self.newline(level) + "}")
+
+    def write_bucket(self, bucket: List[WireField], *, level: int) -> None:
+        if len(bucket) == 1:
+            self.write_field(bucket[0], level=level)
+            return
+        self.write("[")
+        for index, field in enumerate(bucket):
+            self.write(("" if index == 0 else ",") + self.newline(level + 1))
+            self.write_field(field, level=level + 1)
+        self.write(self.newline(level) + "]")
+
+    def write_field(self, field: WireField, *, level: int) -> None:
+        if field.wire_type == 2:
+            nested = field.message()
+            if nested is not None:
+                self.write_message(nested, level=level)
+                # 已写出：丢弃该字段的嵌套视图树，保持内存只与当前路径相关
+                field.release()
+                return
+        self.write_value(field.to_numeric_value(prefer_raw_hex_for_utf8=False), level=level)
+        field.release()
+
+    def write_value(self, value: Any, *, level: int) -> None:
+        if isinstance(value, dict):
+            # 非 message 的 dict 仅有 fixed64 形态（{"fixed64_int": ...}）
+            self.write("{")
+            for index, (key, item) in enumerate(value.items()):
+                self.write_key(json.dumps(str(key), ensure_ascii=False), level=level + 1, first=index == 0)
+                self.write_value(item, level=level + 1)
+            self.write(self.newline(level) + "}")
+            return
+        self.write(json.dumps(value, ensure_ascii=False))
 
-__all__ = ["dump_gil_to_json"]
 
+__all__ = ["dump_gil_to_json", "write_gil_payload_json"]
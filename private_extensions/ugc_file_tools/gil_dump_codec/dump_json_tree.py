@@ -14,11 +14,9 @@ dump_json_tree.py
 """
 
 from pathlib import Path
-from typing import Any, Dict, List, Mapping
+from typing import Any, Dict, Iterable, List, Mapping
 
-from ugc_file_tools.gil_dump_codec.gil_container import read_gil_payload_bytes
-from ugc_file_tools.gil_dump_codec.protobuf_like import decode_message_to_field_map
-from ugc_file_tools.gil_dump_codec.protobuf_like_bridge import decoded_field_map_to_numeric_message
+from ugc_file_tools.gil_dump_codec.gil_payload_view import get_gil_payload_view
 
 
 def ensure_dict(parent: Dict[str, Any], key: str) -> Dict[str, Any]:
@@ -141,52 +139,50 @@ def load_gil_payload_as_dump_json_object(
 
     - `prefer_raw_hex_for_utf8=False`：更可读（倾向输出 utf8 string）
     - `prefer_raw_hex_for_utf8=True`：更保守（utf8 节点也优先用 raw_hex 转为 `<binary_data>`，便于 lossless roundtrip）
-    """
-    input_path = Path(gil_file_path).resolve()
-    if not input_path.is_file():
-        raise FileNotFoundError(str(input_path))
 
-    payload_bytes = read_gil_payload_bytes(input_path)
-    decoded_field_map, consumed_offset = decode_message_to_field_map(
-        data_bytes=payload_bytes,
-        start_offset=0,
-        end_offset=len(payload_bytes),
-        remaining_depth=int(max_depth),
-    )
-    if consumed_offset != len(payload_bytes):
-        raise ValueError(
-            "gil payload 未能完整解码为单个 message（存在 trailing bytes）："
-            f"consumed={consumed_offset}, total={len(payload_bytes)} path={str(input_path)!r}"
+    基于进程级共享的 `GilPayloadView`：同一文件（内容未变）重复加载时复用已解码的段，返回值为独立副本。
+    """
+    return {
+        "4": load_gil_payload_as_numeric_message(
+            gil_file_path,
+            max_depth=int(max_depth),
+            prefer_raw_hex_for_utf8=bool(prefer_raw_hex_for_utf8),
         )
+    }
 
-    payload_root = decoded_field_map_to_numeric_message(
-        decoded_field_map,
+
+def load_gil_payload_as_numeric_message(
+    gil_file_path: Path,
+    *,
+    max_depth: int = 32,
+    prefer_raw_hex_for_utf8: bool = False,
+) -> Dict[str, Any]:
+    """
+    统一入口：返回 `.gil` payload_root 的 numeric_message（等价于 `dump_obj['4']`）。
+    """
+    return get_gil_payload_view(Path(gil_file_path)).to_numeric_message(
+        max_depth=int(max_depth),
         prefer_raw_hex_for_utf8=bool(prefer_raw_hex_for_utf8),
     )
-    if not isinstance(payload_root, dict):
-        raise TypeError("decoded payload_root is not dict")
 
-    return {"4": dict(payload_root)}
 
-
-def load_gil_payload_as_numeric_message(
+def load_gil_payload_sections_as_numeric_message(
     gil_file_path: Path,
     *,
+    field_numbers: Iterable[int],
     max_depth: int = 32,
     prefer_raw_hex_for_utf8: bool = False,
 ) -> Dict[str, Any]:
     """
-    统一入口：返回 `.gil` payload_root 的 numeric_message（等价于 `dump_obj['4']`）。
+    只解码指定顶层段：返回 payload_root 的子集（缺失段不出现），其余段不解码。
+
+    适用于只读取个别段的扫描/检测（如实体摆放 `5`、模板 `4`、基础设施段），避免整份 payload 解码。
     """
-    dump_obj = load_gil_payload_as_dump_json_object(
-        gil_file_path,
+    return get_gil_payload_view(Path(gil_file_path)).to_numeric_message(
         max_depth=int(max_depth),
         prefer_raw_hex_for_utf8=bool(prefer_raw_hex_for_utf8),
+        field_numbers=field_numbers,
     )
-    payload_root = dump_obj.get("4")
-    if not isinstance(payload_root, dict):
-        raise TypeError("dump object missing key '4' (payload_root)")
-    return dict(payload_root)
 
 
 __all__ = [
@@ -198,5 +194,6 @@ __all__ = [
     "deep_replace_int_inplace",
     "load_gil_payload_as_dump_json_object",
     "load_gil_payload_as_numeric_message",
+    "load_gil_payload_sections_as_numeric_message",
 ]
 
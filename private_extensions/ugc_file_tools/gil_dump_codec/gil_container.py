@@ -26,6 +26,24 @@ def read_gil_container_spec(input_gil_file_path: Path) -> GilContainerSpec:
     )
 
 
+def split_gil_file_bytes(gil_bytes: bytes) -> tuple[bytes, GilContainerSpec]:
+    """
+    从已读入内存的 `.gil` 文件 bytes 中同时切出 payload 与容器头尾规格（避免同一文件被重复读盘）。
+    """
+    header = read_gil_header(gil_bytes)
+    start = 0x14
+    end = int(start + int(header.body_size))
+    if end > len(gil_bytes):
+        raise ValueError("gil payload range out of file size")
+    container_spec = GilContainerSpec(
+        header_value_one=int(header.header_value_one),
+        header_value_two=int(header.header_value_two),
+        type_id_value=int(header.type_id_value),
+        footer_value=int(header.footer_value),
+    )
+    return bytes(gil_bytes[start:end]), container_spec
+
+
 def read_gil_payload_bytes(input_gil_file_path: Path) -> bytes:
     """
     读取 `.gil` 文件的 payload bytes（不包含头尾封装）。
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+"""
+gil_payload_view.py
+
+`.gil` payload 的段级惰性视图 + 进程级共享解码缓存。
+
+动机：
+- 多数工具只关心个别顶层段（如 `10` 节点图、`5` 实体摆放、`4` 模板、`15`），
+  但 `load_gil_payload_as_*` 会把整份 payload 解到 depth=32 再整体转换为 numeric_message；
+- 一次导出/写回流程中同一份 base `.gil` 往往被多个步骤重复解码。
+
+约定：
+- 构造时只扫描顶层字段区间（`MessageView` 单层扫描）；每个段在首次访问时才按 (max_depth, prefer_raw_hex) 解码并缓存；
+- 对外返回的一律是缓存值的独立副本（调用方可随意修改，不会污染共享缓存）；
+- 缓存键为 (resolved path, size, mtime_ns, sha1)：文件内容变化（即使 mtime 未变）也会命中新条目；
+- LRU 同时受条目数与“估算内存权重”约束（payload 字节 + 已解码段字节 × 膨胀系数）。
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ugc_file_tools.gil_package_exporter.gil_reader import read_gil_header
+
+from .protobuf_like_view import MessageView, WireField
+
+GilPayloadCacheKey = Tuple[str, int, int, str]
+
+_GIL_HEADER_SIZE = 0x14
+_MAX_CACHED_VIEWS = 8
+_MAX_CACHE_WEIGHT_BYTES = 256 * 1024 * 1024
+# 经验值：numeric_message（dict/list/str/int）相对 wire bytes 的内存膨胀倍数
+_DECODED_WEIGHT_FACTOR = 16
+
+
+def copy_numeric_value(value: Any) -> Any:
+    """numeric_message 的结构化副本（dict/list 逐层复制，标量共享；比 copy.deepcopy 快一个量级）。"""
+    if isinstance(value, dict):
+        return {key: copy_numeric_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [copy_numeric_value(item) for item in value]
+    return value
+
+
+class GilPayloadView:
+    """单个 `.gil` 文件的 payload 视图（顶层段区间索引 + 按段惰性解码缓存）。"""
+
+    def __init__(self, *, path: Path, file_bytes: bytes, mtime_ns: int, sha1: str) -> None:
+        header = read_gil_header(file_bytes)
+        body_size = int(header.body_size)
+        end = _GIL_HEADER_SIZE + body_size
+        if end > len(file_bytes):
+            raise ValueError("gil payload range out of file size")
+
+        self.path = Path(path)
+        self.file_size = len(file_bytes)
+        self.mtime_ns = int(mtime_ns)
+        self.sha1 = str(sha1)
+        self.header = header
+        self.file_bytes = file_bytes
+        self.payload = memoryview(file_bytes)[_GIL_HEADER_SIZE:end]
+
+        self._lock = threading.Lock()
+        self._root_views: Dict[int, MessageView] = {}
+        self._decoded_sections: Dict[Tuple[int, int, bool], Any] = {}
+        self._decoded_bytes = 0
+
+    @property
+    def cache_key(self) -> GilPayloadCacheKey:
+        return (str(self.path), int(self.file_size), int(self.mtime_ns), str(self.sha1))
+
+    @property
+    def weight(self) -> int:
+        return int(self.file_size) + int(self._decoded_bytes) * _DECODED_WEIGHT_FACTOR
+
+    def payload_bytes(self) -> bytes:
+        return self.payload.tobytes()
+
+    # -------- 顶层段索引 --------
+    def _root_view(self, max_depth: int) -> MessageView:
+        root_view = self._root_views.get(int(max_depth))
+        if root_view is None:
+            root_view = MessageView(self.payload, remaining_depth=int(max_depth))
+            consumed_offset = root_view.consumed_offset
+            if consumed_offset != len(self.payload):
+                raise ValueError(
+                    "gil payload 未能完整解码为单个 message（存在 trailing bytes）："
+                    f"consumed={consumed_offset}, total={len(self.payload)} path={str(self.path)!r}"
+                )
+            self._root_views[int(max_depth)] = root_view
+        return root_view
+
+    def field_numbers(self) -> List[int]:
+        """顶层段号（按首次出现顺序）。"""
+        with self._lock:
+            return list(self._root_view(32).grouped_fields().keys())
+
+    def has_section(self, field_number: int) -> bool:
+        with self._lock:
+            return self._root_view(32).first(int(field_number)) is not None
+
+    def section_spans(self, field_number: int) -> List[Tuple[int, int]]:
+        """顶层段在 payload 内的值区间（wire_type=2 时不含长度前缀），repeated 段返回多个。"""
+        with self._lock:
+            return [(field.start, field.end) for field in self._root_view(32).iter_fields(int(field_number))]
+
+    # -------- 按段解码 --------
+    def _decoded_section(self, fields: List[WireField], *, max_depth: int, prefer_raw_hex_for_utf8: bool) -> Any:
+        cache_key = (int(fields[0].field_number), int(max_depth), bool(prefer_raw_hex_for_utf8))
+        if cache_key in self._decoded_sections:
+            return self._decoded_sections[cache_key]
+        if len(fields) == 1:
+            value: Any = fields[0].to_numeric_value(prefer_raw_hex_for_utf8=prefer_raw_hex_for_utf8)
+        else:
+            value = [field.to_numeric_value(prefer_raw_hex_for_utf8=prefer_raw_hex_for_utf8) for field in fields]
+        self._decoded_sections[cache_key] = value
+        self._decoded_bytes += sum(field.length for field in fields)
+        for field in fields:
+            # 已缓存 numeric 值：释放该段的嵌套视图树，只保留顶层区间
+            field.release()
+        return value
+
+    def get_section(
+        self,
+        field_number: int,
+        *,
+        max_depth: int = 32,
+        prefer_raw_hex_for_utf8: bool = False,
+    ) -> Any:
+        """返回顶层段 `payload_root[str(field_number)]` 的 numeric 值副本；段缺失时返回 None。"""
+        with self._lock:
+            fields = list(self._root_view(max_depth).iter_fields(int(field_number)))
+            if not fields:
+                return None
+            value = self._decoded_section(fields, max_depth=max_depth, prefer_raw_hex_for_utf8=prefer_raw_hex_for_utf8)
+        _trim_cache()
+        return copy_numeric_value(value)
+
+    def to_numeric_message(
+        self,
+        *,
+        max_depth: int = 32,
+        prefer_raw_hex_for_utf8: bool = False,
+        field_numbers: Optional[Iterable[int]] = None,
+    ) -> Dict[str, Any]:
+        """组装 payload_root 的 numeric_message 副本；提供 field_numbers 时只解码并返回这些段（缺失段不出现）。"""
+        wanted = None if field_numbers is None else {int(number) for number in field_numbers}
+        message: Dict[str, Any] = {}
+        with self._lock:
+            for field_number, fields in self._root_view(max_depth).grouped_fields().items():
+                if wanted is not None and field_number not in wanted:
+                    continue
+                value = self._decoded_section(fields, max_depth=max_depth, prefer_raw_hex_for_utf8=prefer_raw_hex_for_utf8)
+                message[str(field_number)] = copy_numeric_value(value)
+        _trim_cache()
+        return message
+
+
+_cache_lock = threading.Lock()
+_cached_views: "OrderedDict[GilPayloadCacheKey, GilPayloadView]" = OrderedDict()
+
+
+def get_gil_payload_view(gil_file_path: Path) -> GilPayloadView:
+    """获取 `.gil` 的共享 payload 视图（进程级 LRU，按 (path, size, mtime_ns, sha1) 命中）。"""
+    path = Path(gil_file_path).resolve()
+    if not path.is_file():
+        raise FileNotFoundError(str(path))
+    stat_result = path.stat()
+    file_bytes = path.read_bytes()
+    sha1 = hashlib.sha1(file_bytes).hexdigest()
+    cache_key: GilPayloadCacheKey = (str(path), int(len(file_bytes)), int(stat_result.st_mtime_ns), sha1)
+
+    with _cache_lock:
+        view = _cached_views.get(cache_key)
+        if view is not None:
+            _cached_views.move_to_end(cache_key)
+            return view
+
+    view = GilPayloadView(path=path, file_bytes=file_bytes, mtime_ns=int(stat_result.st_mtime_ns), sha1=sha1)
+    with _cache_lock:
+        existing = _cached_views.get(cache_key)
+        if existing is not None:
+            _cached_views.move_to_end(cache_key)
+            return existing
+        # 同一路径的旧版本不会再被命中，直接淘汰
+        for stale_key in [key for key in _cached_views if key[0] == cache_key[0]]:
+            del _cached_views[stale_key]
+        _cached_views[cache_key] = view
+    _trim_cache()
+    return view
+
+
+def _trim_cache() -> None:
+    with _cache_lock:
+        while len(_cached_views) > _MAX_CACHED_VIEWS:
+            _cached_views.popitem(last=False)
+        # 至少保留最近使用的一个条目（单个超大文件也要能复用）
+        while len(_cached_views) > 1 and sum(view.weight for view in _cached_views.values()) > _MAX_CACHE_WEIGHT_BYTES:
+            _cached_views.popitem(last=False)
+
+
+def clear_gil_payload_view_cache(gil_file_path: Optional[Path] = None) -> None:
+    """丢弃指定文件（或全部）的共享视图。"""
+    with _cache_lock:
+        if gil_file_path is None:
+            _cached_views.clear()
+            return
+        path_text = str(Path(gil_file_path).resolve())
+        for stale_key in [key for key in _cached_views if key[0] == path_text]:
+            del _cached_views[stale_key]
+
+
+__all__ = [
+    "GilPayloadView",
+    "copy_numeric_value",
+    "get_gil_payload_view",
+    "clear_gil_payload_view_cache",
+]
@@ -3,7 +3,7 @@ from __future__ import annotations
 import base64
 import hashlib
 import struct
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 
 JsonValue = Any
@@ -18,18 +18,126 @@ def encode_message(message_object: Dict[str, Any]) -> bytes:
     - float -> wire_type=5 (fixed32 float)
     - str -> wire_type=2 (utf-8 string)
     - "<binary_data> XX ..." -> wire_type=2 (bytes)
+    - bytes / bytearray / memoryview -> wire_type=2 (bytes，原样写入，无需 hex 文本往返)
     - dict -> wire_type=2 (nested message)
     - list -> repeated field（对每个元素单独写入一次同 field_number 的 tag+value）
+
+    实现：单趟遍历把所有片段按写出顺序追加到同一个扁平列表，嵌套 message 的长度在子树遍历结束时回填
+    （不再为每层嵌套生成中间 bytes）；最后由 `b"".join` 一次性拼接输出（单次分配与拷贝）。
     """
     if not isinstance(message_object, dict):
         raise TypeError(f"encode_message expects dict[str, Any], got {type(message_object)}")
 
-    chunks: List[bytes] = []
-    for field_key in _sorted_field_keys(message_object.keys()):
-        value = message_object[field_key]
-        field_number = _parse_field_number(field_key)
-        chunks.extend(_encode_field_value(field_number, value))
-    return b"".join(chunks)
+    pieces: List[Any] = []
+    _append_message_pieces(message_object, pieces)
+    return b"".join(pieces)
+
+
+# 小整数 varint 预编码表（覆盖绝大多数 tag / 长度 / 枚举值）
+_SMALL_VARINT_LIMIT = 1 << 14
+_SMALL_VARINTS: Tuple[bytes, ...] = tuple(
+    bytes((value,)) if value < 0x80 else bytes(((value & 0x7F) | 0x80, value >> 7))
+    for value in range(_SMALL_VARINT_LIMIT)
+)
+
+# 字段编码计划缓存：dict 键序列（插入顺序）→ ((key, field_number), ...)，避免每次编码都排序/解析键
+_FIELD_PLAN_CACHE: Dict[Tuple[Any, ...], Tuple[Tuple[str, int], ...]] = {}
+_FIELD_PLAN_CACHE_MAX_ENTRIES = 4096
+
+_BINARY_LIKE_TYPES = (bytes, bytearray, memoryview)
+
+
+def _varint_bytes(value: int) -> bytes:
+    if 0 <= value < _SMALL_VARINT_LIMIT:
+        return _SMALL_VARINTS[value]
+    return encode_varint(value)
+
+
+def _field_plan(message_object: Dict[str, Any]) -> Tuple[Tuple[str, int], ...]:
+    keys = tuple(message_object)
+    plan = _FIELD_PLAN_CACHE.get(keys)
+    if plan is None:
+        plan = tuple((field_key, _parse_field_number(field_key)) for field_key in _sorted_field_keys(keys))
+        if len(_FIELD_PLAN_CACHE) >= _FIELD_PLAN_CACHE_MAX_ENTRIES:
+            _FIELD_PLAN_CACHE.clear()
+        _FIELD_PLAN_CACHE[keys] = plan
+    return plan
+
+
+def _append_message_pieces(message_object: Dict[str, Any], pieces: List[Any]) -> int:
+    size = 0
+    for field_key, field_number in _field_plan(message_object):
+        size += _append_field_pieces(field_number, message_object[field_key], pieces)
+    return size
+
+
+def _append_field_pieces(field_number: int, value: Any, pieces: List[Any]) -> int:
+    """按写出顺序追加一个字段（repeated 时为多个）的 wire 片段，返回追加的总字节数。"""
+    if isinstance(value, list):
+        size = 0
+        for element in value:
+            size += _append_field_pieces(field_number, element, pieces)
+        return size
+
+    if isinstance(value, dict):
+        # 兼容“decoded_field_map 风格节点”的 fixed64 表示：
+        # - {"fixed64_int": <u64>} 或 {"fixed64_double": <float>}（或两者同时存在）
+        # 说明：该形态不会与 nested message 冲突（nested message 的 key 只会是数字字符串）。
+        if "fixed64_int" in value or "fixed64_double" in value:
+            raw_u64 = value.get("fixed64_int")
+            if isinstance(raw_u64, int):
+                chunk = encode_tag(field_number, 1) + int(raw_u64).to_bytes(8, byteorder="little", signed=False)
+            else:
+                raw_f64 = value.get("fixed64_double")
+                if not isinstance(raw_f64, (float, int)):
+                    raise TypeError(f"unsupported fixed64 node for field {field_number}: {value!r}")
+                chunk = encode_tag(field_number, 1) + struct.pack("<d", float(raw_f64))
+            pieces.append(chunk)
+            return len(chunk)
+        # 先占位，子树遍历结束后回填 tag + 长度
+        slot = len(pieces)
+        pieces.append(b"")
+        nested_size = _append_message_pieces(value, pieces)
+        head = _tag_bytes(field_number, 2) + _varint_bytes(nested_size)
+        pieces[slot] = head
+        return len(head) + nested_size
+
+    if isinstance(value, bool):
+        # dump-json 通常不会直接输出 bool；为稳妥起见按 varint 处理
+        chunk = _tag_bytes(field_number, 0) + (b"\x01" if value else b"\x00")
+    elif isinstance(value, int):
+        chunk = _tag_bytes(field_number, 0) + _varint_bytes(value if value >= 0 else value & 0xFFFFFFFF)
+    elif isinstance(value, float):
+        chunk = _tag_bytes(field_number, 5) + struct.pack("<f", value)
+    elif isinstance(value, str):
+        if value.startswith("<binary_data>"):
+            raw_bytes = parse_binary_data_hex_text(value)
+        else:
+            raw_bytes = value.encode("utf-8")
+        head = _tag_bytes(field_number, 2) + _varint_bytes(len(raw_bytes))
+        pieces.append(head)
+        pieces.append(raw_bytes)
+        return len(head) + len(raw_bytes)
+    elif isinstance(value, _BINARY_LIKE_TYPES):
+        # 原始 bytes 直接作为 length-delimited payload（memoryview 零拷贝参与最终拼接）
+        if isinstance(value, memoryview) and value.format != "B":
+            value = value.cast("B")
+        payload_size = len(value)
+        head = _tag_bytes(field_number, 2) + _varint_bytes(payload_size)
+        pieces.append(head)
+        pieces.append(value)
+        return len(head) + payload_size
+    else:
+        raise TypeError(f"unsupported value type for field {field_number}: {type(value).__name__}")
+    pieces.append(chunk)
+    return len(chunk)
+
+
+def _tag_bytes(field_number: int, wire_type: int) -> bytes:
+    tag_value = (field_number << 3) | wire_type
+    if tag_value < _SMALL_VARINT_LIMIT:
+        return _SMALL_VARINTS[tag_value]
+    return encode_tag(field_number, wire_type)
 
 
 def _sorted_field_keys(keys: Iterable[str]) -> List[str]:
@@ -54,77 +162,17 @@ def _parse_field_number(field_key: str) -> int:
     return field_number
 
 
-def _encode_field_value(field_number: int, value: Any) -> List[bytes]:
-    if isinstance(value, list):
-        chunks: List[bytes] = []
-        for element in value:
-            chunks.extend(_encode_field_value(field_number, element))
-        return chunks
+def iter_message_fields(message_object: Dict[str, Any]) -> Iterator[Tuple[int, Any]]:
+    """按 `encode_message` 的写出顺序产出 (field_number, value)；repeated 字段的 value 为 list。"""
+    for field_key, field_number in _field_plan(message_object):
+        yield field_number, message_object[field_key]
 
-    if isinstance(value, dict):
-        # 兼容“decoded_field_map 风格节点”的 fixed64 表示：
-        # - {"fixed64_int": <u64>} 或 {"fixed64_double": <float>}（或两者同时存在）
-        # 说明：该形态不会与 nested message 冲突（nested message 的 key 只会是数字字符串）。
-        if "fixed64_int" in value or "fixed64_double" in value:
-            raw_u64 = value.get("fixed64_int")
-            if isinstance(raw_u64, int):
-                return [
-                    encode_tag(field_number, 1),
-                    int(raw_u64).to_bytes(8, byteorder="little", signed=False),
-                ]
-            raw_f64 = value.get("fixed64_double")
-            if isinstance(raw_f64, (float, int)):
-                return [
-                    encode_tag(field_number, 1),
-                    struct.pack("<d", float(raw_f64)),
-                ]
-            raise TypeError(
-                f"unsupported fixed64 node for field {field_number}: {value!r}"
-            )
-        nested_bytes = encode_message(value)
-        return [
-            encode_tag(field_number, 2),
-            encode_varint(len(nested_bytes)),
-            nested_bytes,
-        ]
 
-    if isinstance(value, bool):
-        # dump-json 通常不会直接输出 bool；为稳妥起见按 varint 处理
-        return [
-            encode_tag(field_number, 0),
-            encode_varint(1 if value else 0),
-        ]
-
-    if isinstance(value, int):
-        return [
-            encode_tag(field_number, 0),
-            encode_varint(value),
-        ]
-
-    if isinstance(value, float):
-        return [
-            encode_tag(field_number, 5),
-            struct.pack("<f", float(value)),
-        ]
-
-    if isinstance(value, str):
-        if value.startswith("<binary_data>"):
-            raw_bytes = parse_binary_data_hex_text(value)
-            return [
-                encode_tag(field_number, 2),
-                encode_varint(len(raw_bytes)),
-                raw_bytes,
-            ]
-        encoded = value.encode("utf-8")
-        return [
-            encode_tag(field_number, 2),
-            encode_varint(len(encoded)),
-            encoded,
-        ]
-
-    raise TypeError(
-        f"unsupported value type for field {field_number}: {type(value).__name__}"
-    )
+def encode_field(field_number: int, value: Any) -> bytes:
+    """编码单个字段（与 `encode_message` 内的字段编码一致；list 视为 repeated，逐元素写入 tag+value）。"""
+    pieces: List[Any] = []
+    _append_field_pieces(int(field_number), value, pieces)
+    return b"".join(pieces)
 
 
 def encode_tag(field_number: int, wire_type: int) -> bytes:
@@ -328,60 +376,6 @@ def _sanitize_utf8_text_for_decode_gil(text: str) -> tuple[str, bool]:
     return str(stripped_text), bool(removed_controls)
 
 
-def _decode_length_delimited_to_decoded_node(field_bytes: bytes, remaining_depth: int) -> Any:
-    """
-    decode_gil 风格（lossless 优先）的 length-delimited 解码：
-    - 优先尝试 UTF-8 可读文本（返回 {raw_hex, utf8}）
-    - 否则尝试嵌套 message（返回 {message: {...}}）
-    - 否则返回 {raw_hex}
-
-    注意：该输出结构会被 node_graph_writeback 用作“可修改并可回写”的中间表示，因此：
-    - packed 不会展开为 list（避免回写时语义漂移）；必要信息通过 raw_hex 保留。
-    """
-    if len(field_bytes) == 0:
-        return {"raw_hex": ""}
-
-    raw_hex = field_bytes.hex()
-
-    # 文本判定：统一采用严格 UTF-8（errors=replace 且不允许出现 U+FFFD）+ printable 比例阈值
-    decoded_text = field_bytes.decode("utf-8", errors="replace")
-    if "\ufffd" not in decoded_text and _is_probably_printable_text(decoded_text):
-        cleaned_text, removed_controls = _sanitize_utf8_text_for_decode_gil(decoded_text)
-        value_object: Dict[str, Any] = {"raw_hex": raw_hex}
-        # 关键：若清理过程中剔除了非 printable 控制字符，则视为“更像 bytes/blob”，不要写入 utf8 字段。
-        # 否则在 dump-json → numeric_message → encode_message 的链路中会把 bytes 误写成字符串并造成 payload 漂移。
-        if cleaned_text != "" and (not bool(removed_controls)):
-            value_object["utf8"] = cleaned_text
-        return value_object
-
-    # packed varint stream 探测（保持 raw_hex，不误判为嵌套 message）：
-    # - 典型场景：UI record 的 children GUID 列表（varint stream）在少数情况下会“碰巧可被当作 message 解码”，
-    #   从而导致 writeback/export 时把原始 bytes 误写成 nested message（游戏侧可能拒绝解析）。
-    # - 这里不展开为 list（仍然保持 raw_hex 以便 lossless roundtrip），仅用于阻止错误的 message 识别。
-    packed_varints = _parse_packed_varints(field_bytes, max_items=256)
-    if packed_varints is not None:
-        # 经验：GUID 大多落在 0x40000000 段（约 1.07e9），用范围过滤避免误判普通嵌套 message。
-        guid_like = 0
-        for v in packed_varints:
-            if 1073000000 <= int(v) <= 1075000000:
-                guid_like += 1
-        if guid_like / max(len(packed_varints), 1) >= 0.8:
-            return {"raw_hex": raw_hex}
-
-    # 非文本：尝试嵌套 message（深度允许时）
-    if remaining_depth > 1:
-        nested_message, nested_consumed_offset = decode_message_to_field_map(
-            data_bytes=field_bytes,
-            start_offset=0,
-            end_offset=len(field_bytes),
-            remaining_depth=remaining_depth - 1,
-        )
-        if len(nested_message) > 0 and nested_consumed_offset == len(field_bytes):
-            return {"message": nested_message}
-
-    return {"raw_hex": raw_hex}
-
-
 def decode_message_to_field_map(
     *,
     data_bytes: bytes,
@@ -401,6 +395,9 @@ def decode_message_to_field_map(
       - length-delimited: {"raw_hex": str, "utf8"?: str} 或 {"message": {...}}
 
     重要：本实现会将 tag=0 / field_number<=0 视为非法并停止解析，避免产出 field_0 导致回写 encoder 抛错。
+
+    实现：基于 `protobuf_like_view.MessageView` 在同一个 memoryview 上按区间解码（不逐层复制 bytes）；
+    只需访问部分字段时请直接使用 `MessageView` / `LazyDecodedFieldMap`，按需物化。
     """
     if remaining_depth <= 0:
         return {}, start_offset
@@ -412,103 +409,11 @@ def decode_message_to_field_map(
     if end_offset > len(data_bytes):
         raise ValueError(f"end_offset out of range: end_offset={end_offset}, size={len(data_bytes)}")
 
-    fields_map: Dict[str, Any] = {}
-    current_offset = start_offset
+    # 延迟导入：视图模块复用本模块的文本判定 helper
+    from .protobuf_like_view import MessageView
 
-    def _append(field_number: int, value_object: Any) -> None:
-        field_key = "field_" + str(field_number)
-        existing_value = fields_map.get(field_key)
-        if existing_value is None:
-            fields_map[field_key] = value_object
-            return
-        if isinstance(existing_value, list):
-            existing_value.append(value_object)
-            return
-        fields_map[field_key] = [existing_value, value_object]
-
-    while current_offset < end_offset:
-        tag_value, current_offset, ok = decode_varint(data_bytes, current_offset, end_offset)
-        if not ok:
-            break
-        if tag_value == 0:
-            break
-
-        field_number = tag_value >> 3
-        wire_type = tag_value & 0x07
-        if field_number <= 0:
-            break
-
-        if wire_type == 0:
-            value, current_offset, ok = decode_varint(data_bytes, current_offset, end_offset)
-            if not ok:
-                break
-            if 0 <= value <= 0xFFFFFFFF:
-                lower32 = value & 0xFFFFFFFF
-                high16 = lower32 >> 16
-                low16 = lower32 & 0xFFFF
-                value_object = {
-                    "int": int(value),
-                    "int32_high16": int(high16),
-                    "int32_low16": int(low16),
-                }
-            else:
-                value_object = {
-                    "int": int(value),
-                }
-            _append(int(field_number), value_object)
-            continue
-
-        if wire_type == 1:
-            if current_offset + 8 > end_offset:
-                break
-            raw_bytes = data_bytes[current_offset : current_offset + 8]
-            current_offset += 8
-            integer_value = int.from_bytes(raw_bytes, byteorder="little", signed=False)
-            float_value = struct.unpack("<d", raw_bytes)[0]
-            _append(
-                int(field_number),
-                {
-                    "fixed64_int": int(integer_value),
-                    "fixed64_double": float(float_value),
-                },
-            )
-            continue
-
-        if wire_type == 5:
-            if current_offset + 4 > end_offset:
-                break
-            raw_bytes = data_bytes[current_offset : current_offset + 4]
-            current_offset += 4
-            integer_value = int.from_bytes(raw_bytes, byteorder="little", signed=False)
-            float_value = struct.unpack("<f", raw_bytes)[0]
-            _append(
-                int(field_number),
-                {
-                    "fixed32_int": int(integer_value),
-                    "fixed32_float": float(float_value),
-                },
-            )
-            continue
-
-        if wire_type == 2:
-            length_value, current_offset, ok = decode_varint(data_bytes, current_offset, end_offset)
-            if not ok:
-                break
-            length_int = int(length_value)
-            if length_int < 0:
-                break
-            if current_offset + length_int > end_offset:
-                break
-            field_bytes = data_bytes[current_offset : current_offset + length_int]
-            current_offset += length_int
-            value_object = _decode_length_delimited_to_decoded_node(field_bytes, remaining_depth)
-            _append(int(field_number), value_object)
-            continue
-
-        # 其他 wire_type（3/4 group 等）暂不支持
-        break
-
-    return fields_map, current_offset
+    view = MessageView(data_bytes, start_offset, end_offset, remaining_depth=remaining_depth)
+    return view.to_field_map(), view.consumed_offset
 
 
 def _bytes_to_sha1_hex(byte_data: bytes) -> str:
@@ -608,6 +513,10 @@ def parse_message(
     if end_offset > len(byte_data):
         raise ValueError(f"end_offset out of range: end_offset={end_offset}, size={len(byte_data)}")
 
+    if not isinstance(byte_data, memoryview):
+        # 整段 payload 只包一层 memoryview：length-delimited 子区间切片为零拷贝视图
+        byte_data = memoryview(byte_data)
+
     current_offset = start_offset
     message_fields: Dict[str, List[JsonValue]] = {}
     total_entries = 0
@@ -789,7 +698,7 @@ def interpret_length_delimited(byte_data: bytes, depth: int, options: ProtobufLi
         return {"kind": "bytes", "length": 0, "sha1": sha1_hex, "preview_hex": ""}
 
     if byte_length <= options.max_length_delimited_string_bytes:
-        decoded_text = byte_data.decode("utf-8", errors="replace")
+        decoded_text = str(byte_data, "utf-8", "replace")
         if "\ufffd" not in decoded_text and _is_probably_printable_text(decoded_text):
             return {"kind": "string", "text": decoded_text}
 
@@ -835,18 +744,13 @@ def parse_binary_data_hex_text(text: str) -> bytes:
         return b""
     if len(compact) % 2 != 0:
         raise ValueError("binary_data hex length must be even")
-    hexdigits = "0123456789abcdefABCDEF"
-    if any(ch not in hexdigits for ch in compact):
-        raise ValueError("binary_data hex contains non-hex digits")
+    # 非 hex 字符由 bytes.fromhex 自身抛出 ValueError（不再逐字符预检查）
     return bytes.fromhex(compact)
 
 
 def format_binary_data_hex_text(data: bytes) -> str:
     if not isinstance(data, (bytes, bytearray)):
         raise TypeError(f"data must be bytes, got {type(data).__name__}")
-    data_bytes = bytes(data)
-    if not data_bytes:
-        return "<binary_data> "
-    return "<binary_data> " + " ".join(f"{b:02X}" for b in data_bytes)
+    return "<binary_data> " + bytes(data).hex(" ").upper()
 
 
@@ -47,11 +47,12 @@ def decoded_node_to_numeric_value(node: Any, *, prefer_raw_hex_for_utf8: bool) -
     if isinstance(node, list):
         return [decoded_node_to_numeric_value(item, prefer_raw_hex_for_utf8=prefer_raw_hex_for_utf8) for item in node]
 
-    if not isinstance(node, dict):
+    if not isinstance(node, Mapping):
         raise TypeError(f"decoded node must be dict/list, got {type(node).__name__}")
 
+    # Mapping：兼容 `protobuf_like_view.LazyDecodedFieldMap`（按需物化的 field_map 适配器）
     nested = node.get("message")
-    if isinstance(nested, dict):
+    if isinstance(nested, Mapping):
         return decoded_field_map_to_numeric_message(nested, prefer_raw_hex_for_utf8=prefer_raw_hex_for_utf8)
 
     if "int" in node:
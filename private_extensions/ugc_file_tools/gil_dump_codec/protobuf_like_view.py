@@ -0,0 +1,430 @@
+from __future__ import annotations
+
+"""
+protobuf_like_view.py
+
+零拷贝的 protobuf-like message 视图：整个 payload 只持有一个 `memoryview`，字段以 (offset, length) 区间表示。
+
+与 `decode_message_to_field_map` 的区别：
+- 扫描只进行一层：嵌套 message 在首次访问时才扫描；
+- bytes/str/hex/节点 dict 只在访问时物化（length-delimited 字段不再逐层切片复制）；
+- 判定口径（文本 / packed GUID 列表 / 嵌套 message / raw bytes）与 `decode_message_to_field_map` 完全一致，
+  `MessageView.to_field_map()` 的输出与其逐字段相等，`LazyDecodedFieldMap` 为按需物化的同形态适配器；
+- `MessageView.to_numeric_message()` 直接产出 `decoded_field_map_to_numeric_message(...)` 的等价结果，
+  跳过 field_map 中间层（不再为每个 varint/fixed 字段分配节点 dict、为每段 bytes 生成 raw_hex）。
+"""
+
+import struct
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from .protobuf_like import (
+    _is_probably_printable_text,
+    _sanitize_utf8_text_for_decode_gil,
+)
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+# length-delimited 字段的判定结果
+_KIND_RAW = 0
+_KIND_TEXT = 1
+_KIND_MESSAGE = 2
+
+_GUID_MIN = 1073000000
+_GUID_MAX = 1075000000
+_MAX_PACKED_ITEMS = 256
+
+
+def _read_varint(buffer: memoryview, offset: int, end_offset: int) -> Tuple[int, int]:
+    """返回 (value, next_offset)；失败时 value=-1，next_offset 与 `decode_varint` 失败时的位置一致。"""
+    value = 0
+    shift_bits = 0
+    while offset < end_offset:
+        current_byte = buffer[offset]
+        offset += 1
+        value |= (current_byte & 0x7F) << shift_bits
+        if current_byte < 0x80:
+            return value, offset
+        shift_bits += 7
+        if shift_bits >= 64:
+            return -1, offset
+    return -1, offset
+
+
+def format_binary_data_hex_view(data: BytesLike) -> str:
+    """与 `format_binary_data_hex_text` 等价（大写、空格分隔），直接作用于 memoryview 不复制。"""
+    return "<binary_data> " + memoryview(data).hex(" ").upper()
+
+
+class WireField:
+    """单个字段的 wire 区间。
+
+    - wire_type=0：`varint` 为解码值，start/end 为值字节区间；
+    - wire_type=1/5：start/end 为 8/4 字节区间；
+    - wire_type=2：start/end 为 payload 区间（不含长度前缀）。
+    """
+
+    __slots__ = ("buffer", "field_number", "wire_type", "start", "end", "varint", "remaining_depth", "_kind", "_value")
+
+    def __init__(
+        self,
+        buffer: memoryview,
+        field_number: int,
+        wire_type: int,
+        start: int,
+        end: int,
+        varint: int,
+        remaining_depth: int,
+    ) -> None:
+        self.buffer = buffer
+        self.field_number = field_number
+        self.wire_type = wire_type
+        self.start = start
+        self.end = end
+        self.varint = varint
+        self.remaining_depth = remaining_depth
+        self._kind: int = -1
+        self._value: Any = None
+
+    @property
+    def length(self) -> int:
+        return self.end - self.start
+
+    def raw(self) -> memoryview:
+        """值字节区间的零拷贝视图。"""
+        return self.buffer[self.start : self.end]
+
+    def to_bytes(self) -> bytes:
+        return self.buffer[self.start : self.end].tobytes()
+
+    def fixed_int(self) -> int:
+        return int.from_bytes(self.buffer[self.start : self.end], byteorder="little", signed=False)
+
+    def fixed_float(self) -> float:
+        return float(struct.unpack_from("<d" if self.wire_type == 1 else "<f", self.buffer, self.start)[0])
+
+    # -------- length-delimited 判定（decode_gil 风格，lossless 优先） --------
+    def _classify(self) -> int:
+        """文本 → GUID 列表（保持 raw）→ 嵌套 message → raw bytes；结果缓存在字段上。
+
+        注意：该判定决定 node_graph_writeback 的“可修改并可回写”中间表示，因此 packed 不展开为 list，
+        必要信息通过 raw bytes 保留。
+        """
+        if self._kind >= 0:
+            return self._kind
+        kind = _KIND_RAW
+        value: Any = None
+        if self.end > self.start:
+            # 文本判定：严格 UTF-8（errors=replace 且不允许出现 U+FFFD）+ printable 比例阈值
+            decoded_text = str(self.buffer[self.start : self.end], "utf-8", "replace")
+            if "\ufffd" not in decoded_text and _is_probably_printable_text(decoded_text):
+                cleaned_text, removed_controls = _sanitize_utf8_text_for_decode_gil(decoded_text)
+                kind = _KIND_TEXT
+                # 清理过程中剔除了控制字符时视为“更像 bytes/blob”，不暴露 utf8，
+                # 否则 dump-json → numeric_message → encode_message 链路会把 bytes 误写成字符串导致 payload 漂移。
+                value = cleaned_text if (cleaned_text != "" and not bool(removed_controls)) else None
+            elif not _is_guid_varint_stream(self.buffer, self.start, self.end) and self.remaining_depth > 1:
+                nested = MessageView(self.buffer, self.start, self.end, remaining_depth=self.remaining_depth - 1)
+                if nested.fields and nested.consumed_offset == self.end:
+                    kind = _KIND_MESSAGE
+                    value = nested
+        self._kind = kind
+        self._value = value
+        return kind
+
+    def release(self) -> None:
+        """丢弃判定缓存（含嵌套视图树）；下次访问时重新判定。"""
+        self._kind = -1
+        self._value = None
+
+    def message(self) -> Optional["MessageView"]:
+        """若该 length-delimited 字段按口径判定为嵌套 message，返回其视图。"""
+        if self.wire_type != 2 or self._classify() != _KIND_MESSAGE:
+            return None
+        return self._value
+
+    def utf8(self) -> Optional[str]:
+        """若该 length-delimited 字段按口径判定为可读文本，返回清理后的文本。"""
+        if self.wire_type != 2 or self._classify() != _KIND_TEXT:
+            return None
+        return self._value
+
+    # -------- 物化 --------
+    def to_decoded_node(self, *, lazy: bool = False) -> Dict[str, Any]:
+        """物化为 `decode_message_to_field_map` 的节点形态；lazy=True 时嵌套 message 为 `LazyDecodedFieldMap`。"""
+        wire_type = self.wire_type
+        if wire_type == 0:
+            value = self.varint
+            if value <= 0xFFFFFFFF:
+                return {"int": value, "int32_high16": value >> 16, "int32_low16": value & 0xFFFF}
+            return {"int": value}
+        if wire_type == 1:
+            return {"fixed64_int": self.fixed_int(), "fixed64_double": self.fixed_float()}
+        if wire_type == 5:
+            return {"fixed32_int": self.fixed_int(), "fixed32_float": self.fixed_float()}
+        kind = self._classify()
+        if kind == _KIND_MESSAGE:
+            nested: MessageView = self._value
+            return {"message": nested.as_field_map() if lazy else nested.to_field_map()}
+        node: Dict[str, Any] = {"raw_hex": self.buffer[self.start : self.end].hex()}
+        if kind == _KIND_TEXT and self._value is not None:
+            node["utf8"] = self._value
+        return node
+
+    def to_numeric_value(self, *, prefer_raw_hex_for_utf8: bool) -> Any:
+        """等价于 `decoded_node_to_numeric_value(self.to_decoded_node(), ...)`，但不构造中间节点。"""
+        wire_type = self.wire_type
+        if wire_type == 0:
+            return self.varint
+        if wire_type == 5:
+            return self.fixed_float()
+        if wire_type == 1:
+            return {"fixed64_int": self.fixed_int()}
+        kind = self._classify()
+        if kind == _KIND_MESSAGE:
+            nested: MessageView = self._value
+            return nested.to_numeric_message(prefer_raw_hex_for_utf8=prefer_raw_hex_for_utf8)
+        if kind == _KIND_TEXT and self._value is not None and not prefer_raw_hex_for_utf8:
+            return self._value
+        return format_binary_data_hex_view(self.buffer[self.start : self.end])
+
+
+def _is_guid_varint_stream(buffer: memoryview, start: int, end: int) -> bool:
+    """packed varint stream 探测（口径同 `_parse_packed_varints(max_items=256)` + 80% GUID 阈值）。
+
+    典型场景：UI record 的 children GUID 列表在少数情况下“碰巧可被当作 message 解码”，
+    误判会让 writeback/export 把原始 bytes 写成 nested message（游戏侧可能拒绝解析）。
+    GUID 大多落在 0x40000000 段（约 1.07e9），用范围过滤避免误伤普通嵌套 message。
+    """
+    if end - start > _MAX_PACKED_ITEMS * 10:
+        return False
+    item_count = 0
+    guid_like = 0
+    offset = start
+    while offset < end:
+        if item_count >= _MAX_PACKED_ITEMS:
+            return False
+        value = 0
+        shift_bits = 0
+        while True:
+            if offset >= end or shift_bits >= 64:
+                return False
+            current_byte = buffer[offset]
+            offset += 1
+            value |= (current_byte & 0x7F) << shift_bits
+            if current_byte < 0x80:
+                break
+            shift_bits += 7
+        item_count += 1
+        if _GUID_MIN <= value <= _GUID_MAX:
+            guid_like += 1
+    if item_count <= 1:
+        return False
+    return guid_like / item_count >= 0.8
+
+
+class MessageView:
+    """单层 message 的零拷贝视图（字段列表在首次访问时扫描一次并缓存）。
+
+    扫描的停止规则与 `decode_message_to_field_map` 一致（非法 tag / 越界 / 不支持的 wire_type 时停止），
+    `consumed_offset` 对应其返回的 next_offset。
+    """
+
+    __slots__ = ("buffer", "start_offset", "end_offset", "remaining_depth", "_fields", "_consumed_offset")
+
+    def __init__(
+        self,
+        data: BytesLike,
+        start_offset: int = 0,
+        end_offset: Optional[int] = None,
+        *,
+        remaining_depth: int = 32,
+    ) -> None:
+        buffer = data if isinstance(data, memoryview) else memoryview(data)
+        if buffer.format != "B" or buffer.ndim != 1:
+            buffer = buffer.cast("B")
+        end = len(buffer) if end_offset is None else int(end_offset)
+        if start_offset < 0:
+            raise ValueError(f"start_offset must be >= 0, got {start_offset}")
+        if end < 0:
+            raise ValueError(f"end_offset must be >= 0, got {end}")
+        if end > len(buffer):
+            raise ValueError(f"end_offset out of range: end_offset={end}, size={len(buffer)}")
+        self.buffer = buffer
+        self.start_offset = int(start_offset)
+        self.end_offset = end
+        self.remaining_depth = int(remaining_depth)
+        self._fields: Optional[List[WireField]] = None
+        self._consumed_offset = self.start_offset
+
+    @property
+    def fields(self) -> List[WireField]:
+        if self._fields is None:
+            self._scan()
+        return self._fields  # type: ignore[return-value]
+
+    @property
+    def consumed_offset(self) -> int:
+        if self._fields is None:
+            self._scan()
+        return self._consumed_offset
+
+    def _scan(self) -> None:
+        fields: List[WireField] = []
+        buffer = self.buffer
+        end_offset = self.end_offset
+        remaining_depth = self.remaining_depth
+        current_offset = self.start_offset
+        if remaining_depth <= 0:
+            self._fields = fields
+            self._consumed_offset = current_offset
+            return
+
+        while current_offset < end_offset:
+            tag_value, current_offset = _read_varint(buffer, current_offset, end_offset)
+            if tag_value <= 0:
+                break
+            field_number = tag_value >> 3
+            wire_type = tag_value & 0x07
+            if field_number <= 0:
+                break
+
+            if wire_type == 0:
+                value_start = current_offset
+                value, current_offset = _read_varint(buffer, current_offset, end_offset)
+                if value < 0:
+                    break
+                fields.append(WireField(buffer, field_number, 0, value_start, current_offset, value, remaining_depth))
+                continue
+
+            if wire_type == 1 or wire_type == 5:
+                size = 8 if wire_type == 1 else 4
+                if current_offset + size > end_offset:
+                    break
+                fields.append(
+                    WireField(buffer, field_number, wire_type, current_offset, current_offset + size, 0, remaining_depth)
+                )
+                current_offset += size
+                continue
+
+            if wire_type == 2:
+                length_value, current_offset = _read_varint(buffer, current_offset, end_offset)
+                if length_value < 0:
+                    break
+                if current_offset + length_value > end_offset:
+                    break
+                fields.append(
+                    WireField(buffer, field_number, 2, current_offset, current_offset + length_value, 0, remaining_depth)
+                )
+                current_offset += length_value
+                continue
+
+            # 其他 wire_type（3/4 group 等）暂不支持
+            break
+
+        self._fields = fields
+        self._consumed_offset = current_offset
+
+    def iter_fields(self, field_number: Optional[int] = None) -> Iterator[WireField]:
+        for field in self.fields:
+            if field_number is None or field.field_number == field_number:
+                yield field
+
+    def first(self, field_number: int) -> Optional[WireField]:
+        for field in self.fields:
+            if field.field_number == field_number:
+                return field
+        return None
+
+    def grouped_fields(self) -> Dict[int, List[WireField]]:
+        """field_number -> 字段列表（按首次出现顺序）。"""
+        grouped: Dict[int, List[WireField]] = {}
+        for field in self.fields:
+            bucket = grouped.get(field.field_number)
+            if bucket is None:
+                grouped[field.field_number] = [field]
+            else:
+                bucket.append(field)
+        return grouped
+
+    def to_field_map(self) -> Dict[str, Any]:
+        """全量物化为 `decode_message_to_field_map` 的输出形态。"""
+        fields_map: Dict[str, Any] = {}
+        for field_number, bucket in self.grouped_fields().items():
+            if len(bucket) == 1:
+                fields_map["field_" + str(field_number)] = bucket[0].to_decoded_node()
+            else:
+                fields_map["field_" + str(field_number)] = [field.to_decoded_node() for field in bucket]
+        return fields_map
+
+    def as_field_map(self) -> "LazyDecodedFieldMap":
+        return LazyDecodedFieldMap(self)
+
+    def to_numeric_message(self, *, prefer_raw_hex_for_utf8: bool = False) -> Dict[str, Any]:
+        """等价于 `decoded_field_map_to_numeric_message(self.to_field_map(), ...)`。"""
+        message: Dict[str, Any] = {}
+        for field_number, bucket in self.grouped_fields().items():
+            if len(bucket) == 1:
+                message[str(field_number)] = bucket[0].to_numeric_value(prefer_raw_hex_for_utf8=prefer_raw_hex_for_utf8)
+            else:
+                message[str(field_number)] = [
+                    field.to_numeric_value(prefer_raw_hex_for_utf8=prefer_raw_hex_for_utf8) for field in bucket
+                ]
+        return message
+
+
+class LazyDecodedFieldMap(Mapping):
+    """`decode_message_to_field_map` 输出形态的只读适配器：按键访问时才物化对应字段（嵌套 message 同样惰性）。
+
+    需要可修改的普通 dict 时调用 `to_dict()`。
+    """
+
+    __slots__ = ("_view", "_grouped", "_cache")
+
+    def __init__(self, view: MessageView) -> None:
+        self._view = view
+        self._grouped: Optional[Dict[str, List[WireField]]] = None
+        self._cache: Dict[str, Any] = {}
+
+    @property
+    def view(self) -> MessageView:
+        return self._view
+
+    def _buckets(self) -> Dict[str, List[WireField]]:
+        if self._grouped is None:
+            self._grouped = {
+                "field_" + str(field_number): bucket for field_number, bucket in self._view.grouped_fields().items()
+            }
+        return self._grouped
+
+    def __getitem__(self, key: str) -> Any:
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        bucket = self._buckets()[key]
+        if len(bucket) == 1:
+            value: Any = bucket[0].to_decoded_node(lazy=True)
+        else:
+            value = [field.to_decoded_node(lazy=True) for field in bucket]
+        self._cache[key] = value
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._buckets())
+
+    def __len__(self) -> int:
+        return len(self._buckets())
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._buckets()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._view.to_field_map()
+
+
+__all__ = [
+    "WireField",
+    "MessageView",
+    "LazyDecodedFieldMap",
+    "format_binary_data_hex_view",
+]
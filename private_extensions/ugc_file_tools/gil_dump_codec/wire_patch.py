@@ -1,9 +1,19 @@
 from __future__ import annotations
 
+import hashlib
+import marshal
 from dataclasses import dataclass
-from typing import Dict, List, Mapping, Sequence, Tuple
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
 
-from .protobuf_like import decode_message_to_wire_chunks, decode_varint, encode_tag, encode_varint, encode_wire_chunks
+from .protobuf_like import (
+    decode_message_to_wire_chunks,
+    decode_varint,
+    encode_field,
+    encode_tag,
+    encode_varint,
+    encode_wire_chunks,
+    iter_message_fields,
+)
 
 
 WireChunk = Tuple[bytes, bytes]
@@ -188,3 +198,184 @@ def replace_length_delimited_fields_payload_bytes_in_message_bytes(
 
     return encode_wire_chunks(list(chunks))
 
+
+
+# ---------------------------------------------------------------------------
+# 增量重编码：未改动的子消息直接复用 base 的原始 wire chunk
+# ---------------------------------------------------------------------------
+
+WireChunkSpan = Tuple[int, int, int, int, int]
+
+
+def iter_wire_chunk_spans(data: bytes, start_offset: int, end_offset: int) -> Iterator[WireChunkSpan]:
+    """
+    单层扫描 message 的 wire chunk 区间。
+
+    产出：(field_number, wire_type, chunk_start, value_start, value_end)
+    - chunk_start 指向 tag 起点；wire_type=2 时 value_start 跳过长度前缀；
+    - chunk bytes 即 `data[chunk_start:value_end]`（tag/length 保持原始编码）。
+    """
+    offset = int(start_offset)
+    end = int(end_offset)
+    while offset < end:
+        chunk_start = offset
+        tag_value, offset, ok = decode_varint(data, offset, end)
+        if not ok or int(tag_value) == 0:
+            raise ValueError(f"invalid tag varint at offset={chunk_start}")
+        field_number = int(tag_value) >> 3
+        wire_type = int(tag_value) & 0x07
+        if wire_type == 0:
+            _value, value_end, ok = decode_varint(data, offset, end)
+            if not ok:
+                raise ValueError(f"invalid varint value at offset={offset}")
+            yield field_number, wire_type, chunk_start, offset, value_end
+            offset = value_end
+        elif wire_type == 1 or wire_type == 5:
+            value_end = offset + (8 if wire_type == 1 else 4)
+            if value_end > end:
+                raise ValueError(f"fixed-width value out of range at offset={offset}")
+            yield field_number, wire_type, chunk_start, offset, value_end
+            offset = value_end
+        elif wire_type == 2:
+            length, value_start, ok = decode_varint(data, offset, end)
+            value_end = value_start + int(length)
+            if not ok or value_end > end:
+                raise ValueError(f"invalid length-delimited value at offset={offset}")
+            yield field_number, wire_type, chunk_start, value_start, value_end
+            offset = value_end
+        else:
+            raise ValueError(f"unsupported wire_type={wire_type} at offset={chunk_start}")
+
+
+def numeric_value_fingerprint(value: Any) -> bytes:
+    """
+    numeric_message 值（dict/list/str/int/float）的内容指纹。
+
+    说明：marshal version=2 不输出引用/驻留标记，相同内容（含 dict 键顺序）必得相同 bytes；
+    键顺序不同只会导致“未命中”（退化为重编码），不会产生误复用。
+    """
+    return hashlib.sha1(marshal.dumps(value, 2)).digest()
+
+
+def _is_nested_message_value(value: Any) -> bool:
+    return isinstance(value, dict) and not ("fixed64_int" in value or "fixed64_double" in value)
+
+
+class WireChunkReuseIndex:
+    """
+    message 内前若干层 length-delimited 字段的 “(字段路径, 值指纹) → 原始 chunk 区间” 索引。
+
+    - 在解码 base 之后、任何就地修改之前构建（指纹代表 base 的原始内容）；
+    - 编码时若某个子值的指纹命中，则原样拷贝 base 中对应 chunk（byte-level 不变），否则才重编码；
+    - 字段路径相对于被索引的 message（如 section10 → `(1,)` 为 group，`(1, 1)` 为 GraphEntry）。
+    """
+
+    __slots__ = ("source_bytes", "max_depth", "_spans")
+
+    def __init__(self, *, source_bytes: bytes, max_depth: int) -> None:
+        self.source_bytes = bytes(source_bytes)
+        self.max_depth = int(max_depth)
+        self._spans: Dict[Tuple[Tuple[int, ...], bytes], Tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+    def find_chunk(self, field_path: Tuple[int, ...], value: Any) -> Optional[bytes]:
+        if not isinstance(value, (dict, str)):
+            return None
+        span = self._spans.get((field_path, numeric_value_fingerprint(value)))
+        if span is None:
+            return None
+        return self.source_bytes[span[0] : span[1]]
+
+    def _index_message(
+        self,
+        message_object: Mapping[str, Any],
+        *,
+        start_offset: int,
+        end_offset: int,
+        field_path: Tuple[int, ...],
+        depth_left: int,
+    ) -> None:
+        spans_by_field: Dict[int, List[WireChunkSpan]] = {}
+        for span in iter_wire_chunk_spans(self.source_bytes, start_offset, end_offset):
+            spans_by_field.setdefault(span[0], []).append(span)
+
+        for field_number, spans in spans_by_field.items():
+            value = message_object.get(str(field_number))
+            items = value if isinstance(value, list) else [value]
+            if value is None or len(items) != len(spans):
+                # 解码形态与 wire 不一一对应：保守跳过（该字段走重编码）
+                continue
+            child_path = field_path + (int(field_number),)
+            for item, (_field_number, wire_type, chunk_start, value_start, value_end) in zip(items, spans):
+                if wire_type != 2 or not isinstance(item, (dict, str)):
+                    continue
+                self._spans.setdefault((child_path, numeric_value_fingerprint(item)), (chunk_start, value_end))
+                if depth_left > 1 and _is_nested_message_value(item):
+                    self._index_message(
+                        item,
+                        start_offset=value_start,
+                        end_offset=value_end,
+                        field_path=child_path,
+                        depth_left=depth_left - 1,
+                    )
+
+
+def build_wire_chunk_reuse_index(
+    *,
+    message_bytes: bytes,
+    message_object: Mapping[str, Any],
+    max_depth: int = 2,
+) -> WireChunkReuseIndex:
+    """为 message（raw bytes 与其解码后的 numeric_message）构建复用索引；max_depth 为参与索引的嵌套层数。"""
+    if not isinstance(message_bytes, (bytes, bytearray)):
+        raise TypeError(f"message_bytes must be bytes, got {type(message_bytes).__name__}")
+    if int(max_depth) <= 0:
+        raise ValueError(f"max_depth must be >= 1, got {max_depth}")
+    index = WireChunkReuseIndex(source_bytes=bytes(message_bytes), max_depth=int(max_depth))
+    index._index_message(
+        message_object,
+        start_offset=0,
+        end_offset=len(index.source_bytes),
+        field_path=(),
+        depth_left=int(max_depth),
+    )
+    return index
+
+
+def encode_message_reusing_wire_chunks(
+    message_object: Dict[str, Any],
+    *,
+    reuse_index: WireChunkReuseIndex,
+) -> bytes:
+    """
+    与 `encode_message` 同口径的编码（字段排序/类型映射一致），但对指纹未变化的子消息直接复用 base 原始 chunk。
+
+    说明：被修改的子消息若仍在索引层数内，会继续向下递归，只重编码真正变化的那一层。
+    """
+    if not isinstance(message_object, dict):
+        raise TypeError(f"encode_message_reusing_wire_chunks expects dict[str, Any], got {type(message_object)}")
+    return b"".join(_encode_message_chunks_reusing(message_object, reuse_index, ()))
+
+
+def _encode_message_chunks_reusing(
+    message_object: Dict[str, Any],
+    reuse_index: WireChunkReuseIndex,
+    field_path: Tuple[int, ...],
+) -> List[bytes]:
+    chunks: List[bytes] = []
+    for field_number, value in iter_message_fields(message_object):
+        child_path = field_path + (int(field_number),)
+        items = value if isinstance(value, list) else [value]
+        for item in items:
+            reused = reuse_index.find_chunk(child_path, item)
+            if reused is not None:
+                chunks.append(reused)
+                continue
+            if len(child_path) < reuse_index.max_depth and _is_nested_message_value(item):
+                nested_bytes = b"".join(_encode_message_chunks_reusing(item, reuse_index, child_path))
+                chunks.extend([encode_tag(field_number, 2), encode_varint(len(nested_bytes)), nested_bytes])
+                continue
+            chunks.append(encode_field(field_number, item))
+    return chunks
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from .file_io import _sanitize_filename
 
@@ -58,43 +58,46 @@ def _extract_resource_entries(python_object: Any) -> List[Dict[str, Any]]:
     return resource_entries
 
 
+# 资源条目按名称关键字分目录：按顺序匹配，首个命中的规则生效（例如“技能资源”需排在“技能”之前）。
+# 导出阶段调度也从该表推导输出范围（_RESOURCE_OUTPUT_SUBDIRS），新增目录只需改这里。
+_RESOURCE_SUBDIR_RULES: Tuple[Tuple[Tuple[str, ...], str], ...] = (
+    (("关卡实体",), "实体摆放"),
+    (("节点图",), "节点图/原始解析"),
+    (("玩家模板",), "战斗预设/玩家模板"),
+    (("职业",), "战斗预设/职业"),
+    (("投射物",), "战斗预设/投射物"),
+    (("单位状态",), "战斗预设/单位状态"),
+    (("道具",), "战斗预设/道具"),
+    (("技能资源",), "管理配置/技能资源"),
+    (("技能",), "战斗预设/技能"),
+    (("结构体",), "管理配置/结构体定义"),
+    (("变量",), "管理配置/关卡变量"),
+    (("信号",), "管理配置/信号"),
+    (("UI", "布局"), "管理配置/UI布局"),
+    (("控件", "按钮"), "管理配置/UI控件模板"),
+    (("元件",), "元件库"),
+)
+# 未命中任何规则（以及名称缺失）时的兜底目录：均位于该目录之下
+_RESOURCE_FALLBACK_SUBDIR = "原始解析/资源条目"
+
+
 def _pick_resource_output_subdir(resource_object: Dict[str, Any]) -> Path:
     name_value = resource_object.get("3 name@string") or resource_object.get("2 name@string") or ""
     if not isinstance(name_value, str):
-        return Path("原始解析") / "资源条目" / "未命名"
-
-    if "关卡实体" in name_value or name_value.endswith("_关卡实体"):
-        return Path("实体摆放")
-    if "节点图" in name_value:
-        return Path("节点图") / "原始解析"
-    if "玩家模板" in name_value:
-        return Path("战斗预设") / "玩家模板"
-    if "职业" in name_value:
-        return Path("战斗预设") / "职业"
-    if "投射物" in name_value:
-        return Path("战斗预设") / "投射物"
-    if "单位状态" in name_value:
-        return Path("战斗预设") / "单位状态"
-    if "道具" in name_value:
-        return Path("战斗预设") / "道具"
-    if "技能资源" in name_value:
-        return Path("管理配置") / "技能资源"
-    if "技能" in name_value:
-        return Path("战斗预设") / "技能"
-    if "结构体" in name_value:
-        return Path("管理配置") / "结构体定义"
-    if "变量" in name_value:
-        return Path("管理配置") / "关卡变量"
-    if "信号" in name_value:
-        return Path("管理配置") / "信号"
-    if "UI" in name_value or "布局" in name_value:
-        return Path("管理配置") / "UI布局"
-    if "控件" in name_value or "按钮" in name_value:
-        return Path("管理配置") / "UI控件模板"
-    if "元件" in name_value:
-        return Path("元件库")
-
-    return Path("原始解析") / "资源条目" / "未分类"
+        return Path(_RESOURCE_FALLBACK_SUBDIR) / "未命名"
+
+    for keywords, subdir in _RESOURCE_SUBDIR_RULES:
+        if any(keyword in name_value for keyword in keywords):
+            return Path(subdir)
+
+    return Path(_RESOURCE_FALLBACK_SUBDIR) / "未分类"
+
+
+# `_pick_resource_output_subdir` 可能返回的全部目录（导出阶段调度据此声明输出范围）
+_RESOURCE_OUTPUT_SUBDIRS: Tuple[str, ...] = (
+    _RESOURCE_FALLBACK_SUBDIR,
+    *dict.fromkeys(subdir for _keywords, subdir in _RESOURCE_SUBDIR_RULES),
+)
 
 
 def _build_resource_file_name(resource_object: Dict[str, Any]) -> str:
@@ -2,12 +2,13 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from .claude_files import _build_package_skeleton, _write_claude_if_missing
 from .combat_presets_exporter import _export_player_templates_and_classes_from_pyugc_dump
 from .data_blob_exporter import _export_data_blobs_from_pyugc_object
 from .dll_dump import _dump_gil_to_json_with_dll
+from .dtype_resource_extractor import _RESOURCE_OUTPUT_SUBDIRS
 from .dtype_type3_exporter import _export_decoded_dtype_type3_from_data_blobs
 from .file_io import _write_json_file, _write_text_file
 from .generic_scan_exporter import _export_generic_decoded_indexes_from_data_blobs
@@ -24,6 +25,7 @@ from .parse_status import _build_parse_status_markdown
 from .paths import _resolve_default_dtype_path, _resolve_parse_status_root_path
 from .pyugc_decode import _decode_gil_with_pyugc
 from .signal_exporter import _export_signals_from_pyugc_dump
+from .stage_scheduler import ExportStage, resolve_export_jobs, run_export_stages
 from .struct_definition_exporter import _export_struct_definitions_from_pyugc_dump
 from .section15_exporter import _export_section15_resources_from_pyugc_dump
 from .template_exporter import _export_templates_from_pyugc_dump
@@ -51,7 +53,15 @@ def export_gil_to_package(
     export_data_blobs: bool = True,
     export_decoded_dtype_type3: bool = True,
     export_decoded_generic: bool = True,
+    jobs: Optional[int] = None,
 ) -> None:
+    """
+    `.gil` → 项目存档目录。
+
+    pyugc 只解码一次；各导出器按 `_build_export_stages` 声明的依赖/输出组成 DAG，
+    互不冲突的阶段在进程池中并行执行（jobs=None 为自动，小文件/打包环境串行；jobs=1 强制串行）。
+    各阶段耗时写入 report.json 的 `stage_timings`。
+    """
     graph_generater_root = _find_graph_generater_root_from_output_package_root(output_package_root)
     if graph_generater_root is not None:
         project_archive_root = graph_generater_root / "assets" / "资源库" / "项目存档"
@@ -65,140 +75,55 @@ def export_gil_to_package(
 
     header, pyugc_object = _decode_gil_with_pyugc(input_gil_file_path, dtype_path)
 
-    exported_ui_widget_templates_index: List[Dict[str, Any]] = []
-
-    pyugc_dump_rel: str | None = None
-    pyugc_string_index_rel: str | None = None
-    if bool(export_raw_pyugc_dump):
-        pyugc_output_directory = output_package_root / "原始解析" / "pyugc"
-        _write_json_file(pyugc_output_directory / "gil_header.json", header.__dict__)
-        _write_json_file(pyugc_output_directory / "dump.json", pyugc_object)
-
-        string_index = _collect_string_values(pyugc_object)
-        sorted_strings = sorted(
-            string_index.items(),
-            key=lambda item: int(item[1].get("count", 0)),
-            reverse=True,
-        )
-        _write_json_file(
-            pyugc_output_directory / "string_index.json",
-            [{"text": text, **meta} for text, meta in sorted_strings],
-        )
-        pyugc_dump_rel = "原始解析/pyugc/dump.json"
-        pyugc_string_index_rel = "原始解析/pyugc/string_index.json"
-
-    pyugc_node_graph_export_result: Dict[str, Any] = {}
-    if bool(export_node_graphs):
-        pyugc_node_graph_export_result = export_pyugc_node_graphs_and_node_defs(
-            pyugc_object=pyugc_object,
-            output_package_root=output_package_root,
-            selected_graph_id_ints=selected_node_graph_id_ints,
-        )
-
-    exported_templates_index: List[Dict[str, Any]] = []
-    exported_instances_index: List[Dict[str, Any]] = []
-    if bool(export_templates):
-        exported_templates_index = _export_templates_from_pyugc_dump(pyugc_object, output_package_root)
-    if bool(export_instances):
-        exported_instances_index = _export_instances_from_pyugc_dump(pyugc_object, output_package_root)
-    if bool(export_templates) and bool(export_instances):
-        exported_templates_index = export_placeholder_templates_for_missing_instance_references(
-            output_package_root=output_package_root,
-            exported_templates_index=exported_templates_index,
-            exported_instances_index=exported_instances_index,
-        )
-
-    combat_presets_export_result: Dict[str, Any] = {}
-    if bool(export_combat_presets):
-        combat_presets_export_result = _export_player_templates_and_classes_from_pyugc_dump(
-            pyugc_object=pyugc_object,
-            output_package_root=output_package_root,
-            focus_graph_id=focus_graph_id,
-        )
-
-    section15_export_result: Dict[str, Any] = {}
-    if bool(export_section15):
-        section15_export_result = _export_section15_resources_from_pyugc_dump(
-            pyugc_object=pyugc_object,
-            output_package_root=output_package_root,
-        )
-
-    struct_definitions_export_result: Dict[str, Any] = {}
-    if bool(export_struct_definitions):
-        struct_definitions_export_result = _export_struct_definitions_from_pyugc_dump(
-            pyugc_object=pyugc_object,
-            output_package_root=output_package_root,
-        )
-
-    signals_export_result: Dict[str, Any] = {}
-    if bool(export_signals):
-        signals_export_result = _export_signals_from_pyugc_dump(
-            pyugc_object=pyugc_object,
-            output_package_root=output_package_root,
-        )
-
-    placeholder_graphs: List[Dict[str, Any]] = []
-    if bool(export_node_graphs) and bool(export_section15):
-        referenced_graph_sources = section15_export_result.get("referenced_graph_sources")
-        if not isinstance(referenced_graph_sources, dict):
-            referenced_graph_sources = {}
-        placeholder_graphs = _export_placeholder_node_graphs_from_references(
-            output_package_root=output_package_root,
-            package_namespace=output_package_root.name,
-            referenced_graph_sources=referenced_graph_sources,
-        )
-
+    saved_full_min_bytes = int(max(256, data_blob_min_bytes_for_decode))
+    stages = _build_export_stages(
+        input_gil_file_path=input_gil_file_path,
+        output_package_root=output_package_root,
+        dtype_path=dtype_path,
+        header_fields=dict(header.__dict__),
+        enable_dll_dump=bool(enable_dll_dump),
+        data_blob_min_bytes_for_decode=int(data_blob_min_bytes_for_decode),
+        generic_scan_min_bytes=int(generic_scan_min_bytes),
+        saved_full_min_bytes=saved_full_min_bytes,
+        focus_graph_id=focus_graph_id,
+        export_raw_pyugc_dump=bool(export_raw_pyugc_dump),
+        export_node_graphs=bool(export_node_graphs),
+        selected_node_graph_id_ints=selected_node_graph_id_ints,
+        export_templates=bool(export_templates),
+        export_instances=bool(export_instances),
+        export_combat_presets=bool(export_combat_presets),
+        export_section15=bool(export_section15),
+        export_struct_definitions=bool(export_struct_definitions),
+        export_signals=bool(export_signals),
+        export_data_blobs=bool(export_data_blobs),
+        export_decoded_dtype_type3=bool(export_decoded_dtype_type3),
+        export_decoded_generic=bool(export_decoded_generic),
+    )
+    stage_run = run_export_stages(
+        stages,
+        payload=pyugc_object,
+        jobs=resolve_export_jobs(jobs, input_size_bytes=int(input_gil_file_path.stat().st_size)),
+    )
+    stage_results = stage_run.results
+
+    raw_pyugc_dump_result: Dict[str, str] = stage_results.get("raw_pyugc_dump") or {}
+    pyugc_dump_rel: str | None = raw_pyugc_dump_result.get("dump")
+    pyugc_string_index_rel: str | None = raw_pyugc_dump_result.get("string_index")
+    pyugc_node_graph_export_result: Dict[str, Any] = stage_results.get("node_graphs") or {}
+    exported_templates_index: List[Dict[str, Any]] = stage_results.get(
+        "template_placeholders", stage_results.get("templates")
+    ) or []
+    exported_instances_index: List[Dict[str, Any]] = stage_results.get("instances") or []
+    combat_presets_export_result: Dict[str, Any] = stage_results.get("combat_presets") or {}
+    section15_export_result: Dict[str, Any] = stage_results.get("section15") or {}
+    struct_definitions_export_result: Dict[str, Any] = stage_results.get("struct_definitions") or {}
+    signals_export_result: Dict[str, Any] = stage_results.get("signals") or {}
+    placeholder_graphs: List[Dict[str, Any]] = stage_results.get("placeholder_graphs") or []
     binary_blob_index: List[DataBlobRecord] = []
     unique_blob_files = 0
-    if bool(export_data_blobs):
-        binary_blob_index, unique_blob_files = _export_data_blobs_from_pyugc_object(
-            pyugc_object=pyugc_object,
-            output_package_root=output_package_root,
-        )
-
-    if enable_dll_dump:
-        dll_output_directory = output_package_root / "原始解析" / "dll"
-        dll_dump_path = dll_output_directory / "dump.json"
-        _dump_gil_to_json_with_dll(
-            input_gil_file_path=input_gil_file_path,
-            dll_dump_path=dll_dump_path,
-        )
-        dll_dump_object = json.loads(dll_dump_path.read_text(encoding="utf-8"))
-        if not isinstance(dll_dump_object, dict):
-            raise ValueError("DLL dump-json 顶层不是 dict")
-
-        # UI 控件模板：依赖 DLL dump-json，导出到项目存档管理配置目录（用于后续写回/合并）
-        from .ui_widget_templates_exporter import _export_ui_widget_templates_from_dll_dump
-
-        exported_ui_widget_templates_index = _export_ui_widget_templates_from_dll_dump(
-            dll_dump_object=dll_dump_object,
-            output_package_root=output_package_root,
-        )
-
-        # UI schema library：遇到就记录（沉淀 record/blob 结构模板，减少重复逆向）
-        from ugc_file_tools.ui_schema_library.recorder import record_ui_schema_library_from_dll_dump
-
-        record_ui_schema_library_from_dll_dump(
-            dll_dump_object=dll_dump_object,
-            source_gil_file_path=input_gil_file_path,
-        )
-
-    if bool(export_data_blobs) and bool(export_decoded_dtype_type3):
-        _export_decoded_dtype_type3_from_data_blobs(
-            output_package_root=output_package_root,
-            dtype_path=dtype_path,
-            data_blob_index=binary_blob_index,
-            data_blob_min_bytes_for_decode=data_blob_min_bytes_for_decode,
-        )
-
-    saved_full_min_bytes = int(max(256, data_blob_min_bytes_for_decode))
-    if bool(export_data_blobs) and bool(export_decoded_generic):
-        _export_generic_decoded_indexes_from_data_blobs(
-            output_package_root=output_package_root,
-            data_blob_index=binary_blob_index,
-            generic_scan_min_bytes=generic_scan_min_bytes,
-            saved_full_min_bytes=saved_full_min_bytes,
-        )
+    if "data_blobs" in stage_results:
+        binary_blob_index, unique_blob_files = stage_results["data_blobs"]
+    exported_ui_widget_templates_index: List[Dict[str, Any]] = stage_results.get("dll_dump") or []
 
     # 生成一份便于人工阅读的汇总报告（不追求语义正确，仅用于定位入口）
     report_object: Dict[str, Any] = {
@@ -308,6 +233,7 @@ def export_gil_to_package(
             package_id=output_package_root.name,
         )
     report_object["validation"] = validation_summary
+    report_object["stage_timings"] = stage_run.to_report()
     report_object["parse_status_doc"] = f"ugc_file_tools/parse_status/{output_package_root.name}/解析状态.md"
 
     _write_json_file(output_package_root / "原始解析" / "report.json", report_object)
@@ -335,6 +261,325 @@ def export_gil_to_package(
     _write_text_file(parse_status_package_root / "解析状态.md", parse_status_markdown)
 
 
+def _build_export_stages(
+    *,
+    input_gil_file_path: Path,
+    output_package_root: Path,
+    dtype_path: Path,
+    header_fields: Dict[str, Any],
+    enable_dll_dump: bool,
+    data_blob_min_bytes_for_decode: int,
+    generic_scan_min_bytes: int,
+    saved_full_min_bytes: int,
+    focus_graph_id: Optional[int],
+    export_raw_pyugc_dump: bool,
+    export_node_graphs: bool,
+    selected_node_graph_id_ints: Optional[Sequence[int]],
+    export_templates: bool,
+    export_instances: bool,
+    export_combat_presets: bool,
+    export_section15: bool,
+    export_struct_definitions: bool,
+    export_signals: bool,
+    export_data_blobs: bool,
+    export_decoded_dtype_type3: bool,
+    export_decoded_generic: bool,
+) -> List[ExportStage]:
+    """
+    导出阶段声明（顺序即串行执行顺序）。
+
+    outputs 需覆盖阶段实际写入的全部路径：路径重叠的阶段会按声明顺序串行，保证同一文件的最终内容确定。
+    """
+    stages: List[ExportStage] = []
+    root_kwargs: Dict[str, Any] = {"output_package_root": output_package_root}
+
+    if export_raw_pyugc_dump:
+        stages.append(
+            ExportStage(
+                name="raw_pyugc_dump",
+                func=_export_raw_pyugc_dump,
+                kwargs={**root_kwargs, "header_fields": dict(header_fields)},
+                outputs=("原始解析/pyugc",),
+                uses_payload=True,
+            )
+        )
+    if export_node_graphs:
+        stages.append(
+            ExportStage(
+                name="node_graphs",
+                func=export_pyugc_node_graphs_and_node_defs,
+                kwargs={
+                    **root_kwargs,
+                    "selected_graph_id_ints": (
+                        [int(x) for x in selected_node_graph_id_ints] if selected_node_graph_id_ints is not None else None
+                    ),
+                },
+                outputs=(
+                    "节点图/原始解析/pyugc_graphs",
+                    "节点图/原始解析/pyugc_node_defs",
+                    "节点图/原始解析/pyugc_graphs_index.json",
+                    "节点图/原始解析/pyugc_node_defs_index.json",
+                ),
+                uses_payload=True,
+            )
+        )
+    if export_templates:
+        stages.append(
+            ExportStage(
+                name="templates",
+                func=_export_templates_from_pyugc_dump,
+                kwargs=dict(root_kwargs),
+                outputs=("元件库",),
+                uses_payload=True,
+            )
+        )
+    if export_instances:
+        stages.append(
+            ExportStage(
+                name="instances",
+                func=_export_instances_from_pyugc_dump,
+                kwargs=dict(root_kwargs),
+                outputs=("实体摆放",),
+                uses_payload=True,
+            )
+        )
+    if export_templates and export_instances:
+        stages.append(
+            ExportStage(
+                name="template_placeholders",
+                func=export_placeholder_templates_for_missing_instance_references,
+                kwargs=dict(root_kwargs),
+                result_kwargs={"exported_templates_index": "templates", "exported_instances_index": "instances"},
+                outputs=("元件库",),
+            )
+        )
+    if export_combat_presets:
+        combat_outputs: Tuple[str, ...] = ("战斗预设/玩家模板", "战斗预设/职业", "管理配置/关卡变量/自定义变量")
+        if isinstance(focus_graph_id, int):
+            combat_outputs += (f"节点图/原始解析/graph_id_{int(focus_graph_id)}",)
+        stages.append(
+            ExportStage(
+                name="combat_presets",
+                func=_export_player_templates_and_classes_from_pyugc_dump,
+                kwargs={**root_kwargs, "focus_graph_id": focus_graph_id},
+                outputs=combat_outputs,
+                uses_payload=True,
+            )
+        )
+    if export_section15:
+        stages.append(
+            ExportStage(
+                name="section15",
+                func=_export_section15_resources_from_pyugc_dump,
+                kwargs=dict(root_kwargs),
+                outputs=(
+                    "战斗预设/技能",
+                    "战斗预设/道具",
+                    "战斗预设/单位状态",
+                    "管理配置/货币背包",
+                    "管理配置/关卡设置",
+                    "管理配置/护盾",
+                    "管理配置/单位标签",
+                    "管理配置/装备数据",
+                    "管理配置/成长曲线",
+                    "管理配置/装备栏模板",
+                    "管理配置/预设点",
+                    "原始解析/资源条目/section15_unclassified",
+                    "节点图/原始解析/referenced_graphs_index.json",
+                ),
+                uses_payload=True,
+            )
+        )
+    if export_struct_definitions:
+        stages.append(
+            ExportStage(
+                name="struct_definitions",
+                func=_export_struct_definitions_from_pyugc_dump,
+                kwargs=dict(root_kwargs),
+                outputs=("管理配置/结构体定义",),
+                uses_payload=True,
+            )
+        )
+    if export_signals:
+        stages.append(
+            ExportStage(
+                name="signals",
+                func=_export_signals_from_pyugc_dump,
+                kwargs=dict(root_kwargs),
+                outputs=("管理配置/信号",),
+                uses_payload=True,
+            )
+        )
+    if export_node_graphs and export_section15:
+        stages.append(
+            ExportStage(
+                name="placeholder_graphs",
+                func=_export_placeholder_graphs_for_section15_references,
+                kwargs=dict(root_kwargs),
+                result_kwargs={"section15_export_result": "section15"},
+                # 占位图会跳过已存在的非占位图文件：保持在节点图导出之后执行
+                depends_on=("node_graphs",),
+                outputs=("节点图/server", "节点图/client", "节点图/原始解析/placeholder_graphs_index.json"),
+            )
+        )
+    if export_data_blobs:
+        stages.append(
+            ExportStage(
+                name="data_blobs",
+                func=_export_data_blobs_from_pyugc_object,
+                kwargs=dict(root_kwargs),
+                outputs=("原始解析/数据块",),
+                uses_payload=True,
+            )
+        )
+    if enable_dll_dump:
+        stages.append(
+            ExportStage(
+                name="dll_dump",
+                func=_export_dll_dump_and_ui_widget_templates,
+                kwargs={**root_kwargs, "input_gil_file_path": input_gil_file_path},
+                outputs=("原始解析/dll", "管理配置/UI控件模板"),
+                # DLL 调用 + UI schema library（进程级全局落盘）：留在主进程
+                run_in_main_process=True,
+            )
+        )
+    if export_data_blobs and export_decoded_dtype_type3:
+        stages.append(
+            ExportStage(
+                name="decoded_dtype_type3",
+                func=_export_decoded_dtype_type3_for_data_blobs,
+                kwargs={
+                    **root_kwargs,
+                    "dtype_path": dtype_path,
+                    "data_blob_min_bytes_for_decode": int(data_blob_min_bytes_for_decode),
+                },
+                result_kwargs={"data_blob_export_result": "data_blobs"},
+                outputs=("原始解析/数据块/decoded_dtype_type3", *_RESOURCE_OUTPUT_SUBDIRS),
+            )
+        )
+    if export_data_blobs and export_decoded_generic:
+        stages.append(
+            ExportStage(
+                name="decoded_generic",
+                func=_export_generic_decoded_indexes_for_data_blobs,
+                kwargs={
+                    **root_kwargs,
+                    "generic_scan_min_bytes": int(generic_scan_min_bytes),
+                    "saved_full_min_bytes": int(saved_full_min_bytes),
+                },
+                result_kwargs={"data_blob_export_result": "data_blobs"},
+                outputs=("原始解析/数据块/decoded_generic", "原始解析/关卡变量"),
+            )
+        )
+    return stages
+
+
+def _export_raw_pyugc_dump(
+    *,
+    pyugc_object: Any,
+    header_fields: Dict[str, Any],
+    output_package_root: Path,
+) -> Dict[str, str]:
+    pyugc_output_directory = output_package_root / "原始解析" / "pyugc"
+    _write_json_file(pyugc_output_directory / "gil_header.json", header_fields)
+    _write_json_file(pyugc_output_directory / "dump.json", pyugc_object)
+
+    string_index = _collect_string_values(pyugc_object)
+    sorted_strings = sorted(
+        string_index.items(),
+        key=lambda item: int(item[1].get("count", 0)),
+        reverse=True,
+    )
+    _write_json_file(
+        pyugc_output_directory / "string_index.json",
+        [{"text": text, **meta} for text, meta in sorted_strings],
+    )
+    return {
+        "dump": "原始解析/pyugc/dump.json",
+        "string_index": "原始解析/pyugc/string_index.json",
+    }
+
+
+def _export_placeholder_graphs_for_section15_references(
+    *,
+    output_package_root: Path,
+    section15_export_result: Dict[str, Any],
+) -> List[Dict[str, Any]]:
+    referenced_graph_sources = section15_export_result.get("referenced_graph_sources")
+    if not isinstance(referenced_graph_sources, dict):
+        referenced_graph_sources = {}
+    return _export_placeholder_node_graphs_from_references(
+        output_package_root=output_package_root,
+        package_namespace=output_package_root.name,
+        referenced_graph_sources=referenced_graph_sources,
+    )
+
+
+def _export_dll_dump_and_ui_widget_templates(
+    *,
+    input_gil_file_path: Path,
+    output_package_root: Path,
+) -> List[Dict[str, Any]]:
+    dll_output_directory = output_package_root / "原始解析" / "dll"
+    dll_dump_path = dll_output_directory / "dump.json"
+    _dump_gil_to_json_with_dll(
+        input_gil_file_path=input_gil_file_path,
+        dll_dump_path=dll_dump_path,
+    )
+    dll_dump_object = json.loads(dll_dump_path.read_text(encoding="utf-8"))
+    if not isinstance(dll_dump_object, dict):
+        raise ValueError("DLL dump-json 顶层不是 dict")
+
+    # UI 控件模板：依赖 DLL dump-json，导出到项目存档管理配置目录（用于后续写回/合并）
+    from .ui_widget_templates_exporter import _export_ui_widget_templates_from_dll_dump
+
+    exported_ui_widget_templates_index = _export_ui_widget_templates_from_dll_dump(
+        dll_dump_object=dll_dump_object,
+        output_package_root=output_package_root,
+    )
+
+    # UI schema library：遇到就记录（沉淀 record/blob 结构模板，减少重复逆向）
+    from ugc_file_tools.ui_schema_library.recorder import record_ui_schema_library_from_dll_dump
+
+    record_ui_schema_library_from_dll_dump(
+        dll_dump_object=dll_dump_object,
+        source_gil_file_path=input_gil_file_path,
+    )
+    return exported_ui_widget_templates_index
+
+
+def _export_decoded_dtype_type3_for_data_blobs(
+    *,
+    output_package_root: Path,
+    dtype_path: Path,
+    data_blob_export_result: Tuple[List[DataBlobRecord], int],
+    data_blob_min_bytes_for_decode: int,
+) -> None:
+    binary_blob_index, _unique_blob_files = data_blob_export_result
+    _export_decoded_dtype_type3_from_data_blobs(
+        output_package_root=output_package_root,
+        dtype_path=dtype_path,
+        data_blob_index=binary_blob_index,
+        data_blob_min_bytes_for_decode=data_blob_min_bytes_for_decode,
+    )
+
+
+def _export_generic_decoded_indexes_for_data_blobs(
+    *,
+    output_package_root: Path,
+    data_blob_export_result: Tuple[List[DataBlobRecord], int],
+    generic_scan_min_bytes: int,
+    saved_full_min_bytes: int,
+) -> None:
+    binary_blob_index, _unique_blob_files = data_blob_export_result
+    _export_generic_decoded_indexes_from_data_blobs(
+        output_package_root=output_package_root,
+        data_blob_index=binary_blob_index,
+        generic_scan_min_bytes=generic_scan_min_bytes,
+        saved_full_min_bytes=saved_full_min_bytes,
+    )
+
+
 def main(argv: Optional[Sequence[str]] = None) -> None:
     import argparse
 
@@ -395,6 +640,14 @@ def main(argv: Optional[Sequence[str]] = None) -> None:
         help="可选：定向定位某个节点图/节点ID（例如 1073741832），会额外导出命中 @data 的通用解码结果到 节点图/原始解析/graph_id_<id>/。",
     )
 
+    argument_parser.add_argument(
+        "--jobs",
+        dest="jobs",
+        type=int,
+        default=None,
+        help="导出阶段并行进程数（默认自动：小文件串行；1 表示强制串行）",
+    )
+
     arguments = argument_parser.parse_args(list(argv) if argv is not None else None)
 
     input_gil_file_path = Path(arguments.input_gil_file)
@@ -414,6 +667,7 @@ def main(argv: Optional[Sequence[str]] = None) -> None:
         generic_scan_min_bytes=int(arguments.generic_scan_min_bytes),
         focus_graph_id=(int(arguments.focus_graph_id) if arguments.focus_graph_id is not None else None),
         parse_status_root=parse_status_root,
+        jobs=(int(arguments.jobs) if arguments.jobs is not None else None),
     )
 
 
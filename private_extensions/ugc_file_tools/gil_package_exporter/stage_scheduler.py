@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+"""
+stage_scheduler.py
+
+`export_gil_to_package` 的导出阶段 DAG 调度器。
+
+约定：
+- 每个阶段声明：上游依赖（显式 depends_on + 通过 result_kwargs 注入的上游结果）与输出路径（相对项目存档根目录）；
+- 两个阶段的输出路径存在包含关系（或同一路径）时，后声明者隐式依赖先声明者：同一文件的写入顺序与串行一致；
+- 依赖只能指向“先声明”的阶段，因此声明顺序本身就是一个合法的串行执行顺序（jobs=1 时按声明顺序执行）；
+- 并行模式下，pyugc 解码结果先序列化到临时文件，worker 进程首次需要时加载一次并缓存（不随每个任务传输）；
+- run_in_main_process=True 的阶段（DLL / 进程级全局副作用）始终在主进程执行；
+- 结果按阶段名返回、耗时按声明顺序汇总，与完成先后无关（输出确定）。
+"""
+
+import os
+import pickle
+import sys
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+PAYLOAD_KWARG = "pyugc_object"
+
+# 输入 `.gil` 小于该体积时进程池的启动/序列化开销大于收益，自动模式退化为串行
+_PARALLEL_MIN_INPUT_BYTES = 1024 * 1024
+_MAX_AUTO_JOBS = 4
+
+
+@dataclass(frozen=True)
+class ExportStage:
+    """单个导出阶段（func 必须是模块级函数，以便在 worker 进程中按引用反序列化）。"""
+
+    name: str
+    func: Callable[..., Any]
+    kwargs: Mapping[str, Any] = field(default_factory=dict)
+    # 形参名 -> 上游阶段名：执行前把上游阶段的返回值注入该形参
+    result_kwargs: Mapping[str, str] = field(default_factory=dict)
+    depends_on: Tuple[str, ...] = ()
+    # 相对项目存档根目录的输出路径（目录或文件，"/" 分隔；"" 表示整个根目录）
+    outputs: Tuple[str, ...] = ()
+    uses_payload: bool = False
+    run_in_main_process: bool = False
+
+
+@dataclass(frozen=True)
+class StageRunResult:
+    results: Dict[str, Any]
+    jobs: int
+    wall_seconds: float
+    timings: List[Dict[str, Any]]
+
+    def to_report(self) -> Dict[str, Any]:
+        return {
+            "jobs": int(self.jobs),
+            "wall_seconds": round(float(self.wall_seconds), 4),
+            "stages": [dict(item) for item in self.timings],
+        }
+
+
+def resolve_export_jobs(jobs: Optional[int], *, input_size_bytes: int) -> int:
+    """jobs=None 为自动：打包环境 / 小文件 / 单核时串行，否则最多 `_MAX_AUTO_JOBS` 个进程。"""
+    if jobs is not None:
+        return max(1, int(jobs))
+    if getattr(sys, "frozen", False):
+        return 1
+    if int(input_size_bytes) < _PARALLEL_MIN_INPUT_BYTES:
+        return 1
+    return max(1, min(int(os.cpu_count() or 1), _MAX_AUTO_JOBS))
+
+
+def _outputs_overlap(first: str, second: str) -> bool:
+    first_parts = PurePosixPath(first).parts if first else ()
+    second_parts = PurePosixPath(second).parts if second else ()
+    shared = min(len(first_parts), len(second_parts))
+    return first_parts[:shared] == second_parts[:shared]
+
+
+def resolve_stage_dependencies(stages: Sequence[ExportStage]) -> Dict[str, Tuple[str, ...]]:
+    """阶段名 -> 全部上游阶段名（显式依赖 + 结果注入 + 输出路径冲突），按声明顺序排列。"""
+    declared_index: Dict[str, int] = {}
+    dependencies: Dict[str, Tuple[str, ...]] = {}
+    for index, stage in enumerate(stages):
+        if stage.name in declared_index:
+            raise ValueError(f"重复的导出阶段名：{stage.name!r}")
+        upstream = set(stage.depends_on) | set(stage.result_kwargs.values())
+        for name in sorted(upstream):
+            if name not in declared_index:
+                raise ValueError(f"导出阶段 {stage.name!r} 依赖未在其之前声明的阶段：{name!r}")
+        for earlier in stages[:index]:
+            if any(_outputs_overlap(mine, theirs) for mine in stage.outputs for theirs in earlier.outputs):
+                upstream.add(earlier.name)
+        dependencies[stage.name] = tuple(sorted(upstream, key=lambda name: declared_index[name]))
+        declared_index[stage.name] = index
+    return dependencies
+
+
+def _stage_call_kwargs(stage: ExportStage, results: Mapping[str, Any]) -> Dict[str, Any]:
+    call_kwargs = dict(stage.kwargs)
+    for kwarg_name, upstream_name in stage.result_kwargs.items():
+        call_kwargs[kwarg_name] = results[upstream_name]
+    return call_kwargs
+
+
+def _call_stage(func: Callable[..., Any], call_kwargs: Dict[str, Any]) -> Tuple[Any, float]:
+    started = time.perf_counter()
+    result = func(**call_kwargs)
+    return result, time.perf_counter() - started
+
+
+_worker_payload_path: Optional[str] = None
+_worker_payload: Any = None
+
+
+def _load_worker_payload(payload_path: str) -> Any:
+    global _worker_payload_path, _worker_payload
+    if _worker_payload_path != payload_path:
+        with open(payload_path, "rb") as payload_file:
+            _worker_payload = pickle.load(payload_file)
+        _worker_payload_path = payload_path
+    return _worker_payload
+
+
+def _run_stage_in_worker(
+    func: Callable[..., Any],
+    call_kwargs: Dict[str, Any],
+    uses_payload: bool,
+    payload_path: str,
+) -> Tuple[Any, float]:
+    """进程池 worker 入口（模块级函数以便序列化）。"""
+    if uses_payload:
+        call_kwargs = {**call_kwargs, PAYLOAD_KWARG: _load_worker_payload(payload_path)}
+    return _call_stage(func, call_kwargs)
+
+
+def run_export_stages(stages: Sequence[ExportStage], *, payload: Any, jobs: int) -> StageRunResult:
+    """按 DAG 执行导出阶段；jobs<=1 时按声明顺序串行执行（与历史行为一致）。"""
+    stage_list = list(stages)
+    dependencies = resolve_stage_dependencies(stage_list)
+    started = time.perf_counter()
+    results: Dict[str, Any] = {}
+    seconds_by_stage: Dict[str, Tuple[float, str]] = {}
+
+    def _run_in_main_process(stage: ExportStage) -> None:
+        call_kwargs = _stage_call_kwargs(stage, results)
+        if stage.uses_payload:
+            call_kwargs[PAYLOAD_KWARG] = payload
+        result, seconds = _call_stage(stage.func, call_kwargs)
+        results[stage.name] = result
+        seconds_by_stage[stage.name] = (seconds, "main")
+
+    effective_jobs = max(1, int(jobs))
+    if effective_jobs <= 1 or len(stage_list) <= 1:
+        effective_jobs = 1
+        for stage in stage_list:
+            _run_in_main_process(stage)
+    else:
+        with tempfile.TemporaryDirectory(prefix="ugc_export_stages_") as temp_dir:
+            payload_path = Path(temp_dir) / "pyugc_payload.pickle"
+            with payload_path.open("wb") as payload_file:
+                pickle.dump(payload, payload_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+            pending: List[ExportStage] = list(stage_list)
+            running: Dict[Future, str] = {}
+            with ProcessPoolExecutor(max_workers=effective_jobs) as executor:
+                while pending or running:
+                    ready = [stage for stage in pending if all(name in results for name in dependencies[stage.name])]
+                    for stage in ready:
+                        if stage.run_in_main_process:
+                            continue
+                        pending.remove(stage)
+                        future = executor.submit(
+                            _run_stage_in_worker,
+                            stage.func,
+                            _stage_call_kwargs(stage, results),
+                            bool(stage.uses_payload),
+                            str(payload_path),
+                        )
+                        running[future] = stage.name
+
+                    main_ready = [stage for stage in ready if stage.run_in_main_process]
+                    if main_ready:
+                        # 主进程阶段与已提交的 worker 阶段重叠执行；完成后回到循环顶部提交新就绪的阶段
+                        pending.remove(main_ready[0])
+                        _run_in_main_process(main_ready[0])
+                        continue
+
+                    if not running:
+                        raise RuntimeError(f"导出阶段依赖无法满足：{[stage.name for stage in pending]}")
+                    finished, _not_done = wait(list(running), return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        stage_name = running.pop(future)
+                        result, seconds = future.result()
+                        results[stage_name] = result
+                        seconds_by_stage[stage_name] = (seconds, "process")
+
+    timings = [
+        {
+            "stage": stage.name,
+            "seconds": round(float(seconds_by_stage[stage.name][0]), 4),
+            "executor": seconds_by_stage[stage.name][1],
+            "depends_on": list(dependencies[stage.name]),
+        }
+        for stage in stage_list
+    ]
+    return StageRunResult(
+        results=results,
+        jobs=effective_jobs,
+        wall_seconds=time.perf_counter() - started,
+        timings=timings,
+    )
+
+
+__all__ = [
+    "PAYLOAD_KWARG",
+    "ExportStage",
+    "StageRunResult",
+    "resolve_export_jobs",
+    "resolve_stage_dependencies",
+    "run_export_stages",
+]
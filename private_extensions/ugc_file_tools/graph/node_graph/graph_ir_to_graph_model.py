@@ -261,7 +261,7 @@ def build_graph_model_from_graph_ir(
         sys.path.insert(0, graph_root_text)
 
     from engine.configs.settings import settings
-    from engine.graph.common import node_name_index_from_library
+    from engine.graph.common import get_node_name_index
     from engine.graph.models import GraphModel, NodeModel, PortModel
     from engine.nodes.node_registry import get_node_registry
 
@@ -269,7 +269,7 @@ def build_graph_model_from_graph_ir(
 
     registry = get_node_registry(graph_generater_root.resolve(), include_composite=True)
     node_library = registry.get_library()
-    node_name_index = node_name_index_from_library(node_library, scope=graph_scope)
+    node_name_index = get_node_name_index(node_library, scope=graph_scope)
 
     graph_model = GraphModel()
     graph_model.graph_name = graph_name
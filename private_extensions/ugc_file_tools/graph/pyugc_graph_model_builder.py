@@ -363,7 +363,7 @@ def build_graph_model_from_pyugc_graph(
         sys.path.insert(0, graph_root_text)
 
     from engine.configs.settings import settings
-    from engine.graph.common import node_name_index_from_library
+    from engine.graph.common import get_node_name_index
     from engine.graph.models import GraphModel, NodeModel, PortModel
     from engine.nodes.node_registry import get_node_registry
 
@@ -371,7 +371,7 @@ def build_graph_model_from_pyugc_graph(
 
     registry = get_node_registry(graph_generater_root.resolve(), include_composite=True)
     node_library = registry.get_library()
-    node_name_index = node_name_index_from_library(node_library, scope=graph_scope)
+    node_name_index = get_node_name_index(node_library, scope=graph_scope)
 
     # GraphModel
     graph_model = GraphModel()
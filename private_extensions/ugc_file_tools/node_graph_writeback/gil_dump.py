@@ -9,8 +9,18 @@ from ugc_file_tools.gil_dump_codec.protobuf_like import (
     encode_message,
     format_binary_data_hex_text,
 )
+from ugc_file_tools.gil_dump_codec.wire_patch import (
+    WireChunkReuseIndex,
+    build_wire_chunk_reuse_index,
+    iter_wire_chunk_spans,
+)
 from ugc_file_tools.gil_package_exporter.gil_reader import read_gil_header
 
+# payload(root4) 的解码深度；顶层段的值按其下一层解码（保持与 dump 结果同一表示口径）
+_PAYLOAD_DECODE_DEPTH = 16
+# section → group → GraphEntry 两层（实体摆放段为 section → instance 一层，两层同样覆盖）
+_WIRE_REUSE_INDEX_DEPTH = 2
+
 
 def _dump_gil_to_raw_json_object(input_gil_file_path: Path) -> Dict[str, Any]:
     """
@@ -41,7 +51,7 @@ def _dump_gil_to_raw_json_object(input_gil_file_path: Path) -> Dict[str, Any]:
         data_bytes=payload_bytes,
         start_offset=0,
         end_offset=len(payload_bytes),
-        remaining_depth=16,
+        remaining_depth=_PAYLOAD_DECODE_DEPTH,
     )
     if consumed_offset != len(payload_bytes):
         raise ValueError(
@@ -53,6 +63,43 @@ def _dump_gil_to_raw_json_object(input_gil_file_path: Path) -> Dict[str, Any]:
     return {"4": payload_root}
 
 
+def build_section_wire_reuse_index(*, payload_bytes: bytes, field_number: int) -> Optional[WireChunkReuseIndex]:
+    """
+    Public API: 从 base payload bytes 为一个顶层段构建“值指纹 → 原始 chunk”复用索引（写盘时按需构建）。
+
+    该段按 dump 口径重新解码（含节点图段的 binary 字段归一化），因此与 `dump_gil_to_raw_json_object`
+    产出的未改动 group/GraphEntry 指纹一致：写盘时这些条目原样拷贝 base bytes，只有真正变化的条目才重编码。
+    段为 repeated / 非 message 形态时返回 None（调用方退化为整段重编码）。
+    """
+    spans = [
+        (wire_type, value_start, value_end)
+        for span_field_number, wire_type, _chunk_start, value_start, value_end in iter_wire_chunk_spans(
+            payload_bytes, 0, len(payload_bytes)
+        )
+        if span_field_number == int(field_number)
+    ]
+    if len(spans) != 1 or spans[0][0] != 2:
+        return None
+    _wire_type, value_start, value_end = spans[0]
+    section_bytes = bytes(payload_bytes[value_start:value_end])
+
+    decoded_field_map, consumed_offset = decode_message_to_field_map(
+        data_bytes=section_bytes,
+        start_offset=0,
+        end_offset=len(section_bytes),
+        remaining_depth=_PAYLOAD_DECODE_DEPTH - 1,
+    )
+    if consumed_offset != len(section_bytes):
+        return None
+    section_value = _decoded_field_map_to_dump_json_message(decoded_field_map)
+    _normalize_node_graph_binary_fields_inplace({str(int(field_number)): section_value})
+    return build_wire_chunk_reuse_index(
+        message_bytes=section_bytes,
+        message_object=section_value,
+        max_depth=_WIRE_REUSE_INDEX_DEPTH,
+    )
+
+
 def dump_gil_to_raw_json_object(input_gil_file_path: Path) -> Dict[str, Any]:
     """Public API: decode `.gil` payload to dump-json style raw object."""
     return _dump_gil_to_raw_json_object(input_gil_file_path)
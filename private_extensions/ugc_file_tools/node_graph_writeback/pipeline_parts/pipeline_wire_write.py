@@ -4,12 +4,10 @@ import json
 from pathlib import Path
 from typing import Any, Dict, Optional
 
-from ugc_file_tools.gil_dump_codec.gil_container import (
-    build_gil_file_bytes_from_payload,
-    read_gil_container_spec,
-    read_gil_payload_bytes,
-)
+from ugc_file_tools.gil_dump_codec.gil_container import build_gil_file_bytes_from_payload, split_gil_file_bytes
 from ugc_file_tools.gil_dump_codec.protobuf_like import encode_message
+from ugc_file_tools.gil_dump_codec.wire_patch import encode_message_reusing_wire_chunks
+from ugc_file_tools.node_graph_writeback.gil_dump import build_section_wire_reuse_index
 from ugc_file_tools.output_paths import resolve_output_file_path_in_out_dir
 from ugc_file_tools.wire import replace_length_delimited_fields_payload_bytes_in_message_bytes
 
@@ -22,23 +20,29 @@ def write_patched_gil_by_sections_and_return_output_path(
     include_section5: bool,
 ) -> Path:
     # ===== 写盘：wire-level 仅替换必要段（默认仅 field10=NodeGraphs），避免整份 payload 重编码漂移 =====
+    # base 只读盘一次：payload 与容器头尾规格都从同一份 bytes 切出
+    base_file_bytes = Path(effective_base_gil_path).read_bytes()
+    base_payload_bytes, container_spec = split_gil_file_bytes(base_file_bytes)
+
     section10_obj = payload_root.get("10")
     if not isinstance(section10_obj, dict):
         raise ValueError("payload_root['10'] must be dict after writeback")
 
-    patched_sections: Dict[int, bytes] = {10: encode_message(dict(section10_obj))}
+    patched_sections: Dict[int, bytes] = {
+        10: _encode_section_reusing_base_chunks(dict(section10_obj), base_payload_bytes=base_payload_bytes, field_number=10)
+    }
     if bool(include_section5):
         section5_obj = payload_root.get("5")
         if not isinstance(section5_obj, dict):
             raise ValueError("ui_custom_variable_sync applied but payload_root['5'] is not dict")
-        patched_sections[5] = encode_message(dict(section5_obj))
+        patched_sections[5] = _encode_section_reusing_base_chunks(
+            dict(section5_obj), base_payload_bytes=base_payload_bytes, field_number=5
+        )
 
-    base_payload_bytes = read_gil_payload_bytes(Path(effective_base_gil_path))
     patched_payload_bytes = replace_length_delimited_fields_payload_bytes_in_message_bytes(
         message_bytes=base_payload_bytes,
         payload_bytes_by_field_number=patched_sections,
     )
-    container_spec = read_gil_container_spec(Path(effective_base_gil_path))
     output_bytes = build_gil_file_bytes_from_payload(payload_bytes=patched_payload_bytes, container_spec=container_spec)
     output_path = resolve_output_file_path_in_out_dir(Path(output_gil_path))
     output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -46,6 +50,17 @@ def write_patched_gil_by_sections_and_return_output_path(
     return Path(output_path)
 
 
+def _encode_section_reusing_base_chunks(section_obj: Dict[str, Any], *, base_payload_bytes: bytes, field_number: int) -> bytes:
+    """
+    增量编码顶层段：按 base 的同一段构建复用索引，只重编码内容变化的 group/GraphEntry，其余条目原样拷贝 base bytes；
+    base 中该段缺失或为 repeated/非 message 形态时退化为整段 encode_message。
+    """
+    reuse_index = build_section_wire_reuse_index(payload_bytes=base_payload_bytes, field_number=int(field_number))
+    if reuse_index is None:
+        return encode_message(section_obj)
+    return encode_message_reusing_wire_chunks(section_obj, reuse_index=reuse_index)
+
+
 def maybe_write_missing_enum_constants_report(
     *,
     output_gil_path: Path,
@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+"""
+项目存档 → `.gia` 导出的内容寻址产物缓存。
+
+- 每张图两级缓存：
+  - graph_model：键 = 图源码内容 + 节点定义指纹 + 映射 JSON + 坐标缩放 + 信号定义 + 结构体定义；命中时复用已落盘的
+    GraphModel(JSON) 与“本图用到的信号规格”（共享信号 bundle 仍按全量图重建，保证跨图一致）；
+    GraphModel(JSON) 记录内容 sha256，被其它导出（关闭缓存/不同参数）覆盖后视为未命中；
+  - gia：键 = graph_model 键 + 本图信号 bundle + UIKey/实体/元件回填结果 + LayoutIndex 回填 + 导出 hints；
+    命中时直接写出缓存的 `.gia` 字节，跳过标准化 / 端口类型缺口报告 / 编码。
+- pack：键 = 全部输入 `.gia` 字节摘要 + 打包文件名；命中时直接写出缓存的打包结果。
+- `.gia` 字节按 sha256 存放在 `blobs/` 下；保存索引时清理不再被引用的 blob。
+- 导出工具自身代码变更（按 *.py 元信息签名）会使全部缓存失效。
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Optional
+
+_CACHE_SCHEMA_VERSION = 2
+_INDEX_FILE_NAME = "index.json"
+_BLOBS_DIR_NAME = "blobs"
+
+# 影响 `.gia` 字节的 ugc_file_tools 子目录（相对 ugc_file_tools 包根）
+_TOOL_SOURCE_DIRS = (
+    "gia",
+    "gia_export",
+    "gil_dump_codec",
+    "graph",
+    "node_graph_semantics",
+    "pipelines/project_export_gia_parts",
+    "signal_writeback",
+)
+
+
+def compute_cache_digest(*parts: object) -> str:
+    """对任意 JSON 可序列化的输入计算稳定摘要（dict 按键排序；Path/set 等按 str 处理）。"""
+    text = json.dumps(list(parts), ensure_ascii=False, sort_keys=True, default=_json_default, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _json_default(value: object) -> object:
+    if isinstance(value, (set, frozenset)):
+        return sorted(str(x) for x in value)
+    return str(value)
+
+
+def compute_file_digest(file_path: Path) -> str:
+    hasher = hashlib.sha256()
+    with open(Path(file_path), "rb") as file_obj:
+        for chunk in iter(lambda: file_obj.read(1 << 20), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def compute_struct_definitions_digest() -> str:
+    """结构体定义摘要：语义 pass 会把结构体定义（字段名/类型）写入 GraphModel 的 struct_bindings。
+
+    说明：取当前默认 DefinitionSchemaView（导出上下文已将其切换到目标存档作用域）的定义内容。
+    """
+    from engine.resources.definition_schema_view import get_default_definition_schema_view
+
+    return compute_cache_digest(get_default_definition_schema_view().get_all_struct_definitions() or {})
+
+
+def compute_export_tool_fingerprint() -> str:
+    """导出工具代码签名：相关子目录下 *.py 的相对路径 + mtime(ns) + size（不读内容，保持轻量）。"""
+    package_root = Path(__file__).resolve().parents[2]
+    hasher = hashlib.sha256(f"schema={_CACHE_SCHEMA_VERSION}".encode("utf-8"))
+    for rel_dir in _TOOL_SOURCE_DIRS:
+        root = (package_root / rel_dir).resolve()
+        if not root.is_dir():
+            continue
+        for path in sorted(root.rglob("*.py")):
+            stat = path.stat()
+            hasher.update(path.relative_to(package_root).as_posix().encode("utf-8"))
+            hasher.update(b"\0")
+            hasher.update(f"{int(stat.st_mtime_ns)}:{int(stat.st_size)}".encode("utf-8"))
+            hasher.update(b"\n")
+    return hasher.hexdigest()
+
+
+class GiaExportArtifactCache:
+    """单个导出目录（output_dir_name）的产物缓存；`enabled=False` 时所有查询都未命中且不落盘。"""
+
+    def __init__(self, *, cache_dir: Path, enabled: bool = True) -> None:
+        self._cache_dir = Path(cache_dir).resolve()
+        self._enabled = bool(enabled)
+        self._tool_fingerprint = compute_export_tool_fingerprint() if self._enabled else ""
+        self._graphs: Dict[str, Dict[str, object]] = {}
+        self._pack: Dict[str, object] = {}
+        if self._enabled:
+            self._load_index()
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    @property
+    def cache_dir(self) -> Path:
+        return self._cache_dir
+
+    @property
+    def tool_fingerprint(self) -> str:
+        return self._tool_fingerprint
+
+    def _index_path(self) -> Path:
+        return self._cache_dir / _INDEX_FILE_NAME
+
+    def _blob_path(self, digest: str) -> Path:
+        return self._cache_dir / _BLOBS_DIR_NAME / f"{digest}.gia"
+
+    def _load_index(self) -> None:
+        index_path = self._index_path()
+        if not index_path.is_file():
+            return
+        payload = json.loads(index_path.read_text(encoding="utf-8"))
+        if not isinstance(payload, dict):
+            return
+        if payload.get("schema_version") != _CACHE_SCHEMA_VERSION or payload.get("tool_fingerprint") != self._tool_fingerprint:
+            return
+        graphs = payload.get("graphs")
+        if isinstance(graphs, dict):
+            self._graphs = {str(k): dict(v) for k, v in graphs.items() if isinstance(v, dict)}
+        pack = payload.get("pack")
+        if isinstance(pack, dict):
+            self._pack = dict(pack)
+
+    def _read_blob(self, digest: object) -> Optional[bytes]:
+        if not isinstance(digest, str) or digest == "":
+            return None
+        blob_path = self._blob_path(digest)
+        if not blob_path.is_file():
+            return None
+        data = blob_path.read_bytes()
+        if hashlib.sha256(data).hexdigest() != digest:
+            return None
+        return data
+
+    def _write_blob(self, data: bytes) -> str:
+        digest = hashlib.sha256(bytes(data)).hexdigest()
+        blob_path = self._blob_path(digest)
+        if not blob_path.is_file():
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = blob_path.with_suffix(".tmp")
+            tmp_path.write_bytes(bytes(data))
+            tmp_path.replace(blob_path)
+        return digest
+
+    # -------- graph_model（Pass 1） --------
+    def lookup_graph_model(self, *, graph_key: str, model_key: str) -> Optional[Dict[str, object]]:
+        """命中时返回 {"export_report": dict, "used_signal_specs": list}；GraphModel(JSON) 缺失或内容已变视为未命中。"""
+        if not self._enabled:
+            return None
+        entry = self._graphs.get(str(graph_key))
+        if entry is None or entry.get("model_key") != str(model_key):
+            return None
+        export_report = entry.get("export_report")
+        used_signal_specs = entry.get("used_signal_specs")
+        if not isinstance(export_report, dict) or not isinstance(used_signal_specs, list):
+            return None
+        output_json = Path(str(export_report.get("output_json") or ""))
+        if not output_json.is_file() or compute_file_digest(output_json) != entry.get("output_json_sha256"):
+            return None
+        return {"export_report": dict(export_report), "used_signal_specs": [dict(x) for x in used_signal_specs if isinstance(x, dict)]}
+
+    def store_graph_model(
+        self,
+        *,
+        graph_key: str,
+        model_key: str,
+        export_report: Dict[str, object],
+        used_signal_specs: list[dict[str, object]],
+    ) -> None:
+        if not self._enabled:
+            return
+        entry = self._graphs.get(str(graph_key))
+        if entry is None or entry.get("model_key") != str(model_key):
+            # 上游输入变化：下游 gia 产物随之失效
+            entry = {}
+            self._graphs[str(graph_key)] = entry
+        entry["model_key"] = str(model_key)
+        entry["export_report"] = dict(export_report)
+        entry["output_json_sha256"] = compute_file_digest(Path(str(export_report["output_json"])))
+        entry["used_signal_specs"] = [dict(x) for x in used_signal_specs]
+
+    # -------- gia（Pass 2） --------
+    def lookup_gia_bytes(self, *, graph_key: str, gia_key: str) -> Optional[bytes]:
+        if not self._enabled:
+            return None
+        entry = self._graphs.get(str(graph_key))
+        if entry is None or entry.get("gia_key") != str(gia_key):
+            return None
+        return self._read_blob(entry.get("gia_blob"))
+
+    def store_gia_file(self, *, graph_key: str, gia_key: str, gia_file: Path) -> None:
+        if not self._enabled:
+            return
+        entry = self._graphs.setdefault(str(graph_key), {})
+        entry["gia_key"] = str(gia_key)
+        entry["gia_blob"] = self._write_blob(Path(gia_file).read_bytes())
+
+    # -------- pack --------
+    def lookup_pack_bytes(self, *, pack_key: str) -> Optional[bytes]:
+        if not self._enabled or self._pack.get("pack_key") != str(pack_key):
+            return None
+        return self._read_blob(self._pack.get("pack_blob"))
+
+    def store_pack_file(self, *, pack_key: str, pack_file: Path) -> None:
+        if not self._enabled:
+            return
+        self._pack = {"pack_key": str(pack_key), "pack_blob": self._write_blob(Path(pack_file).read_bytes())}
+
+    # -------- 落盘 --------
+    def save(self) -> None:
+        """写回索引，并清理未被索引引用的 blob。"""
+        if not self._enabled:
+            return
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "schema_version": _CACHE_SCHEMA_VERSION,
+            "tool_fingerprint": self._tool_fingerprint,
+            "graphs": self._graphs,
+            "pack": self._pack,
+        }
+        index_path = self._index_path()
+        tmp_path = index_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        tmp_path.replace(index_path)
+
+        referenced = {str(e.get("gia_blob")) for e in self._graphs.values() if e.get("gia_blob")}
+        if self._pack.get("pack_blob"):
+            referenced.add(str(self._pack.get("pack_blob")))
+        blobs_dir = self._cache_dir / _BLOBS_DIR_NAME
+        if blobs_dir.is_dir():
+            for blob_path in blobs_dir.glob("*.gia"):
+                if blob_path.stem not in referenced:
+                    blob_path.unlink()
+
+
+def write_bytes_if_changed(target_path: Path, data: bytes) -> None:
+    target = Path(target_path)
+    if target.is_file() and target.stat().st_size == len(data) and target.read_bytes() == data:
+        return
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(bytes(data))
+
+
+__all__ = [
+    "GiaExportArtifactCache",
+    "compute_cache_digest",
+    "compute_export_tool_fingerprint",
+    "compute_file_digest",
+    "compute_struct_definitions_digest",
+    "write_bytes_if_changed",
+]
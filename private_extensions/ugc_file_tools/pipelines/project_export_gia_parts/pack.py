@@ -5,6 +5,20 @@ from pathlib import Path
 from ugc_file_tools.fs_naming import sanitize_file_stem
 
 
+def resolve_pack_output_gia_file(*, graphs_dir: Path, package_id: str, pack_output_gia_file_name: str) -> Path:
+    """pack 输出路径：`graphs_dir/<文件名>.gia`（默认 `<package_id>_packed_graphs.gia`；仅允许文件名）。"""
+    raw_name = str(pack_output_gia_file_name or "").strip()
+    if raw_name == "":
+        raw_name = f"{package_id}_packed_graphs.gia"
+    if not raw_name.lower().endswith(".gia"):
+        raw_name = raw_name + ".gia"
+    if any(sep in raw_name for sep in ["/", "\\\\"]):
+        raise ValueError("pack_output_gia_file_name 只能是文件名，不能包含路径分隔符")
+
+    pack_file_name = sanitize_file_stem(str(Path(raw_name).stem)) + ".gia"
+    return (Path(graphs_dir).resolve() / pack_file_name).resolve()
+
+
 def pack_gia_files_to_single(
     *,
     output_gia_files_for_pack: list[Path],
@@ -15,16 +29,11 @@ def pack_gia_files_to_single(
     """
     pack：合并成单个 .gia（Root.field_1 为 GraphUnit 列表；field_2 为 dependencies）
     """
-    raw_name = str(pack_output_gia_file_name or "").strip()
-    if raw_name == "":
-        raw_name = f"{package_id}_packed_graphs.gia"
-    if not raw_name.lower().endswith(".gia"):
-        raw_name = raw_name + ".gia"
-    if any(sep in raw_name for sep in ["/", "\\\\"]):
-        raise ValueError("pack_output_gia_file_name 只能是文件名，不能包含路径分隔符")
-
-    pack_file_name = sanitize_file_stem(str(Path(raw_name).stem)) + ".gia"
-    pack_output_gia_file = (Path(graphs_dir).resolve() / pack_file_name).resolve()
+    pack_output_gia_file = resolve_pack_output_gia_file(
+        graphs_dir=Path(graphs_dir),
+        package_id=str(package_id),
+        pack_output_gia_file_name=str(pack_output_gia_file_name or ""),
+    )
 
     from ugc_file_tools.gia.container import unwrap_gia_container, wrap_gia_container
     from ugc_file_tools.gia.varbase_semantics import decoded_field_map_to_numeric_message
@@ -9,14 +9,21 @@ from ugc_file_tools.fs_naming import sanitize_file_stem
 from ugc_file_tools.graph.node_graph.pos_scale import ensure_positive_finite_node_pos_scale
 from ugc_file_tools.graph.port_type_gap_report import build_port_type_gap_report
 from ugc_file_tools.graph.port_types import standardize_graph_model_payload_inplace
-from ugc_file_tools.output_paths import resolve_output_dir_path_in_out_dir
+from ugc_file_tools.output_paths import resolve_output_dir_path_in_out_dir, resolve_output_file_path_in_out_dir
 from ugc_file_tools.ui.guid_registry import collect_ui_key_placeholders_from_graph_json_object
 
+from .artifact_cache import (
+    GiaExportArtifactCache,
+    compute_cache_digest,
+    compute_file_digest,
+    compute_struct_definitions_digest,
+    write_bytes_if_changed,
+)
 from .bundle_sidecars import _copy_dir_tree, _export_bundle_sidecars
 from .graph_specs import _GraphExportSpec, _build_graph_specs_by_scanning_roots, _infer_resource_class_from_graph_code_file
 from .id_ref_placeholders import resolve_id_ref_placeholders_for_graph
 from .layout_index import LayoutIndexAutoFiller
-from .pack import pack_gia_files_to_single
+from .pack import pack_gia_files_to_single, resolve_pack_output_gia_file
 from .signal_bundle import build_per_graph_signal_bundle
 from .signals_collect import _collect_used_signal_specs_from_graph_payload
 from .types import ProgressCallback, ProjectExportGiaPlan, _emit_progress
@@ -188,6 +195,12 @@ def run_project_export_to_gia(
     graphs_dir = output_dir / "graphs"
     graphs_dir.mkdir(parents=True, exist_ok=True)
 
+    # 内容寻址产物缓存：与 GraphModel(JSON) 中间产物同属“导出缓存”，按输出目录隔离
+    artifact_cache = GiaExportArtifactCache(
+        cache_dir=(project_root / "管理配置" / "导出缓存" / "gia_artifacts" / output_dir_name).resolve(),
+        enabled=bool(plan.artifact_cache_enabled),
+    )
+
     user_dir: Optional[Path] = None
     if plan.output_user_dir is not None:
         user_dir = Path(plan.output_user_dir).resolve()
@@ -264,11 +277,26 @@ def run_project_export_to_gia(
 
     layout_filler = LayoutIndexAutoFiller(ui_ctx=ui_ctx)
 
+    # 缓存键的全局部分：节点定义指纹 / 映射 JSON / 信号定义 / 结构体定义 / 坐标缩放（每次导出只计算一次）
+    from engine.utils.graph.node_defs_fingerprint import compute_node_defs_fingerprint
+
+    shared_model_key_parts: dict[str, object] = {}
+    if artifact_cache.enabled:
+        shared_model_key_parts = {
+            "package_id": str(package_id),
+            "node_defs_fp": compute_node_defs_fingerprint(Path(gg_root).resolve()),
+            "mapping_digest": compute_file_digest(Path(mapping_path)),
+            "signal_params_by_name": signal_params_by_name,
+            "struct_defs_digest": compute_struct_definitions_digest(),
+            "node_pos_scale": float(node_pos_scale),
+        }
+
     # ---------------------------------------------------------------------
     # Pass 1: 解析 GraphModel(JSON) + 收集全量用到的信号规格（跨图共享）
     # ---------------------------------------------------------------------
     graph_work_items: list[dict[str, object]] = []
     signal_specs_by_name: dict[str, dict[str, object]] = {}
+    cache_hit_graph_models: list[str] = []
 
     for i, spec in enumerate(specs, start=1):
         _emit_progress(
@@ -279,32 +307,52 @@ def run_project_export_to_gia(
         )
 
         scope_text = str(spec.scope)
-        node_type_id_by_node_def_key = build_node_def_key_to_type_id(
-            mapping_path=Path(mapping_path),
-            scope=scope_text,
-            graph_generater_root=Path(gg_root),
-        )
         graph_name = str(spec.graph_name_hint or spec.graph_key or spec.graph_code_file.stem)
 
         graph_model_json_path = model_dir / f"{scope_text}_{int(spec.assigned_graph_id_int)}_{spec.graph_code_file.stem}.graph_model.json"
-        export_report = _export_graph_model_json_from_graph_code_with_context(
-            ctx=gg_ctx,
-            graph_code_file=spec.graph_code_file,
-            output_json_file=graph_model_json_path,
-            node_pos_scale=float(node_pos_scale),
-        )
+        model_key = ""
+        cached_model = None
+        if artifact_cache.enabled:
+            model_key = compute_cache_digest(
+                shared_model_key_parts,
+                str(scope_text),
+                int(spec.assigned_graph_id_int),
+                str(Path(spec.graph_code_file).resolve()),
+                compute_file_digest(Path(spec.graph_code_file)),
+                str(graph_model_json_path),
+            )
+            cached_model = artifact_cache.lookup_graph_model(graph_key=str(spec.graph_key), model_key=model_key)
+
+        if cached_model is None:
+            export_report = _export_graph_model_json_from_graph_code_with_context(
+                ctx=gg_ctx,
+                graph_code_file=spec.graph_code_file,
+                output_json_file=graph_model_json_path,
+                node_pos_scale=float(node_pos_scale),
+            )
+        else:
+            export_report = dict(cached_model["export_report"])
+            used_signal_specs = list(cached_model["used_signal_specs"])
+            cache_hit_graph_models.append(str(spec.graph_key))
 
         graph_json_object = json.loads(Path(export_report["output_json"]).read_text(encoding="utf-8"))
         if not isinstance(graph_json_object, dict):
             raise TypeError("graph_model_json must be dict")
 
-        graph_model_payload = graph_json_object.get("data")
-        used_signal_specs = _collect_used_signal_specs_from_graph_payload(
-            graph_payload=graph_model_payload,
-            signal_params_by_name=signal_params_by_name,
-            composite_mgr=composite_mgr,
-            composite_loaded=composite_loaded,
-        )
+        if cached_model is None:
+            graph_model_payload = graph_json_object.get("data")
+            used_signal_specs = _collect_used_signal_specs_from_graph_payload(
+                graph_payload=graph_model_payload,
+                signal_params_by_name=signal_params_by_name,
+                composite_mgr=composite_mgr,
+                composite_loaded=composite_loaded,
+            )
+            artifact_cache.store_graph_model(
+                graph_key=str(spec.graph_key),
+                model_key=model_key,
+                export_report=dict(export_report),
+                used_signal_specs=[dict(x) for x in used_signal_specs if isinstance(x, dict)],
+            )
         used_signal_names = {str(x.get("signal_name") or "").strip() for x in used_signal_specs if isinstance(x, dict)} - {""}
 
         # merge specs by signal_name（同名参数不一致时 fail-fast，避免 silent 串号/断线）
@@ -332,7 +380,7 @@ def run_project_export_to_gia(
                 "spec": spec,
                 "scope_text": str(scope_text),
                 "graph_name": str(graph_name),
-                "node_type_id_by_node_def_key": dict(node_type_id_by_node_def_key),
+                "model_key": str(model_key),
                 "export_report": dict(export_report),
                 "graph_json_object": dict(graph_json_object),
                 "used_signal_names": set(used_signal_names),
@@ -345,6 +393,8 @@ def run_project_export_to_gia(
     # Pass 2: 导出 `.gia`（复用共享自包含信号 bundle，确保跨图一致）
     # ---------------------------------------------------------------------
     output_gia_files_for_pack: list[Path] = []
+    cache_hit_graphs: list[Dict[str, object]] = []
+    node_type_id_by_node_def_key_by_scope: dict[str, dict[str, int]] = {}
 
     for i, item in enumerate(graph_work_items, start=1):
         _emit_progress(
@@ -360,10 +410,6 @@ def run_project_export_to_gia(
         scope_text = str(item.get("scope_text") or spec.scope)
         graph_name = str(item.get("graph_name") or spec.graph_name_hint or spec.graph_key or spec.graph_code_file.stem)
 
-        node_type_id_by_node_def_key = item.get("node_type_id_by_node_def_key")
-        if not isinstance(node_type_id_by_node_def_key, dict):
-            raise TypeError("invalid graph_work_items: node_type_id_by_node_def_key must be dict")
-
         export_report = item.get("export_report")
         if not isinstance(export_report, dict):
             raise TypeError("invalid graph_work_items: export_report must be dict")
@@ -424,126 +470,172 @@ def run_project_export_to_gia(
             graph_json_object=graph_json_object,
         )
 
-        # === GraphModel 标准化 + 端口类型缺口报告（导出入口落盘 report，显性化“不确定”）===
-        graph_model_payload = graph_json_object.get("data")
-        if not isinstance(graph_model_payload, dict):
-            raise TypeError("graph_model payload must be dict (expected graph_json_object['data'])")
+        resource_class = _infer_resource_class_from_graph_code_file(graph_code_file=Path(spec.graph_code_file), scope=scope_text)
+        game_version = str(graph_json_object.get("engine_version") or graph_json_object.get("game_version") or "6.3.0")
 
-        outer_graph_variables = graph_json_object.get("graph_variables")
-        graph_variables_for_inject = list(outer_graph_variables) if isinstance(outer_graph_variables, list) else None
+        safe_stem = sanitize_file_stem(str(graph_name))
+        output_gia_rel = Path(output_dir.name) / "graphs" / f"{safe_stem}.gia"
 
-        standardize_graph_model_payload_inplace(
-            graph_model_payload=graph_model_payload,
-            graph_variables=graph_variables_for_inject,
-            workspace_root=Path(gg_root).resolve(),
-            scope=str(scope_text),
-            force_reenrich=True,
-            fill_missing_edge_ids=True,
-        )
+        # === 产物缓存：GraphModel + 全部回填结果 + 导出 hints 均未变化时直接复用上次的 `.gia` 字节 ===
+        # 命中意味着上次导出已通过端口类型缺口检查（缺口非空会 fail-fast），因此跳过标准化/缺口报告/编码。
+        gia_key = ""
+        cached_gia_bytes = None
+        if artifact_cache.enabled:
+            gia_key = compute_cache_digest(
+                str(item.get("model_key") or ""),
+                per_graph_signal_ctx,
+                {str(k): (effective_ui_key_to_guid or {}).get(str(k)) for k in sorted(placeholders)},
+                bool(allow_unresolved_effective),
+                resolved_id_ref.component_name_to_id,
+                resolved_id_ref.entity_name_to_guid,
+                bool(resolved_id_ref.allow_unresolved_id_ref_placeholders),
+                graph_variables_layout_index_auto_filled,
+                str(graph_name),
+                str(resource_class),
+                str(game_version),
+                str(output_gia_rel.as_posix()),
+            )
+            cached_gia_bytes = artifact_cache.lookup_gia_bytes(graph_key=str(spec.graph_key), gia_key=gia_key)
 
-        gap_report = build_port_type_gap_report(
-            graph_model_payload=dict(graph_model_payload),
-            graph_scope=str(scope_text),
-            graph_name=str(graph_name),
-            graph_id_int=int(spec.assigned_graph_id_int),
-        )
         gap_report_file = ""
-        if isinstance(gap_report, dict) and isinstance(gap_report.get("counts"), dict):
-            counts = dict(gap_report.get("counts") or {})
-            total = int(counts.get("total") or 0)
-            err_count = int(counts.get("errors") or 0)
-            warn_count = int(counts.get("warnings") or 0)
-
-            if total > 0:
-                report_dir = (Path(output_dir) / "reports" / "port_type_gaps").resolve()
-                report_dir.mkdir(parents=True, exist_ok=True)
-                safe_stem2 = sanitize_file_stem(str(graph_name))
-                report_path = (report_dir / f"{str(scope_text)}__{int(spec.assigned_graph_id_int)}__{safe_stem2}.json").resolve()
-                report_path.write_text(json.dumps(gap_report, ensure_ascii=False, indent=2), encoding="utf-8")
-                gap_report_file = str(report_path)
-
-                port_type_gap_reports.append(
-                    {
-                        "scope": str(scope_text),
-                        "graph_id_int": int(spec.assigned_graph_id_int),
-                        "graph_name": str(graph_name),
-                        "report_file": str(report_path),
-                        "counts": {"errors": int(err_count), "warnings": int(warn_count), "total": int(total)},
-                    }
+        if cached_gia_bytes is not None:
+            output_gia_file = resolve_output_file_path_in_out_dir(output_gia_rel)
+            write_bytes_if_changed(output_gia_file, cached_gia_bytes)
+            cache_hit_graphs.append(
+                {
+                    "scope": str(scope_text),
+                    "graph_key": str(spec.graph_key),
+                    "graph_id_int": int(spec.assigned_graph_id_int),
+                    "graph_name": str(graph_name),
+                }
+            )
+        else:
+            node_type_id_by_node_def_key = node_type_id_by_node_def_key_by_scope.get(str(scope_text))
+            if node_type_id_by_node_def_key is None:
+                node_type_id_by_node_def_key = build_node_def_key_to_type_id(
+                    mapping_path=Path(mapping_path),
+                    scope=str(scope_text),
+                    graph_generater_root=Path(gg_root),
                 )
-                port_type_gap_summary["errors"] = int(port_type_gap_summary["errors"]) + int(err_count)
-                port_type_gap_summary["warnings"] = int(port_type_gap_summary["warnings"]) + int(warn_count)
-                port_type_gap_summary["total"] = int(port_type_gap_summary["total"]) + int(total)
+                node_type_id_by_node_def_key_by_scope[str(scope_text)] = dict(node_type_id_by_node_def_key)
+
+            # === GraphModel 标准化 + 端口类型缺口报告（导出入口落盘 report，显性化“不确定”）===
+            graph_model_payload = graph_json_object.get("data")
+            if not isinstance(graph_model_payload, dict):
+                raise TypeError("graph_model payload must be dict (expected graph_json_object['data'])")
+
+            outer_graph_variables = graph_json_object.get("graph_variables")
+            graph_variables_for_inject = list(outer_graph_variables) if isinstance(outer_graph_variables, list) else None
+
+            standardize_graph_model_payload_inplace(
+                graph_model_payload=graph_model_payload,
+                graph_variables=graph_variables_for_inject,
+                workspace_root=Path(gg_root).resolve(),
+                scope=str(scope_text),
+                force_reenrich=True,
+                fill_missing_edge_ids=True,
+            )
+
+            gap_report = build_port_type_gap_report(
+                graph_model_payload=dict(graph_model_payload),
+                graph_scope=str(scope_text),
+                graph_name=str(graph_name),
+                graph_id_int=int(spec.assigned_graph_id_int),
+            )
+            if isinstance(gap_report, dict) and isinstance(gap_report.get("counts"), dict):
+                counts = dict(gap_report.get("counts") or {})
+                total = int(counts.get("total") or 0)
+                err_count = int(counts.get("errors") or 0)
+                warn_count = int(counts.get("warnings") or 0)
 
-                # fail-fast：存在任何缺口（非流程端口 effective 仍为泛型家族）直接抛错，禁止继续导出写坏存档。
                 if total > 0:
-                    first_items: list[str] = []
-                    items = gap_report.get("items")
-                    if isinstance(items, list):
-                        for it in items:
-                            if not isinstance(it, dict):
-                                continue
-                            first_items.append(
-                                f"{str(it.get('severity') or '')}:{str(it.get('node_title') or '')}.{str(it.get('port_name') or '')} reason={str(it.get('reason') or '')}"
-                            )
-                            if len(first_items) >= 5:
-                                break
-                    raise ValueError(
-                        "端口类型缺口报告非空（导出禁止继续）："
-                        f"graph={str(graph_name)!r} scope={str(scope_text)!r} total={int(total)} errors={int(err_count)} warnings={int(warn_count)} "
-                        f"report_file={str(gap_report_file)!r} first={first_items!r}"
+                    report_dir = (Path(output_dir) / "reports" / "port_type_gaps").resolve()
+                    report_dir.mkdir(parents=True, exist_ok=True)
+                    safe_stem2 = sanitize_file_stem(str(graph_name))
+                    report_path = (report_dir / f"{str(scope_text)}__{int(spec.assigned_graph_id_int)}__{safe_stem2}.json").resolve()
+                    report_path.write_text(json.dumps(gap_report, ensure_ascii=False, indent=2), encoding="utf-8")
+                    gap_report_file = str(report_path)
+
+                    port_type_gap_reports.append(
+                        {
+                            "scope": str(scope_text),
+                            "graph_id_int": int(spec.assigned_graph_id_int),
+                            "graph_name": str(graph_name),
+                            "report_file": str(report_path),
+                            "counts": {"errors": int(err_count), "warnings": int(warn_count), "total": int(total)},
+                        }
                     )
-
-        resource_class = _infer_resource_class_from_graph_code_file(graph_code_file=Path(spec.graph_code_file), scope=scope_text)
-
-        safe_stem = sanitize_file_stem(str(graph_name))
-        output_gia_rel = Path(output_dir.name) / "graphs" / f"{safe_stem}.gia"
-        write_result = create_gia_file_from_graph_model_json(
-            graph_json_object=graph_json_object,
-            hints=GiaAssetBundleGraphExportHints(
-                graph_id_int=int(spec.assigned_graph_id_int),
-                graph_name=str(graph_name),
-                graph_scope=str(scope_text),
-                resource_class=str(resource_class),
-                graph_generater_root=Path(gg_root),
-                node_type_id_by_node_def_key=dict(node_type_id_by_node_def_key),
-                export_uid=0,
-                game_version=str(graph_json_object.get("engine_version") or graph_json_object.get("game_version") or "6.3.0"),
-                node_pos_scale=float(node_pos_scale),
-                signal_send_node_def_id_by_signal_name=dict(per_graph_signal_ctx.get("signal_send_node_def_id_by_signal_name") or {})
-                if per_graph_signal_ctx.get("signal_send_node_def_id_by_signal_name")
-                else None,
-                signal_send_signal_name_port_index_by_signal_name=dict(
-                    per_graph_signal_ctx.get("signal_send_signal_name_port_index_by_signal_name") or {}
-                )
-                if per_graph_signal_ctx.get("signal_send_signal_name_port_index_by_signal_name")
-                else None,
-                signal_send_param_port_indices_by_signal_name=dict(per_graph_signal_ctx.get("signal_send_param_port_indices_by_signal_name") or {})
-                if per_graph_signal_ctx.get("signal_send_param_port_indices_by_signal_name")
-                else None,
-                signal_send_param_var_type_ids_by_signal_name=dict(per_graph_signal_ctx.get("signal_send_param_var_type_ids_by_signal_name") or {})
-                if per_graph_signal_ctx.get("signal_send_param_var_type_ids_by_signal_name")
-                else None,
-                listen_node_def_id_by_signal_name=dict(per_graph_signal_ctx.get("listen_node_def_id_by_signal_name") or {})
-                if per_graph_signal_ctx.get("listen_node_def_id_by_signal_name")
-                else None,
-                listen_signal_name_port_index_by_signal_name=dict(per_graph_signal_ctx.get("listen_signal_name_port_index_by_signal_name") or {})
-                if per_graph_signal_ctx.get("listen_signal_name_port_index_by_signal_name")
-                else None,
-                listen_param_port_indices_by_signal_name=dict(per_graph_signal_ctx.get("listen_param_port_indices_by_signal_name") or {})
-                if per_graph_signal_ctx.get("listen_param_port_indices_by_signal_name")
-                else None,
-                extra_dependency_graph_units=list(per_graph_signal_ctx.get("extra_dependency_graph_units") or [])
-                if per_graph_signal_ctx.get("extra_dependency_graph_units")
-                else None,
-                graph_related_ids=list(per_graph_signal_ctx.get("graph_related_ids") or []) if per_graph_signal_ctx.get("graph_related_ids") else None,
-            ),
-            output_gia_path=output_gia_rel,
-        )
+                    port_type_gap_summary["errors"] = int(port_type_gap_summary["errors"]) + int(err_count)
+                    port_type_gap_summary["warnings"] = int(port_type_gap_summary["warnings"]) + int(warn_count)
+                    port_type_gap_summary["total"] = int(port_type_gap_summary["total"]) + int(total)
+
+                    # fail-fast：存在任何缺口（非流程端口 effective 仍为泛型家族）直接抛错，禁止继续导出写坏存档。
+                    if total > 0:
+                        first_items: list[str] = []
+                        items = gap_report.get("items")
+                        if isinstance(items, list):
+                            for it in items:
+                                if not isinstance(it, dict):
+                                    continue
+                                first_items.append(
+                                    f"{str(it.get('severity') or '')}:{str(it.get('node_title') or '')}.{str(it.get('port_name') or '')} reason={str(it.get('reason') or '')}"
+                                )
+                                if len(first_items) >= 5:
+                                    break
+                        raise ValueError(
+                            "端口类型缺口报告非空（导出禁止继续）："
+                            f"graph={str(graph_name)!r} scope={str(scope_text)!r} total={int(total)} errors={int(err_count)} warnings={int(warn_count)} "
+                            f"report_file={str(gap_report_file)!r} first={first_items!r}"
+                        )
+
+            write_result = create_gia_file_from_graph_model_json(
+                graph_json_object=graph_json_object,
+                hints=GiaAssetBundleGraphExportHints(
+                    graph_id_int=int(spec.assigned_graph_id_int),
+                    graph_name=str(graph_name),
+                    graph_scope=str(scope_text),
+                    resource_class=str(resource_class),
+                    graph_generater_root=Path(gg_root),
+                    node_type_id_by_node_def_key=dict(node_type_id_by_node_def_key),
+                    export_uid=0,
+                    game_version=str(game_version),
+                    node_pos_scale=float(node_pos_scale),
+                    signal_send_node_def_id_by_signal_name=dict(per_graph_signal_ctx.get("signal_send_node_def_id_by_signal_name") or {})
+                    if per_graph_signal_ctx.get("signal_send_node_def_id_by_signal_name")
+                    else None,
+                    signal_send_signal_name_port_index_by_signal_name=dict(
+                        per_graph_signal_ctx.get("signal_send_signal_name_port_index_by_signal_name") or {}
+                    )
+                    if per_graph_signal_ctx.get("signal_send_signal_name_port_index_by_signal_name")
+                    else None,
+                    signal_send_param_port_indices_by_signal_name=dict(per_graph_signal_ctx.get("signal_send_param_port_indices_by_signal_name") or {})
+                    if per_graph_signal_ctx.get("signal_send_param_port_indices_by_signal_name")
+                    else None,
+                    signal_send_param_var_type_ids_by_signal_name=dict(per_graph_signal_ctx.get("signal_send_param_var_type_ids_by_signal_name") or {})
+                    if per_graph_signal_ctx.get("signal_send_param_var_type_ids_by_signal_name")
+                    else None,
+                    listen_node_def_id_by_signal_name=dict(per_graph_signal_ctx.get("listen_node_def_id_by_signal_name") or {})
+                    if per_graph_signal_ctx.get("listen_node_def_id_by_signal_name")
+                    else None,
+                    listen_signal_name_port_index_by_signal_name=dict(per_graph_signal_ctx.get("listen_signal_name_port_index_by_signal_name") or {})
+                    if per_graph_signal_ctx.get("listen_signal_name_port_index_by_signal_name")
+                    else None,
+                    listen_param_port_indices_by_signal_name=dict(per_graph_signal_ctx.get("listen_param_port_indices_by_signal_name") or {})
+                    if per_graph_signal_ctx.get("listen_param_port_indices_by_signal_name")
+                    else None,
+                    extra_dependency_graph_units=list(per_graph_signal_ctx.get("extra_dependency_graph_units") or [])
+                    if per_graph_signal_ctx.get("extra_dependency_graph_units")
+                    else None,
+                    graph_related_ids=list(per_graph_signal_ctx.get("graph_related_ids") or []) if per_graph_signal_ctx.get("graph_related_ids") else None,
+                ),
+                output_gia_path=output_gia_rel,
+            )
+            output_gia_file = Path(write_result["output_gia_file"]).resolve()
+            artifact_cache.store_gia_file(graph_key=str(spec.graph_key), gia_key=gia_key, gia_file=output_gia_file)
         set_ui_key_guid_registry(None, allow_unresolved=False)
         set_component_id_registry(None, allow_unresolved=False)
         set_entity_id_registry(None, allow_unresolved=False)
-        output_gia_file = Path(write_result["output_gia_file"]).resolve()
+        output_gia_file = Path(output_gia_file).resolve()
         output_gia_files_for_pack.append(Path(output_gia_file))
 
         copied_path = ""
@@ -603,6 +695,7 @@ def run_project_export_to_gia(
                 "graph_code_file": str(spec.graph_code_file),
                 "graph_model_json": str(export_report.get("output_json") or ""),
                 "output_gia_file": str(output_gia_file),
+                "cache_hit": bool(cached_gia_bytes is not None),
                 "copied_output_gia_file": str(copied_path),
                 "port_type_gap_report_file": str(gap_report_file),
                 "ui_export_record_id": (str(record_id_text) if ui_ctx.selected_ui_export_record is not None else ""),
@@ -622,6 +715,7 @@ def run_project_export_to_gia(
     # pack：合并成单个 .gia（Root.field_1 为 GraphUnit 列表；field_2 为 dependencies）
     pack_output_gia_file: Path | None = None
     pack_copied_output_gia_file: Path | None = None
+    pack_cache_hit = False
     if bool(pack_enabled):
         _emit_progress(
             progress_cb,
@@ -630,18 +724,39 @@ def run_project_export_to_gia(
             "打包为单个 .gia…",
         )
 
-        pack_output_gia_file = pack_gia_files_to_single(
-            output_gia_files_for_pack=list(output_gia_files_for_pack),
-            graphs_dir=Path(graphs_dir).resolve(),
-            package_id=str(package_id),
-            pack_output_gia_file_name=str(plan.pack_output_gia_file_name or ""),
-        )
+        pack_key = ""
+        cached_pack_bytes = None
+        if artifact_cache.enabled:
+            pack_key = compute_cache_digest(
+                [(Path(p).name, compute_file_digest(Path(p))) for p in output_gia_files_for_pack],
+                str(plan.pack_output_gia_file_name or ""),
+            )
+            cached_pack_bytes = artifact_cache.lookup_pack_bytes(pack_key=pack_key)
+
+        if cached_pack_bytes is not None:
+            pack_output_gia_file = resolve_pack_output_gia_file(
+                graphs_dir=Path(graphs_dir).resolve(),
+                package_id=str(package_id),
+                pack_output_gia_file_name=str(plan.pack_output_gia_file_name or ""),
+            )
+            write_bytes_if_changed(pack_output_gia_file, cached_pack_bytes)
+            pack_cache_hit = True
+        else:
+            pack_output_gia_file = pack_gia_files_to_single(
+                output_gia_files_for_pack=list(output_gia_files_for_pack),
+                graphs_dir=Path(graphs_dir).resolve(),
+                package_id=str(package_id),
+                pack_output_gia_file_name=str(plan.pack_output_gia_file_name or ""),
+            )
+            artifact_cache.store_pack_file(pack_key=pack_key, pack_file=pack_output_gia_file)
 
         if user_dir is not None and not bool(plan.bundle_enabled):
             target = (user_dir / pack_output_gia_file.name).resolve()
             shutil.copy2(pack_output_gia_file, target)
             pack_copied_output_gia_file = Path(target)
 
+    artifact_cache.save()
+
     bundle_copied_items: dict[str, str] = {}
     copied_to_user_dir = str(user_dir) if user_dir is not None else ""
 
@@ -684,6 +799,12 @@ def run_project_export_to_gia(
         "pack_enabled": bool(pack_enabled),
         "pack_output_gia_file": str(pack_output_gia_file) if pack_output_gia_file is not None else "",
         "pack_copied_output_gia_file": str(pack_copied_output_gia_file) if pack_copied_output_gia_file is not None else "",
+        "pack_cache_hit": bool(pack_cache_hit),
+        "artifact_cache_enabled": bool(artifact_cache.enabled),
+        "artifact_cache_dir": str(artifact_cache.cache_dir) if artifact_cache.enabled else "",
+        "cache_hit_graph_models_total": int(len(cache_hit_graph_models)),
+        "cache_hit_graphs_total": int(len(cache_hit_graphs)),
+        "cache_hit_graphs": list(cache_hit_graphs),
         "inject_enabled": bool(inject_enabled),
         "inject_target_gil_file": str(inject_target_gil_file) if inject_target_gil_file is not None else "",
         "inject_check_gia_header": bool(plan.inject_check_gia_header),
@@ -71,3 +71,7 @@ class ProjectExportGiaPlan:
     inject_skip_non_empty_check: bool = False
     inject_create_backup: bool = True
 
+    # 内容寻址产物缓存（<项目存档>/管理配置/导出缓存/gia_artifacts/）：
+    # 图源码/节点定义/映射 JSON/回填上下文均未变化的图直接复用上次的 `.gia` 字节；pack 输入不变时复用打包结果。
+    artifact_cache_enabled: bool = True
+
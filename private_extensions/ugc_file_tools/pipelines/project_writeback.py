@@ -494,10 +494,19 @@ def run_project_writeback_to_gil(
     # - 这类差异在编辑器侧可能仍可渲染，但官方侧更严格校验可能失败；
     # - 因此写回管线在必要时会先用一个 bootstrap `.gil` 补齐缺失字段（只补齐缺失，不覆盖 base 其它业务段）。
     from ugc_file_tools.gil.infrastructure_bootstrap import detect_gil_infrastructure_gaps_in_payload_root
-    from ugc_file_tools.gil_dump_codec.dump_json_tree import load_gil_payload_as_numeric_message
+    from ugc_file_tools.gil_dump_codec.dump_json_tree import (
+        load_gil_payload_as_numeric_message,
+        load_gil_payload_sections_as_numeric_message,
+    )
 
     t0 = perf_counter()
-    payload_root_for_infra_scan = load_gil_payload_as_numeric_message(input_gil_path, max_depth=64, prefer_raw_hex_for_utf8=True)
+    # 缺口检测只读取基础设施段（2/6/11/22/35），不解码节点图等大段
+    payload_root_for_infra_scan = load_gil_payload_sections_as_numeric_message(
+        input_gil_path,
+        field_numbers=(2, 6, 11, 22, 35),
+        max_depth=64,
+        prefer_raw_hex_for_utf8=True,
+    )
     timings_sec["decode_base_gil_for_infra_scan_sec"] = float(perf_counter() - t0)
 
     t0 = perf_counter()
@@ -637,8 +646,9 @@ def run_project_writeback_to_gil(
 
             id_ref_gil_path = Path(plan.id_ref_gil_file).resolve() if plan.id_ref_gil_file is not None else Path(current_input).resolve()
             if id_ref_gil_path == Path(input_gil_path).resolve():
+                # 基底即 id_ref 来源：整份 payload 经共享视图加载（基础设施段已解码过，直接复用）
                 component_name_to_id, entity_name_to_guid = build_id_ref_mappings_from_payload_root(
-                    payload_root=payload_root_for_infra_scan
+                    payload_root=load_gil_payload_as_numeric_message(input_gil_path, max_depth=64, prefer_raw_hex_for_utf8=True)
                 )
             else:
                 component_name_to_id, entity_name_to_guid = build_id_ref_mappings_from_gil_file(gil_file_path=Path(id_ref_gil_path))
@@ -13,6 +13,7 @@ from typing import Callable, Sequence
 _PROGRESS_RE = re.compile(r"^\s*\[(\d+)\s*/\s*(\d+)\]\s*(.*?)\s*$")
 _PYTHON_EXE_NAME = "python.exe"
 _PYTHONW_EXE_NAME = "pythonw.exe"
+_RUN_UGC_FILE_TOOLS_SCRIPT_NAME = "run_ugc_file_tools.py"
 
 
 @dataclass(frozen=True, slots=True)
@@ -57,7 +58,7 @@ def _select_cli_python_executable() -> str:
 
 def build_run_ugc_file_tools_command(*, workspace_root: Path, argv: Sequence[str]) -> list[str]:
     """构建运行 ugc_file_tools 的子进程命令行。"""
-    script_path = (Path(workspace_root).resolve() / "private_extensions" / "run_ugc_file_tools.py").resolve()
+    script_path = (Path(workspace_root).resolve() / "private_extensions" / _RUN_UGC_FILE_TOOLS_SCRIPT_NAME).resolve()
     if not script_path.is_file():
         raise FileNotFoundError(str(script_path))
     return [_select_cli_python_executable(), "-X", "utf8", str(script_path), *[str(x) for x in argv]]
@@ -74,6 +75,17 @@ def parse_progress_from_stderr_line(line: str) -> tuple[int, int, str] | None:
     return int(current), int(total), str(label)
 
 
+def _split_run_ugc_file_tools_command(command: Sequence[str]) -> tuple[str, Path, list[str]] | None:
+    """识别 `build_run_ugc_file_tools_command` 构建的命令行，返回 (python, 脚本路径, argv)。"""
+    parts = [str(x) for x in command]
+    if len(parts) < 4 or parts[1:3] != ["-X", "utf8"]:
+        return None
+    script_path = Path(parts[3])
+    if script_path.name != _RUN_UGC_FILE_TOOLS_SCRIPT_NAME:
+        return None
+    return parts[0], script_path, parts[4:]
+
+
 def run_cli_with_progress(
     *,
     command: Sequence[str],
@@ -82,7 +94,30 @@ def run_cli_with_progress(
     on_log_line: Callable[[str], None] | None = None,
     stderr_tail_max_lines: int = 200,
 ) -> CliRunResult:
-    """运行子进程并解析输出流中的进度行，同时保留输出尾部用于错误提示。"""
+    """
+    运行子进程并解析输出流中的进度行，同时保留输出尾部用于错误提示。
+
+    ugc_file_tools 命令默认交给常驻 worker 执行（免去每次冷启动的 import/索引加载）；
+    worker 正忙或通过 `UGC_FILE_TOOLS_WARM_WORKER=0` 关闭时，退回独立子进程。
+    """
+    warm_target = _split_run_ugc_file_tools_command(command)
+    if warm_target is not None:
+        from ._cli_worker import is_warm_cli_worker_enabled, run_in_warm_cli_worker
+
+        if is_warm_cli_worker_enabled():
+            python_executable, script_path, argv = warm_target
+            warm_result = run_in_warm_cli_worker(
+                python_executable=python_executable,
+                script_path=script_path,
+                argv=argv,
+                cwd=cwd,
+                on_progress=on_progress,
+                on_log_line=on_log_line,
+                stderr_tail_max_lines=stderr_tail_max_lines,
+            )
+            if warm_result is not None:
+                return warm_result
+
     tail = deque(maxlen=max(1, int(stderr_tail_max_lines)))
 
     creationflags = 0
@@ -0,0 +1,364 @@
+from __future__ import annotations
+
+"""
+_cli_worker.py
+
+UI 侧的常驻 ugc_file_tools worker 客户端：复用同一个 `run_ugc_file_tools.py --jsonl-worker` 进程执行多次 CLI，
+避免每次导出都重新 import engine、加载节点库 / 映射 JSON / node_data 索引。
+
+约定：
+- 每个 (python, run_ugc_file_tools.py) 组合一个 worker，首次使用时惰性启动；
+- 同一 worker 同一时间只跑一个任务；worker 忙时 `try_run` 返回 None，由调用方退回冷启动子进程（并发任务互不阻塞）；
+- worker 崩溃（EOF）时当前任务按失败返回，下次提交自动重启；任务尚未开始前 worker 已退出（空闲超时竞态）则重启后重投一次；
+- worker 在限定时间内未就绪 / 未确认开始任务时强杀 worker 并返回 None，由调用方退回冷启动子进程；
+- worker 空闲超时后自行退出；主进程退出时关闭所有 worker；
+- 协议细节见 `_cli_worker_server.py`。
+"""
+
+import atexit
+import itertools
+import json
+import os
+import queue
+import subprocess
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Optional, Sequence, Tuple
+
+from ._cli_subprocess import CliRunResult
+from ._cli_worker_server import PROTOCOL_LINE_PREFIX
+
+_ENV_WARM_WORKER = "UGC_FILE_TOOLS_WARM_WORKER"
+_DEFAULT_IDLE_TIMEOUT_SECONDS = 600.0
+_CANCEL_GRACE_SECONDS = 5.0
+# 等待 worker 发出 ready / started 的上限（二者都不依赖任务本身耗时）
+_WORKER_HANDSHAKE_TIMEOUT_SECONDS = 60.0
+# 任务执行期间的事件轮询间隔：超时后检查 worker 进程是否仍存活（任务本身不设总时长上限）
+_EVENT_POLL_SECONDS = 1.0
+
+_WorkerEvent = Tuple[str, Any]
+
+
+def is_warm_cli_worker_enabled() -> bool:
+    """环境变量 `UGC_FILE_TOOLS_WARM_WORKER=0/false/off` 时关闭常驻 worker（每次都冷启动子进程）。"""
+    raw = str(os.environ.get(_ENV_WARM_WORKER, "") or "").strip().lower()
+    return raw not in {"0", "false", "off", "no"}
+
+
+class WarmCliWorker:
+    """单个常驻 worker 进程的客户端（进程管理 + JSON lines 协议）。"""
+
+    def __init__(
+        self,
+        *,
+        python_executable: str,
+        script_path: Path,
+        idle_timeout_seconds: float = _DEFAULT_IDLE_TIMEOUT_SECONDS,
+    ) -> None:
+        self._python_executable = str(python_executable)
+        self._script_path = Path(script_path).resolve()
+        self._idle_timeout_seconds = float(idle_timeout_seconds)
+        self._run_lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._proc: Optional[subprocess.Popen] = None
+        self._events: "queue.Queue[_WorkerEvent]" = queue.Queue()
+        self._job_ids = itertools.count(1)
+        self._current_job_id: Optional[str] = None
+
+    @property
+    def pid(self) -> Optional[int]:
+        proc = self._proc
+        return None if proc is None else int(proc.pid)
+
+    def is_alive(self) -> bool:
+        proc = self._proc
+        return proc is not None and proc.poll() is None
+
+    # -------- 进程管理 --------
+    def _start(self, log: Callable[[str], None]) -> Optional[bool]:
+        """启动 worker 并等待 ready；返回 True=就绪，False=启动即退出，None=握手超时（worker 已强杀）。"""
+        creationflags = 0
+        if os.name == "nt":
+            creationflags = int(getattr(subprocess, "CREATE_NO_WINDOW", 0) or 0)
+        proc = subprocess.Popen(
+            [
+                self._python_executable,
+                "-X",
+                "utf8",
+                str(self._script_path),
+                "--jsonl-worker",
+                "--idle-timeout",
+                str(self._idle_timeout_seconds),
+            ],
+            cwd=str(self._script_path.parent.parent),
+            stdin=subprocess.PIPE,
+            # worker 进入服务循环前的输出（解释器 / import 错误）同样走 stdout，作为普通日志行
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            bufsize=1,
+            creationflags=creationflags,
+        )
+        events: "queue.Queue[_WorkerEvent]" = queue.Queue()
+        threading.Thread(
+            target=_pump_worker_stdout,
+            args=(proc, events),
+            name=f"ugc-worker-client:{proc.pid}",
+            daemon=True,
+        ).start()
+        self._proc = proc
+        self._events = events
+
+        deadline = time.monotonic() + _WORKER_HANDSHAKE_TIMEOUT_SECONDS
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._kill()
+                return None
+            try:
+                kind, payload = events.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if kind == "raw":
+                log(str(payload))
+            elif kind == "eof":
+                return False
+            elif payload.get("event") == "ready":
+                return True
+
+    def _kill(self) -> None:
+        """强杀无响应的 worker（下次任务自动重启）。"""
+        proc = self._proc
+        if proc is None:
+            return
+        if proc.poll() is None:
+            proc.kill()
+        self._reap_exit_code()
+
+    def _reap_exit_code(self) -> int:
+        proc = self._proc
+        if proc is None:
+            return 1
+        if proc.stdin is not None and not proc.stdin.closed:
+            proc.stdin.close()
+        exit_code = int(proc.wait())
+        # 任务未返回 result 就退出：即使退出码为 0 也按失败处理
+        return exit_code if exit_code != 0 else 1
+
+    def _send(self, message: Dict[str, Any]) -> bool:
+        proc = self._proc
+        if proc is None or proc.stdin is None:
+            return False
+        with self._send_lock:
+            # 进程边界：worker 恰好在此刻退出（空闲超时）时管道已断开，按“需要重启”处理
+            try:
+                proc.stdin.write(json.dumps(message, ensure_ascii=False) + "\n")
+                proc.stdin.flush()
+            except OSError:
+                return False
+        return True
+
+    # -------- 任务 --------
+    def try_run(
+        self,
+        *,
+        argv: Sequence[str],
+        cwd: Path,
+        on_progress: Callable[[int, int, str], None] | None = None,
+        on_log_line: Callable[[str], None] | None = None,
+        stderr_tail_max_lines: int = 200,
+    ) -> Optional[CliRunResult]:
+        """在 worker 中执行一次 CLI；worker 正忙或握手超时时返回 None（调用方应退回冷启动子进程）。"""
+        if not self._run_lock.acquire(blocking=False):
+            return None
+        try:
+            return self._run_locked(
+                argv=[str(item) for item in argv],
+                cwd=Path(cwd).resolve(),
+                on_progress=on_progress,
+                on_log_line=on_log_line,
+                stderr_tail_max_lines=int(stderr_tail_max_lines),
+            )
+        finally:
+            self._current_job_id = None
+            self._run_lock.release()
+
+    def _run_locked(
+        self,
+        *,
+        argv: list[str],
+        cwd: Path,
+        on_progress: Callable[[int, int, str], None] | None,
+        on_log_line: Callable[[str], None] | None,
+        stderr_tail_max_lines: int,
+    ) -> Optional[CliRunResult]:
+        tail: Deque[str] = deque(maxlen=max(1, stderr_tail_max_lines))
+
+        def _log(line: str) -> None:
+            if line:
+                tail.append(line)
+            if callable(on_log_line):
+                on_log_line(line)
+
+        for attempt in range(2):
+            if not self.is_alive() or _drain_exit_event(self._events):
+                if self._proc is not None:
+                    self._reap_exit_code()
+                ready = self._start(_log)
+                if ready is None:
+                    _log("[worker] ugc_file_tools worker 启动超时，改用独立子进程执行")
+                    return None
+                if not ready:
+                    return CliRunResult(exit_code=self._reap_exit_code(), stderr_tail=list(tail))
+
+            job_id = f"{os.getpid()}-{next(self._job_ids)}"
+            self._current_job_id = job_id
+            started = False
+            submitted = self._send(
+                {"op": "run", "id": job_id, "argv": argv, "cwd": str(cwd), "env": dict(os.environ)}
+            )
+            handshake_deadline = time.monotonic() + _WORKER_HANDSHAKE_TIMEOUT_SECONDS
+            while submitted:
+                try:
+                    kind, payload = self._events.get(timeout=_EVENT_POLL_SECONDS)
+                except queue.Empty:
+                    if not started and time.monotonic() >= handshake_deadline:
+                        # 任务尚未开始：worker 无响应，强杀后交给冷启动子进程（不会重复执行任务）
+                        self._kill()
+                        _log("[worker] ugc_file_tools worker 未响应任务请求，改用独立子进程执行")
+                        return None
+                    if not self.is_alive():
+                        break
+                    continue
+                if kind == "raw":
+                    _log(str(payload))
+                    continue
+                if kind == "eof":
+                    break
+                event = payload.get("event")
+                if event == "started" and payload.get("id") == job_id:
+                    started = True
+                elif event == "log":
+                    _log(str(payload.get("line") or ""))
+                elif event == "progress" and callable(on_progress):
+                    on_progress(int(payload["current"]), int(payload["total"]), str(payload.get("label") or ""))
+                elif event == "result" and payload.get("id") == job_id:
+                    return CliRunResult(exit_code=int(payload["exit_code"]), stderr_tail=list(tail))
+                elif event == "error":
+                    _log(f"[worker] {payload.get('message')}")
+                elif event == "exit":
+                    break
+
+            exit_code = self._reap_exit_code()
+            if started or attempt > 0:
+                _log(f"[worker] ugc_file_tools worker 进程已退出（exit_code={exit_code}），下次任务将重新启动")
+                return CliRunResult(exit_code=exit_code, stderr_tail=list(tail))
+        raise AssertionError("unreachable")
+
+    def cancel(self, *, grace_seconds: float = _CANCEL_GRACE_SECONDS) -> bool:
+        """请求取消当前任务；grace_seconds 内仍未结束则强杀 worker（下次任务自动重启）。"""
+        job_id = self._current_job_id
+        proc = self._proc
+        if job_id is None or proc is None:
+            return False
+        self._send({"op": "cancel", "id": job_id})
+
+        def _kill_if_still_running() -> None:
+            if self._current_job_id == job_id and proc.poll() is None:
+                proc.kill()
+
+        timer = threading.Timer(float(grace_seconds), _kill_if_still_running)
+        timer.daemon = True
+        timer.start()
+        return True
+
+    def shutdown(self) -> None:
+        """通知 worker 退出（不等待当前任务）。"""
+        proc = self._proc
+        if proc is None or proc.poll() is not None:
+            return
+        self._send({"op": "shutdown"})
+        if proc.stdin is not None and not proc.stdin.closed:
+            with self._send_lock:
+                proc.stdin.close()
+
+
+def _pump_worker_stdout(proc: subprocess.Popen, events: "queue.Queue[_WorkerEvent]") -> None:
+    out = proc.stdout
+    if out is not None:
+        for raw_line in out:
+            line = str(raw_line).rstrip("\n")
+            if line.startswith(PROTOCOL_LINE_PREFIX):
+                events.put(("event", json.loads(line[len(PROTOCOL_LINE_PREFIX) :])))
+            else:
+                events.put(("raw", line))
+    events.put(("eof", None))
+
+
+def _drain_exit_event(events: "queue.Queue[_WorkerEvent]") -> bool:
+    """丢弃任务间隙残留的事件；若其中有 exit/eof（空闲超时退出）返回 True。"""
+    exited = False
+    while not events.empty():
+        kind, payload = events.get_nowait()
+        if kind == "eof" or (kind == "event" and payload.get("event") == "exit"):
+            exited = True
+    return exited
+
+
+_workers_lock = threading.Lock()
+_workers: Dict[Tuple[str, str], WarmCliWorker] = {}
+
+
+def get_warm_cli_worker(*, python_executable: str, script_path: Path) -> WarmCliWorker:
+    key = (str(python_executable), str(Path(script_path).resolve()))
+    with _workers_lock:
+        worker = _workers.get(key)
+        if worker is None:
+            worker = WarmCliWorker(python_executable=key[0], script_path=Path(key[1]))
+            _workers[key] = worker
+        return worker
+
+
+def run_in_warm_cli_worker(
+    *,
+    python_executable: str,
+    script_path: Path,
+    argv: Sequence[str],
+    cwd: Path,
+    on_progress: Callable[[int, int, str], None] | None = None,
+    on_log_line: Callable[[str], None] | None = None,
+    stderr_tail_max_lines: int = 200,
+) -> Optional[CliRunResult]:
+    """在共享 worker 中执行；worker 正忙时返回 None。"""
+    worker = get_warm_cli_worker(python_executable=python_executable, script_path=script_path)
+    return worker.try_run(
+        argv=argv,
+        cwd=cwd,
+        on_progress=on_progress,
+        on_log_line=on_log_line,
+        stderr_tail_max_lines=stderr_tail_max_lines,
+    )
+
+
+def shutdown_warm_cli_workers() -> None:
+    with _workers_lock:
+        workers = list(_workers.values())
+        _workers.clear()
+    for worker in workers:
+        worker.shutdown()
+
+
+atexit.register(shutdown_warm_cli_workers)
+
+
+__all__ = [
+    "WarmCliWorker",
+    "get_warm_cli_worker",
+    "is_warm_cli_worker_enabled",
+    "run_in_warm_cli_worker",
+    "shutdown_warm_cli_workers",
+]
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+"""
+_cli_worker_server.py
+
+常驻 ugc_file_tools worker 进程（`run_ugc_file_tools.py --jsonl-worker`）的服务端循环。
+
+协议（stdio 上的 JSON lines；worker -> 主进程的协议行带 `PROTOCOL_LINE_PREFIX` 前缀，其余行视为普通输出）：
+- 主进程 -> worker：
+  - `{"op": "run", "id": <job_id>, "argv": [...], "cwd": <dir>, "env": {...}}`
+  - `{"op": "cancel", "id": <job_id>}`
+  - `{"op": "shutdown"}`
+- worker -> 主进程：
+  - `{"event": "ready", "pid": <pid>}`
+  - `{"event": "started", "id": <job_id>}`
+  - `{"event": "log", "id": <job_id>, "line": <text>}`（任务的 stdout+stderr 合并输出，逐行）
+  - `{"event": "progress", "id": <job_id>, "current": i, "total": n, "label": <text>}`
+  - `{"event": "result", "id": <job_id>, "exit_code": <int>, "cancelled": <bool>, "seconds": <float>}`
+  - `{"event": "error", "id": <job_id | null>, "message": <text>}`（无法识别的请求；worker 继续读取后续请求）
+  - `{"event": "exit", "reason": "idle" | "shutdown"}`
+
+约定：
+- 任务在 worker 主线程内以 `unified_cli.main(argv)` 执行，退出码口径与独立子进程一致
+  （正常结束=0，SystemExit 按其 code，未捕获异常打印 traceback 后=1）；
+- fd 1/2 在启动时被重定向到内部管道：任务内 print / logging / 子进程 / DLL 的输出都不会污染协议流；
+- cancel 通过 `_thread.interrupt_main()` 在任务内抛出 KeyboardInterrupt；任务忽略中断时由主进程超时后强杀；
+- 空闲超过 idle_timeout_seconds 或 stdin 关闭（主进程退出）时 worker 自行退出。
+"""
+
+import _thread
+import io
+import json
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
+from typing import Any, Dict, List, Optional
+
+PROTOCOL_LINE_PREFIX = "\x1eugc-worker "
+_FLUSH_MARKER_PREFIX = "\x1eugc-worker-flush "
+# 任务结束后等待输出转发线程处理到 flush 标记的上限；超时仍发送 result（个别尾部日志可能晚于 result 到达）
+_FLUSH_WAIT_SECONDS = 10.0
+
+
+class _ProtocolWriter:
+    def __init__(self, fd: int) -> None:
+        self._stream = io.open(fd, "w", encoding="utf-8", newline="\n", closefd=True)
+        self._lock = threading.Lock()
+
+    def emit(self, message: Dict[str, Any]) -> None:
+        line = PROTOCOL_LINE_PREFIX + json.dumps(message, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._stream.write(line)
+            self._stream.flush()
+
+
+class _WorkerState:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.current_job_id: Optional[str] = None
+        self.cancel_requested = False
+        self.flushed = threading.Event()
+
+
+def _redirect_process_output(state: _WorkerState, writer: _ProtocolWriter) -> None:
+    """把 fd 1/2 接到内部管道，并由后台线程逐行转发为 log/progress 事件。"""
+    sys.stdout.flush()
+    sys.stderr.flush()
+    read_fd, write_fd = os.pipe()
+    os.dup2(write_fd, 1)
+    os.dup2(write_fd, 2)
+    os.close(write_fd)
+    sys.stdout.reconfigure(line_buffering=True)
+    sys.stderr.reconfigure(line_buffering=True)
+
+    def _pump() -> None:
+        # 与独立子进程一致：text 模式 + universal newlines + errors="replace"
+        with io.open(read_fd, "r", encoding="utf-8", errors="replace") as output:
+            for raw_line in output:
+                line = str(raw_line).rstrip("\n")
+                # 任务输出末尾可能没有换行：标记会拼接在最后一行之后，因此按“包含”而不是“前缀”识别
+                marker_index = line.find(_FLUSH_MARKER_PREFIX)
+                if marker_index >= 0:
+                    if marker_index > 0:
+                        _emit_output_line(writer, state.current_job_id, line[:marker_index])
+                    state.flushed.set()
+                    continue
+                _emit_output_line(writer, state.current_job_id, line)
+
+    threading.Thread(target=_pump, name="ugc-worker-output", daemon=True).start()
+
+
+def _emit_output_line(writer: _ProtocolWriter, job_id: Optional[str], line: str) -> None:
+    from ._cli_subprocess import parse_progress_from_stderr_line
+
+    writer.emit({"event": "log", "id": job_id, "line": line})
+    progress = parse_progress_from_stderr_line(line)
+    if progress is not None:
+        current, total, label = progress
+        writer.emit({"event": "progress", "id": job_id, "current": current, "total": total, "label": label})
+
+
+def _read_requests(
+    protocol_in_fd: int,
+    state: _WorkerState,
+    writer: _ProtocolWriter,
+    jobs: "queue.Queue[Optional[Dict[str, Any]]]",
+) -> None:
+    with io.open(protocol_in_fd, "r", encoding="utf-8") as requests:
+        for raw_line in requests:
+            if not raw_line.strip():
+                continue
+            # 无法识别的请求只回复 error：不能在读取线程内抛出（线程退出后 worker 将不再接收任何请求）
+            try:
+                message = json.loads(raw_line)
+            except json.JSONDecodeError as exc:
+                writer.emit({"event": "error", "id": None, "message": f"worker request is not valid JSON: {exc}"})
+                continue
+            if not isinstance(message, dict):
+                writer.emit(
+                    {"event": "error", "id": None, "message": f"worker request must be dict, got {type(message).__name__}"}
+                )
+                continue
+            op = str(message.get("op") or "")
+            if op == "run":
+                jobs.put(message)
+            elif op == "cancel":
+                with state.lock:
+                    if state.current_job_id is not None and state.current_job_id == str(message.get("id")):
+                        state.cancel_requested = True
+                        _thread.interrupt_main()
+            elif op == "shutdown":
+                break
+            else:
+                writer.emit({"event": "error", "id": message.get("id"), "message": f"unknown worker op: {op!r}"})
+    # stdin 关闭（主进程退出）或 shutdown：让主循环在当前任务结束后退出
+    jobs.put(None)
+
+
+def _system_exit_code(exc: SystemExit) -> int:
+    code = exc.code
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return int(code)
+    print(code, file=sys.stderr)
+    return 1
+
+
+def _call_unified_cli(argv: List[str]) -> int:
+    from ugc_file_tools.unified_cli import main as unified_main
+
+    # 进程边界：把 SystemExit / 未捕获异常折算为退出码（与独立子进程的解释器行为一致），worker 本身继续常驻
+    try:
+        unified_main(argv)
+    except SystemExit as exc:
+        return _system_exit_code(exc)
+    except Exception:
+        traceback.print_exc()
+        return 1
+    return 0
+
+
+def _run_job(message: Dict[str, Any], state: _WorkerState, writer: _ProtocolWriter, script_path: str) -> None:
+    job_id = str(message["id"])
+    argv = [str(item) for item in list(message.get("argv") or [])]
+    env = message.get("env")
+    if isinstance(env, dict):
+        os.environ.clear()
+        os.environ.update({str(key): str(value) for key, value in env.items()})
+    previous_cwd = os.getcwd()
+    os.chdir(str(message.get("cwd") or previous_cwd))
+    sys.argv = [script_path, *argv]
+
+    with state.lock:
+        state.current_job_id = job_id
+        state.cancel_requested = False
+    writer.emit({"event": "started", "id": job_id})
+    started = time.perf_counter()
+    try:
+        try:
+            exit_code = _call_unified_cli(argv)
+        finally:
+            with state.lock:
+                state.current_job_id = None
+    except KeyboardInterrupt:
+        # cancel：中断可能落在 unified_cli 内任意位置，也可能落在上面的 finally 中
+        print("[worker] 任务已取消", file=sys.stderr)
+        exit_code = 1
+    cancelled = bool(state.cancel_requested)
+    os.chdir(previous_cwd)
+
+    # 确保任务输出全部转发完，再发送 result（保证 log 事件都先于 result 到达）
+    sys.stdout.flush()
+    sys.stderr.flush()
+    state.flushed.clear()
+    os.write(1, (_FLUSH_MARKER_PREFIX + job_id + "\n").encode("utf-8"))
+    state.flushed.wait(timeout=_FLUSH_WAIT_SECONDS)
+
+    writer.emit(
+        {
+            "event": "result",
+            "id": job_id,
+            "exit_code": int(exit_code),
+            "cancelled": cancelled,
+            "seconds": round(time.perf_counter() - started, 4),
+        }
+    )
+
+
+def serve_jsonl_worker(*, idle_timeout_seconds: float, script_path: str) -> None:
+    """worker 主循环：逐个执行任务，空闲超时 / shutdown / stdin 关闭时返回。"""
+    protocol_out_fd = os.dup(1)
+    protocol_in_fd = os.dup(0)
+    devnull_fd = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull_fd, 0)
+    os.close(devnull_fd)
+
+    writer = _ProtocolWriter(protocol_out_fd)
+    state = _WorkerState()
+    _redirect_process_output(state, writer)
+
+    jobs: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+    threading.Thread(
+        target=_read_requests,
+        args=(protocol_in_fd, state, writer, jobs),
+        name="ugc-worker-requests",
+        daemon=True,
+    ).start()
+
+    writer.emit({"event": "ready", "pid": os.getpid()})
+    while True:
+        try:
+            message = jobs.get(timeout=max(1.0, float(idle_timeout_seconds)))
+        except queue.Empty:
+            writer.emit({"event": "exit", "reason": "idle"})
+            return
+        if message is None:
+            writer.emit({"event": "exit", "reason": "shutdown"})
+            return
+        _run_job(message, state, writer, script_path)
+
+
+__all__ = ["PROTOCOL_LINE_PREFIX", "serve_jsonl_worker"]
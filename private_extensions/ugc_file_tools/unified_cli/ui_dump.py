@@ -13,7 +13,12 @@ def _command_ui_dump(arguments: argparse.Namespace) -> None:
 
     output_path = resolve_output_file_path_in_out_dir(Path(arguments.output_json_file))
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    dump_gil_to_json(arguments.input_gil_file, str(output_path))
+    dump_gil_to_json(
+        arguments.input_gil_file,
+        str(output_path),
+        compact=bool(arguments.compact),
+        split_sections=bool(arguments.split_sections),
+    )
 
 
 def _command_ui_dump_readable(arguments: argparse.Namespace) -> None:
@@ -236,6 +241,12 @@ def register_ui_dump_subcommands(ui_subparsers: argparse._SubParsersAction) -> N
     dump_parser = ui_subparsers.add_parser("dump-json", help="将 .gil 导出为 JSON（只读）")
     dump_parser.add_argument("input_gil_file", help="输入 .gil 文件路径")
     dump_parser.add_argument("output_json_file", help="输出 .json 文件路径")
+    dump_parser.add_argument("--compact", action="store_true", help="紧凑输出（不缩进），适合大存档")
+    dump_parser.add_argument(
+        "--split-sections",
+        action="store_true",
+        help="每个顶层段单独写入 <输出文件名>.sections/<段号>.json，主文件仅写索引",
+    )
     dump_parser.set_defaults(entrypoint=_command_ui_dump)
 
     dump_readable_parser = ui_subparsers.add_parser(
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from engine.graph.graph_code_parser import GraphCodeParser
+from tests._helpers.project_paths import get_repo_root
+
+
+def _template_graph_file(repo_root: Path) -> Path:
+    package_root = repo_root / "assets" / "资源库" / "项目存档" / "示例项目模板"
+    return next(p for p in sorted((package_root / "节点图").rglob("*.py")) if p.name == "模板示例_局部变量计数.py")
+
+
+def test_deferred_layout_skips_layout_until_first_access() -> None:
+    repo_root = get_repo_root()
+    graph_file = _template_graph_file(repo_root)
+
+    eager_model, _ = GraphCodeParser(repo_root).parse_file(graph_file)
+    deferred_model, _ = GraphCodeParser(repo_root, defer_layout=True).parse_file(graph_file)
+
+    assert not eager_model.has_pending_layout()
+    assert deferred_model.has_pending_layout()
+    assert deferred_model._basic_blocks == []
+
+    # 首次读取基本块即触发布局；结果与立即布局一致（节点 id 为随机值，仅比较结构规模）
+    basic_blocks = deferred_model.basic_blocks
+    assert not deferred_model.has_pending_layout()
+    assert len(basic_blocks) == len(eager_model.basic_blocks) > 0
+    assert len(deferred_model.nodes) == len(eager_model.nodes)
+    assert deferred_model.ensure_layout() is False
+
+
+def test_deferred_layout_clone_keeps_pending_steps_and_serialize_applies_layout() -> None:
+    repo_root = get_repo_root()
+    graph_file = _template_graph_file(repo_root)
+
+    deferred_model, _ = GraphCodeParser(repo_root, defer_layout=True).parse_file(graph_file)
+    cloned = deferred_model.clone()
+    assert cloned.has_pending_layout()
+    assert deferred_model.has_pending_layout()
+
+    data = cloned.serialize()
+    assert not cloned.has_pending_layout()
+    assert data["basic_blocks"]
+
+
+def test_deferred_layout_validation_reports_the_same_issues_as_eager(monkeypatch) -> None:
+    from engine.validate.api import validate_files
+    from engine.validate.rules.code_quality import graph_model_utils
+
+    repo_root = get_repo_root()
+    graph_files = [
+        _template_graph_file(repo_root),
+        next((repo_root / "assets" / "资源库" / "项目存档" / "示例项目_第七关" / "节点图").rglob("关卡实体_UI选关页_第七关_倒计时执行.py")),
+    ]
+
+    def _issue_keys(report) -> list[tuple]:
+        return sorted((i.code, i.level, str(i.file), i.line_span, i.message) for i in report.issues)
+
+    deferred = [_issue_keys(validate_files([f], repo_root, use_cache=False)) for f in graph_files]
+
+    class _EagerParser(GraphCodeParser):
+        def __init__(self, *args, defer_layout: bool = False, **kwargs) -> None:
+            super().__init__(*args, defer_layout=False, **kwargs)
+
+    monkeypatch.setattr(graph_model_utils, "GraphCodeParser", _EagerParser)
+    eager = [_issue_keys(validate_files([f], repo_root, use_cache=False)) for f in graph_files]
+    assert deferred == eager
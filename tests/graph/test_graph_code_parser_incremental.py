@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import json
+import re
+import shutil
+from pathlib import Path
+
+from engine.graph.graph_code_parser import GraphCodeParser
+from engine.graph.models import GraphModel
+from tests._helpers.project_paths import get_repo_root
+
+
+def _template_graph_file(repo_root: Path) -> Path:
+    package_root = repo_root / "assets" / "资源库" / "项目存档" / "示例项目模板"
+    return next(p for p in sorted((package_root / "节点图").rglob("*.py")) if p.name == "模板示例_踏板开关_信号广播.py")
+
+
+def _canonical(model: GraphModel) -> tuple:
+    """去除随机节点 ID 后的结构快照：节点（标题/行号/常量）、连线、事件顺序、端口类型覆盖。"""
+
+    def node_key(node_id: str) -> tuple:
+        node = model.nodes[node_id]
+        constants = json.dumps(node.input_constants, sort_keys=True, ensure_ascii=False, default=str)
+        return (node.title, node.source_lineno, node.source_end_lineno, constants)
+
+    overrides = model.metadata.get("port_type_overrides") or {}
+    return (
+        sorted(node_key(node_id) for node_id in model.nodes),
+        sorted((node_key(e.src_node), e.src_port, node_key(e.dst_node), e.dst_port) for e in model.edges.values()),
+        [model.nodes[node_id].title for node_id in model.event_flow_order],
+        sorted((node_key(k), json.dumps(v, sort_keys=True, ensure_ascii=False)) for k, v in overrides.items()),
+    )
+
+
+def _event_method_line_indices(lines: list[str]) -> list[int]:
+    return [i for i, line in enumerate(lines) if re.match(r"    def on_", line)]
+
+
+def test_incremental_reparse_reuses_unchanged_events_and_matches_full_parse(tmp_path: Path) -> None:
+    repo_root = get_repo_root()
+    graph_file = tmp_path / "graph.py"
+    shutil.copy(_template_graph_file(repo_root), graph_file)
+
+    parser = GraphCodeParser(repo_root, strict=False, incremental=True)
+    first_model, _ = parser.parse_file(graph_file)
+    first_event_ids = list(first_model.event_flow_order)
+    assert len(first_event_ids) >= 3
+
+    # 在第二个事件方法体首行前插入注释：其后所有方法整体下移，AST 结构不变
+    lines = graph_file.read_text(encoding="utf-8").splitlines(keepends=True)
+    event_lines = _event_method_line_indices(lines)
+    lines.insert(event_lines[1] + 1, "        # 仅注释：后续方法行号整体下移\n\n")
+    graph_file.write_text("".join(lines), encoding="utf-8")
+
+    shifted_model, _ = parser.parse_file(graph_file)
+    full_model, _ = GraphCodeParser(repo_root, strict=False).parse_file(graph_file)
+    assert _canonical(shifted_model) == _canonical(full_model)
+    # 事件节点复用了上次的 IR 产物（节点 ID 不变）
+    assert shifted_model.event_flow_order[0] == first_event_ids[0]
+    assert shifted_model.event_flow_order[-1] == first_event_ids[-1]
+    # 复用的片段与上次解析结果互不共享节点对象（布局会就地修改节点坐标）
+    assert shifted_model.nodes[first_event_ids[0]] is not first_model.nodes[first_event_ids[0]]
+
+
+def test_incremental_reparse_rebuilds_changed_event_only(tmp_path: Path) -> None:
+    repo_root = get_repo_root()
+    graph_file = tmp_path / "graph.py"
+    shutil.copy(_template_graph_file(repo_root), graph_file)
+
+    parser = GraphCodeParser(repo_root, strict=False, incremental=True)
+    first_model, _ = parser.parse_file(graph_file)
+    first_event_ids = list(first_model.event_flow_order)
+
+    # 修改第一个事件方法：在其方法体末尾追加一条节点调用语句
+    lines = graph_file.read_text(encoding="utf-8").splitlines(keepends=True)
+    event_lines = _event_method_line_indices(lines)
+    body_end = event_lines[1]
+    while not lines[body_end - 1].strip():
+        body_end -= 1
+    lines.insert(body_end, "        打印字符串(self.game, 字符串=\"增量解析\")\n")
+    graph_file.write_text("".join(lines), encoding="utf-8")
+
+    updated_model, _ = parser.parse_file(graph_file)
+    full_model, _ = GraphCodeParser(repo_root, strict=False).parse_file(graph_file)
+    assert _canonical(updated_model) == _canonical(full_model)
+    assert updated_model.event_flow_order[0] != first_event_ids[0]
+    assert updated_model.event_flow_order[1:] == first_event_ids[1:]
+    assert any(node.title == "打印字符串" for node in updated_model.nodes.values())
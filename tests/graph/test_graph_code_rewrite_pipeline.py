@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import ast
+from pathlib import Path
+
+from engine.graph.utils.ast_node_index import GraphCodeAstIndex
+from engine.graph.utils.dict_literal_rewriter import rewrite_graph_code_dict_literals
+from engine.graph.utils.graph_code_rewrite_config import build_graph_code_rewrite_config
+from engine.graph.utils.graph_code_rewrite_pipeline import rewrite_graph_code
+from engine.graph.utils.list_literal_rewriter import rewrite_graph_code_list_literals
+from engine.graph.utils.syntax_sugar_rewriter import rewrite_graph_code_syntax_sugars
+from tests._helpers.project_paths import get_repo_root
+
+
+def _issue_keys(issues: list[object]) -> list[tuple[str, str, object]]:
+    return [
+        (str(getattr(i, "code", "")), str(getattr(i, "message", "")), getattr(getattr(i, "node", None), "lineno", None))
+        for i in issues
+    ]
+
+
+def test_fused_rewrite_matches_sequential_rewriters_and_keeps_input_intact() -> None:
+    repo_root = get_repo_root()
+    package_root = repo_root / "assets" / "资源库" / "项目存档" / "示例项目模板" / "节点图"
+    graph_files = sorted(package_root.rglob("*.py"))
+    assert graph_files
+
+    for graph_file in graph_files:
+        tree = ast.parse(Path(graph_file).read_text(encoding="utf-8-sig"))
+        original_dump = ast.dump(tree, include_attributes=True)
+        for is_composite in (False, True):
+            config = build_graph_code_rewrite_config(is_composite=is_composite)
+            expected, sugar_issues = rewrite_graph_code_syntax_sugars(
+                tree,
+                scope="server",
+                enable_shared_composite_sugars=config.enable_shared_composite_sugars,
+            )
+            expected, list_issues = rewrite_graph_code_list_literals(
+                expected, max_elements=config.max_list_literal_elements
+            )
+            expected, dict_issues = rewrite_graph_code_dict_literals(expected, max_pairs=config.max_dict_literal_pairs)
+
+            result = rewrite_graph_code(tree, scope="server", config=config)
+
+            assert ast.dump(result.tree, include_attributes=True) == ast.dump(expected, include_attributes=True)
+            assert _issue_keys(result.all_issues) == _issue_keys([*sugar_issues, *list_issues, *dict_issues])
+        assert ast.dump(tree, include_attributes=True) == original_dump
+
+
+def test_ast_node_index_parents_and_nodes_by_type() -> None:
+    tree = ast.parse(
+        "class G:\n"
+        "    def on_x(self, 事件源实体):\n"
+        "        a: \"整数\" = 加法运算(self.game, 左值=1, 右值=2)\n"
+        "        b, c = 拆分(self.game)\n"
+        "        a += 1\n"
+    )
+    index = GraphCodeAstIndex(tree)
+
+    walk_order = [n for n in ast.walk(tree) if isinstance(n, (ast.AnnAssign, ast.Assign))]
+    assert index.nodes_of_type(ast.AnnAssign, ast.Assign) == walk_order
+    for node in ast.walk(tree):
+        for child in ast.iter_child_nodes(node):
+            # Load/Store 等上下文节点为解析器共享单例，父节点无意义
+            if not isinstance(child, ast.expr_context):
+                assert index.parent_of(child) is node
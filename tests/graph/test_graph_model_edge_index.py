@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from engine.graph.models import EdgeModel, GraphModel
+from engine.graph.models.graph_edge_index import GraphEdgeIndex
+
+
+def _snapshot(index: GraphEdgeIndex) -> tuple:
+    def ids(buckets: dict) -> dict:
+        return {key: [edge.id for edge in edges] for key, edges in buckets.items()}
+
+    return (
+        ids(index.incoming_by_node),
+        ids(index.outgoing_by_node),
+        ids(index.incoming_by_port),
+        ids(index.outgoing_by_port),
+        dict(index.edge_keys),
+    )
+
+
+def _build_model() -> GraphModel:
+    model = GraphModel(graph_id="g")
+    for title in ("A", "B", "C"):
+        model.add_node(title=title, category="执行节点", input_names=["流程入", "值"], output_names=["流程出", "结果"])
+    return model
+
+
+def test_edge_index_is_maintained_incrementally_and_matches_rebuild() -> None:
+    model = _build_model()
+    a, b, c = list(model.nodes)
+    index = model.get_edge_index()
+    e1 = model.add_edge(a, "流程出", b, "流程入")
+    e2 = model.add_edge(a, "结果", c, "值")
+    e3 = model.add_edge(b, "结果", c, "值")
+    e4 = model.add_edge(c, "结果", c, "值")
+
+    # 增量维护：同一索引对象持续可用，且与整体重建结果一致
+    assert model.get_edge_index() is index
+    assert _snapshot(index) == _snapshot(GraphEdgeIndex.build(model.edges))
+    assert [edge.id for edge in index.get_incoming(c, "值")] == [e2.id, e3.id, e4.id]
+    assert index.count_incoming(b, "流程入") == 1
+
+    assert model.add_edge_if_absent(a, "流程出", b, "流程入") is None
+    assert model.has_port_connections(b, "流程入", is_input=True)
+
+    assert model.remove_edge(e1.id) is e1
+    assert model.remove_edge(e1.id) is None
+    assert not model.has_port_connections(b, "流程入", is_input=True)
+    assert model.add_edge_if_absent(a, "流程出", b, "流程入") is not None
+
+    assert model.remove_port_connections(c, "值", is_input=True) == [e2.id, e3.id, e4.id]
+    model.remove_node(a)
+    assert model.get_edge_index() is index
+    assert _snapshot(index) == _snapshot(GraphEdgeIndex.build(model.edges))
+    assert not model.edges and not index.edge_keys
+
+
+def test_edge_index_rebuilds_after_direct_edge_mutation() -> None:
+    model = _build_model()
+    a, b, c = list(model.nodes)
+    edge = model.add_edge(a, "结果", b, "值")
+    stale = model.get_edge_index()
+
+    # 直接写 edges 字典（条数变化）：下次读取自动重建
+    model.edges["manual"] = EdgeModel(id="manual", src_node=b, src_port="结果", dst_node=c, dst_port="值")
+    rebuilt = model.get_edge_index()
+    assert rebuilt is not stale
+    assert rebuilt.has_edge(b, "结果", c, "值")
+
+    # 原地改写端点：按约定调用 touch_edges_revision 后重建
+    edge.dst_node = c
+    model.touch_edges_revision()
+    assert model.get_edge_index().count_incoming(c, "值") == 2
+    assert model.get_edge_index().count_incoming(b, "值") == 0
+
+    # 克隆模型拥有独立索引
+    cloned = model.clone()
+    assert cloned.get_edge_index() is not model.get_edge_index()
+    assert _snapshot(cloned.get_edge_index()) == _snapshot(model.get_edge_index())
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import pytest
+
+from engine.graph.common import get_composite_defs_by_class, get_node_name_index, node_name_index_from_library
+from engine.nodes.node_def_index import invalidate_node_def_index
+from engine.nodes.node_definition_loader import NodeDef
+
+
+def _build_library() -> dict[str, NodeDef]:
+    shared = NodeDef(name="获取实体", category="查询节点", scopes=["server", "client"])
+    server_only = NodeDef(name="获取实体", category="查询节点", scopes=["server"])
+    composite = NodeDef(name="示例/复合", category="复合节点", is_composite=True, composite_id="composite_示例")
+    return {
+        "查询节点/获取实体": shared,
+        "查询节点/获取实体#server": server_only,
+        "复合节点/示例/复合": composite,
+    }
+
+
+def test_node_name_index_is_memoized_per_library_and_scope() -> None:
+    library = _build_library()
+
+    server_index = get_node_name_index(library, scope="server")
+    assert get_node_name_index(library, scope=" SERVER ") is server_index
+    assert dict(server_index) == node_name_index_from_library(library, scope="server")
+    assert server_index["获取实体"] == "查询节点/获取实体#server"
+
+    unscoped = get_node_name_index(library)
+    assert get_node_name_index(library, scope="unknown") is unscoped
+    assert dict(unscoped) == node_name_index_from_library(library)
+    assert get_node_name_index(library, scope="client") is not server_index
+
+    with pytest.raises(TypeError):
+        server_index["新节点"] = "查询节点/新节点"  # type: ignore[index]
+
+
+def test_memoized_maps_are_rebuilt_after_library_changes() -> None:
+    library = _build_library()
+    index = get_node_name_index(library)
+    composites = get_composite_defs_by_class(library, include_slashless_alias=True)
+    assert composites["示例复合"] is library["复合节点/示例/复合"]
+    assert "示例复合" not in get_composite_defs_by_class(library)
+
+    library["查询节点/新节点"] = NodeDef(name="新节点", category="查询节点")
+    rebuilt = get_node_name_index(library)
+    assert rebuilt is not index and rebuilt["新节点"] == "查询节点/新节点"
+
+    invalidate_node_def_index(library)
+    assert get_node_name_index(library) is not rebuilt
+    assert get_composite_defs_by_class(library, include_slashless_alias=True) is not composites
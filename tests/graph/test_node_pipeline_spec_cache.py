@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from engine.nodes.pipeline import spec_cache
+from engine.nodes.pipeline.extractor_ast import extract_specs
+from engine.nodes.pipeline.normalizer import normalize_specs
+
+
+_NODE_TEMPLATE = '''
+from engine.nodes.node_spec import node_spec
+
+
+@node_spec(
+    name="{name}",
+    category="查询节点",
+    inputs=[("输入A", "整数")],
+    outputs=[("输出A", "整数")],
+)
+def {func}(game, 输入A):
+    return 输入A
+'''
+
+
+def _write_node(path: Path, name: str, func: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(_NODE_TEMPLATE.format(name=name, func=func), encoding="utf-8")
+
+
+@pytest.fixture()
+def isolated_spec_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    cache_file = tmp_path / "cache" / "node_spec_extract_cache.pickle"
+    monkeypatch.setattr(spec_cache, "_get_cache_file", lambda _workspace: cache_file)
+    spec_cache.invalidate_node_spec_cache_in_memory()
+    yield cache_file
+    spec_cache.invalidate_node_spec_cache_in_memory()
+
+
+def test_incremental_specs_match_full_extraction_and_track_edits(
+    tmp_path: Path, isolated_spec_cache: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    impl_root = tmp_path / "plugins" / "nodes" / "server" / "查询节点"
+    file_a = impl_root / "a.py"
+    file_b = impl_root / "b.py"
+    _write_node(file_a, "节点A", "node_a")
+    _write_node(file_b, "节点B", "node_b")
+    files = [file_a, file_b]
+
+    extracted_files: list[Path] = []
+    original_extract = spec_cache._extract_normalized_specs_for_file
+
+    def _counting_extract(file_path: Path):
+        extracted_files.append(file_path)
+        return original_extract(file_path)
+
+    monkeypatch.setattr(spec_cache, "_extract_normalized_specs_for_file", _counting_extract)
+
+    first = spec_cache.extract_normalized_specs_incremental(files, tmp_path)
+    assert [s.to_dict() for s in first] == [s.to_dict() for s in normalize_specs(extract_specs(files))]
+    assert isolated_spec_cache.is_file()
+    assert extracted_files == files
+
+    # 从磁盘缓存恢复（模拟新进程）：未变化的文件不再提取
+    extracted_files.clear()
+    spec_cache.invalidate_node_spec_cache_in_memory()
+    restored = spec_cache.extract_normalized_specs_incremental(files, tmp_path)
+    assert [s.name for s in restored] == ["节点A", "节点B"]
+    assert extracted_files == []
+
+    # 只改一个文件：结果应反映新内容，其它文件保持不变且不重新提取
+    _write_node(file_b, "节点B改名", "node_b")
+    updated = spec_cache.extract_normalized_specs_incremental(files, tmp_path)
+    assert [s.name for s in updated] == ["节点A", "节点B改名"]
+    assert extracted_files == [file_b]
+
+
+def test_cached_specs_are_not_mutated_by_callers(tmp_path: Path, isolated_spec_cache: Path) -> None:
+    file_a = tmp_path / "plugins" / "nodes" / "server" / "查询节点" / "a.py"
+    _write_node(file_a, "节点A", "node_a")
+
+    first = spec_cache.extract_normalized_specs_incremental([file_a], tmp_path)
+    first[0].input_defaults = {"输入A": 1}
+
+    second = spec_cache.extract_normalized_specs_incremental([file_a], tmp_path)
+    assert second[0].input_defaults == {}
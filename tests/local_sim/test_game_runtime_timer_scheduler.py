@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import app.runtime.engine.game_state as game_state_module
+from app.runtime.engine.game_state import GameRuntime
+
+
+def _runtime_with_fake_clock(monkeypatch) -> tuple[GameRuntime, dict]:
+    state = {"t": 0.0}
+    monkeypatch.setattr(game_state_module.time, "monotonic", lambda: float(state["t"]))
+    game = GameRuntime()
+    game.trace_recorder.set_sink(None)
+    return game, state
+
+
+def _collect_timer_fires(game: GameRuntime) -> list[tuple[str, int, int]]:
+    fires: list[tuple[str, int, int]] = []
+
+    def _on_timer(**kwargs) -> None:
+        fires.append((str(kwargs["定时器名称"]), int(kwargs["定时器序列序号"]), int(kwargs["循环次数"])))
+
+    game.register_event_handler("定时器触发时", _on_timer)
+    return fires
+
+
+def test_timer_scheduler_fires_in_time_order_with_start_order_tiebreak(monkeypatch) -> None:
+    game, _state = _runtime_with_fake_clock(monkeypatch)
+    fires = _collect_timer_fires(game)
+    ent = game.create_mock_entity("定时器宿主")
+
+    game.start_timer_sequence(ent, "b", [1.0, 3.0], is_loop=True)
+    game.start_timer_sequence(ent, "a", [1.0], is_loop=True)
+    game.start_timer_sequence(ent, "once", [2.0], is_loop=False)
+
+    assert game.tick(now=3.0, max_fires=2) == 2
+    assert fires == [("b", 1, 0), ("a", 1, 0)]
+
+    assert game.tick(now=3.0) == 4
+    assert fires[2:] == [("a", 1, 1), ("once", 1, 0), ("b", 2, 0), ("a", 1, 2)]
+    assert game.get_timer(ent, "once") is None
+    assert game.get_timer(ent, "b").next_fire_time == 4.0
+
+
+def test_timer_scheduler_stop_restart_and_pause_resume(monkeypatch) -> None:
+    game, state = _runtime_with_fake_clock(monkeypatch)
+    fires = _collect_timer_fires(game)
+    ent = game.create_mock_entity("定时器宿主")
+
+    # 大量启停只留下最后一次启动的定时器生效
+    for i in range(500):
+        game.start_timer_sequence(ent, f"t{i % 50}", [1.0], is_loop=True)
+        if i % 3 == 0:
+            game.stop_timer(ent, f"t{i % 50}")
+    live = sorted(game.timers.keys())
+    assert game.tick(now=1.0) == len(live)
+    assert sorted(f"{ent.entity_id}_{name}" for name, _, _ in fires) == live
+
+    fires.clear()
+    state["t"] = 1.5
+    assert game.pause_timer(ent, "t1") is True
+    assert game.pause_timer(ent, "t1") is False
+    assert abs(game.get_timer_elapsed(ent, "t1") - 0.5) < 1e-9
+    assert game.tick(now=5.0) == (len(live) - 1) * 4
+    assert all(name != "t1" for name, _, _ in fires)
+
+    # 恢复后不追赶：暂停期间错过的触发不补发
+    state["t"] = 5.0
+    assert game.resume_timer(ent, "t1") is True
+    fires.clear()
+    assert game.tick(now=5.4) == 0
+    assert game.tick(now=5.5) == 1
+    assert fires == [("t1", 1, 1)]
+
+
+def test_timer_scheduler_drives_motor_and_drops_timers_of_destroyed_entities(monkeypatch) -> None:
+    game, _state = _runtime_with_fake_clock(monkeypatch)
+    fires = _collect_timer_fires(game)
+    stopped: list[str] = []
+    game.register_event_handler("基础运动器停止时", lambda **kw: stopped.append(str(kw["运动器名称"])))
+
+    mover = game.create_mock_entity("运动体")
+    doomed = game.create_mock_entity("将被销毁")
+    game.start_motor(
+        mover,
+        motor_name="m",
+        duration=2.0,
+        target_position=[1.0, 2.0, 3.0],
+        target_rotation=[0.0, 90.0, 0.0],
+        lock_rotation=True,
+    )
+    game.start_timer_sequence(doomed, "loop", [0.5], is_loop=True)
+    game.destroy_entity(doomed)
+
+    assert game.tick(now=10.0) == 1
+    assert stopped == ["m"] and fires == []
+    assert mover.position == [1.0, 2.0, 3.0]
+    assert mover.rotation == [0.0, 90.0, 0.0]
+    assert len(game.timers) == 0
+
+
+def test_stop_all_motors_node_stops_only_the_target_entity_motors(monkeypatch) -> None:
+    from app.runtime.engine.node_impl_loader import load_node_exports_for_scope
+
+    game, _state = _runtime_with_fake_clock(monkeypatch)
+    stopped: list[str] = []
+    game.register_event_handler("基础运动器停止时", lambda **kw: stopped.append(str(kw["运动器名称"])))
+
+    mover = game.create_mock_entity("运动体")
+    other = game.create_mock_entity("其它运动体")
+    for entity, motor_name in ((mover, "a"), (other, "c"), (mover, "b")):
+        game.start_motor(
+            entity,
+            motor_name=motor_name,
+            duration=2.0,
+            target_position=[1.0, 2.0, 3.0],
+            target_rotation=[0.0, 0.0, 0.0],
+            lock_rotation=False,
+        )
+    game.start_timer_sequence(mover, "plain", [5.0], is_loop=False)
+
+    stop_node = load_node_exports_for_scope("server")["停止并删除基础运动器"]
+    stop_node(game, mover, "", True)
+    assert stopped == ["a", "b"]
+    assert sorted(record.motor_name or record.timer_name for record in game.timers.values()) == ["c", "plain"]
+
+    assert game.tick(now=10.0) == 2
+    assert stopped == ["a", "b", "c"]
+    assert mover.position != [1.0, 2.0, 3.0]
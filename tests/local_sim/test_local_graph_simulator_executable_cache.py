@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+
+import app.runtime.services.local_graph_simulator_loader as loader_module
+from app.runtime.services.local_graph_simulator_loader import compile_graph_to_executable, load_compiled_graph_class
+from engine.resources.definition_schema_view import get_default_definition_schema_view
+from tests._helpers.project_paths import get_repo_root
+
+
+def test_executable_graph_cache_skips_codegen_until_source_changes(tmp_path: Path, monkeypatch) -> None:
+    repo_root = get_repo_root()
+    # 生成物按图文件绝对路径命名：tmp 图的生成物写到 tmp 缓存根，不污染仓库的 runtime cache
+    cache_root = tmp_path / "runtime_cache"
+    monkeypatch.setattr(loader_module, "get_runtime_cache_root", lambda _workspace: cache_root)
+    graph_file = tmp_path / "fixture_graph_local_sim_executable_cache.py"
+    shutil.copyfile(repo_root / "tests/local_sim/fixture_graph_local_sim_minimal.py", graph_file)
+
+    first = compile_graph_to_executable(workspace_root=repo_root, graph_code_file=graph_file)
+    first_class = load_compiled_graph_class(first)
+    assert first.code_cache_file is not None and first.code_cache_file.is_file()
+    assert cache_root in first.executable_file.parents
+
+    # 命中：不再解析/生成代码（解析器被替换为直接失败的桩）
+    def _fail_parse(*_args, **_kwargs):
+        raise AssertionError("cache hit must not re-parse the graph")
+
+    original_parse_file = loader_module.GraphCodeParser.parse_file
+    monkeypatch.setattr(loader_module.GraphCodeParser, "parse_file", _fail_parse)
+    second = compile_graph_to_executable(workspace_root=repo_root, graph_code_file=graph_file)
+    assert second.cache_hit is True
+    assert (second.graph_name, second.class_name, second.executable_file) == (
+        first.graph_name,
+        first.class_name,
+        first.executable_file,
+    )
+    assert load_compiled_graph_class(second).__name__ == first_class.__name__
+    monkeypatch.setattr(loader_module.GraphCodeParser, "parse_file", original_parse_file)
+
+    # 信号定义变化（图源码不变）：生成代码中的信号 ID 可能变化，缓存失效
+    schema_view = get_default_definition_schema_view()
+    signals = dict(schema_view.get_all_signal_definitions() or {})
+    signals["__pytest_added_signal__"] = {"signal_name": "pytest新增信号"}
+    monkeypatch.setattr(type(schema_view), "get_all_signal_definitions", lambda _self: signals)
+    assert compile_graph_to_executable(workspace_root=repo_root, graph_code_file=graph_file).cache_hit is False
+
+    # 源码内容变化：缓存失效并重新生成
+    graph_file.write_text(graph_file.read_text(encoding="utf-8") + "\n# touched\n", encoding="utf-8")
+    third = compile_graph_to_executable(workspace_root=repo_root, graph_code_file=graph_file)
+    assert third.cache_hit is False
+
+    # 字节码缓存头不匹配（例如解释器升级）：回退 compile 并重写缓存
+    third.code_cache_file.write_bytes(b"stale" + third.code_cache_file.read_bytes())
+    assert load_compiled_graph_class(third).__name__ == first_class.__name__
+    assert third.code_cache_file.read_bytes().startswith(loader_module._CODE_CACHE_MAGIC)
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+import urllib.request
+from types import SimpleNamespace
+
+import pytest
+
+from app.runtime.engine.game_state import GameRuntime
+from app.runtime.services.local_graph_sim_change_journal import LocalSimChangeJournal
+from app.runtime.services.local_graph_sim_observability import build_session_snapshot
+from app.runtime.services.local_graph_sim_server import LocalGraphSimServer, LocalGraphSimServerConfig
+from tests._helpers.project_paths import get_repo_root
+
+
+def _keyed_snapshot(game: GameRuntime) -> dict:
+    snap = build_session_snapshot(SimpleNamespace(game=game), include_entities=True)
+    snap["entities"] = {row["entity_id"]: row for row in snap["entities"]}
+    return snap
+
+
+def _apply(snapshot: dict, entries: list) -> None:
+    for entry in entries:
+        if entry.channel in {"trace", "ui_patch", "reset"}:
+            continue
+        parts = [p.replace("~1", "/").replace("~0", "~") for p in entry.path.split("/")[1:]]
+        cur = snapshot
+        for part in parts[:-1]:
+            cur = cur.setdefault(part, {})
+        if entry.op == "remove":
+            del cur[parts[-1]]
+        else:
+            cur[parts[-1]] = entry.value
+
+
+def test_change_journal_replays_runtime_mutations_into_snapshot() -> None:
+    game = GameRuntime()
+    journal = LocalSimChangeJournal()
+    journal.capture(game)
+    assert journal.read_since(0).reset is True
+    cursor = journal.next_seq
+    mirror = _keyed_snapshot(game)
+
+    hero = game.create_mock_entity("英雄")
+    doomed = game.create_mock_entity("将被销毁")
+    game.set_custom_variable(hero, "血量", 100)
+    game.set_custom_variable(doomed, "a/b", [1, 2])
+    game.set_graph_variable("背包", {"金币": 1})
+    game.get_graph_variable("背包")["金币"] = 2  # 读取后原地修改
+    game.create_local_variable(5)
+    hero.position = [1.0, 2.0, 3.0]
+    game.ui_switch_layout(game.get_entity("entity_2"), 7)
+    game.destroy_entity(doomed)
+    del game.entities["entity_3"]
+    assert journal.capture(game) > 0
+
+    result = journal.read_since(cursor)
+    assert result.reset is False and result.next_seq == journal.next_seq
+    channels = {entry.channel for entry in result.entries}
+    assert {"entity", "variable", "ui", "ui_patch", "trace"} <= channels
+    assert [e.value["op"] for e in result.entries if e.channel == "ui_patch"] == ["switch_layout"]
+    # 同一次 capture 内创建又销毁的实体不产出任何条目
+    assert not any(doomed.entity_id in e.path for e in result.entries if e.channel != "trace")
+
+    _apply(mirror, result.entries)
+    assert mirror == _keyed_snapshot(game)
+
+    # 无变化时不产出条目；未读到的游标保持不变
+    assert journal.capture(game) == 0
+    assert journal.read_since(result.next_seq).entries == []
+
+
+def test_ui_patches_are_only_kept_while_a_journal_observes_the_runtime() -> None:
+    game = GameRuntime()
+    for _ in range(3):
+        game.ui_switch_layout(game.get_entity("entity_2"), 7)
+    changes = game.state_changes.drain()
+    assert changes.ui is True and changes.ui_patches == ()
+
+    LocalSimChangeJournal().capture(game)
+    game.ui_switch_layout(game.get_entity("entity_2"), 8)
+    assert len(game.state_changes.drain().ui_patches) == 1
+
+
+def test_change_journal_cursor_reset_rules_and_paging() -> None:
+    game = GameRuntime()
+    journal = LocalSimChangeJournal(capacity=16)
+    journal.capture(game)
+    start = journal.next_seq
+    for i in range(5):
+        game.set_graph_variable(f"v{i}", i)
+    journal.capture(game)
+
+    page = journal.read_since(start, limit=2)
+    assert [e.path for e in page.entries] == ["/variables/graph_variables/v0", "/variables/graph_variables/v1"]
+    assert journal.read_since(page.next_seq, limit=2).entries[0].path == "/variables/graph_variables/v2"
+    assert journal.read_since(journal.next_seq + 1).reset is True
+
+    # 环形缓冲淘汰后的旧游标 / 新会话之前的游标：都需要 reset
+    for i in range(10):
+        game.set_graph_variable("v0", 100 + i)
+        journal.capture(game)
+    assert journal.read_since(start).reset is True
+    cursor = journal.next_seq
+    journal.capture(GameRuntime())
+    assert journal.read_since(cursor).reset is True
+    assert journal.read_since(journal.next_seq).reset is False
+
+
+@pytest.fixture
+def _local_sim_server(monkeypatch) -> LocalGraphSimServer:
+    monkeypatch.setenv("AYAYA_LOCAL_HTTP_PORT", "0")
+    repo_root = get_repo_root()
+    server = LocalGraphSimServer(
+        LocalGraphSimServerConfig(
+            workspace_root=repo_root,
+            graph_code_file=(repo_root / "tests/local_sim/fixture_graph_local_sim_minimal.py").resolve(),
+            ui_html_file=(repo_root / "tests/local_sim/fixture_ui_local_sim_minimal.html").resolve(),
+            present_player_count=1,
+        )
+    )
+    server.start()
+    yield server
+    server.stop()
+
+
+def _get_json(url: str) -> dict:
+    with urllib.request.urlopen(url, timeout=10) as resp:
+        return json.loads(resp.read().decode("utf-8"))
+
+
+def test_local_sim_server_changes_long_poll_and_sse(_local_sim_server: LocalGraphSimServer) -> None:
+    server = _local_sim_server
+    base = server.get_url().rstrip("/") + "/api/local_sim"
+
+    first = _get_json(base + "/changes?since=0")
+    assert first["reset"] is True and "variables" in first["snapshot"]
+    cursor = int(first["next"])
+
+    # 长轮询：等待期间由另一线程修改运行态，应被唤醒并拿到增量
+    def _mutate_later() -> None:
+        time.sleep(0.3)
+        with server.locked():
+            server.session.game.set_graph_variable("长轮询测试", 1)
+
+    threading.Thread(target=_mutate_later, daemon=True).start()
+    started = time.monotonic()
+    delta = _get_json(base + f"/changes?since={cursor}&wait=5")
+    assert time.monotonic() - started < 4.0
+    assert delta["reset"] is False
+    assert any(c["path"] == "/variables/graph_variables/长轮询测试" for c in delta["changes"])
+
+    with urllib.request.urlopen(base + f"/changes_stream?since={delta['next']}", timeout=10) as resp:
+        assert resp.headers.get("Content-Type", "").startswith("text/event-stream")
+        with server.locked():
+            server.session.game.set_graph_variable("SSE测试", 2)
+        lines = []
+        while not lines or lines[-1] != "":
+            lines.append(resp.readline().decode("utf-8").rstrip("\n"))
+    assert lines[0] == f"id: {json.loads(lines[2][len('data: '):])['next']}"
+    assert lines[1] == "event: changes"
+    event = json.loads(lines[2][len("data: ") :])
+    assert any(c["path"] == "/variables/graph_variables/SSE测试" for c in event["changes"])
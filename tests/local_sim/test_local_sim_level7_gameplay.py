@@ -369,15 +369,15 @@ def test_local_sim_level7_door_controller_emits_close_complete_via_motor_stop(_c
     _advance_and_tick(session, advance, 1.1)
 
     # 再关门：应在运动器完成后广播 `第七关_门_关闭完成`
-    base = len(session.game.trace_recorder.events)
+    base = session.game.trace_recorder.next_seq
     session.emit_signal(signal_id="第七关_门_动作", params={"目标状态": "关闭"})
     assert str(session.game.graph_variables.get("门_运动目标状态") or "") == "关闭"
 
     _advance_and_tick(session, advance, 0.9)
-    assert not any(e.kind == "event" and e.message == "第七关_门_关闭完成" for e in session.game.trace_recorder.events[base:])
+    assert not any(e.kind == "event" and e.message == "第七关_门_关闭完成" for e in session.game.trace_recorder.read_since(base)[0])
 
     _advance_and_tick(session, advance, 0.2)
-    assert any(e.kind == "event" and e.message == "第七关_门_关闭完成" for e in session.game.trace_recorder.events[base:])
+    assert any(e.kind == "event" and e.message == "第七关_门_关闭完成" for e in session.game.trace_recorder.read_since(base)[0])
     assert str(session.game.graph_variables.get("门_运动目标状态") or "") == ""
 
 
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import inspect
+
+import app.runtime.engine.node_impl_loader as loader_module
+from app.runtime.engine.game_state import GameRuntime
+from app.runtime.engine.node_impl_loader import LazyNodeFunction, load_node_exports_for_scope
+
+
+def test_node_exports_import_implementation_modules_on_first_use(monkeypatch) -> None:
+    monkeypatch.setattr(loader_module, "_CACHED_MODULES_BY_FILE", {})
+    monkeypatch.setattr(loader_module, "_CACHED_EXPORTS_BY_SCOPE", {})
+
+    exports = load_node_exports_for_scope("server")
+    assert exports and all(isinstance(fn, LazyNodeFunction) for fn in exports.values())
+    # 只构建导出表：不导入任何实现模块
+    assert loader_module._CACHED_MODULES_BY_FILE == {}
+    assert load_node_exports_for_scope("server") is exports
+
+    add = exports["加法运算"]
+    params = list(inspect.signature(add).parameters)
+    assert params[0] == "game"
+    assert set(loader_module._CACHED_MODULES_BY_FILE) == {add.file_path}
+    assert add(GameRuntime(), 1, 2) == 3
+
+    # dunder 元信息不转发：真实函数通过 resolve() 获取
+    assert add.__doc__ == LazyNodeFunction.__doc__
+    assert add.resolve().__name__ == "加法运算" and add.resolve() is add.__wrapped__
+
+    # 未使用的节点仍未导入
+    assert not all(fn.loaded for fn in exports.values())
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import pytest
+
+from app.runtime.engine.game_state import GameRuntime
+from app.runtime.engine.node_executor import NodeExecutor
+from app.runtime.engine.trace_logging import TraceLevel, TraceRecorder, format_trace_event_line
+
+
+def test_trace_recorder_ring_buffer_keeps_monotonic_seq_cursor() -> None:
+    recorder = TraceRecorder(capacity=4)
+    for i in range(3):
+        recorder.record("runtime", "event", f"e{i}")
+
+    events, cursor = recorder.read_since(0)
+    assert [e.seq for e in events] == [0, 1, 2]
+    assert cursor == 3
+
+    for i in range(3, 10):
+        recorder.record("runtime", "event", f"e{i}")
+    # 旧游标指向已被淘汰的事件：从缓冲区最早的事件开始返回
+    events, cursor = recorder.read_since(3)
+    assert [e.message for e in events] == ["e6", "e7", "e8", "e9"]
+    assert cursor == 10
+    assert recorder.read_since(cursor) == ([], 10)
+
+    # clear 不重置 seq：持有游标的读取方不会重复或错过事件
+    recorder.clear()
+    recorder.record("runtime", "event", "after_clear")
+    events, cursor = recorder.read_since(10)
+    assert [(e.seq, e.message) for e in events] == [(10, "after_clear")]
+    assert cursor == 11
+
+
+def test_trace_levels_filter_runtime_and_node_events() -> None:
+    with pytest.raises(ValueError):
+        TraceLevel.parse("verbose")
+
+    def _node(x: int) -> int:
+        return x + 1
+
+    for level, expected_kinds in [
+        ("off", []),
+        ("events", ["event", "event_dispatch"]),
+        ("nodes", ["event", "event_dispatch", "start", "finish"]),
+        ("full", ["event", "event_dispatch", "start", "finish"]),
+    ]:
+        game = GameRuntime(trace_level=level)
+        executor = NodeExecutor(game)
+        game.register_event_handler("测试事件", lambda **_kw: executor.execute_node("加一", _node, 1))
+        game.trigger_event("测试事件", 事件源实体=game.get_entity("entity_1"))
+
+        events = game.trace_recorder.as_list()
+        assert [e.kind for e in events] == expected_kinds
+        starts = [e for e in events if e.kind == "start"]
+        if starts:
+            assert ("call_signature" in starts[0].details) is (level == "full")
+
+
+def test_console_sink_is_optional_and_formats_dispatch_lines(capsys) -> None:
+    quiet = GameRuntime()
+    capsys.readouterr()
+    quiet.register_event_handler("测试事件", lambda **_kw: None, owner=quiet.get_entity("entity_1"))
+    quiet.trigger_event("测试事件", 事件源GUID=7)
+    assert "[事件" not in capsys.readouterr().out
+
+    loud = GameRuntime(trace_console=True)
+    capsys.readouterr()
+    loud.register_event_handler("测试事件", lambda **_kw: None, owner=loud.get_entity("entity_1"))
+    loud.trigger_event("测试事件", 事件源GUID=7)
+    lines = capsys.readouterr().out.splitlines()
+    assert lines == [
+        "[事件触发] 测试事件",
+        "[事件分发] 测试事件 -> entity_1(自身实体) :: <lambda> guid=7",
+    ]
+    assert format_trace_event_line(loud.trace_recorder.as_list()[-1]) == lines[-1]
+
+
+def test_graph_class_labels_do_not_keep_graph_classes_alive() -> None:
+    import gc
+    import weakref
+
+    from app.runtime.engine.game_state import _describe_graph_class
+
+    graph_class = type("临时节点图", (), {"__doc__": "节点图类：临时图"})
+    assert _describe_graph_class(graph_class) == ("临时节点图", "临时图")
+    ref = weakref.ref(graph_class)
+    del graph_class
+    gc.collect()
+    assert ref() is None
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+
+def _ensure_shape_editor_backend_importable() -> None:
+    # `private_extensions/shape-editor` uses a hyphen in directory name, so it isn't a normal Python package.
+    workspace_root = Path(__file__).resolve().parents[2]
+    plugin_dir = (workspace_root / "private_extensions" / "shape-editor").resolve()
+    plugin_dir_text = str(plugin_dir)
+    if plugin_dir_text not in sys.path:
+        sys.path.insert(0, plugin_dir_text)
+
+
+_ensure_shape_editor_backend_importable()
+
+from shape_editor_backend import pixel_art  # noqa: E402
+
+
+def _reference_prequantize(rgb: np.ndarray, palette_hex: list[str]) -> np.ndarray:
+    # 全量广播 (N, P, 3) 的原始口径
+    palette_rgb = pixel_art._hex_to_rgb_array(palette_hex)
+    palette_lab = pixel_art._rgb_uint8_to_lab(palette_rgb)
+    pixels_lab = pixel_art._rgb_uint8_to_lab(rgb.reshape(-1, 3))
+    diff = pixels_lab[:, np.newaxis, :] - palette_lab[np.newaxis, :, :]
+    nearest_idx = np.argmin(np.sum(diff * diff, axis=2), axis=1)
+    return palette_rgb[nearest_idx].reshape(rgb.shape)
+
+
+def test_prequantize_to_palette_matches_full_broadcast(monkeypatch) -> None:
+    rng = np.random.default_rng(20240601)
+    palette_hex = [f"#{int(v):06X}" for v in rng.integers(0, 1 << 24, size=48)]
+
+    # 少量唯一色（像素图常见）+ 全随机噪声；缩小分块上限以覆盖多块路径
+    few_colors = rng.integers(0, 256, size=(12, 3), dtype=np.uint8)
+    images = [
+        few_colors[rng.integers(0, len(few_colors), size=(97, 131))],
+        rng.integers(0, 256, size=(61, 83, 3), dtype=np.uint8),
+    ]
+    monkeypatch.setattr(pixel_art, "_QUANTIZE_CHUNK_ELEMENTS", 48 * 100)
+
+    for image in images:
+        out = pixel_art.prequantize_to_palette(image, palette_hex)
+        assert out.dtype == np.uint8
+        assert out.shape == image.shape
+        assert np.array_equal(out, _reference_prequantize(image, palette_hex))
+
+
+def test_prequantize_to_palette_empty_palette_returns_copy() -> None:
+    image = np.zeros((4, 5, 3), dtype=np.uint8)
+    out = pixel_art.prequantize_to_palette(image, [])
+    assert np.array_equal(out, image)
+    assert out is not image
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+
+def _ensure_private_extensions_importable() -> None:
+    repo_root = Path(__file__).resolve().parents[2]
+    private_extensions_root = (repo_root / "private_extensions").resolve()
+    if str(private_extensions_root) not in sys.path:
+        sys.path.insert(0, str(private_extensions_root))
+
+
+def _sample_gil() -> Path:
+    repo_root = Path(__file__).resolve().parents[2]
+    return repo_root / "private_extensions/ugc_file_tools/builtin_resources/empty_base_samples/two_structs_sample.gil"
+
+
+def test_streaming_dump_matches_whole_tree_json(tmp_path: Path) -> None:
+    _ensure_private_extensions_importable()
+
+    from ugc_file_tools.gil_dump_codec.dump_gil_to_json import dump_gil_to_json
+    from ugc_file_tools.gil_dump_codec.dump_json_tree import load_gil_payload_as_dump_json_object
+
+    expected = load_gil_payload_as_dump_json_object(_sample_gil(), max_depth=32, prefer_raw_hex_for_utf8=False)
+
+    indented_path = tmp_path / "dump.json"
+    dump_gil_to_json(str(_sample_gil()), str(indented_path))
+    assert indented_path.read_text(encoding="utf-8") == json.dumps(expected, ensure_ascii=False, indent=2)
+
+    compact_path = tmp_path / "dump.compact.json"
+    dump_gil_to_json(str(_sample_gil()), str(compact_path), compact=True)
+    assert compact_path.read_text(encoding="utf-8") == json.dumps(expected, ensure_ascii=False, separators=(",", ":"))
+
+
+def test_streaming_dump_can_split_sections(tmp_path: Path) -> None:
+    _ensure_private_extensions_importable()
+
+    from ugc_file_tools.gil_dump_codec.dump_gil_to_json import dump_gil_to_json
+    from ugc_file_tools.gil_dump_codec.dump_json_tree import load_gil_payload_as_dump_json_object
+
+    expected = load_gil_payload_as_dump_json_object(_sample_gil(), max_depth=32, prefer_raw_hex_for_utf8=False)["4"]
+
+    index_path = tmp_path / "dump.json"
+    dump_gil_to_json(str(_sample_gil()), str(index_path), split_sections=True)
+    section_index = json.loads(index_path.read_text(encoding="utf-8"))["4"]
+
+    assert list(section_index) == list(expected)
+    for field_key, relative_path in section_index.items():
+        section_path = tmp_path / relative_path
+        assert section_path.parent.name == "dump.json.sections"
+        assert json.loads(section_path.read_text(encoding="utf-8")) == expected[field_key]
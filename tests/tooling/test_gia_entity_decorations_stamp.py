@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import json
+import struct
+import sys
+from pathlib import Path
+
+
+def _ensure_private_extensions_importable() -> None:
+    repo_root = Path(__file__).resolve().parents[2]
+    private_extensions_root = (repo_root / "private_extensions").resolve()
+    if str(private_extensions_root) not in sys.path:
+        sys.path.insert(0, str(private_extensions_root))
+
+
+def _build_entity_base_gia_bytes() -> bytes:
+    from ugc_file_tools.gia.container import wrap_gia_container
+    from ugc_file_tools.gil_dump_codec.protobuf_like import encode_tag, encode_varint, encode_wire_chunks
+
+    def ld(field_number: int, payload: bytes) -> tuple[bytes, bytes]:
+        return encode_tag(field_number, 2), encode_varint(len(payload)) + payload
+
+    def vi(field_number: int, value: int) -> tuple[bytes, bytes]:
+        return encode_tag(field_number, 0), encode_varint(value)
+
+    def msg(*chunks: tuple[bytes, bytes]) -> bytes:
+        return encode_wire_chunks(list(chunks))
+
+    def vec(x: float, y: float, z: float) -> bytes:
+        return b"\x0d" + struct.pack("<f", x) + b"\x15" + struct.pack("<f", y) + b"\x1d" + struct.pack("<f", z)
+
+    transform = msg(ld(1, vec(0, 0, 0)), ld(2, vec(-90, 0, 0)), ld(3, vec(1, 1, 1)), vi(7, 3))
+    payload = msg(
+        vi(1, 1073741900),
+        vi(2, 10001),
+        ld(4, msg(vi(1, 40), ld(50, msg(vi(502, 5))))),
+        ld(5, msg(vi(1, 3), ld(9, b"abc"))),
+        ld(5, msg(vi(1, 1), ld(11, transform))),
+    )
+    accessory = msg(ld(1, msg(vi(2, 1), vi(4, 1073741900))), ld(3, b"tpl"), ld(12, msg(ld(1, payload), vi(2, 7))))
+    parent = msg(
+        ld(1, msg(vi(2, 1), vi(4, 1000))),
+        ld(2, msg(vi(2, 1), vi(4, 1073741900))),
+        ld(3, b"ent"),
+        ld(5, msg(vi(1, 40), ld(50, msg(ld(501, b""))))),
+    )
+    return wrap_gia_container(msg(ld(1, parent), ld(2, accessory), ld(3, b"dir\\base.gia"), ld(5, b"6.3.0")))
+
+
+def test_build_entity_gia_with_decorations_wire_stamps_each_accessory(tmp_path: Path) -> None:
+    _ensure_private_extensions_importable()
+
+    from ugc_file_tools.gia.container import unwrap_gia_container
+    from ugc_file_tools.gia.entity_decorations_writer import build_entity_gia_with_decorations_wire
+    from ugc_file_tools.gia.varbase_semantics import decoded_field_map_to_numeric_message
+    from ugc_file_tools.gil_dump_codec.protobuf_like import decode_message_to_field_map
+
+    base_gia = tmp_path / "base.gia"
+    base_gia.write_bytes(_build_entity_base_gia_bytes())
+    report = tmp_path / "decorations.json"
+    decorations = [
+        {"name": f"装饰_{i}", "template_id": 20000 + i, "pos": [float(i), 2.0, 3.0], "scale": [1.0, 1.0, 2.0], "yaw_deg": 15.0 * i}
+        for i in range(300)
+    ]
+    report.write_text(json.dumps({"decorations": decorations}, ensure_ascii=False), encoding="utf-8")
+
+    result = build_entity_gia_with_decorations_wire(
+        entity_base_gia=base_gia,
+        accessory_template_gia=None,
+        decorations_report_json=report,
+        output_gia_path=tmp_path / "out.gia",
+        check_header=False,
+        limit_count=0,
+    )
+    assert result["decorations_count"] == 300
+    assert result["parent_unit_id"] == 1000
+
+    proto = unwrap_gia_container(tmp_path / "out.gia", check_header=False)
+    fields_map, consumed = decode_message_to_field_map(data_bytes=proto, start_offset=0, end_offset=len(proto), remaining_depth=16)
+    assert consumed == len(proto)
+    root = decoded_field_map_to_numeric_message(fields_map)
+
+    units = root["2"]
+    assert isinstance(units, list) and len(units) == 300
+    related_ids = root["1"]["2"]
+    assert [int(r["4"]) for r in related_ids] == [1073741900 + i for i in range(300)]
+
+    for i, unit in enumerate(units):
+        unit_id = 1073741900 + i
+        assert int(unit["1"]["4"]) == unit_id
+        assert unit["3"] == f"装饰_{i}"
+        payload = unit["12"]["1"]
+        assert int(payload["1"]) == unit_id
+        assert int(payload["2"]) == 20000 + i
+        assert int(payload["4"]["50"]["502"]) == 1000
+        transform = payload["5"][1]["11"]
+        assert transform["1"]["1"] == float(i)
+        assert transform["2"]["2"] == 15.0 * i
+        assert transform["3"]["3"] == 2.0
+        assert int(transform["7"]) == 3
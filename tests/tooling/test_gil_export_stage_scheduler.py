@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+
+def _ensure_private_extensions_importable() -> None:
+    repo_root = Path(__file__).resolve().parents[2]
+    private_extensions_root = (repo_root / "private_extensions").resolve()
+    if str(private_extensions_root) not in sys.path:
+        sys.path.insert(0, str(private_extensions_root))
+
+
+def test_stage_dependencies_include_output_conflicts() -> None:
+    _ensure_private_extensions_importable()
+
+    from ugc_file_tools.gil_package_exporter.file_io import _write_json_file
+    from ugc_file_tools.gil_package_exporter.stage_scheduler import ExportStage, resolve_stage_dependencies
+
+    stages = [
+        ExportStage(name="a", func=_write_json_file, outputs=("原始解析/数据块",)),
+        ExportStage(name="b", func=_write_json_file, outputs=("元件库",)),
+        ExportStage(name="c", func=_write_json_file, outputs=("原始解析/数据块/index.json",)),
+        ExportStage(name="d", func=_write_json_file, result_kwargs={"python_object": "b"}, outputs=("实体摆放",)),
+    ]
+    assert resolve_stage_dependencies(stages) == {"a": (), "b": (), "c": ("a",), "d": ("b",)}
+
+    with pytest.raises(ValueError):
+        resolve_stage_dependencies([ExportStage(name="x", func=_write_json_file, depends_on=("y",))])
+
+
+def test_parallel_stage_run_matches_serial_run(tmp_path: Path) -> None:
+    _ensure_private_extensions_importable()
+
+    from ugc_file_tools.gil_package_exporter.file_io import _write_json_file
+    from ugc_file_tools.gil_package_exporter.runner import _export_raw_pyugc_dump
+    from ugc_file_tools.gil_package_exporter.stage_scheduler import ExportStage, run_export_stages
+
+    payload = {"4": {"1": "名称", "2": ["名称", "其它"]}}
+
+    def _build_stages(root: Path) -> list:
+        return [
+            ExportStage(
+                name="raw",
+                func=_export_raw_pyugc_dump,
+                kwargs={"output_package_root": root, "header_fields": {"body_size": 1}},
+                outputs=("原始解析/pyugc",),
+                uses_payload=True,
+            ),
+            ExportStage(
+                name="first_writer",
+                func=_write_json_file,
+                kwargs={"file_path": root / "shared" / "out.json", "python_object": {"v": 1}},
+                outputs=("shared",),
+            ),
+            ExportStage(
+                name="second_writer",
+                func=_write_json_file,
+                kwargs={"file_path": root / "shared" / "out.json"},
+                result_kwargs={"python_object": "raw"},
+                outputs=("shared/out.json",),
+            ),
+        ]
+
+    outputs = {}
+    for jobs in (1, 2):
+        root = tmp_path / f"jobs_{jobs}"
+        run = run_export_stages(_build_stages(root), payload=payload, jobs=jobs)
+        assert run.jobs == jobs
+        assert [item["stage"] for item in run.to_report()["stages"]] == ["raw", "first_writer", "second_writer"]
+        assert run.results["raw"]["dump"] == "原始解析/pyugc/dump.json"
+        outputs[jobs] = {
+            path.relative_to(root).as_posix(): path.read_bytes() for path in sorted(root.rglob("*")) if path.is_file()
+        }
+
+    assert outputs[1] == outputs[2]
+    assert b"string_index" in outputs[2]["shared/out.json"]
+
+
+def test_resource_output_subdirs_cover_every_routed_resource_dir() -> None:
+    _ensure_private_extensions_importable()
+
+    from ugc_file_tools.gil_package_exporter.dtype_resource_extractor import (
+        _RESOURCE_OUTPUT_SUBDIRS,
+        _RESOURCE_SUBDIR_RULES,
+        _pick_resource_output_subdir,
+    )
+
+    names = [keyword for keywords, _subdir in _RESOURCE_SUBDIR_RULES for keyword in keywords]
+    routed = {_pick_resource_output_subdir({"3 name@string": name}) for name in [*names, "未知资源", None]}
+    declared = [Path(subdir) for subdir in _RESOURCE_OUTPUT_SUBDIRS]
+    for subdir in routed:
+        assert any(subdir == root or root in subdir.parents for root in declared), subdir
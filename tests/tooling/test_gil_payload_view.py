@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import shutil
+import sys
+from pathlib import Path
+
+
+def _ensure_private_extensions_importable() -> None:
+    repo_root = Path(__file__).resolve().parents[2]
+    private_extensions_root = (repo_root / "private_extensions").resolve()
+    if str(private_extensions_root) not in sys.path:
+        sys.path.insert(0, str(private_extensions_root))
+
+
+def _copy_sample_gil(tmp_path: Path) -> Path:
+    repo_root = Path(__file__).resolve().parents[2]
+    sample = repo_root / "private_extensions/ugc_file_tools/builtin_resources/empty_base_samples/two_structs_sample.gil"
+    target = tmp_path / "base.gil"
+    shutil.copyfile(sample, target)
+    return target
+
+
+def test_gil_payload_view_is_shared_and_returns_independent_copies(tmp_path: Path) -> None:
+    _ensure_private_extensions_importable()
+
+    from ugc_file_tools.gil_dump_codec.dump_json_tree import (
+        load_gil_payload_as_numeric_message,
+        load_gil_payload_sections_as_numeric_message,
+    )
+    from ugc_file_tools.gil_dump_codec.gil_payload_view import clear_gil_payload_view_cache, get_gil_payload_view
+
+    gil_path = _copy_sample_gil(tmp_path)
+    view = get_gil_payload_view(gil_path)
+    assert get_gil_payload_view(gil_path) is view
+
+    payload_root = load_gil_payload_as_numeric_message(gil_path, max_depth=64, prefer_raw_hex_for_utf8=True)
+    assert list(payload_root) == [str(number) for number in view.field_numbers()]
+
+    first_key = next(iter(payload_root))
+    section = view.get_section(int(first_key), max_depth=64, prefer_raw_hex_for_utf8=True)
+    assert section == payload_root[first_key]
+
+    # 返回值为独立副本：修改不会污染共享缓存
+    payload_root[first_key] = "mutated"
+    assert load_gil_payload_as_numeric_message(gil_path, max_depth=64, prefer_raw_hex_for_utf8=True)[first_key] == section
+
+    subset = load_gil_payload_sections_as_numeric_message(
+        gil_path, field_numbers=(int(first_key), 999), max_depth=64, prefer_raw_hex_for_utf8=True
+    )
+    assert subset == {first_key: section}
+    assert view.get_section(999) is None
+
+    clear_gil_payload_view_cache(gil_path)
+    assert get_gil_payload_view(gil_path) is not view
+
+
+def test_gil_payload_view_cache_misses_after_file_content_changes(tmp_path: Path) -> None:
+    _ensure_private_extensions_importable()
+
+    from ugc_file_tools.gil_dump_codec.gil_payload_view import get_gil_payload_view
+
+    gil_path = _copy_sample_gil(tmp_path)
+    view = get_gil_payload_view(gil_path)
+
+    empty_base = (
+        Path(__file__).resolve().parents[2]
+        / "private_extensions/ugc_file_tools/builtin_resources/empty_base_samples/empty_base_vacuum.gil"
+    )
+    shutil.copyfile(empty_base, gil_path)
+    replaced = get_gil_payload_view(gil_path)
+    assert replaced is not view
+    assert replaced.sha1 != view.sha1
+    assert replaced.file_size == empty_base.stat().st_size
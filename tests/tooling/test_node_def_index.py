@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from engine.graph.models import NodeDefRef, NodeModel
+from engine.nodes.node_def_index import get_node_def_index, invalidate_node_def_index
+from engine.nodes.node_definition_loader import NodeDef, find_composite_node_def
+from engine.nodes.node_library_cache import build_lazy_node_library, load_node_library_cache, save_node_library_cache
+from engine.validate.node_def_resolver import resolve_node_def_for_model
+
+
+def _build_library() -> dict[str, NodeDef]:
+    add_node = NodeDef(name="加法运算", category="运算节点", canonical_key="运算节点/加法运算")
+    first = NodeDef(
+        name="示例复合",
+        category="复合节点",
+        canonical_key="复合节点/示例复合",
+        is_composite=True,
+        composite_id="composite_示例复合",
+    )
+    shadow = NodeDef(
+        name="示例复合_副本",
+        category="复合节点",
+        canonical_key="复合节点/示例复合_副本",
+        is_composite=True,
+        composite_id="composite_示例复合",
+    )
+    return {
+        "运算节点/加法运算": add_node,
+        "运算节点/加法": add_node,
+        "复合节点/示例复合": first,
+        "复合节点/示例复合_副本": shadow,
+    }
+
+
+def test_index_matches_linear_scan_semantics_and_is_shared_per_library() -> None:
+    library = _build_library()
+    index = get_node_def_index(library)
+    assert get_node_def_index(library) is index
+
+    # 同一 composite_id 命中多个条目时，与线性扫描一致取节点库顺序中的第一个
+    assert index.get_composite("composite_示例复合") is library["复合节点/示例复合"]
+    assert index.get_composite("composite_不存在") is None
+    assert index.get_by_category_title("运算节点", "加法运算") is library["运算节点/加法运算"]
+    assert find_composite_node_def(library, composite_id="composite_示例复合") == (
+        "复合节点/示例复合",
+        library["复合节点/示例复合"],
+    )
+
+    node = NodeModel(
+        id="n1",
+        title="示例复合",
+        category="复合节点",
+        node_def_ref=NodeDefRef(kind="composite", key="composite_示例复合"),
+    )
+    resolved = resolve_node_def_for_model(library, node_model=node)
+    assert resolved is not None and resolved.node_def is library["复合节点/示例复合"]
+
+    # 节点库条目数变化后索引自动重建；显式失效同样生效
+    library["复合节点/新增"] = NodeDef(name="新增", category="复合节点", is_composite=True, composite_id="composite_新增")
+    rebuilt = get_node_def_index(library)
+    assert rebuilt is not index
+    assert rebuilt.get_composite("composite_新增") is library["复合节点/新增"]
+    invalidate_node_def_index(library)
+    assert get_node_def_index(library) is not rebuilt
+
+
+def test_index_over_lazy_library_materializes_only_hits(tmp_path: Path) -> None:
+    cache_file = tmp_path / "node_library.pickle"
+    save_node_library_cache(cache_file, _build_library(), "fp-1")
+    payload = load_node_library_cache(cache_file)
+    assert payload is not None
+    library = build_lazy_node_library(payload)
+    pending_before = library.pending_count
+
+    index = get_node_def_index(library)
+    assert library.pending_count == pending_before
+    found = index.get_composite("composite_示例复合")
+    assert found is not None and found.name == "示例复合"
+    assert library.pending_count == pending_before - 1
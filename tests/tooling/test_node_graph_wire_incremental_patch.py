@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+
+def _ensure_private_extensions_importable() -> None:
+    repo_root = Path(__file__).resolve().parents[2]
+    private_extensions_root = (repo_root / "private_extensions").resolve()
+    if str(private_extensions_root) not in sys.path:
+        sys.path.insert(0, str(private_extensions_root))
+
+
+def _length_delimited(field_number: int, payload: bytes, *, padded_length: bool = False) -> bytes:
+    from ugc_file_tools.gil_dump_codec.protobuf_like import encode_tag, encode_varint
+
+    # padded_length：使用非最短的长度 varint（合法但 encode_message 不会这样写），用来识别“原样复用”
+    length_raw = bytes([0x80 | len(payload), 0x00]) if padded_length else encode_varint(len(payload))
+    return encode_tag(field_number, 2) + length_raw + payload
+
+
+def _graph_group(graph_id: int, name: str, *, padded_length: bool) -> bytes:
+    from ugc_file_tools.gil_dump_codec.protobuf_like import encode_message
+
+    header = encode_message({"5": int(graph_id)})
+    entry = _length_delimited(1, header) + _length_delimited(2, name.encode("utf-8"), padded_length=padded_length)
+    return _length_delimited(1, _length_delimited(1, entry))
+
+
+def _write_base_gil(tmp_path: Path) -> tuple[Path, bytes, bytes]:
+    from ugc_file_tools.gil_dump_codec.gil_container import GilContainerSpec, build_gil_file_bytes_from_payload
+    from ugc_file_tools.gil_dump_codec.protobuf_like import encode_message
+
+    untouched_group = _graph_group(1073741825, "untouched", padded_length=True)
+    edited_group = _graph_group(1073741826, "edited", padded_length=True)
+    section10 = untouched_group + edited_group + encode_message({"7": 2})
+    payload = encode_message({"1": 1}) + _length_delimited(10, section10)
+    spec = GilContainerSpec(header_value_one=1, header_value_two=2, type_id_value=3, footer_value=4)
+    base_path = tmp_path / "base.gil"
+    base_path.write_bytes(build_gil_file_bytes_from_payload(payload_bytes=payload, container_spec=spec))
+    return base_path, payload, untouched_group
+
+
+def test_section10_reencodes_only_changed_graph_entries(tmp_path: Path) -> None:
+    _ensure_private_extensions_importable()
+
+    from ugc_file_tools.gil_dump_codec.protobuf_like import encode_message
+    from ugc_file_tools.gil_dump_codec.protobuf_like_view import MessageView
+    from ugc_file_tools.gil_dump_codec.wire_patch import encode_message_reusing_wire_chunks
+    from ugc_file_tools.node_graph_writeback.gil_dump import (
+        _iter_graph_entries_for_group,
+        _iter_graph_groups,
+        build_section_wire_reuse_index,
+        dump_gil_to_raw_json_object,
+    )
+
+    base_path, payload, untouched_group = _write_base_gil(tmp_path)
+    section10 = dump_gil_to_raw_json_object(base_path)["4"]["10"]
+
+    # 索引在写盘时由 base payload 按需构建（解码本身不再记录任何全局状态）
+    reuse_index = build_section_wire_reuse_index(payload_bytes=payload, field_number=10)
+    assert reuse_index is not None
+    assert build_section_wire_reuse_index(payload_bytes=payload, field_number=5) is None
+
+    # 未修改：整段与 base 逐字节一致（而整段重编码会把非最短长度 varint 规范化）
+    base_section10 = payload[payload.index(untouched_group) :]
+    assert encode_message_reusing_wire_chunks(section10, reuse_index=reuse_index) == base_section10
+    assert encode_message(section10) != base_section10
+
+    edited_entry = _iter_graph_entries_for_group(_iter_graph_groups(section10)[1])[0]
+    edited_entry["2"] = "renamed"
+    patched = encode_message_reusing_wire_chunks(section10, reuse_index=reuse_index)
+
+    assert patched.startswith(untouched_group)
+    assert MessageView(patched).to_numeric_message() == MessageView(encode_message(section10)).to_numeric_message()
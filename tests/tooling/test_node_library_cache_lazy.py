@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import pickle
+from pathlib import Path
+
+from engine.nodes.node_definition_loader import NodeDef
+from engine.nodes.node_library_cache import (
+    build_lazy_node_library,
+    load_node_library_cache,
+    payload_contains_composite,
+    save_node_library_cache,
+)
+
+
+def _build_library() -> dict[str, NodeDef]:
+    add_node = NodeDef(
+        name="加法运算",
+        category="运算节点",
+        canonical_key="运算节点/加法运算",
+        inputs=["左值", "右值"],
+        outputs=["结果"],
+        input_types={"左值": "整数", "右值": "整数"},
+        output_types={"结果": "整数"},
+    )
+    composite_node = NodeDef(
+        name="示例复合",
+        category="复合节点",
+        canonical_key="复合节点/示例复合",
+        is_composite=True,
+        composite_id="composite_示例复合",
+    )
+    return {
+        "运算节点/加法运算": add_node,
+        "运算节点/加法": add_node,  # 别名注入键：与 canonical 共享同一实例
+        "复合节点/示例复合": composite_node,
+    }
+
+
+def test_cache_stores_canonical_once_and_materializes_on_lookup(tmp_path: Path) -> None:
+    cache_file = tmp_path / "node_library.pickle"
+    save_node_library_cache(cache_file, _build_library(), "fp-1")
+
+    with open(cache_file, "rb") as f:
+        raw_payload = pickle.load(f)
+    assert sorted(raw_payload["rows"]) == ["复合节点/示例复合", "运算节点/加法运算"]
+    assert raw_payload["aliases"] == {"运算节点/加法": "运算节点/加法运算"}
+
+    payload = load_node_library_cache(cache_file)
+    assert payload is not None
+    assert payload["node_defs_fp"] == "fp-1"
+    assert payload_contains_composite(payload)
+
+    library = build_lazy_node_library(payload)
+    assert isinstance(library, dict)
+    assert list(library) == ["运算节点/加法运算", "运算节点/加法", "复合节点/示例复合"]
+    assert library.pending_count == 2
+
+    alias_def = library.get("运算节点/加法")
+    assert isinstance(alias_def, NodeDef)
+    assert alias_def is library["运算节点/加法运算"]
+    assert alias_def.canonical_key == "运算节点/加法运算"
+    assert alias_def.get_port_type("左值", is_input=True) == "整数"
+    assert library.pending_count == 1
+
+    # 整库复制/遍历不会泄漏占位对象
+    assert all(isinstance(v, NodeDef) for v in dict(library).values())
+    assert library.pending_count == 0
+    assert library == _build_library()
+
+
+def test_lazy_library_filters_composites_without_materializing(tmp_path: Path) -> None:
+    cache_file = tmp_path / "node_library.pickle"
+    save_node_library_cache(cache_file, _build_library(), "fp-1")
+    payload = load_node_library_cache(cache_file)
+    assert payload is not None
+
+    library = build_lazy_node_library(payload, include_composite=False)
+    assert "复合节点/示例复合" not in library
+    assert library.pending_count == 1
+    assert [nd.name for nd in library.values()] == ["加法运算", "加法运算"]
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import shutil
+import sys
+from pathlib import Path
+
+
+def _ensure_private_extensions_importable() -> None:
+    repo_root = Path(__file__).resolve().parents[2]
+    private_extensions_root = (repo_root / "private_extensions").resolve()
+    if str(private_extensions_root) not in sys.path:
+        sys.path.insert(0, str(private_extensions_root))
+
+
+def test_gia_export_artifact_cache_roundtrip_and_invalidation(tmp_path: Path) -> None:
+    _ensure_private_extensions_importable()
+
+    from ugc_file_tools.pipelines.project_export_gia_parts.artifact_cache import GiaExportArtifactCache
+
+    model_json = tmp_path / "a.graph_model.json"
+    model_json.write_text("{}", encoding="utf-8")
+    gia_file = tmp_path / "a.gia"
+    gia_file.write_bytes(b"gia-bytes-v1")
+
+    cache = GiaExportArtifactCache(cache_dir=tmp_path / "cache")
+    cache.store_graph_model(
+        graph_key="g1",
+        model_key="m1",
+        export_report={"output_json": str(model_json)},
+        used_signal_specs=[{"signal_name": "s", "params": []}],
+    )
+    cache.store_gia_file(graph_key="g1", gia_key="k1", gia_file=gia_file)
+    cache.save()
+
+    reloaded = GiaExportArtifactCache(cache_dir=tmp_path / "cache")
+    hit = reloaded.lookup_graph_model(graph_key="g1", model_key="m1")
+    assert hit is not None and hit["used_signal_specs"] == [{"signal_name": "s", "params": []}]
+    assert reloaded.lookup_gia_bytes(graph_key="g1", gia_key="k1") == b"gia-bytes-v1"
+    assert reloaded.lookup_gia_bytes(graph_key="g1", gia_key="k2") is None
+
+    # GraphModel(JSON) 被其它导出覆盖（例如关闭缓存或不同坐标缩放）：不再复用
+    model_json.write_text('{"nodes": []}', encoding="utf-8")
+    assert reloaded.lookup_graph_model(graph_key="g1", model_key="m1") is None
+    model_json.write_text("{}", encoding="utf-8")
+    assert reloaded.lookup_graph_model(graph_key="g1", model_key="m1") is not None
+
+    # 上游（graph_model）键变化：下游 gia 产物一并失效，旧 blob 在保存时被清理
+    reloaded.store_graph_model(graph_key="g1", model_key="m2", export_report={"output_json": str(model_json)}, used_signal_specs=[])
+    assert reloaded.lookup_gia_bytes(graph_key="g1", gia_key="k1") is None
+    reloaded.save()
+    assert list((tmp_path / "cache" / "blobs").glob("*.gia")) == []
+
+    disabled = GiaExportArtifactCache(cache_dir=tmp_path / "cache", enabled=False)
+    assert disabled.lookup_graph_model(graph_key="g1", model_key="m2") is None
+
+
+def test_project_export_gia_reuses_unchanged_graph_artifacts(monkeypatch) -> None:
+    _ensure_private_extensions_importable()
+
+    from ugc_file_tools.output_paths import resolve_output_dir_path_in_out_dir
+    from ugc_file_tools.pipelines.project_export_gia import ProjectExportGiaPlan, run_project_export_to_gia
+
+    repo_root = Path(__file__).resolve().parents[2]
+    project_root = repo_root / "assets" / "资源库" / "项目存档" / "示例项目模板"
+    graph_dir = project_root / "节点图" / "server" / "实体节点图" / "模板示例"
+    graph_code_files = [
+        graph_dir / "模板示例_踏板开关_信号广播.py",
+        graph_dir / "模板示例_击杀计数_达10胜利.py",
+    ]
+    output_dir_name = "_pytest_gia_artifact_cache"
+    export_cache_root = project_root / "管理配置" / "导出缓存"
+    export_cache_root_existed = export_cache_root.is_dir()
+    cleanup_dirs = [
+        resolve_output_dir_path_in_out_dir(Path(output_dir_name)),
+        export_cache_root / "gia_artifacts" / output_dir_name,
+        export_cache_root / "graph_models" / output_dir_name,
+    ]
+
+    plan = ProjectExportGiaPlan(
+        project_archive_path=project_root,
+        graph_code_files=graph_code_files,
+        output_dir_name_in_out=output_dir_name,
+        pack_graphs_to_single_gia=True,
+    )
+    try:
+        first = run_project_export_to_gia(plan=plan)
+        assert first["cache_hit_graphs_total"] == 0
+        assert first["pack_cache_hit"] is False
+        first_bytes = {g["graph_name"]: Path(g["output_gia_file"]).read_bytes() for g in first["exported_graphs"]}
+
+        second = run_project_export_to_gia(plan=plan)
+        assert second["cache_hit_graphs_total"] == 2
+        assert second["cache_hit_graph_models_total"] == 2
+        assert second["pack_cache_hit"] is True
+        assert all(bool(g["cache_hit"]) for g in second["exported_graphs"])
+        assert {g["graph_name"]: Path(g["output_gia_file"]).read_bytes() for g in second["exported_graphs"]} == first_bytes
+
+        # 结构体定义变化（会写入 GraphModel 的 struct_bindings）：GraphModel 缓存失效
+        from engine.resources.definition_schema_view import get_default_definition_schema_view
+
+        schema_view_type = type(get_default_definition_schema_view())
+        original_get_structs = schema_view_type.get_all_struct_definitions
+        monkeypatch.setattr(
+            schema_view_type,
+            "get_all_struct_definitions",
+            lambda self: {**(original_get_structs(self) or {}), "__pytest_struct__": {"type": "Struct", "fields": []}},
+        )
+        third = run_project_export_to_gia(plan=plan)
+        assert third["cache_hit_graph_models_total"] == 0
+    finally:
+        for directory in cleanup_dirs:
+            if directory.is_dir():
+                shutil.rmtree(directory)
+        if not export_cache_root_existed and export_cache_root.is_dir():
+            shutil.rmtree(export_cache_root)
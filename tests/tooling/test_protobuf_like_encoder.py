@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+
+def _ensure_private_extensions_importable() -> None:
+    repo_root = Path(__file__).resolve().parents[2]
+    private_extensions_root = (repo_root / "private_extensions").resolve()
+    if str(private_extensions_root) not in sys.path:
+        sys.path.insert(0, str(private_extensions_root))
+
+
+def test_encode_message_accepts_raw_bytes_like_values() -> None:
+    _ensure_private_extensions_importable()
+
+    from ugc_file_tools.gil_dump_codec.protobuf_like import encode_message, format_binary_data_hex_text
+
+    blob = bytes(range(200))
+    as_text = {"1": format_binary_data_hex_text(blob), "2": [{"3": format_binary_data_hex_text(b"")}]}
+    expected = encode_message(as_text)
+
+    assert encode_message({"1": blob, "2": [{"3": b""}]}) == expected
+    assert encode_message({"1": bytearray(blob), "2": [{"3": memoryview(b"")}]}) == expected
+    assert encode_message({"1": memoryview(b"xx" + blob)[2:], "2": {"3": b""}}) == expected
+
+
+def test_encode_message_nested_sizes_and_scalar_shapes() -> None:
+    _ensure_private_extensions_importable()
+
+    from ugc_file_tools.gil_dump_codec.protobuf_like import encode_message
+    from ugc_file_tools.gil_dump_codec.protobuf_like_view import MessageView
+
+    # 嵌套长度跨越 1→2 字节 varint 边界；键乱序时按字段号升序写出
+    message = {
+        "20": {"1": "x" * 300, "2": {"1": [1, 2, 3]}},
+        "3": -1,
+        "1": True,
+        "2000": 0.5,
+        "4": {"fixed64_int": 7},
+    }
+    payload = encode_message(message)
+    assert payload.startswith(b"\x08\x01\x18\xff\xff\xff\xff\x0f\x21\x07" + b"\x00" * 7)
+    decoded = MessageView(payload).to_numeric_message()
+    assert decoded["20"] == {"1": "x" * 300, "2": {"1": [1, 2, 3]}}
+    assert decoded["2000"] == 0.5
+
+    with pytest.raises(ValueError):
+        encode_message({"a": 1})
+    with pytest.raises(TypeError):
+        encode_message({"1": object()})
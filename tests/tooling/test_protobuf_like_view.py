@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+
+def _ensure_private_extensions_importable() -> None:
+    repo_root = Path(__file__).resolve().parents[2]
+    private_extensions_root = (repo_root / "private_extensions").resolve()
+    if str(private_extensions_root) not in sys.path:
+        sys.path.insert(0, str(private_extensions_root))
+
+
+def _sample_message() -> dict:
+    return {
+        "1": 7,
+        "2": "名称",
+        "3": [{"1": 1, "2": "a"}, {"1": 2, "2": 0.5}],
+        "4": "<binary_data> 00 FF 10",
+        "5": {"1": {"1": 5000000000}},
+    }
+
+
+def test_message_view_matches_field_map_and_numeric_shapes() -> None:
+    _ensure_private_extensions_importable()
+
+    from ugc_file_tools.gil_dump_codec.protobuf_like import encode_message
+    from ugc_file_tools.gil_dump_codec.protobuf_like_bridge import decoded_field_map_to_numeric_message
+    from ugc_file_tools.gil_dump_codec.protobuf_like_view import MessageView
+
+    payload = encode_message(_sample_message())
+    view = MessageView(memoryview(payload))
+    assert view.consumed_offset == len(payload)
+
+    field_map = view.to_field_map()
+    assert field_map["field_1"] == {"int": 7, "int32_high16": 0, "int32_low16": 7}
+    assert field_map["field_2"] == {"raw_hex": "名称".encode("utf-8").hex(), "utf8": "名称"}
+    assert field_map["field_4"] == {"raw_hex": "00ff10"}
+    assert field_map["field_5"]["message"]["field_1"]["message"]["field_1"] == {"int": 5000000000}
+
+    for prefer_raw_hex in (False, True):
+        assert view.to_numeric_message(prefer_raw_hex_for_utf8=prefer_raw_hex) == decoded_field_map_to_numeric_message(
+            field_map, prefer_raw_hex_for_utf8=prefer_raw_hex
+        )
+    assert encode_message(view.to_numeric_message(prefer_raw_hex_for_utf8=True)) == payload
+
+
+def test_lazy_field_map_materializes_on_access_only() -> None:
+    _ensure_private_extensions_importable()
+
+    from ugc_file_tools.gil_dump_codec.protobuf_like import decode_message_to_field_map, encode_message
+    from ugc_file_tools.gil_dump_codec.protobuf_like_bridge import decoded_field_map_to_numeric_message
+    from ugc_file_tools.gil_dump_codec.protobuf_like_view import MessageView
+
+    payload = encode_message(_sample_message())
+    view = MessageView(payload)
+    lazy_map = view.as_field_map()
+    assert list(lazy_map) == ["field_1", "field_2", "field_3", "field_4", "field_5"]
+
+    # 未访问的嵌套 message 不会被扫描
+    nested_field = view.first(5)
+    assert nested_field is not None and nested_field._kind < 0
+    assert lazy_map["field_3"][1]["message"]["field_2"]["fixed32_float"] == 0.5
+    assert nested_field._kind < 0
+
+    expected, _ = decode_message_to_field_map(
+        data_bytes=payload, start_offset=0, end_offset=len(payload), remaining_depth=32
+    )
+    assert lazy_map == expected
+    assert decoded_field_map_to_numeric_message(lazy_map) == view.to_numeric_message()
+
+
+def test_message_view_on_sample_gil_roundtrips_payload() -> None:
+    _ensure_private_extensions_importable()
+
+    from ugc_file_tools.gil_dump_codec.gil_container import read_gil_payload_bytes
+    from ugc_file_tools.gil_dump_codec.protobuf_like import encode_message
+    from ugc_file_tools.gil_dump_codec.protobuf_like_view import MessageView
+
+    repo_root = Path(__file__).resolve().parents[2]
+    sample = (
+        repo_root
+        / "private_extensions/ugc_file_tools/builtin_resources/empty_base_samples/two_structs_sample.gil"
+    )
+    payload = read_gil_payload_bytes(sample)
+    view = MessageView(payload)
+    assert view.consumed_offset == len(payload)
+    assert encode_message(view.to_numeric_message(prefer_raw_hex_for_utf8=True)) == payload
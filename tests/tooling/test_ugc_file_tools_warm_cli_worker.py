@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+
+def _ensure_private_extensions_importable() -> None:
+    repo_root = Path(__file__).resolve().parents[2]
+    private_extensions_root = (repo_root / "private_extensions").resolve()
+    if str(private_extensions_root) not in sys.path:
+        sys.path.insert(0, str(private_extensions_root))
+
+
+def _script_path() -> Path:
+    return Path(__file__).resolve().parents[2] / "private_extensions" / "run_ugc_file_tools.py"
+
+
+def test_warm_cli_worker_reuses_process_and_restarts_after_crash(tmp_path: Path) -> None:
+    _ensure_private_extensions_importable()
+
+    from ugc_file_tools.ui_integration._cli_worker import WarmCliWorker
+
+    worker = WarmCliWorker(python_executable=sys.executable, script_path=_script_path(), idle_timeout_seconds=60)
+    log_lines: list[str] = []
+    result = worker.try_run(argv=["--help"], cwd=tmp_path, on_log_line=log_lines.append)
+    assert result is not None
+    assert result.exit_code == 0
+    assert any("usage:" in line for line in log_lines)
+    first_pid = worker.pid
+
+    # argparse 错误：退出码与独立子进程一致（2），且 worker 保持常驻
+    result = worker.try_run(argv=["no-such-command"], cwd=tmp_path)
+    assert result is not None
+    assert result.exit_code == 2
+    assert any("invalid choice" in line for line in result.stderr_tail)
+    assert worker.pid == first_pid
+
+    # worker 崩溃后下一次提交自动重启
+    worker._proc.kill()
+    worker._proc.wait()
+    result = worker.try_run(argv=["--help"], cwd=tmp_path)
+    assert result is not None
+    assert result.exit_code == 0
+    assert worker.pid != first_pid
+
+    worker.shutdown()
+
+
+def test_run_cli_with_progress_routes_ugc_file_tools_commands_to_warm_worker(tmp_path: Path, monkeypatch) -> None:
+    _ensure_private_extensions_importable()
+
+    from ugc_file_tools.ui_integration import _cli_worker
+    from ugc_file_tools.ui_integration._cli_subprocess import run_cli_with_progress
+
+    monkeypatch.delenv("UGC_FILE_TOOLS_WARM_WORKER", raising=False)
+    command = [sys.executable, "-X", "utf8", str(_script_path()), "--help"]
+    first = run_cli_with_progress(command=command, cwd=tmp_path)
+    worker = _cli_worker.get_warm_cli_worker(python_executable=sys.executable, script_path=_script_path())
+    pid = worker.pid
+    second = run_cli_with_progress(command=command, cwd=tmp_path)
+    assert first.exit_code == 0 and second.exit_code == 0
+    assert first.stderr_tail == second.stderr_tail
+    assert pid is not None and worker.pid == pid
+
+    # 关闭开关后退回冷启动子进程，输出口径不变
+    monkeypatch.setenv("UGC_FILE_TOOLS_WARM_WORKER", "0")
+    cold = run_cli_with_progress(command=command, cwd=tmp_path)
+    assert cold.exit_code == 0
+    assert cold.stderr_tail == first.stderr_tail
+
+    _cli_worker.shutdown_warm_cli_workers()
+
+
+def test_warm_cli_worker_handles_output_without_trailing_newline_and_bad_requests(tmp_path: Path) -> None:
+    _ensure_private_extensions_importable()
+
+    from ugc_file_tools.ui_integration._cli_worker import WarmCliWorker
+
+    private_extensions_root = Path(__file__).resolve().parents[2] / "private_extensions"
+    script_dir = tmp_path / "scripts"
+    script_dir.mkdir()
+    script = script_dir / "fake_worker.py"
+    script.write_text(
+        "import sys\n"
+        f"sys.path.insert(0, {str(private_extensions_root)!r})\n"
+        "from ugc_file_tools.ui_integration import _cli_worker_server as server\n"
+        "def _fake_call(argv):\n"
+        "    sys.stdout.write('partial-no-newline')\n"
+        "    return 0\n"
+        "server._call_unified_cli = _fake_call\n"
+        "server.serve_jsonl_worker(idle_timeout_seconds=60, script_path=__file__)\n",
+        encoding="utf-8",
+    )
+
+    worker = WarmCliWorker(python_executable=sys.executable, script_path=script, idle_timeout_seconds=60)
+    log_lines: list[str] = []
+    result = worker.try_run(argv=[], cwd=tmp_path, on_log_line=log_lines.append)
+    assert result is not None and result.exit_code == 0
+    assert "partial-no-newline" in log_lines
+
+    # 未知请求 / 非 JSON 行只回复 error，worker 仍继续接收任务
+    pid = worker.pid
+    assert worker._send({"op": "bogus", "id": "x"})
+    assert worker._proc is not None and worker._proc.stdin is not None
+    worker._proc.stdin.write("not-json {\n")
+    worker._proc.stdin.flush()
+    log_lines.clear()
+    result = worker.try_run(argv=[], cwd=tmp_path, on_log_line=log_lines.append)
+    assert result is not None and result.exit_code == 0
+    assert "partial-no-newline" in log_lines
+    assert worker.pid == pid
+
+    worker.shutdown()
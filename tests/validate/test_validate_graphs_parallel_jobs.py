@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import List, Tuple
+
+from engine.validate.graph_validation_orchestrator import (
+    ValidateGraphsOrchestrationOptions,
+    collect_validate_graphs_engine_issues,
+    ensure_validate_graphs_scope_applied,
+)
+from engine.validate.issue import EngineIssue
+from tests._helpers.project_paths import get_repo_root
+
+
+def _issue_signature(issues: List[EngineIssue]) -> List[Tuple[str, str, str, str]]:
+    # detail 中包含随机生成的 node_id，不参与比较。
+    return [(str(i.level), str(i.code), str(i.file or ""), str(i.category)) for i in issues]
+
+
+def _pick_targets(repo_root: Path) -> List[Path]:
+    library_root = repo_root / "assets" / "资源库"
+    shared_graphs = sorted((library_root / "共享" / "复合节点库").glob("composite_*.py"))[:2]
+    demo_graphs = sorted((library_root / "项目存档" / "演示项目" / "节点图").rglob("*.py"))[:1]
+    template_graphs = sorted((library_root / "项目存档" / "示例项目模板" / "节点图").rglob("模板示例_局部变量*.py"))[:2]
+    targets = [*template_graphs, *shared_graphs, *demo_graphs]
+    assert len(targets) >= 4
+    return targets
+
+
+def test_parallel_jobs_preserve_serial_issue_order() -> None:
+    repo_root = get_repo_root()
+    targets = _pick_targets(repo_root)
+
+    serial_options = ValidateGraphsOrchestrationOptions(use_cache=False, jobs=1)
+    parallel_options = ValidateGraphsOrchestrationOptions(use_cache=False, jobs=2)
+    try:
+        serial_issues = collect_validate_graphs_engine_issues(targets, repo_root, options=serial_options)
+        parallel_issues = collect_validate_graphs_engine_issues(targets, repo_root, options=parallel_options)
+    finally:
+        # 串行模式会在本进程切换作用域；还原为共享根，避免影响后续用例。
+        ensure_validate_graphs_scope_applied(None, repo_root)
+
+    assert _issue_signature(parallel_issues) == _issue_signature(serial_issues)
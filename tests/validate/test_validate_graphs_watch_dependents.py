@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import List
+
+from engine.validate.graph_validation_orchestrator import ValidateGraphsOrchestrationOptions
+from engine.validate.graph_validation_watch import GraphValidationWatcher
+from tests._helpers.project_paths import get_repo_root
+
+
+def _package_root(repo_root: Path) -> Path:
+    return repo_root / "assets" / "资源库" / "项目存档" / "示例项目模板"
+
+
+def _names(paths: List[Path]) -> List[str]:
+    return [p.name for p in paths]
+
+
+def _build_watcher(repo_root: Path) -> GraphValidationWatcher:
+    package_root = _package_root(repo_root)
+    targets = sorted((package_root / "节点图").rglob("*.py")) + sorted((package_root / "复合节点库").glob("*.py"))
+    return GraphValidationWatcher(targets, repo_root, options=ValidateGraphsOrchestrationOptions(use_cache=False))
+
+
+def test_graph_change_only_affects_itself() -> None:
+    repo_root = get_repo_root()
+    watcher = _build_watcher(repo_root)
+    graph_file = next(p for p in watcher.targets if p.name == "模板示例_局部变量计数.py")
+
+    assert watcher.compute_affected_targets([graph_file]) == [graph_file]
+
+
+def test_composite_change_affects_direct_and_nested_users() -> None:
+    repo_root = get_repo_root()
+    watcher = _build_watcher(repo_root)
+    composite_file = _package_root(repo_root) / "复合节点库" / "composite_多引脚模板_示例.py"
+
+    affected = _names(watcher.compute_affected_targets([composite_file]))
+
+    assert "composite_多引脚模板_示例.py" in affected
+    # 包装复合节点直接引用被修改的复合节点；使用包装复合节点的节点图属于传递依赖。
+    assert "composite_多引脚模板_包装_单入口_示例.py" in affected
+    assert "模板示例_多引脚_复合节点用法.py" in affected
+    assert "模板示例_局部变量计数.py" not in affected
+
+
+def test_signal_definition_change_affects_graphs_using_signal_name() -> None:
+    repo_root = get_repo_root()
+    watcher = _build_watcher(repo_root)
+    signal_file = _package_root(repo_root) / "管理配置" / "信号" / "signal_example_pedal_switch_state.py"
+
+    affected = _names(watcher.compute_affected_targets([signal_file]))
+
+    assert "模板示例_踏板开关_信号广播.py" in affected
+    # 复合节点内部发送该信号：使用该复合节点的节点图属于传递依赖。
+    assert "composite_复合内发送信号_示例_类格式.py" in affected
+    assert "模板示例_复合内发送信号_复合节点用法.py" in affected
+    assert "模板示例_局部变量计数.py" not in affected
+
+
+def test_watch_validates_each_scope_group_in_one_batch(monkeypatch) -> None:
+    from engine.validate import api as validate_api
+    from engine.validate import graph_validation_watch as watch_module
+
+    repo_root = get_repo_root()
+    package_root = _package_root(repo_root)
+    targets = [
+        next((package_root / "节点图").rglob("模板示例_局部变量计数.py")),
+        next((package_root / "节点图").rglob("模板示例_多引脚_复合节点用法.py")),
+        package_root / "复合节点库" / "composite_多引脚模板_示例.py",
+    ]
+    options = ValidateGraphsOrchestrationOptions(use_cache=False, enable_composite_struct_check=True)
+    watcher = GraphValidationWatcher(targets, repo_root, options=options)
+
+    batches: List[List[Path]] = []
+    original_validate_each = validate_api.GraphFileValidator.validate_each
+
+    def _recording_validate_each(self, paths, **kwargs):
+        batches.append(list(paths))
+        return original_validate_each(self, paths, **kwargs)
+
+    clears: List[int] = []
+    original_clear = watch_module.clear_node_index_caches
+    monkeypatch.setattr(validate_api.GraphFileValidator, "validate_each", _recording_validate_each)
+    monkeypatch.setattr(watch_module, "clear_node_index_caches", lambda: (clears.append(1), original_clear())[1])
+
+    cycle = watcher.run_initial()
+    assert batches == [[p.resolve() for p in targets]]
+    assert len(clears) == 1
+    assert cycle.validated_files == [p.resolve() for p in targets]
+
+    # 与逐文件调用 validate_files（+ 复合节点结构校验）的结果一致
+    for file_path in cycle.validated_files:
+        expected = list(validate_api.validate_files([file_path], repo_root, use_cache=False).issues)
+        expected.extend(watch_module.collect_composite_structural_issues([file_path], repo_root))
+        assert [i.to_dict() for i in cycle.issues_by_file[file_path]] == [i.to_dict() for i in expected]
+
+    # 目标文件自身变化：只重新校验该文件，规则流水线与节点索引缓存保持预热
+    batches.clear()
+    watcher._validate([targets[0].resolve()], changed_files=[targets[0].resolve()], use_cache=False)
+    assert batches == [[targets[0].resolve()]]
+    assert len(clears) == 1